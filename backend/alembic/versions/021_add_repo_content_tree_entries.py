@@ -0,0 +1,75 @@
+"""Add directory-indexed repo_content_tree_entries table.
+
+Stores the commit-centric file explorer tree as one row per entry, indexed
+by (cache_id, parent_path), so listing a directory reads only its children
+instead of loading the whole full_tree JSONB blob. Existing full_tree
+values are copied into the new table.
+
+Revision ID: 021_add_tree_entries
+Revises: 020_add_full_tree
+Create Date: 2024-12-16
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "021_add_tree_entries"
+down_revision: str | None = "020_add_full_tree"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create repo_content_tree_entries and backfill from full_tree."""
+    op.create_table(
+        "repo_content_tree_entries",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("cache_id", UUID(as_uuid=True), sa.ForeignKey("repo_content_cache.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("parent_path", sa.String(1024), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("path", sa.String(1024), nullable=False),
+        sa.Column("type", sa.String(10), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.UniqueConstraint("cache_id", "path", name="uq_repo_content_tree_entries_cache_path"),
+    )
+
+    # Directory listing lookup: WHERE cache_id = ? AND parent_path = ?
+    op.create_index(
+        "ix_repo_content_tree_entries_parent",
+        "repo_content_tree_entries",
+        ["cache_id", "parent_path"],
+    )
+
+    # Backfill from existing full_tree JSONB arrays
+    op.execute(
+        """
+        INSERT INTO repo_content_tree_entries (cache_id, parent_path, name, path, type, size)
+        SELECT
+            t.cache_id,
+            CASE WHEN position('/' IN e->>'path') > 0
+                 THEN regexp_replace(e->>'path', '/[^/]*$', '')
+                 ELSE ''
+            END,
+            e->>'name',
+            e->>'path',
+            e->>'type',
+            (e->>'size')::bigint
+        FROM repo_content_tree t
+        CROSS JOIN LATERAL jsonb_array_elements(t.full_tree) AS e
+        WHERE t.full_tree IS NOT NULL
+        ON CONFLICT ON CONSTRAINT uq_repo_content_tree_entries_cache_path DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop repo_content_tree_entries table."""
+    op.drop_index("ix_repo_content_tree_entries_parent", table_name="repo_content_tree_entries")
+    op.drop_table("repo_content_tree_entries")
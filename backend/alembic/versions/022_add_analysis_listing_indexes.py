@@ -0,0 +1,45 @@
+"""Add composite indexes for analysis listing endpoints.
+
+list_analyses orders a repository's analyses by created_at, and the VCI
+history filters completed analyses by repository and orders by
+completed_at. Both previously relied on the single-column repository_id
+index and a sort over full rows.
+
+Revision ID: 022_add_analysis_listing_idx
+Revises: 021_add_tree_entries
+Create Date: 2024-12-17
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "022_add_analysis_listing_idx"
+down_revision: str | None = "021_add_tree_entries"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create listing indexes on analyses."""
+    # Covering index for VCI history (index-only scan: includes every column the history reads)
+    op.create_index(
+        "ix_analyses_repo_status_completed",
+        "analyses",
+        ["repository_id", "status", "completed_at"],
+        postgresql_include=["vci_score", "commit_sha", "created_at"],
+    )
+    # Paginated analysis list ordered by created_at
+    op.create_index(
+        "ix_analyses_repo_created",
+        "analyses",
+        ["repository_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    """Drop listing indexes on analyses."""
+    op.drop_index("ix_analyses_repo_created", table_name="analyses")
+    op.drop_index("ix_analyses_repo_status_completed", table_name="analyses")
@@ -0,0 +1,42 @@
+"""Add ai_scan_fingerprint to analyses.
+
+Stores a SHA-256 of the AI scan inputs (repo view content, model list and
+prompt version) so a new scan with identical inputs can reuse the cached
+result of an earlier analysis instead of calling the models again.
+
+Revision ID: 023_add_ai_scan_fingerprint
+Revises: 022_add_analysis_listing_idx
+Create Date: 2024-12-17
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "023_add_ai_scan_fingerprint"
+down_revision: str | None = "022_add_analysis_listing_idx"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add ai_scan_fingerprint column and reuse lookup index."""
+    op.add_column(
+        "analyses",
+        sa.Column("ai_scan_fingerprint", sa.String(64), nullable=True),
+    )
+    op.create_index(
+        "ix_analyses_repo_ai_scan_fingerprint",
+        "analyses",
+        ["repository_id", "ai_scan_fingerprint"],
+    )
+
+
+def downgrade() -> None:
+    """Drop ai_scan_fingerprint column and index."""
+    op.drop_index("ix_analyses_repo_ai_scan_fingerprint", table_name="analyses")
+    op.drop_column("analyses", "ai_scan_fingerprint")
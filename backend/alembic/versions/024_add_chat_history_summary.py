@@ -0,0 +1,44 @@
+"""Add running history summary to chat threads.
+
+Chat prompts now load a SQL-side window of the latest messages and fold
+older turns into a per-thread summary. The composite index serves the
+ordered window query without sorting the whole thread.
+
+Revision ID: 024_add_chat_history_summary
+Revises: 023_add_ai_scan_fingerprint
+Create Date: 2024-12-18
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "024_add_chat_history_summary"
+down_revision: str | None = "023_add_ai_scan_fingerprint"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add summary columns and the history window index."""
+    op.add_column("chat_threads", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column(
+        "chat_threads",
+        sa.Column("summary_through", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_chat_messages_thread_created",
+        "chat_messages",
+        ["thread_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    """Drop summary columns and the history window index."""
+    op.drop_index("ix_chat_messages_thread_created", table_name="chat_messages")
+    op.drop_column("chat_threads", "summary_through")
+    op.drop_column("chat_threads", "summary")
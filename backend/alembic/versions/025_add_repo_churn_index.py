@@ -0,0 +1,54 @@
+"""Add per-repository churn index tables.
+
+GitAnalyzer mines git history into day-bucketed per-file churn. Persisting
+it per repository, keyed by the last mined commit, lets later analyses mine
+only the commits pushed since.
+
+Revision ID: 025_add_repo_churn_index
+Revises: 024_add_chat_history_summary
+Create Date: 2024-12-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "025_add_repo_churn_index"
+down_revision: str | None = "024_add_chat_history_summary"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create repo_churn_indexes and repo_churn_index_files."""
+    op.create_table(
+        "repo_churn_indexes",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("repository_id", UUID(as_uuid=True), sa.ForeignKey("repositories.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("head_sha", sa.String(40), nullable=False),
+        sa.Column("created_at", TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("updated_at", TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.UniqueConstraint("repository_id", name="uq_repo_churn_indexes_repository_id"),
+    )
+
+    op.create_table(
+        "repo_churn_index_files",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("index_id", UUID(as_uuid=True), sa.ForeignKey("repo_churn_indexes.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("file_path", sa.String(1024), nullable=False),
+        sa.Column("days", JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("last_modified", TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("created_at", TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.UniqueConstraint("index_id", "file_path", name="uq_repo_churn_index_files_index_path"),
+    )
+
+
+def downgrade() -> None:
+    """Drop churn index tables."""
+    op.drop_table("repo_churn_index_files")
+    op.drop_table("repo_churn_indexes")
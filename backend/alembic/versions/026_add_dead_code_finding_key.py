@@ -0,0 +1,49 @@
+"""Add a unique key to dead code findings.
+
+Architecture findings are now upserted with INSERT ... ON CONFLICT, which
+needs a key per finding: (analysis, file, function, start line).
+Duplicate rows are removed first, keeping a dismissed row over an
+undismissed one.
+
+Revision ID: 026_add_dead_code_finding_key
+Revises: 025_add_repo_churn_index
+Create Date: 2024-12-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "026_add_dead_code_finding_key"
+down_revision: str | None = "025_add_repo_churn_index"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Deduplicate dead_code and add uq_dead_code_analysis_finding."""
+    op.execute(
+        """
+        DELETE FROM dead_code d
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY analysis_id, file_path, function_name, line_start
+                ORDER BY is_dismissed DESC, created_at, id
+            ) AS rank
+            FROM dead_code
+        ) ranked
+        WHERE d.id = ranked.id AND ranked.rank > 1
+        """
+    )
+    op.create_unique_constraint(
+        "uq_dead_code_analysis_finding",
+        "dead_code",
+        ["analysis_id", "file_path", "function_name", "line_start"],
+    )
+
+
+def downgrade() -> None:
+    """Drop uq_dead_code_analysis_finding."""
+    op.drop_constraint("uq_dead_code_analysis_finding", "dead_code", type_="unique")
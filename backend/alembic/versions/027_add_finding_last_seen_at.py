@@ -0,0 +1,43 @@
+"""Add last_seen_at to architecture findings.
+
+Each persist of an analysis' findings stamps the rows it upserts, and
+removes the analysis' rows carrying an older stamp, instead of sending
+every kept id back in a NOT IN list.
+
+Revision ID: 027_add_finding_last_seen_at
+Revises: 026_add_dead_code_finding_key
+Create Date: 2024-12-20
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "027_add_finding_last_seen_at"
+down_revision: str | None = "026_add_dead_code_finding_key"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add last_seen_at to dead_code and file_churn."""
+    for table in ("dead_code", "file_churn"):
+        op.add_column(
+            table,
+            sa.Column(
+                "last_seen_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Drop last_seen_at from dead_code and file_churn."""
+    for table in ("file_churn", "dead_code"):
+        op.drop_column(table, "last_seen_at")
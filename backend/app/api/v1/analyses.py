@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from typing import Literal
 from uuid import UUID
 
@@ -10,12 +10,12 @@ from fastapi import APIRouter, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from app.api.deps import CurrentUser, DbSession
 from app.core.config import settings
 from app.core.redis import publish_analysis_progress, subscribe_analysis_progress
-from app.models.analysis import Analysis
+from app.models.analysis import Analysis, grade_for_score
 from app.models.issue import Issue
 from app.models.repository import Repository
 from app.schemas.analysis import (
@@ -27,6 +27,7 @@ from app.schemas.analysis import (
     compute_overall_progress_parallel,
     compute_overall_stage_parallel,
 )
+from app.services.analysis_state import get_stuck_reason
 from app.workers.ai_scan import run_ai_scan
 from app.workers.analysis import analyze_repository
 from app.workers.embeddings import generate_embeddings_parallel
@@ -90,74 +91,65 @@ async def get_analysis_for_user_or_404(
 
 
 # =============================================================================
-# Stuck Analysis Detection Helpers
+# Listing Query Helpers
 # =============================================================================
 
+# Columns rendered by list_analyses. The semantic_cache and ai_scan_cache JSONB
+# blobs are never loaded, so list latency does not depend on their size.
+ANALYSIS_LIST_COLUMNS = (
+    Analysis.id,
+    Analysis.repository_id,
+    Analysis.commit_sha,
+    Analysis.branch,
+    Analysis.status,
+    Analysis.vci_score,
+    Analysis.tech_debt_level,
+    Analysis.metrics,
+    Analysis.ai_report,
+    Analysis.started_at,
+    Analysis.completed_at,
+    Analysis.created_at,
+)
 
-def is_analysis_stuck(analysis: Analysis) -> bool:
-    """
-    Determine if an analysis is stuck based on heartbeat-based detection.
-
-    For pending status: stuck if created_at is older than analysis_pending_stuck_minutes.
-    For running status: stuck if state_updated_at is older than analysis_running_heartbeat_timeout_minutes.
-    Terminal states (completed/failed/skipped) are never considered stuck.
-
-    Args:
-        analysis: The Analysis model instance to check.
 
-    Returns:
-        True if the analysis is stuck, False otherwise.
+def build_analysis_list_query(repository_id: UUID, limit: int, offset: int):
+    """Build the paginated analysis list query (served by ix_analyses_repo_created)."""
+    return (
+        select(Analysis)
+        .options(load_only(*ANALYSIS_LIST_COLUMNS, raiseload=True))
+        .where(Analysis.repository_id == repository_id)
+        .order_by(Analysis.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
 
-    **Feature: heartbeat-stuck-detection**
-    **Validates: Section 6.2 of analysis-status-contract.md**
-    """
-    now = datetime.now(UTC)
 
-    # Terminal states are never stuck
-    if analysis.status in ("completed", "failed", "skipped"):
-        return False
+def build_vci_history_query(repository_id: UUID, limit: int):
+    """Build the VCI history query as a plain column projection.
 
-    if analysis.status == "pending":
-        # Pending-stuck: waiting too long for a worker to start
-        pending_timeout = timedelta(minutes=settings.analysis_pending_stuck_minutes)
-        created_at = analysis.created_at
-        # Ensure timezone-aware comparison
-        if created_at.tzinfo is None:
-            created_at = created_at.replace(tzinfo=UTC)
-        return created_at < (now - pending_timeout)
-
-    if analysis.status == "running":
-        # Running-stuck: no heartbeat for too long
-        heartbeat_timeout = timedelta(minutes=settings.analysis_running_heartbeat_timeout_minutes)
-        state_updated_at = analysis.state_updated_at
-        # Ensure timezone-aware comparison
-        if state_updated_at.tzinfo is None:
-            state_updated_at = state_updated_at.replace(tzinfo=UTC)
-        return state_updated_at < (now - heartbeat_timeout)
-
-    # Unknown status - treat as not stuck (shouldn't happen)
-    return False
-
-
-def get_stuck_reason(analysis: Analysis) -> Literal["pending_timeout", "heartbeat_timeout"] | None:
+    Every selected column is in ix_analyses_repo_status_completed, so
+    PostgreSQL can answer it with an index-only scan.
     """
-    Get the reason why an analysis is stuck.
-
-    Args:
-        analysis: The Analysis model instance to check.
+    return (
+        select(
+            Analysis.completed_at,
+            Analysis.created_at,
+            Analysis.vci_score,
+            Analysis.commit_sha,
+        )
+        .where(
+            Analysis.repository_id == repository_id,
+            Analysis.status == "completed",
+            Analysis.vci_score.isnot(None),
+        )
+        .order_by(Analysis.completed_at.desc())
+        .limit(limit)
+    )
 
-    Returns:
-        "pending_timeout" if pending too long, "heartbeat_timeout" if no heartbeat,
-        or None if not stuck.
-    """
-    if not is_analysis_stuck(analysis):
-        return None
 
-    if analysis.status == "pending":
-        return "pending_timeout"
-    if analysis.status == "running":
-        return "heartbeat_timeout"
-    return None
+# =============================================================================
+# Stuck Analysis Detection Helpers
+# =============================================================================
 
 
 def mark_analysis_as_stuck_failed(
@@ -232,13 +224,9 @@ async def list_analyses(
             detail="Repository not found",
         )
 
-    # Get analyses
+    # Get analyses (summary columns only, heavy JSONB caches are not loaded)
     result = await db.execute(
-        select(Analysis)
-        .where(Analysis.repository_id == repository_id)
-        .order_by(Analysis.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+        build_analysis_list_query(repository_id, limit, offset)
     )
     analyses = result.scalars().all()
 
@@ -883,18 +871,9 @@ async def get_vci_history(
             detail="Repository not found",
         )
 
-    # Get completed analyses
-    result = await db.execute(
-        select(Analysis)
-        .where(
-            Analysis.repository_id == repository_id,
-            Analysis.status == "completed",
-            Analysis.vci_score.isnot(None),
-        )
-        .order_by(Analysis.completed_at.desc())
-        .limit(limit)
-    )
-    analyses = result.scalars().all()
+    # Get completed analyses (column projection, no ORM rows)
+    result = await db.execute(build_vci_history_query(repository_id, limit))
+    analyses = result.all()
 
     # Reverse for chronological order
     analyses = list(reversed(analyses))
@@ -905,7 +884,7 @@ async def get_vci_history(
             {
                 "date": a.completed_at.isoformat() if a.completed_at else a.created_at.isoformat(),
                 "vci_score": float(a.vci_score) if a.vci_score is not None else None,
-                "grade": a.grade,
+                "grade": grade_for_score(a.vci_score),
                 "commit_sha": a.commit_sha[:7] if a.commit_sha else None,
             }
             for a in analyses
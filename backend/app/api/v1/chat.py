@@ -3,10 +3,12 @@
 **Feature: commit-aware-rag**
 """
 
+import asyncio
 import logging
+import re
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from qdrant_client import QdrantClient
@@ -18,8 +20,18 @@ from app.core.config import settings
 from app.core.rate_limit import enforce_rate_limit
 from app.models.chat import ChatMessage, ChatThread
 from app.models.repository import Repository
+from app.services.chat_context import (
+    PromptHistory,
+    budget_for_model,
+    fit_history,
+    format_rag_context,
+    load_history_window,
+    roll_up_history,
+    truncate_to_tokens,
+)
 from app.services.github import GitHubService
 from app.services.llm_gateway import get_llm_gateway
+from app.services.tokenizer import get_tokenizer
 from app.services.vector_store import VectorStoreService
 
 logger = logging.getLogger(__name__)
@@ -34,6 +46,10 @@ _MAX_TREE_ENTRIES = 2000
 _MAX_TREE_LINES = 2000
 _MAX_ACTIVE_FILE_CHARS = 12000
 _MAX_FILE_BYTES = 1_000_000  # GitHub contents API limit
+# Tool loop: keys that open a tool call object (see _parse_tool_calls)
+_TOOL_CALL_KEYS = frozenset({"tool", "tool_call", "name"})
+_JSON_FIRST_KEY = re.compile(r'\{\s*"((?:[^"\\]|\\.)*)"')
+_JSON_KEY_PENDING = re.compile(r'\{\s*(?:"(?:[^"\\]|\\.)*)?$')
 _SENSITIVE_PATH_SUBSTRINGS = [
     "/.env",
     ".env",
@@ -109,6 +125,99 @@ def _is_sensitive_repo_path(path: str) -> bool:
     return any(s in p for s in _SENSITIVE_PATH_SUBSTRINGS)
 
 
+def _merge_turn_stats(total: dict | None, turn: dict | None) -> dict | None:
+    """Add one tool loop turn's usage and cost to the running totals.
+
+    The model reported is the one that served the latest turn.
+    """
+    if not turn:
+        return total
+    total = total or {}
+    usage = total.get("usage")
+    if turn.get("usage"):
+        usage = {
+            key: ((usage or {}).get(key) or 0) + (turn["usage"].get(key) or 0)
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens")
+        }
+    cost = total.get("cost")
+    if turn.get("cost") is not None:
+        cost = (cost or 0.0) + turn["cost"]
+    return {"model": turn.get("model") or total.get("model"), "usage": usage, "cost": cost}
+
+
+def _line_kind(rest: str) -> str | None:
+    """Classify the model output line that starts `rest` (the unsent tail).
+
+    Returns "tool" if the line opens a tool call object (bare or in a
+    code fence), "prose" if it cannot, and None while undecided.
+    """
+    stripped = rest.lstrip(" \t")
+    if not stripped:
+        return None
+    if stripped.startswith("{"):
+        match = _JSON_FIRST_KEY.match(stripped)
+        if match:
+            return "tool" if match.group(1) in _TOOL_CALL_KEYS else "prose"
+        return None if _JSON_KEY_PENDING.match(stripped) else "prose"
+    if stripped in ("`", "``"):
+        return None
+    if stripped.startswith("```"):
+        if "\n" not in stripped:
+            return None
+        # A fence opens a tool call only if its first line does
+        return _line_kind(stripped.split("\n", 1)[1])
+    return "prose"
+
+
+class _TurnSplitter:
+    """Split a streamed tool loop turn into prose to forward and a held tail.
+
+    Tool calls are JSON objects on their own lines, so prose is released
+    line by line as it arrives (a line is held only while it might still
+    open a tool call). From the first line that opens a tool call the rest
+    of the turn is held until it can be parsed.
+    """
+
+    def __init__(self, detect_tool_calls: bool = True):
+        self.detect_tool_calls = detect_tool_calls
+        self.text = ""
+        self._sent = 0
+        self._at_line_start = True
+        self._tool_call_seen = False
+
+    @property
+    def held(self) -> str:
+        """Text not forwarded yet."""
+        return self.text[self._sent:]
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk of the turn and return the prose that is safe to forward."""
+        self.text += chunk
+        if not self.detect_tool_calls:
+            self._sent = len(self.text)
+            return chunk
+        if self._tool_call_seen:
+            return ""
+
+        pos = self._sent
+        while pos < len(self.text):
+            line_end = self.text.find("\n", pos)
+            end = len(self.text) if line_end == -1 else line_end + 1
+            if self._at_line_start:
+                kind = _line_kind(self.text[pos:])
+                if kind is None:
+                    break
+                if kind == "tool":
+                    self._tool_call_seen = True
+                    break
+            pos = end
+            self._at_line_start = line_end != -1
+
+        released = self.text[self._sent:pos]
+        self._sent = pos
+        return released
+
+
 async def _get_repo_tree_lines(
     repository_id: UUID,
     user_id: UUID,
@@ -680,6 +789,7 @@ async def send_message(
     db: DbSession,
     user: CurrentUser,
     request: Request,
+    background_tasks: BackgroundTasks,
 ):
     """Send a message and get AI response (with optional streaming)."""
     enforce_rate_limit(
@@ -692,10 +802,7 @@ async def send_message(
     # Get thread
     result = await db.execute(
         select(ChatThread)
-        .options(
-            selectinload(ChatThread.messages),
-            selectinload(ChatThread.repository),
-        )
+        .options(selectinload(ChatThread.repository))
         .where(ChatThread.id == thread_id, ChatThread.user_id == user.id)
     )
     thread = result.scalar_one_or_none()
@@ -703,6 +810,9 @@ async def send_message(
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found")
 
+    # Latest turns for the prompt, loaded before the new message is saved
+    history_window = await load_history_window(db, thread)
+
     # Save user message with context_ref
     # **Feature: chat-branch-context**
     # **Validates: Requirements 2.1**
@@ -728,14 +838,21 @@ async def send_message(
                 db,
                 model=resolved_model,
                 context=payload.context,
+                history_window=history_window,
             ),
             media_type="text/event-stream",
         )
     else:
         # Non-streaming response - build context here
-        messages = await _build_chat_messages(thread, payload.content, context=payload.context)
+        messages, history = await _build_chat_messages(
+            thread,
+            payload.content,
+            context=payload.context,
+            history_window=history_window,
+            model=resolved_model,
+        )
         llm = get_llm_gateway()
-        response = await llm.chat(messages=messages, model=resolved_model)
+        response = await llm.chat(messages=messages, model=resolved_model, task="chat")
 
         # Save assistant message with context_ref
         # **Feature: chat-branch-context**
@@ -751,6 +868,10 @@ async def send_message(
         thread.message_count += 2
         await db.commit()
 
+        # Fold turns that no longer fit into the running summary after the
+        # response is sent, so it never delays the answer
+        background_tasks.add_task(_roll_up_history_in_background, thread_id, history, llm)
+
         return {
             "message": {
                 "id": str(assistant_message.id),
@@ -768,9 +889,13 @@ async def _stream_response(
     db,
     model: str | None = None,
     context: ChatContext | None = None,
+    history_window: list[ChatMessage] | None = None,
 ):
     """Stream LLM response (SSE) and persist assistant message at the end.
 
+    The prompt is assembled against the model's token budget (see
+    app.services.chat_context); tool results share the tools budget.
+
     Structured SSE events:
       - event: context_source  data: {"source": "...", "status": "found"|"empty"|"error", "detail": "...", "count": N}
       - event: step            data: {"title": "...", "detail": "..."}
@@ -787,12 +912,13 @@ async def _stream_response(
 
     llm = get_llm_gateway()
     full_response: list[str] = []
+    tokenizer = get_tokenizer(settings.chat_tokenizer)
+    budget = budget_for_model(model)
 
     # ----------------------------
     # Tool loop configuration
     # ----------------------------
     max_tool_calls = 8
-    max_total_tool_chars = 200_000
     max_tool_result_chars = 50_000
 
     @dataclass
@@ -1049,9 +1175,12 @@ async def _stream_response(
     # ----------------------------
     tool_system = """You may call tools to inspect the repository.
 
-When you need to use a tool, output ONLY a single JSON object in one line:
+When you need to use a tool, output ONLY JSON objects, one per line:
 {"tool":"<name>","arguments":{...}}
 
+You may output several tool calls at once when they do not depend on each
+other (e.g. reading three files); they run in parallel.
+
 Available tools:
 - list_files(path, depth, max_entries)
 - read_file(path, max_chars)
@@ -1137,17 +1266,10 @@ Rules:
                 "No vectors found for this repository/commit. Using GitHub API fallback.",
             )
 
-        # Build RAG context section
-        context_section = ""
-        if rag_chunks:
-            context_section = "\n\n## Relevant Code Context (from vector search):\n"
-            for i, chunk in enumerate(rag_chunks, 1):
-                context_section += f"\n### {i}. {chunk['file_path']}"
-                if chunk['name']:
-                    context_section += f" - {chunk['chunk_type']} `{chunk['name']}`"
-                if chunk['line_start']:
-                    context_section += f" (lines {chunk['line_start']}-{chunk['line_end']})"
-                context_section += f"\n```\n{(chunk.get('content') or '')[:1500]}\n```\n"
+        # Build RAG context section (best-ranked chunks within the RAG budget)
+        context_section, _ = format_rag_context(
+            rag_chunks, budget.rag, tokenizer, heading="Relevant Code Context (from vector search)"
+        )
 
         # --- IDE Context Pack ---
         ide_section = ""
@@ -1234,6 +1356,9 @@ Rules:
                     logger.warning(f"Failed to read active file for context: {e}")
                     yield _emit_context_source("active_file", "error", str(e)[:100])
 
+        # IDE context pack shares the system prompt budget
+        ide_section = truncate_to_tokens(ide_section, budget.system, tokenizer)
+
         # Build system prompt
         system_prompt = f"""You are n9r, an AI assistant specialized in code analysis and improvement.
 You are helping with repository: {thread.repository.full_name}
@@ -1262,16 +1387,20 @@ Be concise, technical, and helpful. Reference specific files and line numbers wh
         messages: list[dict[str, str]] = []
         messages.append({"role": "system", "content": system_prompt})
 
-        # Add conversation history (last 10 messages)
-        sorted_messages = sorted(thread.messages, key=lambda x: x.created_at)[-10:]
-        for msg in sorted_messages:
-            messages.append({"role": msg.role, "content": msg.content})
+        # Add conversation history (running summary + newest turns that fit)
+        history = fit_history(
+            history_window or [],
+            thread.summary,
+            budget.history - tokenizer.count(user_message),
+            tokenizer,
+        )
+        messages.extend(history.to_messages())
 
         # Detect ref change and inject context switch notification if needed
         # **Feature: chat-branch-context**
         # **Validates: Requirements 1.1, 1.3**
         current_ref = context.ref if context else None
-        prev_ref, new_ref = _detect_ref_change(sorted_messages, current_ref)
+        prev_ref, new_ref = _detect_ref_change(history.window, current_ref)
         if prev_ref and new_ref:
             notification = _build_context_switch_notification(prev_ref, new_ref)
             messages.append({"role": "system", "content": notification})
@@ -1285,124 +1414,153 @@ Be concise, technical, and helpful. Reference specific files and line numbers wh
         tool_messages = [{"role": "system", "content": tool_system}] + list(messages)
 
         tool_calls_used = 0
-        total_tool_chars = 0
-        final_answer_seed: str | None = None
+        total_tool_tokens = 0
+        final_stats = None
+        answering = False
 
-        print(f"[chat] Entering tool loop, max_tool_calls={max_tool_calls}", flush=True)
-        while tool_calls_used < max_tool_calls:
+        def _token(delta: str) -> str:
+            full_response.append(delta)
+            return _sse("token", {"delta": delta})
+
+        logger.info(f"[chat] Entering tool loop, max_tool_calls={max_tool_calls}")
+        while True:
             # Emit reasoning step with iteration counter for visibility
             yield _emit_step(
                 f"Reasoning{f' ({tool_calls_used + 1})' if tool_calls_used > 0 else ''}",
                 "Processing with AI model"
             )
 
-            resp = await llm.chat(
-                messages=tool_messages,
-                model=model,
-                temperature=0.2,
-                max_tokens=1024,
-                fallback=True,  # Enable fallback for resilience against API 500 errors
-            )
-            content = (resp.get("content") or "").strip()
+            if tool_calls_used >= max_tool_calls:
+                tool_messages.append(
+                    {
+                        "role": "user",
+                        "content": "Provide the final answer now in plain text. Do not output JSON.",
+                    }
+                )
 
-            # Emit thinking event with preview of LLM reasoning
-            # This shows users what the model is thinking about
-            print(f"[chat] LLM response received, content_len={len(content)}, preview={content[:100]!r}", flush=True)
-            if content:
-                thinking_event = _emit_thinking(content, tool_calls_used + 1)
-                print(f"[chat] thinking_event generated: {bool(thinking_event)}", flush=True)
-                if thinking_event:
-                    yield thinking_event
+            # Prose is forwarded as it is generated; from the first line that
+            # opens a tool call the rest of the turn is held back and parsed
+            # once the turn ends. Once the budget is spent nothing is held back
+            tools_available = tool_calls_used < max_tool_calls
+            splitter = _TurnSplitter(detect_tool_calls=tools_available)
+            streamed = False
+            try:
+                token_iter, stats_future = await llm.chat_stream_with_usage(
+                    messages=tool_messages,
+                    model=model,
+                    temperature=0.2,
+                    max_tokens=16384,  # Large limit for code-heavy responses
+                    task="chat",
+                )
+                async for chunk in token_iter:
+                    prose = splitter.feed(chunk)
+                    if not prose:
+                        continue
+                    streamed = True
+                    if not answering:
+                        answering = True
+                        yield _emit_step("Answering", "Streaming response")
+                    yield _token(prose)
+                content = splitter.text.strip()
+                held = splitter.held
+                final_stats = _merge_turn_stats(final_stats, await stats_future)
+            except Exception as e:
+                if streamed:
+                    raise
+                # Nothing of this turn reached the client yet: retry without
+                # streaming, with model fallback for resilience against API 500 errors
+                logger.warning(f"[chat] Streaming turn failed, retrying with fallback: {e}")
+                resp = await llm.chat(
+                    messages=tool_messages,
+                    model=model,
+                    temperature=0.2,
+                    max_tokens=16384,
+                    fallback=True,
+                    task="chat",
+                )
+                content = (resp.get("content") or "").strip()
+                held = content
+                final_stats = _merge_turn_stats(
+                    final_stats, {"model": resp.get("model"), "usage": resp.get("usage"), "cost": resp.get("cost")}
+                )
 
+            logger.info(f"[chat] LLM turn received, content_len={len(content)}")
             # Parse tool calls from anywhere in the content (not just at start)
             # The model may output explanatory text before/after the JSON tool call
-            calls = _parse_tool_calls(content)
-            print(f"[chat] Tool calls parsed: {len(calls)} found", flush=True)
+            calls = _parse_tool_calls(content) if tools_available else []
             if not calls:
-                # No tool calls found - this is the final answer
-                final_answer_seed = content
+                # No tool calls found - this is the final answer; send whatever
+                # was held back while it might have been a tool call
+                if held:
+                    if not answering:
+                        answering = True
+                        yield _emit_step("Answering", "Streaming response")
+                    yield _token(held)
                 tool_messages.append({"role": "assistant", "content": content})
                 break
 
-            # Execute only the first tool call (one at a time)
-            call = calls[0]
-            tool_calls_used += 1
-            yield _sse("tool_call", {"name": call.name, "args": call.arguments})
-
-            ok, result, err = await _execute_tool(call)
-            if result is not None:
-                result_str = json.dumps(result)
-                total_tool_chars += len(result_str)
-                if total_tool_chars > max_total_tool_chars:
-                    ok = False
-                    result = None
-                    err = "Tool budget exceeded"
-
-                if result_str and len(result_str) > max_tool_result_chars:
-                    result = {"truncated": True, "preview": result_str[:max_tool_result_chars]}
-
-            yield _sse("tool_result", {"name": call.name, "ok": ok, "result": result, "error": err})
+            # Emit thinking event with preview of LLM reasoning
+            thinking_event = _emit_thinking(content, tool_calls_used + 1)
+            if thinking_event:
+                yield thinking_event
+
+            # All tools are read-only: run the independent calls of one turn
+            # concurrently (deduplicated, within the remaining call budget)
+            unique_calls: list[ToolCall] = []
+            seen: set[str] = set()
+            for call in calls:
+                key = json.dumps([call.name, call.arguments], sort_keys=True, default=str)
+                if key not in seen:
+                    seen.add(key)
+                    unique_calls.append(call)
+            batch = unique_calls[: max_tool_calls - tool_calls_used]
+            tool_calls_used += len(batch)
+
+            for call in batch:
+                yield _sse("tool_call", {"name": call.name, "args": call.arguments})
+
+            outcomes = await asyncio.gather(*(_execute_tool(call) for call in batch))
+
+            # Budgets are applied in call order, so results are deterministic
+            feedback: list[str] = []
+            for call, (ok, result, err) in zip(batch, outcomes, strict=True):
+                if result is not None:
+                    result_str = json.dumps(result)
+                    total_tool_tokens += tokenizer.count(result_str)
+                    if total_tool_tokens > budget.tools:
+                        ok = False
+                        result = None
+                        err = "Tool budget exceeded"
+
+                    if result_str and len(result_str) > max_tool_result_chars:
+                        result = {"truncated": True, "preview": result_str[:max_tool_result_chars]}
+
+                yield _sse("tool_result", {"name": call.name, "ok": ok, "result": result, "error": err})
+                feedback.append(
+                    f"Tool result for {call.name} {json.dumps(call.arguments)}:\n"
+                    f"{json.dumps({'ok': ok, 'result': result, 'error': err})}"
+                )
 
-            # Feed tool result back to model as user message (do NOT store tool JSON as assistant content)
+            # Feed tool results back to model as user message (do NOT store tool JSON as assistant content)
             tool_messages.append(
                 {
                     "role": "user",
                     "content": (
-                        f"Tool result for {call.name}:\n"
-                        f"{json.dumps({'ok': ok, 'result': result, 'error': err})}\n\n"
-                        "If you have enough info now, answer in plain text. Otherwise, output the next tool JSON."
+                        "\n\n".join(feedback)
+                        + "\n\nIf you have enough info now, answer in plain text. Otherwise, output the next tool JSON."
                     ),
                 }
             )
 
-        # If the model already produced a plain-text answer, stream it directly (no second model call)
-        if final_answer_seed:
-            yield _emit_step("Formatting", "Preparing response")
-            for chunk in [final_answer_seed[i:i+200] for i in range(0, len(final_answer_seed), 200)]:
-                full_response.append(chunk)
-                yield "event: token\n"
-                yield f"data: {json.dumps({'delta': chunk})}\n\n"
-            content = "".join(full_response)
-            final_stats = None
-            tokens_used = None
-            cost = None
-            final_model = model
-        else:
-            # Otherwise, ask for a final answer explicitly and stream it
-            yield _emit_step("Answering", "Streaming final response")
-            tool_messages.append(
-                {
-                    "role": "user",
-                    "content": "Provide the final answer now in plain text. Do not output JSON.",
-                }
-            )
-            token_iter, final_stats_future = await llm.chat_stream_with_usage(
-                messages=tool_messages,
-                model=model,
-                max_tokens=16384,  # Large limit for code-heavy responses
-            )
-
-            async for chunk in token_iter:
-                full_response.append(chunk)
-                yield "event: token\n"
-                yield f"data: {json.dumps({'delta': chunk})}\n\n"
-
-            content = "".join(full_response)
-
-            final_stats = None
-            try:
-                final_stats = await final_stats_future
-            except Exception:
-                final_stats = None
-
-            tokens_used = None
-            cost = None
-            final_model = None
-            if final_stats:
-                final_model = final_stats.get("model")
-                usage = final_stats.get("usage") or {}
-                tokens_used = usage.get("total_tokens")
-                cost = final_stats.get("cost")
+        content = "".join(full_response)
+        tokens_used = None
+        cost = None
+        final_model = None
+        if final_stats:
+            final_model = final_stats.get("model")
+            usage = final_stats.get("usage") or {}
+            tokens_used = usage.get("total_tokens")
+            cost = final_stats.get("cost")
 
         # Save assistant message with context_ref
         # **Feature: chat-branch-context**
@@ -1425,19 +1583,44 @@ Be concise, technical, and helpful. Reference specific files and line numbers wh
                 {
                     "message_id": str(assistant_message.id),
                     "model": final_model or model,
-                    "usage": (final_stats or {}).get("usage") if 'final_stats' in locals() else None,
+                    "usage": (final_stats or {}).get("usage"),
                     "cost": cost,
                     "context_ref": assistant_message.context_ref,
                 }
             )
             + "\n\n"
         )
+
+        # Fold turns that no longer fit into the running summary (after the
+        # answer is delivered, so it never delays the response)
+        try:
+            await roll_up_history(db, thread, history, llm)
+        except Exception as e:
+            logger.warning(f"Chat history roll-up failed: {e}")
+            return
     except Exception as e:
         logger.exception("Chat streaming failed")
         yield "event: error\n"
         yield f"data: {json.dumps({'detail': str(e)})}\n\n"
 
 
+async def _roll_up_history_in_background(thread_id: UUID, history: PromptHistory, llm) -> None:
+    """Run the history roll-up for a thread once its response has been sent.
+
+    The request's session is closed by then, so the thread is reloaded in a
+    session of its own. Best-effort: failures are logged and dropped.
+    """
+    from app.core.database import async_session_maker
+
+    try:
+        async with async_session_maker() as db:
+            thread = await db.get(ChatThread, thread_id)
+            if thread:
+                await roll_up_history(db, thread, history, llm)
+    except Exception as e:
+        logger.warning(f"Chat history roll-up failed: {e}")
+
+
 async def _get_rag_context(
     repository_id: UUID,
     query: str,
@@ -1478,7 +1661,9 @@ async def _get_rag_context(
 
         # Optionally prioritize current file context
         if context_file:
-            file_results = qdrant.query_points(
+            # The Qdrant client is blocking; keep concurrent tool calls moving
+            file_results = (await asyncio.to_thread(
+                qdrant.query_points,
                 collection_name=COLLECTION_NAME,
                 query=query_embedding[0],
                 query_filter=Filter(
@@ -1486,9 +1671,10 @@ async def _get_rag_context(
                     + [FieldCondition(key="file_path", match=MatchValue(value=context_file))]
                 ),
                 limit=2,
-            ).points
+            )).points
 
-            other_results = qdrant.query_points(
+            other_results = (await asyncio.to_thread(
+                qdrant.query_points,
                 collection_name=COLLECTION_NAME,
                 query=query_embedding[0],
                 query_filter=Filter(
@@ -1496,16 +1682,17 @@ async def _get_rag_context(
                     must_not=[FieldCondition(key="file_path", match=MatchValue(value=context_file))],
                 ),
                 limit=max(0, limit - len(file_results)),
-            ).points
+            )).points
 
             results = list(file_results) + list(other_results)
         else:
-            results = qdrant.query_points(
+            results = (await asyncio.to_thread(
+                qdrant.query_points,
                 collection_name=COLLECTION_NAME,
                 query=query_embedding[0],
                 query_filter=Filter(must=must),
                 limit=limit,
-            ).points
+            )).points
 
         return [
             {
@@ -1529,14 +1716,21 @@ async def _build_chat_messages(
     thread: ChatThread,
     user_message: str,
     context: ChatContext | None = None,
-) -> list[dict]:
+    history_window: list[ChatMessage] | None = None,
+    model: str | None = None,
+) -> tuple[list[dict], PromptHistory]:
     """Build messages array with RAG context + IDE context pack.
 
     Note: This function does not run an agent tool loop yet. It can, however,
     include a bounded repository tree snapshot and active file content to reduce
     hallucinations.
+
+    Returns:
+        The messages and the history they include (for the summary roll-up)
     """
     messages = []
+    tokenizer = get_tokenizer(settings.chat_tokenizer)
+    budget = budget_for_model(model)
 
     # Get RAG context
     rag_chunks = await _get_rag_context(
@@ -1545,17 +1739,8 @@ async def _build_chat_messages(
         context_file=thread.context_file,
     )
 
-    # Build RAG context section
-    context_section = ""
-    if rag_chunks:
-        context_section = "\n\n## Relevant Code Context:\n"
-        for i, chunk in enumerate(rag_chunks, 1):
-            context_section += f"\n### {i}. {chunk['file_path']}"
-            if chunk['name']:
-                context_section += f" - {chunk['chunk_type']} `{chunk['name']}`"
-            if chunk['line_start']:
-                context_section += f" (lines {chunk['line_start']}-{chunk['line_end']})"
-            context_section += f"\n```\n{(chunk.get('content') or '')[:1500]}\n```\n"
+    # Build RAG context section (best-ranked chunks within the RAG budget)
+    context_section, _ = format_rag_context(rag_chunks, budget.rag, tokenizer)
 
     # IDE context pack section (Phase A+)
     ide_section = ""
@@ -1612,6 +1797,9 @@ async def _build_chat_messages(
             except Exception as e:
                 logger.warning(f"Failed to read active file for context: {e}")
 
+    # IDE context pack shares the system prompt budget
+    ide_section = truncate_to_tokens(ide_section, budget.system, tokenizer)
+
     # System prompt with repository context
     system_prompt = f"""You are n9r, an AI assistant specialized in code analysis and improvement.
 You are helping with repository: {thread.repository.full_name}
@@ -1638,16 +1826,20 @@ Be concise, technical, and helpful. Reference specific files and line numbers wh
 
     messages.append({"role": "system", "content": system_prompt})
 
-    # Add conversation history (last 10 messages)
-    sorted_messages = sorted(thread.messages, key=lambda x: x.created_at)[-10:]
-    for msg in sorted_messages:
-        messages.append({"role": msg.role, "content": msg.content})
+    # Add conversation history (running summary + newest turns that fit)
+    history = fit_history(
+        history_window or [],
+        thread.summary,
+        budget.history - tokenizer.count(user_message),
+        tokenizer,
+    )
+    messages.extend(history.to_messages())
 
     # Detect ref change and inject context switch notification if needed
     # **Feature: chat-branch-context**
     # **Validates: Requirements 1.1, 1.3**
     current_ref = context.ref if context else None
-    prev_ref, new_ref = _detect_ref_change(sorted_messages, current_ref)
+    prev_ref, new_ref = _detect_ref_change(history.window, current_ref)
     if prev_ref and new_ref:
         notification = _build_context_switch_notification(prev_ref, new_ref)
         messages.append({"role": "system", "content": notification})
@@ -1655,7 +1847,7 @@ Be concise, technical, and helpful. Reference specific files and line numbers wh
     # Add current message
     messages.append({"role": "user", "content": user_message})
 
-    return messages
+    return messages, history
 
 
 @router.delete("/chat/threads/{thread_id}")
@@ -1,20 +1,36 @@
-"""Playground API - public repo scanning without auth."""
+"""Playground API - public repo scanning without auth.
 
+Scans run on the dedicated "playground" Celery queue (app.workers.playground),
+never in the API process. Results are reused for an unchanged repository
+HEAD, and concurrent requests for the same commit share one scan.
+"""
+
+import asyncio
 import logging
 import re
 from datetime import datetime
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field, field_validator
 
 from app.core.redis import (
     check_playground_rate_limit,
+    claim_playground_scan,
+    get_cached_playground_result,
     get_playground_scan,
+    release_playground_claim,
     store_playground_scan,
     update_playground_scan,
 )
-from app.services.repo_analyzer import RepoAnalyzer
+from app.workers.helpers import resolve_remote_head_sha
+from app.workers.playground import (
+    PLAYGROUND_QUEUE,
+    PLAYGROUND_SLOT_TTL_SECONDS,
+    release_playground_slot,
+    reserve_playground_slot,
+    run_playground_scan,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +70,8 @@ class PlaygroundScanResult(BaseModel):
     top_issues: list | None = None
     ai_report: str | None = None
     error: str | None = None
+    commit_sha: str | None = None
+    cached: bool = False
     started_at: datetime | None = None
     completed_at: datetime | None = None
 
@@ -66,45 +84,10 @@ def _get_client_ip(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
-def _run_scan(scan_id: str, repo_url: str):
-    """Run the actual scan (background task)."""
-    logger.info(f"Starting playground scan {scan_id} for {repo_url}")
-
-    update_playground_scan(scan_id, {
-        "status": "running",
-        "started_at": datetime.utcnow().isoformat(),
-    })
-
-    try:
-        with RepoAnalyzer(repo_url) as analyzer:
-            result = analyzer.analyze()
-
-        update_playground_scan(scan_id, {
-            "status": "completed",
-            "vci_score": result.vci_score,
-            "tech_debt_level": result.tech_debt_level,
-            "metrics": result.metrics,
-            "top_issues": result.issues[:5],  # Top 5 issues
-            "ai_report": result.ai_report,
-            "completed_at": datetime.utcnow().isoformat(),
-        })
-
-        logger.info(f"Playground scan {scan_id} completed, VCI: {result.vci_score}")
-
-    except Exception as e:
-        logger.error(f"Playground scan {scan_id} failed: {e}")
-        update_playground_scan(scan_id, {
-            "status": "failed",
-            "error": str(e)[:500],
-            "completed_at": datetime.utcnow().isoformat(),
-        })
-
-
 @router.post("/scan", response_model=PlaygroundScanResponse)
 async def start_scan(
     request: Request,
     body: PlaygroundScanRequest,
-    background_tasks: BackgroundTasks,
 ):
     """
     Start a public repository scan.
@@ -112,6 +95,8 @@ async def start_scan(
     - **repo_url**: GitHub repository URL (must be public)
     - Rate limited: 5 scans per hour per IP
     - No authentication required
+    - Returns a completed scan immediately if this HEAD commit was scanned recently
+    - 503 when the playground backlog is full
     """
     client_ip = _get_client_ip(request)
 
@@ -124,17 +109,69 @@ async def start_scan(
 
     # Generate scan ID
     scan_id = str(uuid4())
-
-    # Initialize scan result in Redis
-    store_playground_scan(scan_id, {
+    scan = {
         "scan_id": scan_id,
         "repo_url": body.repo_url,
-        "status": "pending",
         "client_ip": client_ip,
-    })
+    }
+
+    # Resolve HEAD without cloning (off the event loop); None means the
+    # worker scans whatever HEAD it clones, uncached lookup
+    head_sha = await asyncio.to_thread(resolve_remote_head_sha, body.repo_url)
+
+    if head_sha:
+        cached = get_cached_playground_result(body.repo_url, head_sha)
+        if cached:
+            now = datetime.utcnow().isoformat()
+            store_playground_scan(scan_id, {
+                **scan,
+                **cached,
+                "status": "completed",
+                "cached": True,
+                "started_at": now,
+                "completed_at": now,
+            })
+            return PlaygroundScanResponse(
+                scan_id=scan_id,
+                repo_url=body.repo_url,
+                status="completed",
+                message="Repository unchanged since a recent scan; result reused.",
+            )
+
+        # An identical scan is in flight: follow it instead of scanning again
+        leader_id = claim_playground_scan(
+            body.repo_url, head_sha, scan_id, ttl=PLAYGROUND_SLOT_TTL_SECONDS
+        )
+        if leader_id:
+            store_playground_scan(scan_id, {**scan, "status": "pending", "alias_of": leader_id})
+            return PlaygroundScanResponse(
+                scan_id=scan_id,
+                repo_url=body.repo_url,
+                status="pending",
+                message="Scan started. Poll GET /playground/scan/{scan_id} for results.",
+            )
+
+    if not reserve_playground_slot(scan_id):
+        if head_sha:
+            release_playground_claim(body.repo_url, head_sha, scan_id)
+        raise HTTPException(
+            status_code=503,
+            detail="Playground is busy. Please try again in a few minutes.",
+            headers={"Retry-After": "60"},
+        )
 
-    # Start background scan
-    background_tasks.add_task(_run_scan, scan_id, body.repo_url)
+    # Initialize scan result in Redis
+    store_playground_scan(scan_id, {**scan, "status": "pending", "commit_sha": head_sha})
+
+    try:
+        run_playground_scan.apply_async(args=[scan_id, body.repo_url, head_sha], queue=PLAYGROUND_QUEUE)
+    except Exception as e:
+        logger.error(f"Failed to queue playground scan {scan_id}: {e}")
+        release_playground_slot(scan_id)
+        if head_sha:
+            release_playground_claim(body.repo_url, head_sha, scan_id)
+        update_playground_scan(scan_id, {"status": "failed", "error": "Scan could not be queued"})
+        raise HTTPException(status_code=503, detail="Playground is unavailable. Please try again later.")
 
     return PlaygroundScanResponse(
         scan_id=scan_id,
@@ -150,13 +187,19 @@ async def get_scan_result(scan_id: str):
     Get scan result by ID.
 
     - Returns current status and results when completed
-    - Results are cached for 1 hour
+    - Scan state is kept for 1 hour
     """
     result = get_playground_scan(scan_id)
 
     if not result:
         raise HTTPException(status_code=404, detail="Scan not found")
 
+    # Scans that joined an identical in-flight scan report its progress
+    if result.get("alias_of"):
+        leader = get_playground_scan(result["alias_of"])
+        if leader:
+            result = {**leader, "scan_id": scan_id}
+
     return PlaygroundScanResult(
         scan_id=result["scan_id"],
         repo_url=result["repo_url"],
@@ -167,6 +210,8 @@ async def get_scan_result(scan_id: str):
         top_issues=result.get("top_issues"),
         ai_report=result.get("ai_report"),
         error=result.get("error"),
+        commit_sha=result.get("commit_sha"),
+        cached=result.get("cached", False),
         started_at=result.get("started_at"),
         completed_at=result.get("completed_at"),
     )
@@ -795,16 +795,22 @@ async def list_commits(
         commit_shas = [commit["sha"] for commit in commits]
 
         # Query Analysis table for matching commit SHAs
+        # (only the columns shown in the timeline; JSONB caches are not loaded)
         analysis_result = await db.execute(
-            select(Analysis).where(
+            select(
+                Analysis.id,
+                Analysis.commit_sha,
+                Analysis.vci_score,
+                Analysis.status,
+            ).where(
                 Analysis.repository_id == repo_id,
                 Analysis.commit_sha.in_(commit_shas),
             )
         )
-        analyses = analysis_result.scalars().all()
+        analyses = analysis_result.all()
 
         # Build lookup dict by commit SHA
-        analysis_by_sha: dict[str, Analysis] = {
+        analysis_by_sha = {
             analysis.commit_sha: analysis for analysis in analyses
         }
 
@@ -5,12 +5,17 @@ import hmac
 import logging
 
 from fastapi import APIRouter, Header, HTTPException, Request, status
+from redis.exceptions import RedisError
 from sqlalchemy import select
 
 from app.api.deps import DbSession
 from app.core.config import settings
+from app.models.analysis import Analysis
 from app.models.repository import Repository
-from app.workers.analysis import analyze_repository
+from app.services.vector_store import acache_ref_sha
+from app.workers.helpers import find_analysis_for_commit
+from app.workers.scheduled import flush_push_analysis
+from app.workers.scheduling import enqueue_analysis, record_push, take_pushed_head
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -97,7 +102,13 @@ async def github_webhook(
 
 
 async def handle_push_event(data: dict, db: DbSession) -> dict:
-    """Handle push events - trigger analysis on default branch pushes."""
+    """Handle push events - trigger analysis on default branch pushes.
+
+    Pushes are coalesced per repository: the first push of a window schedules
+    flush_push_analysis, later ones only move the head, and the flush
+    analyzes the newest head once. Without Redis, or for pushes without a
+    head commit, the push is analyzed directly.
+    """
     repo_data = data.get("repository", {})
     github_repo_id = repo_data.get("id")
     ref = data.get("ref", "")
@@ -126,13 +137,60 @@ async def handle_push_event(data: dict, db: DbSession) -> dict:
     head_commit = data.get("head_commit", {})
     commit_sha = head_commit.get("id") or data.get("after")
 
+    if commit_sha:
+        # Keep the shared ref cache current so the scheduled sweep and
+        # API ref resolution don't have to ask GitHub for this head
+        await acache_ref_sha(str(repository.id), default_branch, commit_sha)
+
+        existing = await db.run_sync(find_analysis_for_commit, repository.id, commit_sha)
+        if existing:
+            logger.info(
+                f"Commit {commit_sha[:7]} of repository {repository.id} already has "
+                f"analysis {existing.id} ({existing.status}), not re-analyzing"
+            )
+            return {
+                "status": "skipped",
+                "reason": "commit already analyzed",
+                "repository_id": str(repository.id),
+                "analysis_id": str(existing.id),
+                "commit_sha": commit_sha,
+            }
+
+        debounce = settings.webhook_push_debounce_seconds
+        try:
+            opened = record_push(str(repository.id), commit_sha)
+            if opened:
+                flush_push_analysis.apply_async(
+                    kwargs={"repository_id": str(repository.id), "branch": default_branch},
+                    countdown=debounce,
+                )
+            logger.info(
+                f"Push {commit_sha[:7]} to repository {repository.id} recorded; "
+                f"{'analysis scheduled' if opened else 'coalesced into pending analysis'} "
+                f"in {debounce}s"
+            )
+            return {
+                "status": "scheduled" if opened else "coalesced",
+                "repository_id": str(repository.id),
+                "commit_sha": commit_sha,
+                "debounce_seconds": debounce,
+            }
+        except RedisError as e:
+            logger.warning(f"Push coalescing unavailable for repository {repository.id}, analyzing directly: {e}")
+        except Exception as e:
+            # The window is open but no flush was scheduled: close it
+            logger.error(f"Failed to schedule push analysis for repository {repository.id}: {e}")
+            try:
+                take_pushed_head(str(repository.id))
+            except RedisError:
+                pass
+
     logger.info(
         f"Triggering analysis for repository {repository.id}, "
         f"commit {commit_sha}"
     )
 
     # Create analysis record first
-    from app.models.analysis import Analysis
     analysis = Analysis(
         repository_id=repository.id,
         commit_sha=commit_sha or "HEAD",
@@ -142,8 +200,8 @@ async def handle_push_event(data: dict, db: DbSession) -> dict:
     db.add(analysis)
     await db.flush()
 
-    # Queue analysis task with analysis_id
-    task = analyze_repository.delay(
+    # Queue analysis task on the webhook lane
+    task = enqueue_analysis(
         repository_id=str(repository.id),
         analysis_id=str(analysis.id),
         commit_sha=commit_sha,
@@ -0,0 +1,168 @@
+"""Two-tier cache: a per-process LRU in front of Redis.
+
+Hits in the local tier cost a dict lookup; misses fall through to Redis,
+so every API replica and Celery worker shares what any one of them
+fetched. Values must be JSON-serializable.
+
+Redis problems never fail a lookup: the cache degrades to its local tier
+and retries Redis after REDIS_RETRY_SECONDS.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# After a Redis error, skip the shared tier for this long
+REDIS_RETRY_SECONDS = 30.0
+
+
+class SharedCache:
+    """Namespaced TTL cache with a local LRU tier and a Redis tier."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        local_ttl_seconds: float | None = None,
+        local_max_entries: int | None = None,
+        redis_client=None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            namespace: Redis key prefix (e.g. "cache:ref")
+            ttl_seconds: Lifetime of entries in Redis
+            local_ttl_seconds: Lifetime in the local tier; keep this short when
+                other processes may overwrite entries (defaults to
+                settings.shared_cache_local_ttl_seconds, capped at ttl_seconds)
+            local_max_entries: LRU bound of the local tier
+            redis_client: Sync Redis client (defaults to the shared pool)
+        """
+        self.namespace = namespace
+        self.ttl_seconds = max(1, ttl_seconds)
+        local_ttl = settings.shared_cache_local_ttl_seconds if local_ttl_seconds is None else local_ttl_seconds
+        self.local_ttl_seconds = min(local_ttl, self.ttl_seconds)
+        self.local_max_entries = max(1, local_max_entries or settings.shared_cache_local_max_entries)
+        self._redis = redis_client
+        self._local: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+
+    # ------------------------------------------------------------------
+    # Local tier
+    # ------------------------------------------------------------------
+
+    def _local_get(self, key: str) -> Any | None:
+        with self._lock:
+            hit = self._local.get(key)
+            if hit is None:
+                return None
+            expires_at, value = hit
+            if time.monotonic() >= expires_at:
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + min(ttl_seconds, self.local_ttl_seconds), value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    # ------------------------------------------------------------------
+    # Redis tier
+    # ------------------------------------------------------------------
+
+    def _client(self):
+        if self._redis is None:
+            import redis as sync_redis
+
+            from app.core.redis import sync_redis_pool
+
+            self._redis = sync_redis.Redis(connection_pool=sync_redis_pool)
+        return self._redis
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _redis_call(self, fn, default=None):
+        if time.monotonic() < self._redis_down_until:
+            return default
+        try:
+            return fn(self._client())
+        except RedisError as e:
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+            logger.warning(f"Shared cache '{self.namespace}' falling back to local tier: {e}")
+            return default
+
+    def _shared_get(self, key: str) -> Any | None:
+        raw = self._redis_call(lambda r: r.get(self._redis_key(key)))
+        if raw is None:
+            return None
+        try:
+            value = json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        self._local_set(key, value, self.local_ttl_seconds)
+        return value
+
+    def _shared_set(self, key: str, payload: str, ttl_seconds: int) -> None:
+        self._redis_call(lambda r: r.set(self._redis_key(key), payload, ex=ttl_seconds))
+
+    def _shared_delete(self, key: str) -> None:
+        self._redis_call(lambda r: r.delete(self._redis_key(key)))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Any | None:
+        value = self._local_get(key)
+        return value if value is not None else self._shared_get(key)
+
+    def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
+        ttl = ttl_seconds or self.ttl_seconds
+        self._local_set(key, value, ttl)
+        self._shared_set(key, json.dumps(value), ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+        self._shared_delete(key)
+
+    async def aget(self, key: str) -> Any | None:
+        """Async get; local hits never leave the event loop."""
+        value = self._local_get(key)
+        return value if value is not None else await asyncio.to_thread(self._shared_get, key)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
+        ttl = ttl_seconds or self.ttl_seconds
+        self._local_set(key, value, ttl)
+        await asyncio.to_thread(self._shared_set, key, json.dumps(value), ttl)
+
+    def clear(self) -> None:
+        """Drop all entries in both tiers (Redis keys of this namespace only)."""
+        self.clear_local()
+
+        def _delete_namespace(r) -> None:
+            keys = list(r.scan_iter(match=f"{self.namespace}:*", count=500))
+            if keys:
+                r.delete(*keys)
+
+        self._redis_call(_delete_namespace)
@@ -34,13 +34,24 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,  # One task at a time per worker
     worker_concurrency=4,
 
+    # Broker: countdowns from the scheduled sweep must stay below the
+    # visibility timeout, or Redis redelivers the still-waiting message
+    broker_transport_options={
+        "visibility_timeout": max(3600, (settings.analysis_sweep_window_minutes + 30) * 60),
+    },
+
     # Task routing
+    # Analyses use separate lanes by trigger (see app.workers.scheduling):
+    # "analysis" (manual/connect), "analysis_webhook" and "analysis_scheduled".
+    # Workers must consume all three.
     task_routes={
         "app.workers.ai_scan.*": {"queue": "ai_scan"},
         "app.workers.analysis.*": {"queue": "analysis"},
         "app.workers.embeddings.*": {"queue": "embeddings"},
         "app.workers.healing.*": {"queue": "healing"},
         "app.workers.notifications.*": {"queue": "notifications"},
+        # Public playground scans: consumed by a dedicated, bounded worker
+        "app.workers.playground.*": {"queue": "playground"},
     },
 
     # Default queue
@@ -56,7 +67,7 @@ celery_app.conf.update(
         "daily-repo-analysis": {
             "task": "app.workers.scheduled.analyze_all_repositories",
             "schedule": crontab(hour=2, minute=0),  # Run at 2:00 AM UTC
-            "options": {"queue": "analysis"},
+            "options": {"queue": "analysis_scheduled"},
         },
         # Weekly cleanup of old data
         "weekly-cleanup": {
@@ -100,5 +111,6 @@ import app.workers.analysis  # noqa: F401, E402
 import app.workers.embeddings  # noqa: F401, E402
 import app.workers.healing  # noqa: F401, E402
 import app.workers.notifications  # noqa: F401, E402
+import app.workers.playground  # noqa: F401, E402
 import app.workers.repo_content_gc  # noqa: F401, E402
 import app.workers.scheduled  # noqa: F401, E402
@@ -49,6 +49,9 @@ class Settings(BaseSettings):
     debug: bool = True
     secret_key: str = Field(default=_INSECURE_SECRET_KEY)
     api_v1_prefix: str = "/v1"
+    # Bearer token for scraping /metrics; without one, /metrics is only
+    # served outside production
+    metrics_token: str = ""
 
     # Database
     database_url: str = Field(
@@ -114,9 +117,28 @@ class Settings(BaseSettings):
     default_llm_model: str = "gpt-4o"
     embedding_model: str = ""  # Auto-detected if empty
 
+    # LLM Routing / Hedging
+    # Requests per model kept for rolling latency and error rate
+    llm_routing_window: int = 50
+    # Send a hedged request to the healthiest fallback model for "chat"/"fast"
+    # tasks once the primary exceeds its p95 latency (costs extra tokens on
+    # the slowest requests)
+    llm_hedging_enabled: bool = False
+    # Hedge delay in seconds before p95 is known, and clamp bounds for it
+    llm_hedge_default_delay: float = 3.0
+    llm_hedge_min_delay: float = 0.5
+    llm_hedge_max_delay: float = 15.0
+
     # AI Scan Settings
     ai_scan_enabled: bool = True  # Enable/disable automatic AI scan after semantic cache
     ai_scan_max_cost_per_scan: float = 10.0  # Maximum cost in USD per AI scan (2 models ~$5-6)
+    ai_scan_tokenizer: str = "tiktoken"  # Repo view token counter: "tiktoken[:encoding]" or "chars" (~4 chars/token)
+    ai_scan_reuse_enabled: bool = True  # Reuse a previous scan when repo view, models and prompt are unchanged
+    ai_scan_incremental_enabled: bool = True  # Scan only changed files (+ import neighbours) when a previous scan exists
+    ai_scan_incremental_max_changed_files: int = 50  # Fall back to a full scan above this many changed files
+    ai_scan_incremental_max_related_files: int = 50  # Cap on import graph neighbours sent as context
+    ai_scan_investigation_concurrency: int = 4  # Issues investigated in parallel per scan
+    ai_scan_investigation_max_cost: float = 2.0  # Maximum investigation cost in USD per scan
 
     # Analysis Heartbeat Settings (stuck detection)
     # Time in minutes before a pending analysis is considered stuck
@@ -125,12 +147,41 @@ class Settings(BaseSettings):
     analysis_running_heartbeat_timeout_minutes: int = 15
     # How often (in seconds) the worker should update the heartbeat
     analysis_heartbeat_interval_seconds: int = 30
+    # Analysis scheduling (priority lanes and fairness)
+    # Max concurrent webhook/scheduled analyses per repository owner
+    analysis_owner_max_concurrency: int = 2
+    # Max concurrent scheduled analyses across all owners (keeps workers free for manual runs)
+    analysis_scheduled_max_concurrency: int = 2
+    # A capped analysis is re-queued after ~this many seconds (±50% jitter)
+    analysis_defer_seconds: int = 30
+    # Deferrals before a capped analysis runs anyway (keep defer_seconds * retries
+    # well under analysis_pending_stuck_minutes)
+    analysis_defer_max_retries: int = 20
+    # The daily sweep spreads scheduled analyses over this window
+    analysis_sweep_window_minutes: int = 60
+    # Pushes to a repository within this window are coalesced into one analysis
+    # of the newest head (0 analyzes every push as soon as it arrives)
+    webhook_push_debounce_seconds: int = 60
+    # Minimum seconds between PostgreSQL writes of embeddings/AI scan progress
+    # (Redis events are still published on every update)
+    progress_flush_interval_seconds: float = 5.0
+
+    # SSE fan-out: max buffered messages per connected client before the
+    # oldest is dropped (progress messages are full state snapshots)
+    sse_client_queue_size: int = 100
 
     # Feature Flags
     # When True, use PostgreSQL as single source of truth for embeddings state
     # When False, fall back to legacy Redis-based state management
     use_postgres_embeddings_state: bool = True
 
+    # Shared caches (per-process LRU in front of Redis)
+    shared_cache_local_ttl_seconds: float = 15.0  # Local tier lifetime; bounds cross-process staleness
+    shared_cache_local_max_entries: int = 4096
+    ref_cache_ttl_seconds: int = 300  # Branch ref -> commit SHA
+    github_etag_cache_ttl_seconds: int = 24 * 3600  # Cached GitHub responses kept for ETag revalidation
+    github_cache_max_age_seconds: int = 60  # Serve without revalidating for min(this, Cache-Control max-age)
+
     # Celery
     celery_broker_url: str = "redis://localhost:6379/1"
     celery_result_backend: str = "redis://localhost:6379/2"
@@ -150,6 +201,21 @@ class Settings(BaseSettings):
     # Chat streaming is expensive; keep it lower
     rate_limit_chat_per_minute: int = 20
 
+    # Playground scans (public, unauthenticated; run on the "playground" Celery queue)
+    # Queued + running playground scans; new scans are refused with 503 above this
+    playground_max_queued_scans: int = 20
+    # Per-scan limits, enforced on the scan subprocess
+    playground_scan_time_limit_seconds: int = 300
+    playground_scan_cpu_limit_seconds: int = 240
+    playground_scan_memory_limit_mb: int = 2048
+    # Completed results are reused for the same repository HEAD commit
+    playground_result_cache_ttl_seconds: int = 24 * 3600
+
+    # Chat prompt assembly
+    chat_tokenizer: str = "chars"  # Prompt token counter: "chars" (~4 chars/token) or "tiktoken[:encoding]"
+    chat_prompt_token_budget: int = 32000  # Prompt cap in tokens (lowered to the model's input window if smaller)
+    chat_history_window_messages: int = 20  # Latest messages loaded per prompt; older turns live in the summary
+
     # Sandbox Settings (for Docker deployment)
     # When running Celery inside Docker, these paths must be configured correctly:
     # - sandbox_root_dir: Base directory for sandbox workdirs (inside Celery container)
@@ -157,6 +223,15 @@ class Settings(BaseSettings):
     # For local development, leave host_sandbox_path empty to use sandbox_root_dir directly.
     sandbox_root_dir: str = "/tmp"  # Override via SANDBOX_ROOT_DIR
     host_sandbox_path: str = ""  # Override via HOST_SANDBOX_PATH (empty = local dev mode)
+    sandbox_max_output_bytes: int = 1024 * 1024  # Captured per stream per command (head + tail kept)
+    sandbox_pool_size: int = 1  # Pre-started validation containers per healing worker (0 = start on demand)
+
+    # Healing validation
+    # "impacted" also runs the repository's existing tests that reach the fixed
+    # file (import/call graph); "generated" runs only the generated test
+    healing_validation_mode: Literal["generated", "impacted"] = "impacted"
+    healing_impacted_tests_max_files: int = 20
+    healing_impacted_tests_timeout_seconds: int = 180  # Per run (baseline and with the fix)
 
     # Vector Retention Policy (commit-aware RAG cleanup)
     # ⚠️  DISABLED BY DEFAULT - Enable only if you understand the implications!
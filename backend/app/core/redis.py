@@ -1,13 +1,15 @@
 """Redis client for application-wide caching and state storage."""
 
+import asyncio
 import json
 import logging
-from collections.abc import AsyncGenerator, Generator
-from contextlib import contextmanager
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator
+from contextlib import asynccontextmanager, contextmanager
 from datetime import UTC, datetime
 
 import redis as sync_redis
 import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError
 
 from app.core.config import settings
 
@@ -66,10 +68,304 @@ def get_sync_redis_context() -> Generator[sync_redis.Redis, None, None]:
 
 async def close_redis_pool() -> None:
     """Close Redis connection pools on shutdown."""
+    await close_pubsub_dispatcher()
     await async_redis_pool.disconnect()
     sync_redis_pool.disconnect()
 
 
+# =============================================================================
+# Pub/Sub Fan-out (one Redis subscription per API process)
+# =============================================================================
+
+# Delay before re-establishing the shared subscription after a Redis error,
+# doubled after each failed attempt up to the max
+PUBSUB_RECONNECT_DELAY_SECONDS = 1.0
+PUBSUB_RECONNECT_MAX_DELAY_SECONDS = 30.0
+# Failed reconnects in a row before clients are told the stream is gone
+PUBSUB_RECONNECT_ATTEMPTS = 6
+
+
+def get_channel_pattern(channel: str) -> str:
+    """Get the pattern subscription covering a channel family.
+
+    "analysis:progress:<id>" -> "analysis:progress:*"
+    """
+    prefix, _, _ = channel.rpartition(":")
+    return f"{prefix}:*" if prefix else channel
+
+
+class PubSubDispatcher:
+    """Process-wide Redis Pub/Sub fan-out for SSE clients.
+
+    Holds a single pub/sub connection with one pattern subscription per
+    channel family (e.g. "analysis:progress:*") and routes each message to
+    the asyncio queues of the local clients listening on that exact
+    channel. SSE clients no longer open a Redis connection each, so the
+    number of Redis connections no longer grows with open dashboards.
+
+    Queues are bounded. When a slow client falls behind, the oldest queued
+    message is dropped: progress payloads are full state snapshots, so the
+    newest one supersedes anything older.
+
+    A lost connection is re-established with exponential backoff. If Redis
+    stays unreachable for PUBSUB_RECONNECT_ATTEMPTS attempts, a
+    RedisConnectionError is queued for every client (stream_channel raises
+    it) and the next subscription starts over with a fresh connection.
+    """
+
+    def __init__(
+        self,
+        pubsub_factory: Callable[[], aioredis.client.PubSub] | None = None,
+        queue_size: int | None = None,
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            pubsub_factory: Creates the shared PubSub (defaults to the async pool)
+            queue_size: Max buffered messages per client
+                (defaults to settings.sse_client_queue_size)
+        """
+        self._pubsub_factory = pubsub_factory or (
+            lambda: aioredis.Redis(connection_pool=async_redis_pool).pubsub()
+        )
+        self._queue_size = queue_size or settings.sse_client_queue_size
+        self._subscribers: dict[str, set[asyncio.Queue[str | Exception]]] = {}
+        self._patterns: set[str] = set()
+        self._pubsub: aioredis.client.PubSub | None = None
+        self._reader: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self.dropped_messages = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of local client queues currently registered."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue[str | Exception]]:
+        """Register a client queue for a channel for the duration of the block.
+
+        The queue yields message payloads, or an exception once the shared
+        subscription is lost for good.
+        """
+        queue: asyncio.Queue[str | Exception] = asyncio.Queue(maxsize=self._queue_size)
+        await self._register(channel, queue)
+        try:
+            yield queue
+        finally:
+            self._unregister(channel, queue)
+
+    async def close(self) -> None:
+        """Stop the reader and close the shared subscription."""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+        await self._close_pubsub()
+        self._patterns.clear()
+
+    async def _register(self, channel: str, queue: asyncio.Queue[str | Exception]) -> None:
+        self._subscribers.setdefault(channel, set()).add(queue)
+        pattern = get_channel_pattern(channel)
+
+        try:
+            async with self._lock:
+                if self._pubsub is None:
+                    self._pubsub = self._pubsub_factory()
+                if pattern not in self._patterns:
+                    try:
+                        await self._pubsub.psubscribe(pattern)
+                    except Exception:
+                        if not self._patterns:
+                            # Nothing else uses this connection; start fresh next time
+                            await self._close_pubsub()
+                        raise
+                    self._patterns.add(pattern)
+                    logger.info(f"Dispatcher subscribed to pattern: {pattern}")
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.create_task(self._read_loop())
+        except BaseException:
+            # The caller never gets the queue, so it must not stay registered
+            self._unregister(channel, queue)
+            raise
+
+    def _unregister(self, channel: str, queue: asyncio.Queue[str | Exception]) -> None:
+        queues = self._subscribers.get(channel)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[channel]
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Pub/Sub dispatcher connection lost, reconnecting: {e}")
+                if not await self._reconnect_with_backoff():
+                    return
+
+    async def _reconnect_with_backoff(self) -> bool:
+        """Re-establish the shared subscription, failing clients if it cannot be.
+
+        Returns:
+            True once reconnected, False after giving up
+        """
+        delay = PUBSUB_RECONNECT_DELAY_SECONDS
+        for attempt in range(1, PUBSUB_RECONNECT_ATTEMPTS + 1):
+            await asyncio.sleep(delay)
+            try:
+                await self._reconnect()
+                return True
+            except Exception as e:
+                logger.warning(
+                    f"Pub/Sub dispatcher reconnect {attempt}/{PUBSUB_RECONNECT_ATTEMPTS} failed: {e}"
+                )
+            delay = min(delay * 2, PUBSUB_RECONNECT_MAX_DELAY_SECONDS)
+
+        logger.error("Pub/Sub dispatcher could not reconnect to Redis, closing client streams")
+        async with self._lock:
+            await self._close_pubsub()
+            # The next subscription opens a new connection and resubscribes
+            self._patterns.clear()
+        error = RedisConnectionError("Lost connection to Redis Pub/Sub")
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._put(queue, error)
+        return False
+
+    async def _reconnect(self) -> None:
+        async with self._lock:
+            await self._close_pubsub()
+            self._pubsub = self._pubsub_factory()
+            if self._patterns:
+                await self._pubsub.psubscribe(*self._patterns)
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing dispatcher pub/sub: {e}")
+        self._pubsub = None
+
+    def _dispatch(self, channel: str | bytes, data: str | bytes) -> None:
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+
+        for queue in self._subscribers.get(channel, ()):
+            self._put(queue, data)
+
+    def _put(self, queue: asyncio.Queue[str | Exception], item: str | Exception) -> None:
+        if queue.full():
+            queue.get_nowait()
+            self.dropped_messages += 1
+        queue.put_nowait(item)
+
+
+_pubsub_dispatcher: PubSubDispatcher | None = None
+
+
+def get_pubsub_dispatcher() -> PubSubDispatcher:
+    """Get the process-wide Pub/Sub dispatcher (created on first use)."""
+    global _pubsub_dispatcher
+    if _pubsub_dispatcher is None:
+        _pubsub_dispatcher = PubSubDispatcher()
+    return _pubsub_dispatcher
+
+
+async def close_pubsub_dispatcher() -> None:
+    """Close the process-wide Pub/Sub dispatcher, if one was started."""
+    global _pubsub_dispatcher
+    if _pubsub_dispatcher is not None:
+        await _pubsub_dispatcher.close()
+        _pubsub_dispatcher = None
+
+
+async def stream_channel(
+    channel: str,
+    timeout_seconds: float | None = None,
+    keepalive_interval: float | None = None,
+    terminal_statuses: frozenset[str] = frozenset(),
+    timeout_payload: Callable[[], str] | None = None,
+) -> AsyncGenerator[str, None]:
+    """Stream messages for one channel through the shared dispatcher.
+
+    Args:
+        channel: Redis channel name
+        timeout_seconds: Stop after this long (None = no limit)
+        keepalive_interval: Yield an SSE comment after this long without
+            messages (None = no keepalives)
+        terminal_statuses: Stop after a message whose "status" is in this set
+        timeout_payload: Builds the message yielded when the stream times out
+
+    Yields:
+        Message payloads, or ": keepalive\n" SSE comments
+
+    Raises:
+        RedisConnectionError: If the shared subscription is lost and cannot
+            be re-established
+    """
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    last_message_time = start_time
+
+    async with get_pubsub_dispatcher().subscribe(channel) as queue:
+        logger.info(f"Subscribed to channel: {channel}")
+
+        while True:
+            current_time = loop.time()
+
+            if timeout_seconds is not None and current_time - start_time > timeout_seconds:
+                logger.warning(f"Subscription to {channel} timed out after {timeout_seconds}s")
+                if timeout_payload is not None:
+                    yield timeout_payload()
+                return
+
+            waits = []
+            if timeout_seconds is not None:
+                waits.append(timeout_seconds - (current_time - start_time))
+            if keepalive_interval is not None:
+                waits.append(keepalive_interval - (current_time - last_message_time))
+            wait_timeout = max(0.1, min(waits)) if waits else None
+
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=wait_timeout)
+            except TimeoutError:
+                if (
+                    keepalive_interval is not None
+                    and loop.time() - last_message_time >= keepalive_interval
+                ):
+                    # SSE comment keeps the connection alive through proxies
+                    last_message_time = loop.time()
+                    yield ": keepalive\n"
+                continue
+
+            if isinstance(data, Exception):
+                raise data
+
+            last_message_time = loop.time()
+            yield data
+
+            if terminal_statuses:
+                try:
+                    if json.loads(data).get("status") in terminal_statuses:
+                        return
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+
+
 # OAuth state storage constants
 OAUTH_STATE_PREFIX = "oauth:state:"
 OAUTH_STATE_TTL = 600  # 10 minutes
@@ -175,7 +471,8 @@ async def subscribe_analysis_progress(analysis_id: str, timeout_seconds: int = 6
     """
     Subscribe to analysis progress updates (async generator for SSE).
 
-    Yields JSON-encoded progress updates.
+    Yields JSON-encoded progress updates. Messages are delivered through the
+    process-wide PubSubDispatcher rather than a dedicated Redis connection.
 
     Args:
         analysis_id: The analysis ID to subscribe to
@@ -183,82 +480,23 @@ async def subscribe_analysis_progress(analysis_id: str, timeout_seconds: int = 6
 
     Note: Includes keepalive pings every 30 seconds to detect dead connections.
     """
-    import asyncio
-
-    client = aioredis.Redis(connection_pool=async_redis_pool)
-    pubsub = client.pubsub()
-    channel = get_analysis_channel(analysis_id)
-
-    start_time = asyncio.get_event_loop().time()
-    last_message_time = start_time
-    keepalive_interval = 30  # Send keepalive every 30 seconds
-
-    try:
-        await pubsub.subscribe(channel)
-        logger.info(f"Subscribed to channel: {channel}")
-
-        while True:
-            current_time = asyncio.get_event_loop().time()
-
-            # Check overall timeout
-            if current_time - start_time > timeout_seconds:
-                logger.warning(f"Analysis {analysis_id} subscription timed out after {timeout_seconds}s")
-                # Send timeout message to client
-                timeout_data = json.dumps({
-                    "analysis_id": analysis_id,
-                    "stage": "timeout",
-                    "progress": 0,
-                    "message": "Connection timed out. Refresh to check status.",
-                    "status": "failed",
-                })
-                yield timeout_data
-                break
-
-            # Calculate time until next keepalive
-            time_since_last = current_time - last_message_time
-            wait_timeout = max(0.1, keepalive_interval - time_since_last)
-
-            try:
-                # Wait for message with timeout
-                message = await asyncio.wait_for(
-                    pubsub.get_message(ignore_subscribe_messages=True, timeout=wait_timeout),
-                    timeout=wait_timeout + 1
-                )
-
-                if message and message["type"] == "message":
-                    last_message_time = asyncio.get_event_loop().time()
-                    data = message["data"]
-                    if isinstance(data, bytes):
-                        data = data.decode("utf-8")
-                    yield data
+    def timeout_payload() -> str:
+        return json.dumps({
+            "analysis_id": analysis_id,
+            "stage": "timeout",
+            "progress": 0,
+            "message": "Connection timed out. Refresh to check status.",
+            "status": "failed",
+        })
 
-                    # Check if analysis completed or failed
-                    try:
-                        parsed = json.loads(data)
-                        if parsed.get("status") in ("completed", "failed"):
-                            logger.info(f"Analysis {analysis_id} finished with status: {parsed.get('status')}")
-                            return
-                    except json.JSONDecodeError:
-                        pass
-
-                elif current_time - last_message_time >= keepalive_interval:
-                    # Send keepalive ping (SSE comment)
-                    last_message_time = current_time
-                    # Note: We yield a comment that the SSE parser will ignore
-                    # This keeps the connection alive through proxies
-                    yield ": keepalive\n"
-
-            except TimeoutError:
-                # No message received, check if we need keepalive
-                if current_time - last_message_time >= keepalive_interval:
-                    last_message_time = current_time
-                    yield ": keepalive\n"
-                continue
-
-    finally:
-        await pubsub.unsubscribe(channel)
-        await pubsub.aclose()
-        await client.aclose()
+    async for data in stream_channel(
+        get_analysis_channel(analysis_id),
+        timeout_seconds=timeout_seconds,
+        keepalive_interval=30,
+        terminal_statuses=frozenset({"completed", "failed"}),
+        timeout_payload=timeout_payload,
+    ):
+        yield data
 
 
 async def subscribe_to_channel(channel: str):
@@ -271,23 +509,8 @@ async def subscribe_to_channel(channel: str):
     Yields:
         JSON-encoded messages from the channel
     """
-    client = aioredis.Redis(connection_pool=async_redis_pool)
-    pubsub = client.pubsub()
-
-    try:
-        await pubsub.subscribe(channel)
-        logger.info(f"Subscribed to channel: {channel}")
-
-        async for message in pubsub.listen():
-            if message["type"] == "message":
-                data = message["data"]
-                if isinstance(data, bytes):
-                    data = data.decode("utf-8")
-                yield data
-    finally:
-        await pubsub.unsubscribe(channel)
-        await pubsub.aclose()
-        await client.aclose()
+    async for data in stream_channel(channel):
+        yield data
 
 
 # =============================================================================
@@ -422,57 +645,21 @@ async def subscribe_embedding_progress(repository_id: str, timeout_seconds: int
 
     Yields JSON-encoded progress updates.
     """
-    import asyncio
-
-    client = aioredis.Redis(connection_pool=async_redis_pool)
-    pubsub = client.pubsub()
-    channel = get_embedding_channel(repository_id)
-
-    start_time = asyncio.get_event_loop().time()
-
-    try:
-        await pubsub.subscribe(channel)
-        logger.info(f"Subscribed to embedding channel: {channel}")
-
-        while True:
-            current_time = asyncio.get_event_loop().time()
-
-            if current_time - start_time > timeout_seconds:
-                yield json.dumps({
-                    "repository_id": repository_id,
-                    "stage": "timeout",
-                    "status": "timeout",
-                    "message": "Embedding progress timed out",
-                })
-                break
-
-            try:
-                message = await asyncio.wait_for(
-                    pubsub.get_message(ignore_subscribe_messages=True, timeout=5.0),
-                    timeout=6.0
-                )
-
-                if message and message["type"] == "message":
-                    data = message["data"]
-                    if isinstance(data, bytes):
-                        data = data.decode("utf-8")
-                    yield data
-
-                    # Check if completed or failed
-                    try:
-                        parsed = json.loads(data)
-                        if parsed.get("status") in ("completed", "failed", "error"):
-                            return
-                    except json.JSONDecodeError:
-                        pass
-
-            except TimeoutError:
-                continue
+    def timeout_payload() -> str:
+        return json.dumps({
+            "repository_id": repository_id,
+            "stage": "timeout",
+            "status": "timeout",
+            "message": "Embedding progress timed out",
+        })
 
-    finally:
-        await pubsub.unsubscribe(channel)
-        await pubsub.aclose()
-        await client.aclose()
+    async for data in stream_channel(
+        get_embedding_channel(repository_id),
+        timeout_seconds=timeout_seconds,
+        terminal_statuses=frozenset({"completed", "failed", "error"}),
+        timeout_payload=timeout_payload,
+    ):
+        yield data
 
 
 # =============================================================================
@@ -532,6 +719,83 @@ def update_playground_scan(scan_id: str, updates: dict) -> None:
             client.setex(key, PLAYGROUND_SCAN_TTL, json.dumps(data))
 
 
+PLAYGROUND_RESULT_PREFIX = "playground:result:"
+PLAYGROUND_CLAIM_PREFIX = "playground:claim:"
+
+
+def _playground_commit_key(repo_url: str, commit_sha: str) -> str:
+    """Cache key part for a repository commit (owner/name is case-insensitive)."""
+    repo = repo_url.rstrip("/").removesuffix(".git").split("github.com/", 1)[-1].lower()
+    return f"{repo}:{commit_sha}"
+
+
+def get_cached_playground_result(repo_url: str, commit_sha: str) -> dict | None:
+    """Get a completed playground scan result for a repository commit.
+
+    Args:
+        repo_url: GitHub repository URL
+        commit_sha: Scanned commit SHA
+
+    Returns:
+        Result dict or None if not cached
+    """
+    with get_sync_redis_context() as client:
+        result = client.get(f"{PLAYGROUND_RESULT_PREFIX}{_playground_commit_key(repo_url, commit_sha)}")
+        if result is None:
+            return None
+        return json.loads(str(result))
+
+
+def cache_playground_result(repo_url: str, commit_sha: str, result: dict, ttl: int) -> None:
+    """Cache a completed playground scan result for a repository commit.
+
+    Args:
+        repo_url: GitHub repository URL
+        commit_sha: Scanned commit SHA
+        result: Result fields (vci_score, metrics, top_issues, ...)
+        ttl: Cache lifetime in seconds
+    """
+    with get_sync_redis_context() as client:
+        client.setex(
+            f"{PLAYGROUND_RESULT_PREFIX}{_playground_commit_key(repo_url, commit_sha)}",
+            ttl,
+            json.dumps(result),
+        )
+
+
+def claim_playground_scan(repo_url: str, commit_sha: str, scan_id: str, ttl: int) -> str | None:
+    """Claim the scan of a repository commit so concurrent requests share it.
+
+    Args:
+        repo_url: GitHub repository URL
+        commit_sha: Commit SHA to be scanned
+        scan_id: Scan that will do the work
+        ttl: Claim lifetime in seconds (released early when the scan ends)
+
+    Returns:
+        None if the claim was taken, otherwise the scan_id already holding it
+    """
+    key = f"{PLAYGROUND_CLAIM_PREFIX}{_playground_commit_key(repo_url, commit_sha)}"
+    with get_sync_redis_context() as client:
+        # Retry once if the holder finished between SET NX and GET
+        for _ in range(2):
+            if client.set(key, scan_id, nx=True, ex=ttl):
+                return None
+            holder = client.get(key)
+            if holder is not None:
+                return str(holder)
+    return None
+
+
+def release_playground_claim(repo_url: str, commit_sha: str, scan_id: str) -> None:
+    """Release a scan claim if ``scan_id`` still holds it."""
+    key = f"{PLAYGROUND_CLAIM_PREFIX}{_playground_commit_key(repo_url, commit_sha)}"
+    with get_sync_redis_context() as client:
+        holder = client.get(key)
+        if holder is not None and str(holder) == scan_id:
+            client.delete(key)
+
+
 def check_playground_rate_limit(client_ip: str, max_requests: int = 5) -> bool:
     """Check if client has exceeded playground rate limit.
 
@@ -711,59 +975,17 @@ async def subscribe_analysis_events(analysis_id: str, timeout_seconds: int = 600
     **Feature: progress-tracking-refactor**
     **Validates: Requirements 7.1, 7.3**
     """
-    import asyncio
-
-    client = aioredis.Redis(connection_pool=async_redis_pool)
-    pubsub = client.pubsub()
-    channel = get_analysis_events_channel(analysis_id)
-
-    start_time = asyncio.get_event_loop().time()
-    last_message_time = start_time
-    keepalive_interval = 30
-
-    try:
-        await pubsub.subscribe(channel)
-        logger.info(f"Subscribed to analysis events channel: {channel}")
-
-        while True:
-            current_time = asyncio.get_event_loop().time()
-
-            if current_time - start_time > timeout_seconds:
-                logger.warning(f"Analysis events subscription timed out for {analysis_id}")
-                yield json.dumps({
-                    "analysis_id": analysis_id,
-                    "event_type": "timeout",
-                    "timestamp": datetime.now(UTC).isoformat(),
-                })
-                break
-
-            time_since_last = current_time - last_message_time
-            wait_timeout = max(0.1, keepalive_interval - time_since_last)
-
-            try:
-                message = await asyncio.wait_for(
-                    pubsub.get_message(ignore_subscribe_messages=True, timeout=wait_timeout),
-                    timeout=wait_timeout + 1
-                )
-
-                if message and message["type"] == "message":
-                    last_message_time = asyncio.get_event_loop().time()
-                    data = message["data"]
-                    if isinstance(data, bytes):
-                        data = data.decode("utf-8")
-                    yield data
-
-                elif current_time - last_message_time >= keepalive_interval:
-                    last_message_time = current_time
-                    yield ": keepalive\n"
-
-            except TimeoutError:
-                if current_time - last_message_time >= keepalive_interval:
-                    last_message_time = current_time
-                    yield ": keepalive\n"
-                continue
-
-    finally:
-        await pubsub.unsubscribe(channel)
-        await pubsub.aclose()
-        await client.aclose()
+    def timeout_payload() -> str:
+        return json.dumps({
+            "analysis_id": analysis_id,
+            "event_type": "timeout",
+            "timestamp": datetime.now(UTC).isoformat(),
+        })
+
+    async for data in stream_channel(
+        get_analysis_events_channel(analysis_id),
+        timeout_seconds=timeout_seconds,
+        keepalive_interval=30,
+        timeout_payload=timeout_payload,
+    ):
+        yield data
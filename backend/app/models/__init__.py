@@ -7,9 +7,11 @@ from app.models.dead_code import DeadCode
 from app.models.file_churn import FileChurn
 from app.models.issue import Issue
 from app.models.organization import Member, Organization
+from app.models.repo_churn_index import RepoChurnIndex, RepoChurnIndexFile
 from app.models.repo_content_cache import RepoContentCache
 from app.models.repo_content_object import RepoContentObject
 from app.models.repo_content_tree import RepoContentTree
+from app.models.repo_content_tree_entry import RepoContentTreeEntry
 from app.models.repository import Repository
 from app.models.semantic_ai_insight import SemanticAIInsight
 from app.models.subscription import Subscription
@@ -32,4 +34,7 @@ __all__ = [
     "RepoContentCache",
     "RepoContentObject",
     "RepoContentTree",
+    "RepoContentTreeEntry",
+    "RepoChurnIndex",
+    "RepoChurnIndexFile",
 ]
@@ -4,7 +4,17 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,10 +28,41 @@ if TYPE_CHECKING:
     from app.models.semantic_ai_insight import SemanticAIInsight
 
 
+def grade_for_score(vci_score: Any) -> str | None:
+    """Calculate letter grade from a VCI score (None if not scored)."""
+    if vci_score is None:
+        return None
+    score = float(vci_score)
+    if score >= 90:
+        return "A"
+    if score >= 80:
+        return "B"
+    if score >= 70:
+        return "C"
+    if score >= 60:
+        return "D"
+    return "F"
+
+
 class Analysis(BaseModelNoUpdate):
     """Analysis model for repository code analysis."""
 
     __tablename__ = "analyses"
+    __table_args__ = (
+        # Listing/history views: filter by repository + status, order by date.
+        # INCLUDE makes the VCI history query an index-only scan, so it never
+        # touches the heap rows holding the large JSONB caches.
+        Index(
+            "ix_analyses_repo_status_completed",
+            "repository_id",
+            "status",
+            "completed_at",
+            postgresql_include=["vci_score", "commit_sha", "created_at"],
+        ),
+        Index("ix_analyses_repo_created", "repository_id", "created_at"),
+        # Reuse lookup for AI scans with identical inputs
+        Index("ix_analyses_repo_ai_scan_fingerprint", "repository_id", "ai_scan_fingerprint"),
+    )
 
     repository_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -117,6 +158,11 @@ class Analysis(BaseModelNoUpdate):
         DateTime(timezone=True),
         nullable=True,
     )
+    # SHA-256 of the AI scan inputs (repo view, models, prompt version)
+    ai_scan_fingerprint: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+    )
 
     # Embeddings tracking columns (Requirements 2.1, 2.2, 2.3, 2.4)
     # Valid values: 'none', 'pending', 'running', 'completed', 'failed'
@@ -214,18 +260,7 @@ class Analysis(BaseModelNoUpdate):
     @property
     def grade(self) -> str | None:
         """Calculate grade from VCI score."""
-        if self.vci_score is None:
-            return None
-        score = float(self.vci_score)
-        if score >= 90:
-            return "A"
-        if score >= 80:
-            return "B"
-        if score >= 70:
-            return "C"
-        if score >= 60:
-            return "D"
-        return "F"
+        return grade_for_score(self.vci_score)
 
     def __repr__(self) -> str:
         return f"<Analysis {self.id} status={self.status}>"
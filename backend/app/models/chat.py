@@ -2,9 +2,10 @@
 
 import enum
 import uuid
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -64,6 +65,16 @@ class ChatThread(BaseModel):
         ForeignKey("issues.id", ondelete="SET NULL"),
         nullable=True,
     )
+    # Running summary of the turns that fell out of the prompt history window
+    summary: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    # created_at of the newest message folded into the summary
+    summary_through: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
 
     # Relationships
     repository: Mapped["Repository"] = relationship(
@@ -93,6 +104,10 @@ class ChatMessage(BaseModel):
     """Chat message model."""
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Prompt history: the latest messages of a thread, newest first
+        Index("ix_chat_messages_thread_created", "thread_id", "created_at"),
+    )
 
     thread_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
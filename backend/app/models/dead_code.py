@@ -8,7 +8,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +29,12 @@ class DeadCode(BaseModelNoUpdate):
     """
 
     __tablename__ = "dead_code"
+    __table_args__ = (
+        UniqueConstraint(
+            "analysis_id", "file_path", "function_name", "line_start",
+            name="uq_dead_code_analysis_finding",
+        ),
+    )
 
     analysis_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -89,6 +95,12 @@ class DeadCode(BaseModelNoUpdate):
         DateTime(timezone=True),
         nullable=True,
     )
+    # Set by every persist that reports the finding; stale rows are removed by it
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
 
     # Relationships
     analysis: Mapped["Analysis"] = relationship(
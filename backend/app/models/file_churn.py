@@ -5,9 +5,10 @@ Part of the Semantic AI Insights feature.
 """
 
 import uuid
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Float, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -69,6 +70,12 @@ class FileChurn(BaseModelNoUpdate):
         nullable=False,
         server_default="0.0",
     )
+    # Set by every persist that reports the file; stale rows are removed by it
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
 
     # Relationships
     analysis: Mapped["Analysis"] = relationship(
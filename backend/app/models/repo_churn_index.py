@@ -0,0 +1,76 @@
+"""Per-repository churn index models.
+
+Persist the day-bucketed git history mined by GitAnalyzer, so later
+analyses of a repository only mine commits pushed since the index head.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel, BaseModelNoUpdate
+
+
+class RepoChurnIndex(BaseModel):
+    """Churn index head of a repository.
+
+    head_sha is the last commit mined into the index; its files are in
+    repo_churn_index_files.
+    """
+
+    __tablename__ = "repo_churn_indexes"
+    __table_args__ = (
+        UniqueConstraint("repository_id", name="uq_repo_churn_indexes_repository_id"),
+    )
+
+    repository_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("repositories.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    head_sha: Mapped[str] = mapped_column(
+        String(40),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<RepoChurnIndex repository={self.repository_id} head={self.head_sha[:7]}>"
+
+
+class RepoChurnIndexFile(BaseModelNoUpdate):
+    """Day-bucketed change history of one file in a churn index.
+
+    days maps an ISO date to
+    ``{"commits": int, "added": int, "removed": int, "authors": [str]}``;
+    buckets older than the longest churn window are dropped.
+    """
+
+    __tablename__ = "repo_churn_index_files"
+    __table_args__ = (
+        UniqueConstraint("index_id", "file_path", name="uq_repo_churn_index_files_index_path"),
+    )
+
+    index_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("repo_churn_indexes.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    file_path: Mapped[str] = mapped_column(
+        String(1024),
+        nullable=False,
+    )
+    days: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        server_default="'{}'::jsonb",
+    )
+    last_modified: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<RepoChurnIndexFile {self.file_path} days={len(self.days)}>"
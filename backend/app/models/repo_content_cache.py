@@ -12,6 +12,7 @@ from app.models.base import BaseModel
 if TYPE_CHECKING:
     from app.models.repo_content_object import RepoContentObject
     from app.models.repo_content_tree import RepoContentTree
+    from app.models.repo_content_tree_entry import RepoContentTreeEntry
     from app.models.repository import Repository
 
 
@@ -76,6 +77,13 @@ class RepoContentCache(BaseModel):
         uselist=False,
         cascade="all, delete-orphan",
     )
+    # Rows are removed by ON DELETE CASCADE; never load them just to delete
+    tree_entries: Mapped[list["RepoContentTreeEntry"]] = relationship(
+        "RepoContentTreeEntry",
+        back_populates="cache",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __repr__(self) -> str:
         return f"<RepoContentCache {self.repository_id}@{self.commit_sha[:7]} status={self.status}>"
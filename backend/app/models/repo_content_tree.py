@@ -18,8 +18,12 @@ class RepoContentTree(BaseModelNoUpdate):
 
     Stores two tree formats:
     - tree: List of code file paths for embeddings ["src/main.py", ...]
-    - full_tree: Complete directory structure with metadata for file explorer
+    - full_tree: Legacy complete directory structure for file explorer
       [{"name": "src", "path": "src", "type": "directory", "size": null}, ...]
+
+    The explorer tree now lives in RepoContentTreeEntry rows (one per
+    entry, indexed by parent directory). full_tree is no longer written;
+    migration 021 copied existing values into the entries table.
     """
 
     __tablename__ = "repo_content_tree"
@@ -38,7 +42,7 @@ class RepoContentTree(BaseModelNoUpdate):
         JSONB,
         nullable=False,
     )
-    # Full directory tree with metadata (for file explorer)
+    # Legacy full directory tree (superseded by repo_content_tree_entries)
     # Format: [{"name": str, "path": str, "type": "file"|"directory", "size": int|null}, ...]
     full_tree: Mapped[list[Any] | None] = mapped_column(
         JSONB,
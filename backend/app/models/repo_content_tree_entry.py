@@ -0,0 +1,66 @@
+"""Repository content tree entry model for directory-indexed listings."""
+
+import uuid
+from typing import TYPE_CHECKING
+
+from sqlalchemy import BigInteger, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import BaseModelNoUpdate
+
+if TYPE_CHECKING:
+    from app.models.repo_content_cache import RepoContentCache
+
+
+class RepoContentTreeEntry(BaseModelNoUpdate):
+    """Single file or directory in a cached commit tree.
+
+    One row per entry, indexed by (cache_id, parent_path) so listing a
+    directory in the file explorer reads only its direct children instead
+    of deserializing the whole tree.
+
+    parent_path is "" for root-level entries.
+    """
+
+    __tablename__ = "repo_content_tree_entries"
+    __table_args__ = (
+        UniqueConstraint("cache_id", "path", name="uq_repo_content_tree_entries_cache_path"),
+        Index("ix_repo_content_tree_entries_parent", "cache_id", "parent_path"),
+    )
+
+    cache_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("repo_content_cache.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    parent_path: Mapped[str] = mapped_column(
+        String(1024),
+        nullable=False,
+    )
+    name: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+    path: Mapped[str] = mapped_column(
+        String(1024),
+        nullable=False,
+    )
+    # 'file' or 'directory'
+    type: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+    )
+    size: Mapped[int | None] = mapped_column(
+        BigInteger,
+        nullable=True,
+    )
+
+    # Relationships
+    cache: Mapped["RepoContentCache"] = relationship(
+        "RepoContentCache",
+        back_populates="tree_entries",
+    )
+
+    def __repr__(self) -> str:
+        return f"<RepoContentTreeEntry {self.path} type={self.type}>"
@@ -156,6 +156,7 @@ FIX_TYPE:
                 prompt=prompt,
                 temperature=0.1,
                 max_tokens=1000,
+                task="healing_diagnosis",
             )
             return self._parse_llm_response(response)
         except Exception as e:
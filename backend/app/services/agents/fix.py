@@ -230,6 +230,7 @@ CHANGES:
                 prompt=prompt,
                 temperature=0.1 if iteration == 1 else 0.2,  # Slightly more creative on retries
                 max_tokens=4000,
+                task="healing_fix",
             )
             return self._parse_fix_response(response, file_content)
         except Exception as e:
@@ -313,6 +314,7 @@ CONSIDERATIONS:
                 prompt=prompt,
                 temperature=0.2 if iteration == 1 else 0.3,  # More creative on retries
                 max_tokens=4000,
+                task="healing_fix",
             )
             result = self._parse_fix_response(response, file_content)
             # Lower confidence for complex fixes, even more for retries
@@ -371,6 +373,7 @@ Provide detailed suggestions:
                 prompt=prompt,
                 temperature=0.3,
                 max_tokens=2000,
+                task="healing_fix",
             )
             return {
                 "success": False,
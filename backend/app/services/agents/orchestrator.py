@@ -1,5 +1,6 @@
 """Healing Orchestrator - Coordinates all agents for auto-healing with iterative retry loop."""
 
+import asyncio
 import logging
 import shlex
 from collections.abc import Callable
@@ -11,16 +12,46 @@ from uuid import UUID
 
 import docker
 
+from app.core.config import settings
 from app.services.agents.diagnosis import DiagnosisAgent, DiagnosisResult
 from app.services.agents.fix import FixAgent, FixResult
 from app.services.agents.test import TestAgent, TestResult
-from app.services.sandbox import Sandbox
+from app.services.impact_analysis import (
+    ImpactIndex,
+    SelectedTest,
+    impacted_test_command,
+    language_family,
+    parse_failed_tests,
+)
+from app.services.sandbox import Sandbox, SandboxPool
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 MAX_HEALING_ITERATIONS = 3  # Maximum retry attempts for healing
 
+# Validation sandbox limits
+VALIDATION_MEMORY_LIMIT = "512m"
+VALIDATION_CPU_LIMIT = 1.0
+VALIDATION_TIMEOUT = 300  # 5 minute timeout for validation
+
+# Warm validation sandboxes, shared by all orchestrators in the worker process
+_validation_pool: SandboxPool | None = None
+
+
+def get_validation_pool(client: docker.DockerClient) -> SandboxPool:
+    """Get or create the worker's pool of pre-started validation sandboxes."""
+    global _validation_pool
+    if _validation_pool is None:
+        _validation_pool = SandboxPool(
+            client=client,
+            size=settings.sandbox_pool_size,
+            memory_limit=VALIDATION_MEMORY_LIMIT,
+            cpu_limit=VALIDATION_CPU_LIMIT,
+            timeout=VALIDATION_TIMEOUT,
+        )
+    return _validation_pool
+
 
 class HealingStatus(Enum):
     """Status of healing process."""
@@ -69,6 +100,9 @@ class HealingOrchestrator:
         self.max_iterations = max_iterations
         # Docker client for sandbox creation
         self._docker_client: docker.DockerClient | None = None
+        # Impact-scoped test selection state, per heal
+        self._impact_index: ImpactIndex | None = None
+        self._impact_baselines: dict[tuple, dict] = {}
 
     def _get_docker_client(self) -> docker.DockerClient:
         """Get or create Docker client lazily."""
@@ -123,6 +157,11 @@ class HealingOrchestrator:
             if on_log:
                 on_log(entry)
 
+        # Validation workspace, cloned once and reset between iterations
+        workspace: Sandbox | None = None
+        self._impact_index = None
+        self._impact_baselines = {}
+
         try:
             # Stage 1: Diagnosis (only done once)
             log("diagnosis", "Starting issue diagnosis")
@@ -213,12 +252,38 @@ class HealingOrchestrator:
                 log("validation", f"Validating fix in sandbox (iteration {iteration})")
                 result.status = HealingStatus.VALIDATING
 
+                if workspace is None:
+                    workspace = await self._provision_workspace(repository, access_token)
+
                 validation_result = await self._validate_in_sandbox(
                     repository=repository,
                     fix=fix,
                     test=test,
                     access_token=access_token,
+                    sandbox=workspace,
                 )
+                if validation_result.get("workspace_discarded"):
+                    # The workspace failed, not the fix: validate the same fix
+                    # once more on a fresh one without spending an iteration
+                    log("validation", "Sandbox workspace unusable, provisioning a fresh one", {
+                        "error": validation_result.get("error"),
+                    })
+                    workspace = await self._provision_workspace(repository, access_token)
+                    validation_result = await self._validate_in_sandbox(
+                        repository=repository,
+                        fix=fix,
+                        test=test,
+                        access_token=access_token,
+                        sandbox=workspace,
+                    )
+                    if validation_result.get("workspace_discarded"):
+                        workspace = None
+                        log("failed", "Sandbox workspace unavailable", {
+                            "error": validation_result.get("error"),
+                        })
+                        result.status = HealingStatus.FAILED
+                        result.error_message = f"Sandbox validation unavailable: {validation_result.get('error')}"
+                        return result
 
                 result.validation_passed = validation_result["passed"]
 
@@ -261,6 +326,10 @@ class HealingOrchestrator:
             log("error", f"Healing process failed: {e}")
             return result
 
+        finally:
+            if workspace is not None:
+                await workspace.cleanup()
+
     def _extract_error_details(self, validation_result: dict) -> str:
         """Extract detailed error information from validation result for retry context."""
         error_parts = []
@@ -284,6 +353,11 @@ class HealingOrchestrator:
             if tests.get("output"):
                 error_parts.append(f"Test output:\n{tests['output']}")
 
+        # Existing tests that regressed
+        impacted = validation_result.get("impacted_tests")
+        if isinstance(impacted, dict) and impacted.get("regressions"):
+            error_parts.append("Regressed existing tests:\n" + "\n".join(impacted["regressions"]))
+
         # Lint failure output
         if validation_result.get("lint") and isinstance(validation_result["lint"], dict):
             lint = validation_result["lint"]
@@ -292,12 +366,72 @@ class HealingOrchestrator:
 
         return "\n\n".join(error_parts) if error_parts else "Validation failed (no details)"
 
+    async def _provision_workspace(
+        self,
+        repository: dict,
+        access_token: str | None = None,
+    ) -> Sandbox | None:
+        """Lease a warm sandbox and clone the repository into it.
+
+        SECURITY NOTE:
+        - Sandbox runs with network_mode="none" (complete network isolation)
+        - Repository is cloned on HOST into the sandbox's mounted workdir
+
+        Args:
+            repository: Repository dict with clone_url, default_branch, id
+            access_token: GitHub access token for private repositories
+
+        Returns:
+            Sandbox with the repository checked out, or None if it failed
+        """
+        # Get repository ID for sandbox naming
+        repo_id_str = str(repository.get("id", "unknown"))
+        try:
+            repo_uuid = UUID(repo_id_str)
+        except (ValueError, TypeError):
+            repo_uuid = UUID("00000000-0000-0000-0000-000000000000")
+
+        try:
+            sandbox = await get_validation_pool(self._get_docker_client()).acquire(repo_uuid)
+        except Exception as e:
+            logger.error(f"Failed to start validation sandbox: {e}")
+            return None
+
+        # Clone happens on HOST, sandbox has no network access
+        logger.info("[SECURITY] Cloning repository on HOST (sandbox has network_mode=none)")
+        clone_success = await asyncio.to_thread(
+            sandbox.clone_repository_on_host,
+            clone_url=repository.get("clone_url", ""),
+            branch=repository.get("default_branch", "main"),
+            depth=1,
+            access_token=access_token,
+        )
+        if not clone_success:
+            await sandbox.cleanup()
+            return None
+
+        # Snapshot the fresh checkout so later iterations reset from it instead
+        # of re-cloning (without one, a dirty workspace is discarded)
+        await asyncio.to_thread(sandbox.snapshot_workspace)
+
+        # Index the pristine checkout, before any repository code has run
+        if settings.healing_validation_mode == "impacted" and self._impact_index is None:
+            try:
+                self._impact_index = await asyncio.to_thread(
+                    ImpactIndex.build, Path(sandbox.workdir) / "repo"
+                )
+            except Exception as e:
+                logger.warning(f"Impacted test selection unavailable: {e}")
+
+        return sandbox
+
     async def _validate_in_sandbox(
         self,
         repository: dict,
         fix: FixResult,
         test: TestResult,
         access_token: str | None = None,
+        sandbox: Sandbox | None = None,
     ) -> dict:
         """Validate the fix in a sandbox environment.
 
@@ -312,118 +446,235 @@ class HealingOrchestrator:
             fix: FixResult with file_path and fixed_content
             test: TestResult with test_file_path and test_content
             access_token: GitHub access token for private repositories
+            sandbox: Provisioned workspace from a previous iteration; it is
+                reset to a clean checkout before the fix is applied. When
+                omitted, a workspace is provisioned and removed afterwards.
 
         Returns:
-            Dict with passed, lint, tests, error keys
+            Dict with passed, lint, tests, error keys (workspace_discarded is
+            set when the workspace failed rather than the fix; the workspace
+            has then been removed and the fix was not judged)
         """
-        # Get repository ID for sandbox naming
-        repo_id_str = str(repository.get("id", "unknown"))
-        try:
-            repo_uuid = UUID(repo_id_str)
-        except (ValueError, TypeError):
-            repo_uuid = UUID("00000000-0000-0000-0000-000000000000")
-
-        # Create sandbox instance
-        sandbox = Sandbox(
-            client=self._get_docker_client(),
-            repository_id=repo_uuid,
-            memory_limit="512m",
-            cpu_limit=1.0,
-            timeout=300,  # 5 minute timeout for validation
-        )
+        owns_sandbox = sandbox is None
+        if owns_sandbox:
+            sandbox = await self._provision_workspace(repository, access_token)
+            if sandbox is None:
+                return {
+                    "passed": False,
+                    "error": "Failed to clone repository on host",
+                    "workspace_discarded": True,
+                }
+        elif not await sandbox.reset_workspace():
+            await sandbox.cleanup()
+            return {
+                "passed": False,
+                "error": "Failed to reset sandbox workspace",
+                "workspace_discarded": True,
+            }
 
         try:
-            # Use async context manager for automatic cleanup
-            async with sandbox:
-                # STEP 1: Clone repository on HOST (sandbox has no network)
-                # This is critical - clone happens BEFORE sandbox starts network isolation
-                clone_url = repository.get("clone_url", "")
-                default_branch = repository.get("default_branch", "main")
-
-                logger.info("[SECURITY] Cloning repository on HOST (sandbox has network_mode=none)")
-                clone_success = sandbox.clone_repository_on_host(
-                    clone_url=clone_url,
-                    branch=default_branch,
-                    depth=1,
-                    access_token=access_token,
+            normalized_fix_path = fix.file_path.lstrip("/")
+
+            # Existing tests that reach the fixed file, and their results
+            # on the clean checkout (computed once per selection)
+            impacted, framework = self._select_impacted_tests(sandbox, normalized_fix_path, test)
+            baseline_key = (framework, *(t.path for t in impacted))
+            if impacted and baseline_key not in self._impact_baselines:
+                self._impact_baselines[baseline_key] = await self._run_selected_tests(
+                    sandbox, impacted, framework
                 )
-
-                if not clone_success:
+                if not await sandbox.reset_workspace():
+                    if not owns_sandbox:
+                        await sandbox.cleanup()
                     return {
                         "passed": False,
-                        "error": "Failed to clone repository on host",
+                        "error": "Failed to reset sandbox workspace after baseline run",
+                        "workspace_discarded": True,
                     }
 
-                # STEP 2: Write fixed file to sandbox's workdir (on host, mounted into sandbox)
-                repo_dir = Path(sandbox.workdir) / "repo"
-
-                # Normalize file path (remove leading slashes, handle relative paths)
-                normalized_fix_path = fix.file_path.lstrip("/")
-                fix_full_path = repo_dir / normalized_fix_path
+            # Write fixed file to sandbox's workdir (on host, mounted into sandbox)
+            logger.info(f"Writing fix to: {normalized_fix_path}")
+            try:
+                sandbox.write_workspace_file(normalized_fix_path, fix.fixed_content)
+            except Exception as e:
+                return {
+                    "passed": False,
+                    "error": f"Failed to write fix file: {e}",
+                }
 
-                logger.info(f"Writing fix to: {fix_full_path}")
+            # Write test file if generated
+            if test.success and test.test_content and test.test_file_path:
+                normalized_test_path = test.test_file_path.lstrip("/")
+                logger.info(f"Writing test to: {normalized_test_path}")
                 try:
-                    fix_full_path.parent.mkdir(parents=True, exist_ok=True)
-                    fix_full_path.write_text(fix.fixed_content)
+                    sandbox.write_workspace_file(normalized_test_path, test.test_content)
                 except Exception as e:
+                    logger.warning(f"Failed to write test file: {e}")
+                    # Continue without tests
+
+            # Run lint check in sandbox
+            lint_result = await self._run_lint_check_in_sandbox(
+                sandbox, normalized_fix_path
+            )
+
+            if not lint_result["passed"]:
+                return {
+                    "passed": False,
+                    "error": "Lint check failed",
+                    "details": lint_result,
+                    "lint": lint_result,
+                }
+
+            # Run tests if available
+            test_result_output = None
+            if test.success and test.test_file_path:
+                normalized_test_path = test.test_file_path.lstrip("/")
+                test_result_output = await self._run_tests_in_sandbox(
+                    sandbox, normalized_test_path, test.test_framework
+                )
+
+                if not test_result_output["passed"]:
                     return {
                         "passed": False,
-                        "error": f"Failed to write fix file: {e}",
+                        "error": "Tests failed",
+                        "details": test_result_output,
+                        "tests": test_result_output,
                     }
 
-                # STEP 3: Write test file if generated
-                if test.success and test.test_content and test.test_file_path:
-                    normalized_test_path = test.test_file_path.lstrip("/")
-                    test_full_path = repo_dir / normalized_test_path
-
-                    logger.info(f"Writing test to: {test_full_path}")
-                    try:
-                        test_full_path.parent.mkdir(parents=True, exist_ok=True)
-                        test_full_path.write_text(test.test_content)
-                    except Exception as e:
-                        logger.warning(f"Failed to write test file: {e}")
-                        # Continue without tests
-
-                # STEP 4: Run lint check in sandbox
-                lint_result = await self._run_lint_check_in_sandbox(
-                    sandbox, normalized_fix_path
+            # Run existing tests that reach the fixed file
+            impacted_result = None
+            if impacted:
+                impacted_result = await self._run_impacted_tests_in_sandbox(
+                    sandbox, impacted, framework, self._impact_baselines[baseline_key]
                 )
 
-                if not lint_result["passed"]:
+                if not impacted_result["passed"]:
                     return {
                         "passed": False,
-                        "error": "Lint check failed",
-                        "details": lint_result,
-                        "lint": lint_result,
+                        "error": "Existing tests regressed",
+                        "details": impacted_result,
+                        "impacted_tests": impacted_result,
                     }
 
-                # STEP 5: Run tests if available
-                test_result_output = None
-                if test.success and test.test_file_path:
-                    normalized_test_path = test.test_file_path.lstrip("/")
-                    test_result_output = await self._run_tests_in_sandbox(
-                        sandbox, normalized_test_path, test.test_framework
-                    )
-
-                    if not test_result_output["passed"]:
-                        return {
-                            "passed": False,
-                            "error": "Tests failed",
-                            "details": test_result_output,
-                            "tests": test_result_output,
-                        }
-
-                # All checks passed
-                return {
-                    "passed": True,
-                    "lint": lint_result,
-                    "tests": test_result_output,
-                }
+            # All checks passed
+            return {
+                "passed": True,
+                "lint": lint_result,
+                "tests": test_result_output,
+                "impacted_tests": impacted_result,
+            }
 
         except Exception as e:
             logger.error(f"Sandbox validation failed: {e}")
             return {"passed": False, "error": str(e)}
 
+        finally:
+            if owns_sandbox:
+                await sandbox.cleanup()
+
+    def _select_impacted_tests(
+        self, sandbox: Sandbox, file_path: str, test: TestResult
+    ) -> tuple[list[SelectedTest], str | None]:
+        """Select existing tests reaching the fixed file and their framework.
+
+        Returns:
+            Tuple of (selected tests, framework); empty when selection is
+            disabled, unavailable or finds nothing
+        """
+        if settings.healing_validation_mode != "impacted" or self._impact_index is None:
+            return [], None
+
+        family = language_family(file_path)
+        if family == "python":
+            framework = "pytest"
+        elif family == "javascript":
+            framework = test.test_framework if test.test_framework in ("jest", "vitest") else None
+            if framework is None:
+                package_json = Path(sandbox.workdir) / "repo" / "package.json"
+                try:
+                    framework = "vitest" if "vitest" in package_json.read_text() else "jest"
+                except OSError:
+                    framework = "jest"
+        else:
+            return [], None
+
+        selected = self._impact_index.select_tests(
+            file_path, max_files=settings.healing_impacted_tests_max_files
+        )
+        if selected:
+            logger.info(f"Selected {len(selected)} existing test file(s) reaching {file_path}")
+        return selected, framework
+
+    async def _run_selected_tests(
+        self, sandbox: Sandbox, selected: list[SelectedTest], framework: str
+    ) -> dict:
+        """Run selected test files within the time budget.
+
+        Returns:
+            Dict with exit_code, output, failed (test ids or None), timed_out keys
+        """
+        command = impacted_test_command([t.path for t in selected], framework)
+        result = await sandbox.run(
+            command,
+            workdir="/workspace/repo",
+            timeout=settings.healing_impacted_tests_timeout_seconds,
+        )
+        return {
+            "exit_code": result.exit_code,
+            "output": result.output,
+            "failed": parse_failed_tests(result.output, framework),
+            "timed_out": result.timed_out,
+        }
+
+    async def _run_impacted_tests_in_sandbox(
+        self,
+        sandbox: Sandbox,
+        selected: list[SelectedTest],
+        framework: str,
+        baseline: dict,
+    ) -> dict:
+        """Run the selected existing tests and compare with the clean checkout.
+
+        Only regressions fail validation: tests that already fail without
+        the fix (e.g. missing dependencies in the offline sandbox) do not.
+
+        Returns:
+            Dict with passed, selected, output, regressions, error keys
+        """
+        report = {
+            "selected": [t.to_dict() for t in selected],
+            "framework": framework,
+        }
+        try:
+            run = await self._run_selected_tests(sandbox, selected, framework)
+        except Exception as e:
+            logger.error(f"Impacted test execution failed: {e}")
+            return {**report, "passed": False, "error": str(e), "output": ""}
+
+        regressions: list[str] = []
+        if run["timed_out"]:
+            # Inconclusive when the clean checkout exceeded the budget too
+            passed = baseline["timed_out"]
+            if not passed:
+                regressions = ["time budget exceeded"]
+        elif run["failed"] is not None and baseline["failed"] is not None and not baseline["timed_out"]:
+            regressions = sorted(run["failed"] - baseline["failed"])
+            # A crash without per-test failures counts if the baseline was clean
+            crashed = not run["failed"] and run["exit_code"] not in (0, 5) and baseline["exit_code"] in (0, 5)
+            passed = not regressions and not crashed
+        else:
+            passed = run["exit_code"] == 0 or baseline["exit_code"] != 0
+
+        return {
+            **report,
+            "passed": passed,
+            "output": run["output"],
+            "exit_code": run["exit_code"],
+            "regressions": regressions,
+            "baseline_failures": sorted(baseline["failed"] or []),
+            "timed_out": run["timed_out"],
+        }
+
     async def _run_lint_check_in_sandbox(
         self, sandbox: Sandbox, file_path: str
     ) -> dict:
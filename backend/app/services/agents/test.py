@@ -180,6 +180,7 @@ EXPLANATION:
                 prompt=prompt,
                 temperature=0.2,
                 max_tokens=3000,
+                task="healing_test",
             )
             return self._parse_test_response(response)
         except Exception as e:
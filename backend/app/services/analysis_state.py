@@ -8,13 +8,14 @@ ensuring state transitions are validated and events are published for real-time
 """
 
 import logging
-from datetime import UTC, datetime
-from typing import Any
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.analysis import Analysis
 
 logger = logging.getLogger(__name__)
@@ -167,6 +168,77 @@ def validate_progress(progress: int) -> None:
         raise InvalidProgressValueError(progress)
 
 
+# =============================================================================
+# Stuck Analysis Detection
+# =============================================================================
+
+
+def is_analysis_stuck(analysis: Analysis) -> bool:
+    """
+    Determine if an analysis is stuck based on heartbeat-based detection.
+
+    For pending status: stuck if created_at is older than analysis_pending_stuck_minutes.
+    For running status: stuck if state_updated_at is older than analysis_running_heartbeat_timeout_minutes.
+    Terminal states (completed/failed/skipped) are never considered stuck.
+
+    Args:
+        analysis: The Analysis model instance to check.
+
+    Returns:
+        True if the analysis is stuck, False otherwise.
+
+    **Feature: heartbeat-stuck-detection**
+    **Validates: Section 6.2 of analysis-status-contract.md**
+    """
+    now = datetime.now(UTC)
+
+    # Terminal states are never stuck
+    if analysis.status in ("completed", "failed", "skipped"):
+        return False
+
+    if analysis.status == "pending":
+        # Pending-stuck: waiting too long for a worker to start
+        pending_timeout = timedelta(minutes=settings.analysis_pending_stuck_minutes)
+        created_at = analysis.created_at
+        # Ensure timezone-aware comparison
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+        return created_at < (now - pending_timeout)
+
+    if analysis.status == "running":
+        # Running-stuck: no heartbeat for too long
+        heartbeat_timeout = timedelta(minutes=settings.analysis_running_heartbeat_timeout_minutes)
+        state_updated_at = analysis.state_updated_at
+        # Ensure timezone-aware comparison
+        if state_updated_at.tzinfo is None:
+            state_updated_at = state_updated_at.replace(tzinfo=UTC)
+        return state_updated_at < (now - heartbeat_timeout)
+
+    # Unknown status - treat as not stuck (shouldn't happen)
+    return False
+
+
+def get_stuck_reason(analysis: Analysis) -> Literal["pending_timeout", "heartbeat_timeout"] | None:
+    """
+    Get the reason why an analysis is stuck.
+
+    Args:
+        analysis: The Analysis model instance to check.
+
+    Returns:
+        "pending_timeout" if pending too long, "heartbeat_timeout" if no heartbeat,
+        or None if not stuck.
+    """
+    if not is_analysis_stuck(analysis):
+        return None
+
+    if analysis.status == "pending":
+        return "pending_timeout"
+    if analysis.status == "running":
+        return "heartbeat_timeout"
+    return None
+
+
 # =============================================================================
 # AnalysisStateService
 # =============================================================================
@@ -952,6 +1024,7 @@ class AnalysisStateService:
         analysis.ai_scan_message = "AI scan completed"
         analysis.ai_scan_completed_at = datetime.now(UTC)
         analysis.ai_scan_cache = cache_data
+        analysis.ai_scan_fingerprint = cache_data.get("fingerprint")
 
         # Update timestamp for polling optimization
         self._update_timestamp(analysis)
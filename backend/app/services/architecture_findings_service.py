@@ -3,13 +3,22 @@
 Handles persistence of architecture findings (dead code, hot spots)
 to PostgreSQL database.
 
+Findings are written set-based: one multi-row INSERT ... ON CONFLICT DO
+UPDATE per table that stamps last_seen_at with the persist time, followed
+by one DELETE of the analysis' findings carrying an older stamp (those
+not reported again). Rows of re-reported findings are updated in
+place, so dismissals survive re-analysis; dead code dismissed in an earlier
+analysis of the repository stays dismissed in new analyses.
+
 Requirements: 7.1, 7.2
 """
 
 import logging
+from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import delete
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models.dead_code import DeadCode
@@ -38,7 +47,8 @@ class ArchitectureFindingsService:
     ) -> dict:
         """Persist architecture findings to PostgreSQL.
 
-        Clears existing findings for the analysis and inserts new ones.
+        Upserts the reported findings and removes the analysis' findings
+        that were not reported again.
 
         Args:
             db: Database session
@@ -51,8 +61,8 @@ class ArchitectureFindingsService:
 
         Requirements: 7.1, 7.2
         """
-        # Clear existing findings for this analysis
-        self._clear_existing_findings(db, analysis_id)
+        # Stamp of this persist; rows of the analysis without it are stale
+        seen_at = datetime.now(UTC)
 
         # Persist dead code findings
         dead_code_count = self._persist_dead_code(
@@ -60,6 +70,7 @@ class ArchitectureFindingsService:
             repository_id=repository_id,
             analysis_id=analysis_id,
             findings=architecture_data.dead_code,
+            seen_at=seen_at,
         )
 
         # Persist hot spot findings
@@ -68,6 +79,7 @@ class ArchitectureFindingsService:
             repository_id=repository_id,
             analysis_id=analysis_id,
             findings=architecture_data.hot_spots,
+            seen_at=seen_at,
         )
 
         db.commit()
@@ -82,22 +94,13 @@ class ArchitectureFindingsService:
             "hot_spot_count": hot_spot_count,
         }
 
-    def _clear_existing_findings(self, db: Session, analysis_id: UUID) -> None:
-        """Clear existing findings for an analysis.
-
-        Args:
-            db: Database session
-            analysis_id: UUID of the analysis
-        """
-        db.execute(delete(DeadCode).where(DeadCode.analysis_id == analysis_id))
-        db.execute(delete(FileChurn).where(FileChurn.analysis_id == analysis_id))
-
     def _persist_dead_code(
         self,
         db: Session,
         repository_id: UUID,
         analysis_id: UUID,
         findings: list[DeadCodeFinding],
+        seen_at: datetime,
     ) -> int:
         """Persist dead code findings to database.
 
@@ -106,28 +109,49 @@ class ArchitectureFindingsService:
             repository_id: UUID of the repository
             analysis_id: UUID of the analysis
             findings: List of dead code findings
+            seen_at: Stamp of this persist
 
         Returns:
             Number of findings persisted
 
-        Requirements: 7.1
+        Requirements: 7.1, 7.3
         """
-        for finding in findings:
-            dead_code = DeadCode(
-                analysis_id=analysis_id,
-                repository_id=repository_id,
-                file_path=finding.file_path,
-                function_name=finding.function_name,
-                line_start=finding.line_start,
-                line_end=finding.line_end,
-                line_count=finding.line_count,
-                confidence=finding.confidence,
-                evidence=finding.evidence,
-                suggested_action=finding.suggested_action,
+        rows = self._dead_code_rows(repository_id, analysis_id, findings, seen_at)
+
+        if rows:
+            dismissed = self._dismissed_dead_code(db, repository_id)
+            for row in rows:
+                key = (row["file_path"], row["function_name"])
+                if key in dismissed:
+                    row["is_dismissed"] = True
+                    row["dismissed_at"] = dismissed[key]
+
+            stmt = pg_insert(DeadCode)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_dead_code_analysis_finding",
+                set_={
+                    "line_end": stmt.excluded.line_end,
+                    "line_count": stmt.excluded.line_count,
+                    "confidence": stmt.excluded.confidence,
+                    "evidence": stmt.excluded.evidence,
+                    "suggested_action": stmt.excluded.suggested_action,
+                    "impact_score": stmt.excluded.impact_score,
+                    "last_seen_at": stmt.excluded.last_seen_at,
+                    # Keep a dismissal made on this row or carried from an earlier analysis
+                    "is_dismissed": DeadCode.is_dismissed | stmt.excluded.is_dismissed,
+                    "dismissed_at": func.coalesce(DeadCode.dismissed_at, stmt.excluded.dismissed_at),
+                },
+            )
+            db.execute(stmt, rows)
+
+        db.execute(
+            delete(DeadCode).where(
+                DeadCode.analysis_id == analysis_id,
+                DeadCode.last_seen_at != seen_at,
             )
-            db.add(dead_code)
+        )
 
-        return len(findings)
+        return len(rows)
 
     def _persist_hot_spots(
         self,
@@ -135,6 +159,7 @@ class ArchitectureFindingsService:
         repository_id: UUID,
         analysis_id: UUID,
         findings: list[HotSpotFinding],
+        seen_at: datetime,
     ) -> int:
         """Persist hot spot findings to database.
 
@@ -143,25 +168,101 @@ class ArchitectureFindingsService:
             repository_id: UUID of the repository
             analysis_id: UUID of the analysis
             findings: List of hot spot findings
+            seen_at: Stamp of this persist
 
         Returns:
             Number of findings persisted
 
         Requirements: 7.2
         """
-        for finding in findings:
-            file_churn = FileChurn(
-                analysis_id=analysis_id,
-                file_path=finding.file_path,
-                changes_90d=finding.churn_count,
-                coverage_rate=finding.coverage_rate,
-                unique_authors=finding.unique_authors,
-                risk_factors=finding.risk_factors,
-                suggested_action=finding.suggested_action,
+        rows = self._hot_spot_rows(analysis_id, findings, seen_at)
+
+        if rows:
+            stmt = pg_insert(FileChurn)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_file_churn_analysis_file",
+                set_={
+                    column: stmt.excluded[column]
+                    for column in rows[0]
+                    if column not in ("analysis_id", "file_path")
+                },
             )
-            db.add(file_churn)
+            db.execute(stmt, rows)
 
-        return len(findings)
+        db.execute(
+            delete(FileChurn).where(
+                FileChurn.analysis_id == analysis_id,
+                FileChurn.last_seen_at != seen_at,
+            )
+        )
+
+        return len(rows)
+
+    @staticmethod
+    def _dead_code_rows(
+        repository_id: UUID,
+        analysis_id: UUID,
+        findings: list[DeadCodeFinding],
+        seen_at: datetime,
+    ) -> list[dict]:
+        """Build dead code rows, one per (file, function, start line).
+
+        A repeated finding would make the upsert touch a row twice, so the
+        last one wins.
+        """
+        rows: dict[tuple[str, str, int], dict] = {}
+        for finding in findings:
+            rows[(finding.file_path, finding.function_name, finding.line_start)] = {
+                "analysis_id": analysis_id,
+                "repository_id": repository_id,
+                "file_path": finding.file_path,
+                "function_name": finding.function_name,
+                "line_start": finding.line_start,
+                "line_end": finding.line_end,
+                "line_count": finding.line_count,
+                "confidence": finding.confidence,
+                "evidence": finding.evidence,
+                "suggested_action": finding.suggested_action,
+                "impact_score": finding.impact_score,
+                "is_dismissed": False,
+                "dismissed_at": None,
+                "last_seen_at": seen_at,
+            }
+        return list(rows.values())
+
+    @staticmethod
+    def _hot_spot_rows(
+        analysis_id: UUID, findings: list[HotSpotFinding], seen_at: datetime
+    ) -> list[dict]:
+        """Build hot spot rows, one per file (the last finding wins)."""
+        rows: dict[str, dict] = {}
+        for finding in findings:
+            rows[finding.file_path] = {
+                "analysis_id": analysis_id,
+                "file_path": finding.file_path,
+                "changes_90d": finding.churn_count,
+                "coverage_rate": finding.coverage_rate,
+                "unique_authors": finding.unique_authors,
+                "risk_factors": finding.risk_factors,
+                "suggested_action": finding.suggested_action,
+                "risk_score": finding.risk_score,
+                "last_seen_at": seen_at,
+            }
+        return list(rows.values())
+
+    @staticmethod
+    def _dismissed_dead_code(db: Session, repository_id: UUID) -> dict[tuple[str, str], datetime | None]:
+        """Dismissed dead code of a repository, by (file, function).
+
+        Line numbers are left out of the key: they shift between commits
+        while the finding stays the same.
+        """
+        result = db.execute(
+            select(DeadCode.file_path, DeadCode.function_name, func.max(DeadCode.dismissed_at))
+            .where(DeadCode.repository_id == repository_id, DeadCode.is_dismissed.is_(True))
+            .group_by(DeadCode.file_path, DeadCode.function_name)
+        )
+        return {(file_path, function_name): dismissed_at for file_path, function_name, dismissed_at in result}
 
 
 def get_architecture_findings_service() -> ArchitectureFindingsService:
@@ -5,6 +5,7 @@ Uses multiple models in parallel for consensus-based issue detection.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 from dataclasses import dataclass, field
@@ -203,6 +204,10 @@ You MUST respond with valid JSON in the following structure:
 
 Analyze the repository content provided and return your findings in the JSON format specified above."""
 
+# Bump when scan semantics change without a prompt text change (e.g. parsing
+# or model parameters), so cached scans are no longer reused.
+BROAD_SCAN_PROMPT_VERSION = "1"
+
 
 # =============================================================================
 # Model Configuration
@@ -506,6 +511,7 @@ class BroadScanAgent:
                     max_tokens=config["max_tokens"],
                     temperature=temperature,
                     fallback=False,  # Don't use fallback - we want specific model results
+                    task="broad_scan",
                     **kwargs,
                 ),
                 timeout=timeout_seconds,
@@ -640,6 +646,32 @@ class BroadScanAgent:
 # =============================================================================
 
 
+def compute_scan_fingerprint(repo_view_content: str, models: list[str]) -> str:
+    """Fingerprint the inputs that determine a broad scan result.
+
+    Two scans with the same fingerprint send byte-identical repo views to
+    the same set of models with the same prompt, so the earlier result can
+    be reused instead of re-running the scan.
+
+    Args:
+        repo_view_content: Generated repo view sent to the models
+        models: Model identifiers used for the scan (order-insensitive)
+
+    Returns:
+        Hex-encoded SHA-256 fingerprint
+    """
+    digest = hashlib.sha256()
+    for part in (
+        BROAD_SCAN_PROMPT_VERSION,
+        hashlib.sha256(BROAD_SCAN_SYSTEM_PROMPT.encode()).hexdigest(),
+        "\n".join(sorted(set(models))),
+        repo_view_content,
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
 def get_broad_scan_agent(
     llm_gateway: LLMGateway | None = None,
     models: list[str] | None = None,
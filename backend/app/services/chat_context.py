@@ -0,0 +1,318 @@
+"""Token-budgeted prompt assembly for repository chat.
+
+A chat prompt is built from four parts that compete for the model's input
+window: the system prompt (including the IDE context pack), RAG context,
+tool results and conversation history. Each part gets an explicit share
+of a per-model token budget, so long threads or large tool results cannot
+crowd out the rest.
+
+History is loaded as a SQL-side window of the latest messages (never the
+whole thread). Turns that fall out of the window are folded into a running
+summary persisted on the thread, which is sent ahead of the history.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.chat import ChatMessage, ChatThread
+from app.services.tokenizer import Tokenizer
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# Share of the prompt budget per part (the user's message comes out of history)
+SYSTEM_BUDGET_SHARE = 0.15
+RAG_BUDGET_SHARE = 0.25
+TOOLS_BUDGET_SHARE = 0.35
+HISTORY_BUDGET_SHARE = 0.25
+
+# Tokens left free in the model's window for the reply
+REPLY_RESERVE_TOKENS = 4096
+
+# Unsummarized turns required before a roll-up is worth an LLM call
+SUMMARY_MIN_MESSAGES = 4
+# Turns folded per roll-up; larger backlogs are folded over several requests
+SUMMARY_MAX_MESSAGES = 40
+# Reply cap for the summarizer; also bounds the summary's share of history
+SUMMARY_MAX_TOKENS = 800
+# Per-message cap in the summarizer transcript
+SUMMARY_MESSAGE_MAX_CHARS = 2000
+
+RAG_CHUNK_MAX_CHARS = 1500
+TRUNCATION_MARKER = "\n[... truncated to fit the prompt budget ...]"
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a conversation about a code repository.
+Merge the new turns into the existing summary. Keep file paths, symbol names,
+decisions, open questions and what the user is trying to achieve; drop
+pleasantries and code that can be re-read from the repository.
+Reply with the updated summary only, at most a few short paragraphs."""
+
+
+# =============================================================================
+# Budget
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class ChatPromptBudget:
+    """Token budget for one chat prompt, split by part."""
+
+    total: int
+    system: int
+    rag: int
+    tools: int
+    history: int
+
+    @classmethod
+    def split(cls, total: int) -> "ChatPromptBudget":
+        return cls(
+            total=total,
+            system=int(total * SYSTEM_BUDGET_SHARE),
+            rag=int(total * RAG_BUDGET_SHARE),
+            tools=int(total * TOOLS_BUDGET_SHARE),
+            history=int(total * HISTORY_BUDGET_SHARE),
+        )
+
+
+@lru_cache(maxsize=32)
+def _model_input_tokens(model: str) -> int | None:
+    try:
+        import litellm
+
+        return litellm.get_model_info(model).get("max_input_tokens")
+    except Exception:
+        return None
+
+
+def budget_for_model(model: str | None) -> ChatPromptBudget:
+    """Get the prompt budget for a model.
+
+    The configured ``chat_prompt_token_budget`` is lowered to the model's
+    input window (minus a reply reserve) when LiteLLM knows a smaller one.
+    """
+    from app.services.llm_gateway import LLMGateway
+
+    total = settings.chat_prompt_token_budget
+    window = _model_input_tokens(model or LLMGateway.DEFAULT_MODELS["chat"])
+    if window:
+        total = min(total, max(window - REPLY_RESERVE_TOKENS, window // 2))
+    return ChatPromptBudget.split(total)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, tokenizer: Tokenizer) -> str:
+    """Cut text from the end until it fits max_tokens."""
+    tokens = tokenizer.count(text)
+    if tokens <= max_tokens:
+        return text
+    marker_tokens = tokenizer.count(TRUNCATION_MARKER)
+    if max_tokens <= marker_tokens:
+        return ""
+    target = max_tokens - marker_tokens
+    while tokens > target and text:
+        # Proportional cut with a margin; converges in a couple of passes
+        text = text[: int(len(text) * target / tokens * 0.95)]
+        tokens = tokenizer.count(text)
+    return text + TRUNCATION_MARKER
+
+
+# =============================================================================
+# RAG Context
+# =============================================================================
+
+
+def format_rag_context(
+    chunks: list[dict],
+    max_tokens: int,
+    tokenizer: Tokenizer,
+    heading: str = "Relevant Code Context",
+) -> tuple[str, int]:
+    """Format retrieved chunks, best-ranked first, until the budget is used.
+
+    Returns:
+        The context section and how many chunks it includes
+    """
+    if not chunks:
+        return "", 0
+
+    header = f"\n\n## {heading}:\n"
+    section = header
+    used = tokenizer.count(header)
+    included = 0
+    for chunk in chunks:
+        entry = f"\n### {included + 1}. {chunk['file_path']}"
+        if chunk.get("name"):
+            entry += f" - {chunk['chunk_type']} `{chunk['name']}`"
+        if chunk.get("line_start"):
+            entry += f" (lines {chunk['line_start']}-{chunk['line_end']})"
+        entry += f"\n```\n{(chunk.get('content') or '')[:RAG_CHUNK_MAX_CHARS]}\n```\n"
+
+        cost = tokenizer.count(entry)
+        if used + cost > max_tokens:
+            break
+        section += entry
+        used += cost
+        included += 1
+
+    if not included:
+        return "", 0
+    return section, included
+
+
+# =============================================================================
+# History
+# =============================================================================
+
+
+@dataclass
+class PromptHistory:
+    """Conversation history fitted to the history budget."""
+
+    summary: str | None
+    # Messages sent verbatim, oldest first
+    messages: list[ChatMessage] = field(default_factory=list)
+    # Every message loaded in the window, oldest first (for ref change detection)
+    window: list[ChatMessage] = field(default_factory=list)
+    # Unsummarized messages older than this are not in the prompt and can be rolled up
+    roll_up_before: datetime | None = None
+
+    def to_messages(self) -> list[dict[str, str]]:
+        """Render as LLM messages: the summary first, then the kept turns."""
+        messages = []
+        if self.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{self.summary}",
+            })
+        messages.extend({"role": m.role, "content": m.content} for m in self.messages)
+        return messages
+
+
+async def load_history_window(
+    db: AsyncSession,
+    thread: ChatThread,
+    limit: int | None = None,
+) -> list[ChatMessage]:
+    """Load the latest messages of a thread not yet folded into its summary.
+
+    Ordering and the limit are applied in SQL (served by
+    ix_chat_messages_thread_created), so the cost does not grow with the
+    thread.
+
+    Returns:
+        Up to ``limit`` messages, oldest first
+    """
+    query = select(ChatMessage).where(ChatMessage.thread_id == thread.id)
+    if thread.summary_through is not None:
+        query = query.where(ChatMessage.created_at > thread.summary_through)
+    query = query.order_by(ChatMessage.created_at.desc()).limit(
+        limit or settings.chat_history_window_messages
+    )
+    result = await db.execute(query)
+    return list(reversed(result.scalars().all()))
+
+
+def fit_history(
+    window: list[ChatMessage],
+    summary: str | None,
+    max_tokens: int,
+    tokenizer: Tokenizer,
+) -> PromptHistory:
+    """Keep the newest turns of the window that fit the history budget.
+
+    The summary is charged to the budget first. Turns are kept newest to
+    oldest and stop at the first that does not fit, so the kept history is
+    always a contiguous tail of the conversation.
+    """
+    if summary:
+        summary = truncate_to_tokens(summary, min(SUMMARY_MAX_TOKENS, max_tokens // 2), tokenizer)
+    remaining = max_tokens - (tokenizer.count(summary) if summary else 0)
+
+    kept: list[ChatMessage] = []
+    for message in reversed(window):
+        cost = tokenizer.count(message.content or "")
+        if cost > remaining:
+            break
+        kept.append(message)
+        remaining -= cost
+    kept.reverse()
+
+    if kept:
+        roll_up_before = kept[0].created_at
+    elif window:
+        # Nothing fits: every loaded message may be rolled up
+        roll_up_before = window[-1].created_at + timedelta(microseconds=1)
+    else:
+        roll_up_before = None
+    return PromptHistory(summary=summary, messages=kept, window=window, roll_up_before=roll_up_before)
+
+
+async def roll_up_history(
+    db: AsyncSession,
+    thread: ChatThread,
+    history: PromptHistory,
+    llm,
+) -> bool:
+    """Fold turns that fell out of the prompt into the thread's running summary.
+
+    Best-effort: runs only once enough turns are pending, and a failed
+    summarization leaves the thread unchanged (the turns are retried on a
+    later message).
+
+    Returns:
+        True if the summary was updated
+    """
+    if history.roll_up_before is None:
+        return False
+
+    query = select(ChatMessage).where(
+        ChatMessage.thread_id == thread.id,
+        ChatMessage.created_at < history.roll_up_before,
+    )
+    if thread.summary_through is not None:
+        query = query.where(ChatMessage.created_at > thread.summary_through)
+    query = query.order_by(ChatMessage.created_at).limit(SUMMARY_MAX_MESSAGES)
+    pending = list((await db.execute(query)).scalars().all())
+    if len(pending) < SUMMARY_MIN_MESSAGES:
+        return False
+
+    transcript = "\n\n".join(
+        f"{m.role}: {(m.content or '')[:SUMMARY_MESSAGE_MAX_CHARS]}" for m in pending
+    )
+    prompt = (
+        f"Existing summary:\n{thread.summary or '(none)'}\n\n"
+        f"New turns:\n{transcript}"
+    )
+    try:
+        response = await llm.chat(
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            model=llm.DEFAULT_MODELS["fast"],
+            temperature=0.2,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            task="fast",
+        )
+    except Exception as e:
+        logger.warning(f"Chat history roll-up failed for thread {thread.id}: {e}")
+        return False
+
+    summary = (response.get("content") or "").strip()
+    if not summary:
+        return False
+
+    thread.summary = summary
+    thread.summary_through = pending[-1].created_at
+    await db.commit()
+    logger.info(f"Rolled {len(pending)} messages into the summary of thread {thread.id}")
+    return True
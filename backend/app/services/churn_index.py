@@ -0,0 +1,155 @@
+"""Persistence of per-repository churn indexes.
+
+GitAnalyzer mines git history into an in-memory ChurnIndex; this module
+loads it from and saves it to PostgreSQL (RepoChurnIndex and
+RepoChurnIndexFile), so each analysis only mines commits pushed since the
+last one. Only files changed since loading are written.
+
+Saves are compare-and-set on the index head: if another analysis moved the
+head in the meantime, the save is dropped rather than mixing two histories.
+"""
+
+import logging
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.repo_churn_index import RepoChurnIndex, RepoChurnIndexFile
+from app.services.git_analyzer import ChurnIndex, DayChurn, FileHistory
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT ... ON CONFLICT statement
+FILE_BATCH_SIZE = 500
+
+
+def _dump_days(history: FileHistory) -> dict:
+    return {
+        day: {
+            "commits": bucket.commits,
+            "added": bucket.lines_added,
+            "removed": bucket.lines_removed,
+            "authors": sorted(bucket.authors),
+        }
+        for day, bucket in history.days.items()
+    }
+
+
+def _load_days(days: dict) -> dict[str, DayChurn]:
+    return {
+        day: DayChurn(
+            commits=bucket.get("commits", 0),
+            lines_added=bucket.get("added", 0),
+            lines_removed=bucket.get("removed", 0),
+            authors=set(bucket.get("authors", [])),
+        )
+        for day, bucket in days.items()
+    }
+
+
+def load_churn_index(db: Session, repository_id: str | UUID) -> ChurnIndex | None:
+    """Load a repository's churn index.
+
+    Returns:
+        The index, or None if the repository has none yet
+    """
+    record = db.execute(
+        select(RepoChurnIndex).where(RepoChurnIndex.repository_id == repository_id)
+    ).scalar_one_or_none()
+    if record is None:
+        return None
+
+    rows = db.execute(
+        select(
+            RepoChurnIndexFile.file_path,
+            RepoChurnIndexFile.days,
+            RepoChurnIndexFile.last_modified,
+        ).where(RepoChurnIndexFile.index_id == record.id)
+    ).all()
+
+    return ChurnIndex(
+        head_sha=record.head_sha,
+        base_sha=record.head_sha,
+        files={
+            file_path: FileHistory(days=_load_days(days or {}), last_modified=last_modified)
+            for file_path, days, last_modified in rows
+        },
+    )
+
+
+def save_churn_index(db: Session, repository_id: str | UUID, index: ChurnIndex) -> bool:
+    """Save the files changed since the index was loaded, and its new head.
+
+    The caller commits.
+
+    Returns:
+        False if the index is empty or another analysis moved the head
+        since it was loaded (nothing is written)
+    """
+    if index.head_sha is None:
+        return False
+
+    if index.base_sha is None:
+        stmt = (
+            pg_insert(RepoChurnIndex)
+            .values(repository_id=repository_id, head_sha=index.head_sha)
+            .on_conflict_do_nothing(constraint="uq_repo_churn_indexes_repository_id")
+            .returning(RepoChurnIndex.id)
+        )
+    else:
+        stmt = (
+            update(RepoChurnIndex)
+            .where(
+                RepoChurnIndex.repository_id == repository_id,
+                RepoChurnIndex.head_sha == index.base_sha,
+            )
+            .values(head_sha=index.head_sha, updated_at=func.now())
+            .returning(RepoChurnIndex.id)
+        )
+    index_id = db.execute(stmt).scalar_one_or_none()
+    if index_id is None:
+        logger.info(f"Churn index of repository {repository_id} was updated concurrently, not saving")
+        return False
+
+    if index.rebuilt:
+        db.execute(delete(RepoChurnIndexFile).where(RepoChurnIndexFile.index_id == index_id))
+        changed = set(index.files)
+    else:
+        changed = index.touched
+        removed = [path for path in changed if path not in index.files]
+        if removed:
+            db.execute(
+                delete(RepoChurnIndexFile).where(
+                    RepoChurnIndexFile.index_id == index_id,
+                    RepoChurnIndexFile.file_path.in_(removed),
+                )
+            )
+
+    rows = [
+        {
+            "index_id": index_id,
+            "file_path": path,
+            "days": _dump_days(index.files[path]),
+            "last_modified": index.files[path].last_modified,
+        }
+        for path in sorted(changed)
+        if path in index.files
+    ]
+    for start in range(0, len(rows), FILE_BATCH_SIZE):
+        stmt = pg_insert(RepoChurnIndexFile).values(rows[start:start + FILE_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_repo_churn_index_files_index_path",
+            set_={"days": stmt.excluded.days, "last_modified": stmt.excluded.last_modified},
+        )
+        db.execute(stmt)
+
+    logger.info(
+        f"Saved churn index of repository {repository_id} at {index.head_sha[:7]} "
+        f"({len(rows)} files written)"
+    )
+    index.base_sha = index.head_sha
+    index.touched = set()
+    index.rebuilt = False
+    return True
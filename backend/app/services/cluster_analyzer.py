@@ -28,7 +28,7 @@ from app.schemas.architecture_llm import (
 )
 from app.services.call_graph_analyzer import get_call_graph_analyzer
 from app.services.coverage_analyzer import CoverageAnalyzer
-from app.services.git_analyzer import GitAnalyzer
+from app.services.git_analyzer import ChurnIndex, FileChurn, GitAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -1592,8 +1592,8 @@ class ClusterAnalyzer:
         dead_code = call_graph_analyzer.to_dead_code_findings(call_graph)
         logger.info(f"Found {len(dead_code)} dead code findings")
 
-        # Analyze git churn
-        churn_data = git_analyzer.analyze(repo_path)
+        # Analyze git churn (resumes the repository's persisted churn index)
+        churn_data = self._analyze_churn(git_analyzer, repo_id, repo_path)
         logger.info(f"Analyzed churn for {len(churn_data)} files")
 
         # Parse coverage if available
@@ -1628,6 +1628,40 @@ class ClusterAnalyzer:
             issues=[],  # Future: coupling, complexity issues
         )
 
+    def _analyze_churn(
+        self,
+        git_analyzer: GitAnalyzer,
+        repo_id: str,
+        repo_path: Path,
+    ) -> dict[str, FileChurn]:
+        """Compute churn from the repository's churn index.
+
+        The persisted index is loaded, only commits since its head are
+        mined, and the changed files are saved back. Index load/save
+        failures fall back to mining the full window for this analysis.
+        """
+        from app.core.database import get_sync_session
+        from app.services.churn_index import load_churn_index, save_churn_index
+
+        index = None
+        try:
+            with get_sync_session() as db:
+                index = load_churn_index(db, repo_id)
+        except Exception as e:
+            logger.warning(f"Could not load churn index for repo {repo_id}: {e}")
+
+        index = index or ChurnIndex()
+        churn_data = git_analyzer.analyze(repo_path, index=index)
+
+        if index.head_sha and (index.touched or index.head_sha != index.base_sha):
+            try:
+                with get_sync_session() as db:
+                    save_churn_index(db, repo_id, index)
+            except Exception as e:
+                logger.warning(f"Could not save churn index for repo {repo_id}: {e}")
+
+        return churn_data
+
     def _generate_architecture_summary(
         self,
         dead_code: list[DeadCodeFinding],
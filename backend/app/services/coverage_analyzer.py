@@ -1,29 +1,142 @@
 """Coverage Analyzer for Test Coverage Integration.
 
-Parses Cobertura XML coverage reports (pytest-cov format) to extract
-per-file coverage rates for integration with risk factor calculations.
+Parses coverage reports to extract per-file coverage rates for integration
+with risk factor calculations. Supported formats:
+
+- Cobertura XML (pytest-cov, istanbul's cobertura reporter)
+- lcov tracefiles (istanbul/nyc, c8, genhtml toolchains)
+- coverage.py JSON (``coverage json``)
+
+Reports are read incrementally, so memory stays flat regardless of report
+size: XML via iterparse with each element dropped once read, lcov line by
+line, and JSON one file entry at a time.
 
 Requirements: 3.1, 3.2, 3.3
 """
 
+import io
+import json
 import logging
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import IO, Any
 
 logger = logging.getLogger(__name__)
 
+COBERTURA = "cobertura"
+LCOV = "lcov"
+COVERAGE_JSON = "coverage_json"
+
+# Bytes read per step by the streaming readers
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _clamp_rate(rate: float) -> float:
+    return max(0.0, min(1.0, rate))
+
+
+def _line_rate(hit: int, found: int) -> float:
+    # Files without executable lines count as fully covered (as in Cobertura)
+    return _clamp_rate(hit / found) if found > 0 else 1.0
+
+
+class _JsonStream:
+    """Minimal incremental JSON reader over a text stream.
+
+    Decodes one value at a time with json.JSONDecoder.raw_decode, keeping
+    only the unconsumed tail of the input in memory.
+    """
+
+    _WHITESPACE = " \t\n\r"
+
+    def __init__(self, stream: IO[str], chunk_size: int = READ_CHUNK_SIZE) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self._WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise
+            # A number cut at the buffer end may continue in the next chunk
+            if end == len(self._buffer) and not isinstance(value, (dict, list, str)) and self._read_more():
+                continue
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Iterate the keys of the object at the cursor; the caller consumes each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
 
 class CoverageAnalyzer:
-    """Analyzes test coverage from Cobertura XML reports.
+    """Analyzes test coverage from Cobertura XML, lcov and coverage.py JSON reports.
 
-    Parses coverage.xml files generated by pytest-cov to extract
-    per-file line coverage rates.
+    Produces a per-file line coverage map (path -> rate in 0.0-1.0).
 
     Requirements: 3.1, 3.3
     """
 
-    # Standard coverage file names to look for
-    COVERAGE_FILES = ["coverage.xml", "cov.xml", ".coverage.xml"]
+    # Coverage report locations to look for, in order of preference
+    COVERAGE_FILES = {
+        "coverage.xml": COBERTURA,
+        "cov.xml": COBERTURA,
+        ".coverage.xml": COBERTURA,
+        "coverage/cobertura-coverage.xml": COBERTURA,
+        "coverage.json": COVERAGE_JSON,
+        "lcov.info": LCOV,
+        "coverage/lcov.info": LCOV,
+        "coverage.lcov": LCOV,
+    }
 
     def __init__(self) -> None:
         pass
@@ -31,7 +144,7 @@ class CoverageAnalyzer:
     def parse_if_exists(self, repo_path: Path) -> dict[str, float] | None:
         """Parse coverage report if it exists.
 
-        Searches for coverage.xml in the repository root and parses it
+        Searches the repository for a known coverage report and parses it
         if found. Returns None if no coverage file exists.
 
         Args:
@@ -43,41 +156,55 @@ class CoverageAnalyzer:
 
         Requirements: 3.1, 3.3
         """
-        coverage_file = self._find_coverage_file(repo_path)
+        found = self._find_coverage_file(repo_path)
 
-        if coverage_file is None:
+        if found is None:
             logger.info(f"No coverage file found in {repo_path}")
             return None
 
+        coverage_file, report_format = found
         try:
-            return self.parse_cobertura_xml(coverage_file)
+            return self.parse_file(coverage_file, report_format)
         except Exception as e:
             logger.warning(f"Failed to parse coverage file {coverage_file}: {e}")
             return None
 
-    def _find_coverage_file(self, repo_path: Path) -> Path | None:
+    def _find_coverage_file(self, repo_path: Path) -> tuple[Path, str] | None:
         """Find a coverage file in the repository.
 
         Args:
             repo_path: Path to the repository root
 
         Returns:
-            Path to coverage file if found, None otherwise
+            (path, report format) if found, None otherwise
         """
-        for filename in self.COVERAGE_FILES:
+        for filename, report_format in self.COVERAGE_FILES.items():
             coverage_path = repo_path / filename
-            if coverage_path.exists():
-                logger.info(f"Found coverage file: {coverage_path}")
-                return coverage_path
+            if coverage_path.is_file():
+                logger.info(f"Found {report_format} coverage file: {coverage_path}")
+                return coverage_path, report_format
 
         return None
 
+    def parse_file(self, coverage_file: Path, report_format: str) -> dict[str, float]:
+        """Parse a coverage report of the given format ("cobertura", "lcov" or "coverage_json")."""
+        if report_format == COBERTURA:
+            return self.parse_cobertura_xml(coverage_file)
+        if report_format == LCOV:
+            return self.parse_lcov(coverage_file)
+        if report_format == COVERAGE_JSON:
+            return self.parse_coverage_json(coverage_file)
+        raise ValueError(f"Unknown coverage report format: {report_format}")
+
+    # =========================================================================
+    # Cobertura XML
+    # =========================================================================
+
     def parse_cobertura_xml(self, coverage_file: Path) -> dict[str, float]:
         """Parse a Cobertura XML coverage report.
 
-        Extracts per-file line coverage rates from the XML structure.
-        The Cobertura format stores coverage as line-rate attributes
-        on class elements.
+        Extracts per-file line coverage rates from the line-rate attributes
+        on class elements, streaming the document.
 
         Args:
             coverage_file: Path to the coverage.xml file
@@ -87,43 +214,9 @@ class CoverageAnalyzer:
 
         Requirements: 3.1
         """
-        coverage_data: dict[str, float] = {}
-
         try:
-            tree = ET.parse(coverage_file)
-            root = tree.getroot()
-
-            # Cobertura XML structure:
-            # <coverage>
-            #   <packages>
-            #     <package>
-            #       <classes>
-            #         <class filename="path/to/file.py" line-rate="0.85">
-            #           ...
-            #         </class>
-            #       </classes>
-            #     </package>
-            #   </packages>
-            # </coverage>
-
-            # Find all class elements with filename and line-rate
-            for class_elem in root.iter("class"):
-                filename = class_elem.get("filename")
-                line_rate_str = class_elem.get("line-rate")
-
-                if filename and line_rate_str:
-                    try:
-                        line_rate = float(line_rate_str)
-                        # Clamp to valid range [0.0, 1.0]
-                        line_rate = max(0.0, min(1.0, line_rate))
-                        coverage_data[filename] = line_rate
-                    except ValueError:
-                        logger.warning(
-                            f"Invalid line-rate '{line_rate_str}' for {filename}"
-                        )
-
-            logger.info(f"Parsed coverage for {len(coverage_data)} files")
-
+            with open(coverage_file, "rb") as f:
+                coverage_data = self._parse_cobertura(f)
         except ET.ParseError as e:
             logger.error(f"XML parse error in {coverage_file}: {e}")
             raise
@@ -131,6 +224,7 @@ class CoverageAnalyzer:
             logger.error(f"Error parsing coverage file {coverage_file}: {e}")
             raise
 
+        logger.info(f"Parsed coverage for {len(coverage_data)} files")
         return coverage_data
 
     def parse_cobertura_xml_string(self, xml_content: str) -> dict[str, float]:
@@ -146,28 +240,161 @@ class CoverageAnalyzer:
 
         Requirements: 3.1
         """
-        coverage_data: dict[str, float] = {}
-
         try:
-            root = ET.fromstring(xml_content)
-
-            for class_elem in root.iter("class"):
-                filename = class_elem.get("filename")
-                line_rate_str = class_elem.get("line-rate")
-
-                if filename and line_rate_str:
-                    try:
-                        line_rate = float(line_rate_str)
-                        # Clamp to valid range [0.0, 1.0]
-                        line_rate = max(0.0, min(1.0, line_rate))
-                        coverage_data[filename] = line_rate
-                    except ValueError:
-                        logger.warning(
-                            f"Invalid line-rate '{line_rate_str}' for {filename}"
-                        )
-
+            return self._parse_cobertura(io.BytesIO(xml_content.encode("utf-8")))
         except ET.ParseError as e:
             logger.error(f"XML parse error: {e}")
             raise
 
+    def _parse_cobertura(self, source: IO[bytes]) -> dict[str, float]:
+        # Cobertura XML structure:
+        # <coverage>
+        #   <packages>
+        #     <package>
+        #       <classes>
+        #         <class filename="path/to/file.py" line-rate="0.85">
+        #           <lines><line number="1" hits="1"/>...</lines>
+        #         </class>
+        #       </classes>
+        #     </package>
+        #   </packages>
+        # </coverage>
+        #
+        # Attributes are read on "start"; every element is detached from its
+        # parent on "end", so only the open path stays in memory.
+        coverage_data: dict[str, float] = {}
+        open_elements: list[ET.Element] = []
+
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                open_elements.append(elem)
+                if elem.tag == "class":
+                    self._read_cobertura_class(elem, coverage_data)
+                continue
+
+            open_elements.pop()
+            if open_elements:
+                open_elements[-1].remove(elem)
+
+        return coverage_data
+
+    @staticmethod
+    def _read_cobertura_class(elem: ET.Element, coverage_data: dict[str, float]) -> None:
+        filename = elem.get("filename")
+        line_rate_str = elem.get("line-rate")
+        if not filename or not line_rate_str:
+            return
+        try:
+            coverage_data[filename] = _clamp_rate(float(line_rate_str))
+        except ValueError:
+            logger.warning(f"Invalid line-rate '{line_rate_str}' for {filename}")
+
+    # =========================================================================
+    # lcov
+    # =========================================================================
+
+    def parse_lcov(self, coverage_file: Path) -> dict[str, float]:
+        """Parse an lcov tracefile (lcov.info).
+
+        Args:
+            coverage_file: Path to the tracefile
+
+        Returns:
+            Dictionary mapping file paths to line coverage rates (0.0-1.0)
+        """
+        with open(coverage_file, encoding="utf-8", errors="replace") as f:
+            coverage_data = self.parse_lcov_lines(f)
+        logger.info(f"Parsed lcov coverage for {len(coverage_data)} files")
+        return coverage_data
+
+    def parse_lcov_lines(self, lines: Iterable[str]) -> dict[str, float]:
+        """Parse lcov records from an iterable of lines.
+
+        Each record runs from ``SF:<path>`` to ``end_of_record``. The LF/LH
+        summary is used when present, otherwise DA lines are counted.
+        Records of the same file (one per test) are merged.
+        """
+        found: dict[str, int] = {}
+        hit: dict[str, int] = {}
+
+        path: str | None = None
+        lf = lh = None
+        da_found = da_hit = 0
+        for raw in lines:
+            line = raw.strip()
+            if line.startswith("SF:"):
+                path = line[3:].removeprefix("./")
+                lf = lh = None
+                da_found = da_hit = 0
+            elif path is None:
+                continue
+            elif line.startswith("DA:"):
+                fields = line[3:].split(",")
+                da_found += 1
+                if len(fields) >= 2 and fields[1].strip() not in ("0", "-"):
+                    da_hit += 1
+            elif line.startswith("LF:"):
+                lf = self._lcov_int(line[3:])
+            elif line.startswith("LH:"):
+                lh = self._lcov_int(line[3:])
+            elif line == "end_of_record":
+                record_found = lf if lf is not None else da_found
+                record_hit = lh if lh is not None else da_hit
+                found[path] = found.get(path, 0) + record_found
+                hit[path] = hit.get(path, 0) + record_hit
+                path = None
+
+        return {path: _line_rate(hit[path], found[path]) for path in found}
+
+    @staticmethod
+    def _lcov_int(value: str) -> int | None:
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    # =========================================================================
+    # coverage.py JSON
+    # =========================================================================
+
+    def parse_coverage_json(self, coverage_file: Path) -> dict[str, float]:
+        """Parse a coverage.py JSON report (``coverage json``).
+
+        Args:
+            coverage_file: Path to coverage.json
+
+        Returns:
+            Dictionary mapping file paths to line coverage rates (0.0-1.0)
+        """
+        with open(coverage_file, encoding="utf-8") as f:
+            coverage_data = self.parse_coverage_json_stream(f)
+        logger.info(f"Parsed coverage.py JSON for {len(coverage_data)} files")
+        return coverage_data
+
+    def parse_coverage_json_stream(self, stream: IO[str]) -> dict[str, float]:
+        """Parse a coverage.py JSON report one file entry at a time.
+
+        Only the top-level "files" object is read entry by entry; "meta"
+        and "totals" are small and skipped.
+        """
+        coverage_data: dict[str, float] = {}
+        reader = _JsonStream(stream)
+
+        for key in reader.members():
+            if key != "files":
+                reader.value()
+                continue
+            for filename in reader.members():
+                entry = reader.value()
+                summary = entry.get("summary") if isinstance(entry, dict) else None
+                if not isinstance(summary, dict):
+                    continue
+                try:
+                    coverage_data[filename] = _line_rate(
+                        int(summary.get("covered_lines", 0)),
+                        int(summary.get("num_statements", 0)),
+                    )
+                except (TypeError, ValueError):
+                    logger.warning(f"Invalid coverage summary for {filename}")
+
         return coverage_data
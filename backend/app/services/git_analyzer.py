@@ -3,12 +3,18 @@
 Analyzes git history to identify high-risk files based on code churn metrics.
 Produces HotSpotFinding objects with natural language risk factors.
 
+History is mined in a single ``git log`` pass into a ChurnIndex: per file,
+commits, lines changed and authors per day. All churn windows (30/90 days)
+are computed from the index. The index can be persisted per repository
+(see app.services.churn_index) and resumed from its head commit, so later
+analyses only mine commits pushed since.
+
 Requirements: 2.1, 2.2, 2.3, 2.4
 """
 
 import logging
 import subprocess
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
@@ -16,6 +22,14 @@ from app.schemas.architecture_llm import HotSpotFinding
 
 logger = logging.getLogger(__name__)
 
+# Longest churn window; day buckets older than this are dropped
+CHURN_WINDOW_DAYS = 90
+RECENT_CHURN_WINDOW_DAYS = 30
+
+# Separates commit header fields in the mined log ("%x00" in the format);
+# NUL cannot appear in paths or author names
+_COMMIT_MARKER = "\x00"
+
 
 @dataclass
 class FileChurn:
@@ -40,11 +54,125 @@ class FileChurn:
     last_modified: datetime | None = None
 
 
+@dataclass
+class DayChurn:
+    """Changes to one file on one day (UTC, by author date)."""
+
+    commits: int = 0
+    lines_added: int = 0
+    lines_removed: int = 0
+    authors: set[str] = field(default_factory=set)
+
+
+@dataclass
+class FileHistory:
+    """Day-bucketed change history of one file."""
+
+    days: dict[str, DayChurn] = field(default_factory=dict)
+    last_modified: datetime | None = None
+
+
+@dataclass
+class ChurnIndex:
+    """Per-file churn history of a repository up to ``head_sha``.
+
+    Attributes:
+        head_sha: Last commit mined into the index (None if empty)
+        files: File path -> day-bucketed history
+        base_sha: head_sha when the index was loaded (for safe persistence)
+        touched: Files changed since the index was loaded
+        rebuilt: True if the index was rebuilt from scratch since loading
+    """
+
+    head_sha: str | None = None
+    files: dict[str, FileHistory] = field(default_factory=dict)
+    base_sha: str | None = None
+    touched: set[str] = field(default_factory=set)
+    rebuilt: bool = False
+
+    def reset(self) -> None:
+        """Drop all history (the next update mines from scratch)."""
+        self.head_sha = None
+        self.files = {}
+        self.touched = set()
+        self.rebuilt = True
+
+    def add(
+        self,
+        file_path: str,
+        committed_at: datetime,
+        author: str | None,
+        lines_added: int,
+        lines_removed: int,
+    ) -> None:
+        """Record one commit's change to a file."""
+        history = self.files.setdefault(file_path, FileHistory())
+        bucket = history.days.setdefault(committed_at.astimezone(UTC).date().isoformat(), DayChurn())
+        bucket.commits += 1
+        bucket.lines_added += lines_added
+        bucket.lines_removed += lines_removed
+        if author:
+            bucket.authors.add(author)
+        if history.last_modified is None or committed_at > history.last_modified:
+            history.last_modified = committed_at
+        self.touched.add(file_path)
+
+    def prune(self, now: datetime, days: int = CHURN_WINDOW_DAYS) -> None:
+        """Drop day buckets that fell out of the longest window."""
+        cutoff = (now - timedelta(days=days)).date().isoformat()
+        for file_path in list(self.files):
+            history = self.files[file_path]
+            stale = [day for day in history.days if day < cutoff]
+            if not stale:
+                continue
+            for day in stale:
+                del history.days[day]
+            if not history.days:
+                del self.files[file_path]
+            self.touched.add(file_path)
+
+    def file_churn(self, now: datetime | None = None, days: int = CHURN_WINDOW_DAYS) -> dict[str, FileChurn]:
+        """Compute churn metrics for every file changed within ``days``."""
+        now = now or datetime.now(UTC)
+        window_start = (now - timedelta(days=days)).date().isoformat()
+        recent_start = (now - timedelta(days=RECENT_CHURN_WINDOW_DAYS)).date().isoformat()
+
+        churn_data: dict[str, FileChurn] = {}
+        for file_path, history in self.files.items():
+            churn = FileChurn(file_path=file_path, last_modified=history.last_modified)
+            authors: set[str] = set()
+            for day, bucket in history.days.items():
+                if day < window_start:
+                    continue
+                churn.changes_90d += bucket.commits
+                churn.lines_added_90d += bucket.lines_added
+                churn.lines_removed_90d += bucket.lines_removed
+                authors |= bucket.authors
+                if day >= recent_start:
+                    churn.changes_30d += bucket.commits
+            if churn.changes_90d:
+                churn.unique_authors = len(authors)
+                churn_data[file_path] = churn
+        return churn_data
+
+
+def _numstat_path(path: str) -> str:
+    """Resolve a numstat rename ("a => b" or "src/{a => b}/x.py") to the new path."""
+    if " => " not in path:
+        return path
+    if "{" in path and "}" in path:
+        prefix, rest = path.split("{", 1)
+        renamed, suffix = rest.split("}", 1)
+        new = renamed.split(" => ", 1)[1]
+        return (prefix + new + suffix).replace("//", "/")
+    return path.split(" => ", 1)[1]
+
+
 class GitAnalyzer:
     """Analyzes git history for code churn metrics.
 
-    Parses git log output to calculate per-file churn metrics including
-    commit counts, line changes, and unique authors.
+    Mines git log into a ChurnIndex and calculates per-file churn metrics
+    including commit counts, line changes, and unique authors.
 
     Requirements: 2.1, 2.2
     """
@@ -52,162 +180,206 @@ class GitAnalyzer:
     def __init__(self) -> None:
         pass
 
-    def analyze(self, repo_path: Path, days: int = 90) -> dict[str, FileChurn]:
+    def analyze(
+        self,
+        repo_path: Path,
+        days: int = CHURN_WINDOW_DAYS,
+        index: ChurnIndex | None = None,
+    ) -> dict[str, FileChurn]:
         """Analyze git history for code churn.
 
-        Parses git log for the specified number of days and calculates
-        per-file churn metrics.
-
         Args:
             repo_path: Path to the repository root
             days: Number of days to analyze (default 90)
+            index: Previously persisted index to resume from; updated in place
 
         Returns:
             Dictionary mapping file paths to FileChurn objects
         """
-        churn_data: dict[str, FileChurn] = {}
-
         # Check if repo_path is a git repository
         if not (repo_path / ".git").exists():
             logger.warning(f"Not a git repository: {repo_path}")
-            return churn_data
+            return {}
 
+        index = index if index is not None else ChurnIndex()
         try:
-            # Get git log with numstat format for the last N days
-            since_date = datetime.now(UTC) - timedelta(days=days)
-            since_str = since_date.strftime("%Y-%m-%d")
-
-            # Parse 90-day data
-            churn_data = self._parse_git_log(repo_path, since_str, days)
-
-            # Also calculate 30-day metrics
-            since_30d = datetime.now(UTC) - timedelta(days=30)
-            since_30d_str = since_30d.strftime("%Y-%m-%d")
-            churn_30d = self._parse_git_log(repo_path, since_30d_str, 30)
-
-            # Merge 30-day counts into main data
-            for file_path, churn in churn_30d.items():
-                if file_path in churn_data:
-                    churn_data[file_path].changes_30d = churn.changes_90d
-
+            self.update_index(repo_path, index, days=days)
+            churn_data = index.file_churn(days=days)
             logger.info(f"Analyzed git history: {len(churn_data)} files with changes")
-
+            return churn_data
         except subprocess.CalledProcessError as e:
             logger.error(f"Git command failed: {e}")
         except Exception as e:
             logger.error(f"Failed to analyze git history: {e}")
+        return {}
 
-        return churn_data
-
-    def _parse_git_log(
-        self, repo_path: Path, since_date: str, days: int
-    ) -> dict[str, FileChurn]:
-        """Parse git log output with numstat format.
+    def update_index(
+        self,
+        repo_path: Path,
+        index: ChurnIndex,
+        days: int = CHURN_WINDOW_DAYS,
+    ) -> ChurnIndex:
+        """Mine commits since the index head up to HEAD, in one git log pass.
+
+        Shallow clones are deepened by date until the window (or the index
+        head) is reachable. If the index head is not an ancestor of HEAD
+        (force push, or an older commit being analyzed), the index is
+        rebuilt from scratch.
+
+        Raises:
+            subprocess.CalledProcessError: If git fails
+        """
+        now = datetime.now(UTC)
+        since = now - timedelta(days=days)
+        head = self._git(repo_path, "rev-parse", "HEAD").strip()
+
+        if index.head_sha == head:
+            index.prune(now, days)
+            return index
+
+        base = index.head_sha
+        self._ensure_history(repo_path, since, base)
+        if base and not self._is_ancestor(repo_path, base, head):
+            logger.info(f"Churn index head {base[:7]} is not an ancestor of {head[:7]}, rebuilding")
+            index.reset()
+            base = None
+
+        commits = self._mine(repo_path, index, since, base)
+        index.head_sha = head
+        index.prune(now, days)
+        logger.info(
+            f"Mined {commits} commits into churn index "
+            f"({'since ' + base[:7] if base else 'full window'}), {len(index.files)} files"
+        )
+        return index
 
-        Args:
-            repo_path: Path to the repository root
-            since_date: Date string in YYYY-MM-DD format
-            days: Number of days being analyzed (for field naming)
+    def _mine(self, repo_path: Path, index: ChurnIndex, since: datetime, base: str | None) -> int:
+        """Stream ``git log --numstat`` into the index.
 
         Returns:
-            Dictionary mapping file paths to FileChurn objects
+            Number of commits mined
         """
-        churn_data: dict[str, FileChurn] = {}
-
-        # Run git log with numstat format
-        # Format: commit_hash\nauthor\ndate\n\nlines_added\tlines_removed\tfile_path\n...
+        # Shallow boundary commits diff against an empty tree; their numstat
+        # would count every file as added
+        boundary = self._shallow_commits(repo_path)
         cmd = [
             "git",
             "log",
-            f"--since={since_date}",
+            f"--since={since.strftime('%Y-%m-%d')}",
             "--numstat",
-            "--format=%H%n%an%n%aI",
             "--no-merges",
+            "--format=%x00%H%x00%an%x00%aI",
+            f"{base}..HEAD" if base else "HEAD",
         ]
 
-        result = subprocess.run(
+        commits = 0
+        skip = False
+        author: str | None = None
+        committed_at: datetime | None = None
+
+        process = subprocess.Popen(
             cmd,
             cwd=repo_path,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            check=True,
+            errors="replace",
         )
-
-        # Parse the output
-        lines = result.stdout.strip().split("\n")
-        current_author: str | None = None
-        current_date: datetime | None = None
-        file_authors: dict[str, set[str]] = {}
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Skip empty lines
-            if not line:
-                i += 1
-                continue
-
-            # Check if this is a commit hash (40 hex chars)
-            if len(line) == 40 and all(c in "0123456789abcdef" for c in line):
-                # Next line is author, then date
-                if i + 2 < len(lines):
-                    current_author = lines[i + 1].strip()
-                    try:
-                        date_str = lines[i + 2].strip()
-                        current_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                    except ValueError:
-                        current_date = None
-                    i += 3
-                    continue
-                else:
-                    i += 1
-                    continue
-
-            # Check if this is a numstat line (lines_added\tlines_removed\tfile_path)
-            parts = line.split("\t")
-            if len(parts) == 3:
-                added_str, removed_str, file_path = parts
-
-                # Skip binary files (shown as - - filename)
-                if added_str == "-" or removed_str == "-":
-                    i += 1
-                    continue
-
+        assert process.stdout is not None
+        for raw in process.stdout:
+            line = raw.rstrip("\n")
+            if line.startswith(_COMMIT_MARKER):
+                _, sha, author, date_str = line.split(_COMMIT_MARKER, 3)
+                skip = sha in boundary
                 try:
-                    lines_added = int(added_str)
-                    lines_removed = int(removed_str)
+                    committed_at = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
                 except ValueError:
-                    i += 1
-                    continue
-
-                # Initialize or update file churn
-                if file_path not in churn_data:
-                    churn_data[file_path] = FileChurn(file_path=file_path)
-                    file_authors[file_path] = set()
-
-                churn = churn_data[file_path]
-                churn.changes_90d += 1
-                churn.lines_added_90d += lines_added
-                churn.lines_removed_90d += lines_removed
-
-                # Track authors
-                if current_author:
-                    file_authors[file_path].add(current_author)
-
-                # Update last modified
-                if current_date:
-                    if churn.last_modified is None or current_date > churn.last_modified:
-                        churn.last_modified = current_date
-
-            i += 1
+                    committed_at = None
+                if not skip:
+                    commits += 1
+                continue
 
-        # Set unique author counts
-        for file_path, authors in file_authors.items():
-            if file_path in churn_data:
-                churn_data[file_path].unique_authors = len(authors)
+            if skip or committed_at is None:
+                continue
+            parts = line.split("\t")
+            # Binary files show as "-\t-\tpath"
+            if len(parts) != 3 or parts[0] == "-" or parts[1] == "-":
+                continue
+            try:
+                lines_added = int(parts[0])
+                lines_removed = int(parts[1])
+            except ValueError:
+                continue
+            index.add(_numstat_path(parts[2]), committed_at, author, lines_added, lines_removed)
+
+        stderr = process.stderr.read() if process.stderr else ""
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+        return commits
+
+    def _ensure_history(self, repo_path: Path, since: datetime, base: str | None) -> None:
+        """Deepen a shallow clone so history since ``since`` (or ``base``) is present."""
+        boundary = self._shallow_commits(repo_path)
+        if not boundary:
+            return
+        if base and self._has_commit(repo_path, base):
+            return
+
+        boundary_dates = self._git(
+            repo_path, "show", "-s", "--format=%cI", *sorted(boundary)
+        ).split()
+        if boundary_dates and all(
+            datetime.fromisoformat(d.replace("Z", "+00:00")) < since for d in boundary_dates
+        ):
+            return
+
+        # The oldest commit after --shallow-since becomes a boundary (and is
+        # skipped), so deepen one more commit past the window
+        shallow_since = since.strftime("%Y-%m-%d")
+        for deepen in (f"--shallow-since={shallow_since}", "--deepen=1"):
+            result = subprocess.run(
+                ["git", "fetch", "--quiet", deepen, "origin"],
+                cwd=repo_path,
+                capture_output=True,
+                text=True,
+                timeout=600,
+            )
+            if result.returncode != 0:
+                logger.warning(f"Could not deepen clone to {shallow_since}, churn may be truncated: {result.stderr}")
+                return
+
+    @staticmethod
+    def _git(repo_path: Path, *args: str) -> str:
+        return subprocess.run(
+            ["git", *args],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    @staticmethod
+    def _shallow_commits(repo_path: Path) -> set[str]:
+        shallow_file = repo_path / ".git" / "shallow"
+        if not shallow_file.exists():
+            return set()
+        return set(shallow_file.read_text().split())
+
+    @staticmethod
+    def _has_commit(repo_path: Path, sha: str) -> bool:
+        return subprocess.run(
+            ["git", "cat-file", "-e", f"{sha}^{{commit}}"],
+            cwd=repo_path,
+            capture_output=True,
+        ).returncode == 0
 
-        return churn_data
+    @staticmethod
+    def _is_ancestor(repo_path: Path, ancestor: str, head: str) -> bool:
+        return subprocess.run(
+            ["git", "merge-base", "--is-ancestor", ancestor, head],
+            cwd=repo_path,
+            capture_output=True,
+        ).returncode == 0
 
     def to_hot_spot_findings(
         self,
@@ -1,15 +1,37 @@
 """GitHub API service for repository operations."""
 
+import hashlib
 import logging
+import re
+import time
+from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any
 
 import httpx
 
+from app.core.cache import SharedCache
+from app.core.config import settings
 from app.core.encryption import decrypt_token
 
 logger = logging.getLogger(__name__)
 
+# Conditional-request cache for read endpoints, shared across processes.
+# Entries are scoped by token, so users never see each other's private data.
+# A 304 answer does not count against the GitHub rate limit.
+_etag_cache = SharedCache("cache:github", ttl_seconds=settings.github_etag_cache_ttl_seconds)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _max_age_seconds(response: httpx.Response) -> int:
+    """How long a response may be served without revalidation."""
+    cache_control = response.headers.get("cache-control")
+    match = _MAX_AGE_RE.search(cache_control) if isinstance(cache_control, str) else None
+    if not match:
+        return 0
+    return min(int(match.group(1)), settings.github_cache_max_age_seconds)
+
 
 class GitHubAPIError(Exception):
     """Base exception for GitHub API errors."""
@@ -138,6 +160,60 @@ class GitHubService:
 
         raise GitHubAPIError(message, status_code=status_code)
 
+    def _cache_key(self, url: str, params: dict[str, Any] | None) -> str:
+        token = hashlib.sha256(self.access_token.encode()).hexdigest()[:16]
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{token}:{url}?{query}"
+
+    async def _get_json(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any] | None = None,
+        check: Callable[[httpx.Response], None] | None = None,
+    ) -> Any:
+        """GET a JSON resource through the shared ETag cache.
+
+        A cached response younger than its Cache-Control max-age (capped by
+        settings.github_cache_max_age_seconds) is served without a request;
+        an older one is revalidated with If-None-Match and reused on 304.
+
+        Args:
+            client: Open HTTP client
+            url: Resource URL
+            params: Query parameters
+            check: Raises for error responses (defaults to raise_for_status)
+
+        Returns:
+            Decoded JSON body
+        """
+        key = self._cache_key(url, params)
+        cached = await _etag_cache.aget(key)
+        now = time.time()
+        headers = self._get_headers()
+        if cached:
+            if cached["fresh_until"] > now:
+                return cached["data"]
+            headers["If-None-Match"] = cached["etag"]
+
+        if params is None:
+            response = await client.get(url, headers=headers)
+        else:
+            response = await client.get(url, headers=headers, params=params)
+
+        if cached and response.status_code == 304:
+            await _etag_cache.aset(key, {**cached, "fresh_until": now + _max_age_seconds(response)})
+            return cached["data"]
+
+        (check or httpx.Response.raise_for_status)(response)
+        data = response.json()
+        etag = response.headers.get("etag")
+        if isinstance(etag, str) and etag:
+            await _etag_cache.aset(
+                key, {"etag": etag, "data": data, "fresh_until": now + _max_age_seconds(response)}
+            )
+        return data
+
     async def get_user(self) -> dict[str, Any]:
         """Get the authenticated user's info."""
         async with httpx.AsyncClient(timeout=self.DEFAULT_TIMEOUT) as client:
@@ -191,12 +267,7 @@ class GitHubService:
             Repository data dict.
         """
         async with httpx.AsyncClient(timeout=self.DEFAULT_TIMEOUT) as client:
-            response = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}",
-                headers=self._get_headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+            return await self._get_json(client, f"{self.BASE_URL}/repos/{owner}/{repo}")
 
     async def get_repository_contents(
         self,
@@ -311,12 +382,7 @@ class GitHubService:
             Branch data dict.
         """
         async with httpx.AsyncClient(timeout=self.DEFAULT_TIMEOUT) as client:
-            response = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/branches/{branch}",
-                headers=self._get_headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+            return await self._get_json(client, f"{self.BASE_URL}/repos/{owner}/{repo}/branches/{branch}")
 
     async def list_branches(
         self,
@@ -342,13 +408,12 @@ class GitHubService:
         """
         try:
             async with httpx.AsyncClient(timeout=self.DEFAULT_TIMEOUT) as client:
-                response = await client.get(
+                branches = await self._get_json(
+                    client,
                     f"{self.BASE_URL}/repos/{owner}/{repo}/branches",
-                    headers=self._get_headers(),
                     params={"per_page": min(per_page, 100)},
+                    check=self._handle_response_error,
                 )
-                self._handle_response_error(response)
-                branches = response.json()
 
                 # Transform to consistent format
                 return [
@@ -397,13 +462,12 @@ class GitHubService:
 
         try:
             async with httpx.AsyncClient(timeout=self.DEFAULT_TIMEOUT) as client:
-                response = await client.get(
+                commits = await self._get_json(
+                    client,
                     f"{self.BASE_URL}/repos/{owner}/{repo}/commits",
-                    headers=self._get_headers(),
                     params=params,
+                    check=self._handle_response_error,
                 )
-                self._handle_response_error(response)
-                commits = response.json()
 
                 # Transform to consistent format
                 return [
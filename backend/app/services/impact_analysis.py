@@ -0,0 +1,238 @@
+"""Impact-scoped test selection for fix validation.
+
+Finds the repository's existing tests that can reach a changed file, so a
+fix is validated against more than its own generated test without paying
+for the full suite. Two sources of evidence are combined:
+
+- Import graph (the same regex resolution as incremental scans): test
+  files importing the changed file, directly or through other modules.
+- Call graph (CallGraphAnalyzer): test functions whose calls reach a
+  function defined in the changed file. Call edges are linked by name,
+  so an edge to a name defined in several files is only followed when the
+  caller's file imports the callee's file.
+
+Selection only parses files; nothing from the repository is executed.
+"""
+
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.call_graph_analyzer import CallGraph, CallGraphAnalyzer
+from app.services.incremental_scan import IMPORT_GRAPH_LANGUAGES, build_import_graph
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+PYTHON_TEST_FILE_PATTERN = re.compile(r"(^|/)(test_[^/]+|[^/]+_test)\.py$")
+JS_TEST_FILE_PATTERN = re.compile(r"(\.(test|spec)\.[cm]?[jt]sx?$)|(^|/)__tests__/.+\.[cm]?[jt]sx?$")
+
+# Import hops followed from the changed file (1 = direct importers only)
+MAX_IMPORT_DEPTH = 3
+# Call hops followed from functions of the changed file
+MAX_CALL_DEPTH = 4
+
+
+@dataclass
+class SelectedTest:
+    """An existing test file selected for validation."""
+
+    path: str
+    reason: str
+
+    def to_dict(self) -> dict[str, str]:
+        return {"path": self.path, "reason": self.reason}
+
+
+def language_family(path: str) -> str | None:
+    """Return "python" or "javascript" for source files, else None."""
+    language = IMPORT_GRAPH_LANGUAGES.get(Path(path).suffix.lower())
+    if language is None:
+        return None
+    return "python" if language == "python" else "javascript"
+
+
+def is_test_file(path: str) -> bool:
+    """Check whether a repo-relative path is a test file."""
+    path = path.replace("\\", "/")
+    return bool(PYTHON_TEST_FILE_PATTERN.search(path) or JS_TEST_FILE_PATTERN.search(path))
+
+
+# =============================================================================
+# Impact Index
+# =============================================================================
+
+
+class ImpactIndex:
+    """Import and call graphs of a repository, queried per changed file.
+
+    Build once per checkout (graph construction parses the whole
+    repository) and call select_tests() for every fix.
+    """
+
+    def __init__(self, import_graph: dict[str, set[str]], call_graph: CallGraph | None = None):
+        self.import_graph = import_graph
+        self.call_graph = call_graph or CallGraph()
+
+        self._importers: dict[str, set[str]] = {}
+        for path, targets in import_graph.items():
+            for target in targets:
+                self._importers.setdefault(target, set()).add(path)
+
+        self._name_counts: dict[str, int] = {}
+        for node in self.call_graph.nodes.values():
+            self._name_counts[node.name] = self._name_counts.get(node.name, 0) + 1
+
+    @classmethod
+    def build(cls, repo_path: Path) -> "ImpactIndex":
+        """Build the index for a cloned repository."""
+        repo_path = Path(repo_path)
+        import_graph = build_import_graph(repo_path)
+        try:
+            call_graph = CallGraphAnalyzer().analyze(repo_path)
+        except Exception as e:
+            logger.warning(f"Call graph unavailable for test selection: {e}")
+            call_graph = None
+        return cls(import_graph, call_graph)
+
+    def _import_hits(self, changed_file: str) -> dict[str, str]:
+        """Test files reaching changed_file through imports (BFS over importers)."""
+        hits: dict[str, str] = {}
+        # path -> the chain of modules leading back to the changed file
+        chains: dict[str, list[str]] = {changed_file: []}
+        queue = deque([changed_file])
+        while queue:
+            current = queue.popleft()
+            chain = chains[current]
+            if len(chain) >= MAX_IMPORT_DEPTH:
+                continue
+            for importer in sorted(self._importers.get(current, ())):
+                if importer in chains:
+                    continue
+                chains[importer] = [current, *chain]
+                if is_test_file(importer):
+                    via = chains[importer][:-1]
+                    hits[importer] = (
+                        f"imports {changed_file}" if not via
+                        else f"imports {' -> '.join(via)} -> {changed_file}"
+                    )
+                else:
+                    queue.append(importer)
+        return hits
+
+    def _follows(self, caller_file: str, callee_id: str) -> bool:
+        callee = self.call_graph.nodes[callee_id]
+        if self._name_counts.get(callee.name, 0) <= 1 or caller_file == callee.file_path:
+            return True
+        return callee.file_path in self.import_graph.get(caller_file, set())
+
+    def _call_hits(self, changed_file: str) -> dict[str, str]:
+        """Test files whose functions call into changed_file (BFS over callers)."""
+        nodes = self.call_graph.nodes
+        start = [node_id for node_id, node in nodes.items() if node.file_path == changed_file]
+        hits: dict[str, str] = {}
+        # node id -> the changed function it reaches
+        reached: dict[str, str] = {node_id: nodes[node_id].name for node_id in start}
+        queue = deque((node_id, 0) for node_id in start)
+        while queue:
+            node_id, depth = queue.popleft()
+            if depth >= MAX_CALL_DEPTH:
+                continue
+            for caller_id in sorted(nodes[node_id].called_by):
+                caller = nodes.get(caller_id)
+                if caller is None or caller_id in reached:
+                    continue
+                if not self._follows(caller.file_path, node_id):
+                    continue
+                reached[caller_id] = reached[node_id]
+                if is_test_file(caller.file_path):
+                    hits.setdefault(caller.file_path, f"{caller.name} calls {reached[node_id]}()")
+                else:
+                    queue.append((caller_id, depth + 1))
+        return hits
+
+    def select_tests(self, changed_file: str, max_files: int) -> list[SelectedTest]:
+        """Select existing tests of the changed file's language that reach it.
+
+        Direct importers come first, then call graph hits, then transitive
+        importers; the changed file itself is never selected.
+
+        Args:
+            changed_file: Repo-relative path of the edited file
+            max_files: Maximum number of test files to return
+
+        Returns:
+            Selected test files with the reason each was selected
+        """
+        changed_file = changed_file.lstrip("/")
+        family = language_family(changed_file)
+        if family is None:
+            return []
+
+        import_hits = self._import_hits(changed_file)
+        call_hits = self._call_hits(changed_file)
+
+        def rank(path: str) -> tuple[int, str]:
+            if path in import_hits and " -> " not in import_hits[path]:
+                return 0, path
+            if path in call_hits:
+                return 1, path
+            return 2, path
+
+        selected = []
+        for path in sorted(set(import_hits) | set(call_hits), key=rank):
+            if path == changed_file or language_family(path) != family:
+                continue
+            reasons = [r for r in (import_hits.get(path), call_hits.get(path)) if r]
+            selected.append(SelectedTest(path=path, reason="; ".join(reasons)))
+
+        if len(selected) > max_files:
+            logger.info(f"Limiting impacted tests from {len(selected)} to {max_files}")
+        return selected[:max_files]
+
+
+# =============================================================================
+# Running Selected Tests
+# =============================================================================
+
+
+PYTEST_FAILURE_PATTERN = re.compile(r"^(?:FAILED|ERROR) (\S+)", re.MULTILINE)
+
+
+def impacted_test_command(paths: list[str], framework: str) -> list[str] | None:
+    """Build the argv that runs the given test files (no shell).
+
+    Args:
+        paths: Repo-relative test file paths
+        framework: "pytest", "jest" or "vitest"
+
+    Returns:
+        Command argv, or None for unsupported frameworks
+    """
+    # "./" keeps paths from being parsed as options
+    files = [f"./{path}" for path in paths]
+    if framework == "pytest":
+        return ["python", "-m", "pytest", "-q", "-rfE", "--tb=short", "-p", "no:cacheprovider", *files]
+    if framework == "jest":
+        return ["npx", "jest", "--passWithNoTests", *files]
+    if framework == "vitest":
+        return ["npx", "vitest", "run", "--passWithNoTests", *files]
+    return None
+
+
+def parse_failed_tests(output: str, framework: str) -> set[str] | None:
+    """Extract failing test ids from runner output.
+
+    Returns:
+        Failing test ids (pytest), or None when the output format does not
+        identify individual failures
+    """
+    if framework != "pytest":
+        return None
+    return {match.group(1).removeprefix("./") for match in PYTEST_FAILURE_PATTERN.finditer(output)}
@@ -0,0 +1,254 @@
+"""Diff-scoped incremental AI scan helpers.
+
+An incremental scan sends only the files changed since a previous scan
+(plus their import graph neighbours) to the models, then merges the new
+issues into the previous scan's issues. Previous issues that point at a
+changed file are invalidated, since their evidence may no longer hold.
+
+The import graph is built with the same regex extraction used by the
+cluster analyzer, which covers Python and JavaScript/TypeScript.
+"""
+
+import logging
+import os
+import subprocess
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any
+
+from app.services.issue_merger import DIMENSION_PREFIXES, SIMILARITY_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# File extensions whose imports are resolved into graph neighbours
+IMPORT_GRAPH_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+}
+
+GIT_TIMEOUT_SECONDS = 60
+
+
+# =============================================================================
+# Changed Files
+# =============================================================================
+
+
+def _run_git(repo_path: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        timeout=GIT_TIMEOUT_SECONDS,
+        cwd=str(repo_path),
+    )
+
+
+def get_changed_files(repo_path: Path, base_sha: str, head_sha: str = "HEAD") -> list[str] | None:
+    """List files that differ between two commits of a cloned repository.
+
+    Fetches the base commit if it is not in the (shallow) clone.
+
+    Args:
+        repo_path: Path to the cloned repository
+        base_sha: Commit of the previous scan
+        head_sha: Commit being scanned
+
+    Returns:
+        Sorted repo-relative paths (including deleted files), or None if the
+        diff cannot be computed and a full scan is required
+    """
+    try:
+        if _run_git(repo_path, "cat-file", "-e", f"{base_sha}^{{commit}}").returncode != 0:
+            fetch = _run_git(repo_path, "fetch", "--depth", "1", "origin", base_sha)
+            if fetch.returncode != 0:
+                logger.info(f"Base commit {base_sha[:7]} unavailable: {fetch.stderr.strip()}")
+                return None
+
+        diff = _run_git(repo_path, "diff", "--name-only", "--no-renames", base_sha, head_sha)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"git diff {base_sha[:7]}..{head_sha[:7]} timed out")
+        return None
+
+    if diff.returncode != 0:
+        logger.warning(f"git diff failed: {diff.stderr.strip()}")
+        return None
+
+    return sorted({line.strip() for line in diff.stdout.splitlines() if line.strip()})
+
+
+# =============================================================================
+# Import Graph Neighbours
+# =============================================================================
+
+
+def _module_keys(module_path: str) -> list[str]:
+    """Dotted suffixes a module can be imported by (at least two components).
+
+    "backend.app.services.x" -> ["backend.app.services.x", "app.services.x", "services.x"]
+    """
+    if module_path.endswith(".__init__"):
+        module_path = module_path[: -len(".__init__")]
+    parts = module_path.split(".")
+    keys = [".".join(parts[i:]) for i in range(len(parts) - 1)]
+    return keys or [module_path]
+
+
+def _resolve_import(importer: str, imported: str, module_index: dict[str, set[str]]) -> set[str]:
+    """Resolve an import statement to repository files."""
+    from app.services.cluster_analyzer import to_module_path
+
+    if imported.startswith("."):
+        # Relative JS/TS import: resolve against the importer's directory
+        joined = os.path.normpath(os.path.join(os.path.dirname(importer), imported))
+        key = to_module_path(joined)
+    else:
+        key = imported.replace("/", ".")
+    return module_index.get(key, set())
+
+
+def build_import_graph(repo_path: Path) -> dict[str, set[str]]:
+    """Resolve the imports of every source file to repository files.
+
+    Args:
+        repo_path: Path to the cloned repository
+
+    Returns:
+        Mapping of repo-relative source paths to the repo files they import
+    """
+    from app.services.cluster_analyzer import extract_imports, to_module_path
+
+    repo_path = Path(repo_path)
+    source_files: list[str] = []
+    for root, dirs, filenames in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d != "node_modules"]
+        for filename in filenames:
+            if Path(filename).suffix.lower() in IMPORT_GRAPH_LANGUAGES:
+                source_files.append(os.path.relpath(os.path.join(root, filename), repo_path))
+
+    module_index: dict[str, set[str]] = {}
+    for path in source_files:
+        for key in _module_keys(to_module_path(path)):
+            module_index.setdefault(key, set()).add(path)
+
+    graph: dict[str, set[str]] = {}
+    for path in source_files:
+        try:
+            content = (repo_path / path).read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+
+        language = IMPORT_GRAPH_LANGUAGES[Path(path).suffix.lower()]
+        targets: set[str] = set()
+        for imported in extract_imports(content, language):
+            targets |= _resolve_import(path, imported, module_index)
+        graph[path] = targets
+
+    return graph
+
+
+def find_related_files(
+    repo_path: Path,
+    changed_files: list[str],
+    max_files: int,
+) -> list[str]:
+    """Find files that import, or are imported by, the changed files.
+
+    Args:
+        repo_path: Path to the cloned repository
+        changed_files: Repo-relative paths changed since the base scan
+        max_files: Maximum number of related files to return
+
+    Returns:
+        Sorted repo-relative paths of neighbours (excluding changed files)
+    """
+    changed = set(changed_files)
+    related: set[str] = set()
+    for path, targets in build_import_graph(repo_path).items():
+        if path in changed:
+            # Imported by a changed file
+            related |= targets
+        elif targets & changed:
+            # Imports a changed file
+            related.add(path)
+
+    related -= changed
+    if len(related) > max_files:
+        logger.info(f"Limiting related files from {len(related)} to {max_files}")
+    return sorted(related)[:max_files]
+
+
+# =============================================================================
+# Issue Merging
+# =============================================================================
+
+
+def _issue_paths(issue: dict[str, Any]) -> set[str]:
+    return {
+        f["path"] for f in issue.get("files") or []
+        if isinstance(f, dict) and f.get("path")
+    }
+
+
+def _is_same_issue(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    if a.get("dimension") != b.get("dimension"):
+        return False
+    if not _issue_paths(a) & _issue_paths(b):
+        return False
+    title_a, title_b = (a.get("title") or "").lower(), (b.get("title") or "").lower()
+    return bool(title_a and title_b) and (
+        SequenceMatcher(None, title_a, title_b).ratio() >= SIMILARITY_THRESHOLD
+    )
+
+
+def merge_incremental_issues(
+    previous_issues: list[dict[str, Any]],
+    new_issues: list[dict[str, Any]],
+    changed_files: list[str],
+) -> list[dict[str, Any]]:
+    """Merge issues from an incremental scan into the previous scan's issues.
+
+    Previous issues referencing a changed file are dropped. New issues that
+    duplicate a kept previous issue are dropped. Remaining new issues get
+    IDs continuing after the highest kept ID per dimension prefix.
+
+    Args:
+        previous_issues: Serialized issues from the previous ai_scan_cache
+        new_issues: Serialized issues from the incremental scan
+        changed_files: Repo-relative paths changed since the previous scan
+
+    Returns:
+        Combined list of serialized issues
+    """
+    changed = set(changed_files)
+    kept = [issue for issue in previous_issues if not _issue_paths(issue) & changed]
+
+    counters: dict[str, int] = {}
+    for issue in kept:
+        prefix, _, number = str(issue.get("id", "")).rpartition("-")
+        if number.isdigit():
+            counters[prefix] = max(counters.get(prefix, 0), int(number))
+
+    merged = list(kept)
+    for issue in new_issues:
+        if any(_is_same_issue(issue, existing) for existing in kept):
+            continue
+        prefix = DIMENSION_PREFIXES.get(issue.get("dimension", ""), "other")
+        counters[prefix] = counters.get(prefix, 0) + 1
+        merged.append({**issue, "id": f"{prefix}-{counters[prefix]:03d}"})
+
+    logger.info(
+        f"Incremental merge: kept {len(kept)}/{len(previous_issues)} previous issues, "
+        f"added {len(merged) - len(kept)}/{len(new_issues)} new issues"
+    )
+    return merged
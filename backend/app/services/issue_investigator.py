@@ -4,9 +4,12 @@ Tool-calling agent that validates high-severity issues by investigating
 the codebase with read_file, search, and cli_run tools.
 """
 
+import asyncio
 import json
 import logging
+import os
 import re
+import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -101,6 +104,7 @@ class InvestigationResult:
         commands_executed: List of CLI commands that were run
         files_examined: List of files that were read during investigation
         iterations_used: Number of tool-calling iterations used
+        cost_usd: LLM cost of this investigation in USD
     """
     status: str  # confirmed | likely_real | uncertain | invalid
     technical_notes: list[str] = field(default_factory=list)
@@ -108,6 +112,7 @@ class InvestigationResult:
     commands_executed: list[str] = field(default_factory=list)
     files_examined: list[str] = field(default_factory=list)
     iterations_used: int = 0
+    cost_usd: float = 0.0
 
 
 @dataclass
@@ -138,6 +143,85 @@ class ToolResult:
     error: str | None = None
 
 
+class ToolResultCache:
+    """Per-scan cache of read-only tool results shared by investigators.
+
+    read_file and search only read the cloned repository, so their results
+    are identical for every issue of a scan. Concurrent identical calls
+    await the same in-flight execution instead of running twice.
+    """
+
+    CACHEABLE_TOOLS = frozenset({"read_file", "search"})
+
+    def __init__(self):
+        self._results: dict[tuple, asyncio.Future[ToolResult]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(tool_call: ToolCall) -> tuple | None:
+        """Build the cache key for a tool call, or None if not cacheable."""
+        args = tool_call.arguments
+        if tool_call.name == "read_file":
+            path = os.path.normpath(str(args.get("path", "")))
+            return ("read_file", path, args.get("start_line"), args.get("end_line"))
+        if tool_call.name == "search":
+            return ("search", args.get("query", ""), args.get("file_pattern"))
+        return None
+
+    async def get_or_execute(self, tool_call: ToolCall, execute) -> ToolResult:
+        """Return the cached result for tool_call, executing it on a miss.
+
+        Args:
+            tool_call: Tool call to resolve
+            execute: Coroutine function executing the tool call
+
+        Returns:
+            ToolResult (shared between identical calls)
+        """
+        key = self.make_key(tool_call)
+        if key is None:
+            return await execute(tool_call)
+
+        future = self._results.get(key)
+        if future is not None:
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._results[key] = future
+        try:
+            result = await execute(tool_call)
+        except BaseException as e:
+            # Don't cache failures to execute; let the next caller retry
+            del self._results[key]
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        future.set_result(result)
+        return result
+
+
+@dataclass
+class InvestigationBudget:
+    """LLM cost budget shared by all investigations of a scan.
+
+    Attributes:
+        max_cost_usd: Maximum total cost in USD (None for no limit)
+        spent_usd: Cost spent so far in USD
+    """
+    max_cost_usd: float | None = None
+    spent_usd: float = 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_cost_usd is not None and self.spent_usd >= self.max_cost_usd
+
+    def add(self, cost_usd: float | None) -> None:
+        self.spent_usd += cost_usd or 0.0
+
+
 # =============================================================================
 # Tool Definitions
 # =============================================================================
@@ -293,6 +377,8 @@ class IssueInvestigator:
         repo_path: Path,
         sandbox: Sandbox | None = None,
         model: str = "bedrock/anthropic.claude-sonnet-4-5-20250929-v1:0",
+        tool_cache: ToolResultCache | None = None,
+        budget: InvestigationBudget | None = None,
     ):
         """Initialize the IssueInvestigator.
 
@@ -301,11 +387,16 @@ class IssueInvestigator:
             repo_path: Path to the cloned repository
             sandbox: Optional Sandbox for executing CLI commands
             model: LLM model to use for investigation
+            tool_cache: Optional cache of read_file/search results shared
+                between investigations of the same scan
+            budget: Optional cost budget shared between investigations
         """
         self.llm = llm_gateway
         self.repo_path = Path(repo_path)
         self.sandbox = sandbox
         self.model = model
+        self.tool_cache = tool_cache
+        self.budget = budget
 
     def _build_issue_prompt(self, issue: MergedIssue) -> str:
         """Build the investigation prompt for an issue.
@@ -439,8 +530,6 @@ Please investigate this issue using the available tools and determine if it's a
             ToolResult with search results or error
         """
         try:
-            import subprocess
-
             # Build grep command
             cmd = ["grep", "-rn", "--include=*"]
 
@@ -449,7 +538,9 @@ Please investigate this issue using the available tools and determine if it's a
 
             cmd.extend([query, str(self.repo_path)])
 
-            result = subprocess.run(
+            # Run in a thread so concurrent investigations are not blocked
+            result = await asyncio.to_thread(
+                subprocess.run,
                 cmd,
                 capture_output=True,
                 text=True,
@@ -570,12 +661,21 @@ Please investigate this issue using the available tools and determine if it's a
     async def _execute_tool(self, tool_call: ToolCall) -> ToolResult:
         """Execute a tool call and return the result.
 
+        read_file and search results are served from the shared tool cache
+        when one is configured.
+
         Args:
             tool_call: ToolCall to execute
 
         Returns:
             ToolResult from the tool execution
         """
+        if self.tool_cache is not None:
+            return await self.tool_cache.get_or_execute(tool_call, self._run_tool)
+        return await self._run_tool(tool_call)
+
+    async def _run_tool(self, tool_call: ToolCall) -> ToolResult:
+        """Dispatch a tool call to its implementation."""
         if tool_call.name == "read_file":
             return await self._execute_read_file(
                 path=tool_call.arguments.get("path", ""),
@@ -698,8 +798,20 @@ Please investigate this issue using the available tools and determine if it's a
         files_examined: list[str] = []
         commands_executed: list[str] = []
         iterations = 0
+        cost_usd = 0.0
 
         while iterations < MAX_INVESTIGATION_ITERATIONS:
+            if self.budget is not None and self.budget.exhausted:
+                logger.warning(f"Investigation budget exhausted before finishing {issue.id}")
+                return InvestigationResult(
+                    status="uncertain",
+                    technical_notes=["Investigation stopped: scan investigation budget exhausted"],
+                    files_examined=files_examined,
+                    commands_executed=commands_executed,
+                    iterations_used=iterations,
+                    cost_usd=cost_usd,
+                )
+
             iterations += 1
             logger.debug(f"Investigation iteration {iterations}")
 
@@ -711,8 +823,14 @@ Please investigate this issue using the available tools and determine if it's a
                     temperature=0.1,
                     max_tokens=4096,
                     fallback=False,
+                    task="investigation",
                 )
 
+                call_cost = response.get("cost") or 0.0
+                cost_usd += call_cost
+                if self.budget is not None:
+                    self.budget.add(call_cost)
+
                 content = response.get("content") or ""
 
                 # Check for finish_investigation call
@@ -721,6 +839,7 @@ Please investigate this issue using the available tools and determine if it's a
                     finish_result.files_examined = files_examined
                     finish_result.commands_executed = commands_executed
                     finish_result.iterations_used = iterations
+                    finish_result.cost_usd = cost_usd
                     logger.info(
                         f"Investigation of {issue.id} completed: {finish_result.status} "
                         f"({iterations} iterations)"
@@ -756,6 +875,7 @@ Please investigate this issue using the available tools and determine if it's a
                             files_examined=files_examined,
                             commands_executed=commands_executed,
                             iterations_used=iterations,
+                            cost_usd=cost_usd,
                         )
 
                     # Execute the tool
@@ -796,6 +916,7 @@ Please investigate this issue using the available tools and determine if it's a
                     files_examined=files_examined,
                     commands_executed=commands_executed,
                     iterations_used=iterations,
+                    cost_usd=cost_usd,
                 )
             except Exception as e:
                 logger.error(f"Unexpected error during investigation: {e}")
@@ -805,6 +926,7 @@ Please investigate this issue using the available tools and determine if it's a
                     files_examined=files_examined,
                     commands_executed=commands_executed,
                     iterations_used=iterations,
+                    cost_usd=cost_usd,
                 )
 
         # Max iterations reached
@@ -815,6 +937,7 @@ Please investigate this issue using the available tools and determine if it's a
             files_examined=files_examined,
             commands_executed=commands_executed,
             iterations_used=iterations,
+            cost_usd=cost_usd,
         )
 
 
@@ -828,6 +951,8 @@ def get_issue_investigator(
     repo_path: Path | str | None = None,
     sandbox: Sandbox | None = None,
     model: str = "bedrock/anthropic.claude-sonnet-4-5-20250929-v1:0",
+    tool_cache: ToolResultCache | None = None,
+    budget: InvestigationBudget | None = None,
 ) -> IssueInvestigator:
     """Create an IssueInvestigator instance.
 
@@ -836,6 +961,8 @@ def get_issue_investigator(
         repo_path: Path to the repository to investigate
         sandbox: Optional Sandbox for CLI commands
         model: LLM model to use for investigation
+        tool_cache: Optional shared read_file/search result cache
+        budget: Optional shared cost budget
 
     Returns:
         Configured IssueInvestigator instance
@@ -853,4 +980,6 @@ def get_issue_investigator(
         repo_path=Path(repo_path),
         sandbox=sandbox,
         model=model,
+        tool_cache=tool_cache,
+        budget=budget,
     )
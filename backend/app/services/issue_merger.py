@@ -157,6 +157,32 @@ class IssueMerger:
         similarity = self._calculate_similarity(issue_a.summary, issue_b.summary)
         return similarity > self.similarity_threshold
 
+    def _is_similar_enough(self, matcher: SequenceMatcher, text1: str, text2: str) -> bool:
+        """Check summary similarity > threshold with cheap upper bounds first.
+
+        Equivalent to ``_calculate_similarity(text1, text2) > threshold`` for
+        lowercased inputs. real_quick_ratio() (length bound) and quick_ratio()
+        (character multiset bound) are upper bounds of ratio(), so pairs they
+        rule out can never pass the exact check.
+
+        Args:
+            matcher: Reusable SequenceMatcher
+            text1: Lowercased seed summary
+            text2: Lowercased candidate summary
+
+        Returns:
+            True if the exact similarity ratio exceeds the threshold
+        """
+        if not text1 or not text2:
+            return 0.0 > self.similarity_threshold
+
+        matcher.set_seqs(text1, text2)
+        if matcher.real_quick_ratio() <= self.similarity_threshold:
+            return False
+        if matcher.quick_ratio() <= self.similarity_threshold:
+            return False
+        return matcher.ratio() > self.similarity_threshold
+
     def _boost_confidence(self, found_by_count: int, original_confidence: str) -> str:
         """Determine confidence level based on model consensus.
 
@@ -281,11 +307,25 @@ class IssueMerger:
         # Reset ID counters for each merge operation
         self._id_counters = {}
 
+        # Precompute per-candidate file paths and normalized summaries
+        paths = [self._get_file_paths(candidate) for candidate in candidates]
+        summaries = [candidate.summary.lower() if candidate.summary else "" for candidate in candidates]
+
+        # Inverted index: file path -> candidate indices (ascending)
+        path_index: dict[str, list[int]] = {}
+        for i, candidate_paths in enumerate(paths):
+            for path in candidate_paths:
+                path_index.setdefault(path, []).append(i)
+
         # Track which candidates have been assigned to groups
         assigned: set[int] = set()
         groups: list[list[CandidateIssue]] = []
+        matcher = SequenceMatcher(None)
 
-        # Group duplicates together
+        # Group duplicates together. Each group is seeded by the first
+        # unassigned candidate and collects later unassigned candidates that
+        # share a file path with the seed and have a similar summary. Only
+        # candidates sharing a path are compared.
         for i, candidate_a in enumerate(candidates):
             if i in assigned:
                 continue
@@ -294,13 +334,17 @@ class IssueMerger:
             group = [candidate_a]
             assigned.add(i)
 
-            # Find all duplicates
-            for j, candidate_b in enumerate(candidates):
-                if j in assigned:
-                    continue
-
-                if self._are_duplicates(candidate_a, candidate_b):
-                    group.append(candidate_b)
+            neighbours = {
+                j
+                for path in paths[i]
+                for j in path_index[path]
+                if j not in assigned
+            }
+
+            # Find all duplicates, in candidate order
+            for j in sorted(neighbours):
+                if self._is_similar_enough(matcher, summaries[i], summaries[j]):
+                    group.append(candidates[j])
                     assigned.add(j)
 
             groups.append(group)
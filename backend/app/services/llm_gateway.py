@@ -12,7 +12,8 @@ Note: LiteLLM is imported lazily to avoid fork-safety issues with Celery prefork
 import asyncio
 import logging
 import os
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 
 # Lazy import of litellm to avoid fork-safety issues on macOS
@@ -21,6 +22,8 @@ if TYPE_CHECKING:
     pass
 
 from app.core.config import settings
+from app.services.llm_routing import ModelRouter
+from app.services.llm_telemetry import DEFAULT_TASK, LLMCallRecord, record_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +63,35 @@ class LLMError(Exception):
     pass
 
 
+def _response_meta(response: Any) -> tuple[bool, int]:
+    """Extract (cache_hit, provider_retries) from a LiteLLM response."""
+    hidden = getattr(response, "_hidden_params", None) or {}
+    headers = hidden.get("additional_headers") or {}
+    try:
+        retries = int(headers.get("x-litellm-attempted-retries") or 0)
+    except (TypeError, ValueError):
+        retries = 0
+    return bool(hidden.get("cache_hit")), retries
+
+
+def _served_model(response: Any, candidates: list[str]) -> str | None:
+    """Which of the requested models (primary, then fallbacks) served a response.
+
+    LiteLLM reports the provider's model name, usually without the
+    provider prefix ("gpt-4o" for "openai/gpt-4o").
+    """
+    served = getattr(response, "model", None)
+    if not isinstance(served, str) or not served:
+        return None
+    if served in candidates:
+        return served
+    bare = served.split("/", 1)[-1]
+    for model in candidates:
+        if model.split("/", 1)[-1] == bare:
+            return model
+    return None
+
+
 class LLMGateway:
     """
     Unified LLM Gateway using LiteLLM.
@@ -96,6 +128,9 @@ class LLMGateway:
         "azure/gpt-5.1-codex-mini",                               # Azure Codex 5.1 Mini
     ]
 
+    # Latency-sensitive tasks eligible for hedged requests
+    HEDGED_TASKS = {"chat", "fast"}
+
     # Mapping of model prefixes to environment variable names
     _MODEL_KEY_MAPPING = {
         "openai/": "OPENAI_API_KEY",
@@ -107,10 +142,44 @@ class LLMGateway:
         "vertex_ai/": "VERTEX_PROJECT",
     }
 
-    def __init__(self):
-        """Initialize LLM Gateway with configured API keys."""
+    def __init__(
+        self,
+        completion_fn: Callable[..., Awaitable[Any]] | None = None,
+        cost_fn: Callable[[Any], float] | None = None,
+        router: ModelRouter | None = None,
+        embedding_fn: Callable[..., Awaitable[Any]] | None = None,
+    ):
+        """Initialize LLM Gateway with configured API keys.
+
+        Args:
+            completion_fn: Replacement for ``litellm.acompletion`` (e.g. the
+                stub provider in app.services.llm_stub). Defaults to LiteLLM.
+            cost_fn: Replacement for ``litellm.completion_cost``
+            router: Model health tracker (defaults to a new ModelRouter)
+            embedding_fn: Replacement for ``litellm.aembedding``
+        """
+        self._completion_fn = completion_fn
+        self._cost_fn = cost_fn
+        self._embedding_fn = embedding_fn
+        self._router = router or ModelRouter(window_size=settings.llm_routing_window)
         self._setup_api_keys()
-        self._setup_cache()
+        if completion_fn is None and embedding_fn is None:
+            self._setup_cache()
+
+    @property
+    def router(self) -> ModelRouter:
+        """Per-model latency/error tracker used for routing and hedging."""
+        return self._router
+
+    def _get_completion_fns(self) -> tuple[Callable[..., Awaitable[Any]], Callable[[Any], float]]:
+        """Return the (acompletion, completion_cost) pair in use."""
+        if self._completion_fn is not None:
+            return self._completion_fn, self._cost_fn or (lambda _response: 0.0)
+
+        # Lazy import litellm
+        _ensure_litellm()
+        from litellm import acompletion, completion_cost
+        return acompletion, completion_cost
 
     def _setup_api_keys(self):
         """Set up API keys from settings for all supported providers."""
@@ -253,11 +322,19 @@ class LLMGateway:
         max_tokens: int = 4096,
         response_format: dict | None = None,
         fallback: bool = True,
+        task: str | None = None,
+        hedge: bool | None = None,
         **kwargs,
     ) -> dict[str, Any]:
         """
         Send chat messages with automatic fallback.
 
+        Fallback models are tried healthiest first (by rolling error rate,
+        then p95 latency). For latency-sensitive tasks a hedged request can
+        be sent to the healthiest fallback once the primary exceeds its p95
+        latency; the first successful response wins and the other request
+        is cancelled.
+
         Args:
             messages: List of message dicts with role and content
             model: Model name with provider prefix
@@ -265,14 +342,15 @@ class LLMGateway:
             max_tokens: Maximum tokens in response
             response_format: Optional response format (e.g., {"type": "json_object"})
             fallback: Enable automatic fallback to other models
+            task: Task label for telemetry; "chat" and "fast" are hedged when
+                LLM_HEDGING_ENABLED is set
+            hedge: Force hedging on or off regardless of task and settings
             **kwargs: Additional parameters passed to LiteLLM
 
         Returns:
             Dict with content, model, usage stats, and cost
         """
-        # Lazy import litellm
-        _ensure_litellm()
-        from litellm import acompletion, completion_cost
+        acompletion, completion_cost = self._get_completion_fns()
 
         model = model or self.DEFAULT_MODELS["chat"]
 
@@ -287,16 +365,29 @@ class LLMGateway:
         if response_format:
             params["response_format"] = response_format
 
-        # Add fallback models if enabled (only those with configured API keys)
-        if fallback:
-            available_fallbacks = self._get_available_fallbacks(model)
-            if available_fallbacks:
-                params["fallbacks"] = available_fallbacks
+        # Fallback models with configured API keys, healthiest first
+        fallbacks = self._router.rank(self._get_available_fallbacks(model)) if fallback else []
 
+        if hedge is None:
+            hedge = settings.llm_hedging_enabled and task in self.HEDGED_TASKS
+        hedge_model = self._router.pick_hedge_model(model, fallbacks) if hedge else None
+
+        record = LLMCallRecord(kind="chat", task=task or DEFAULT_TASK, model=model)
+        start = time.monotonic()
         try:
-            response = await acompletion(**params)
+            if hedge_model:
+                response, hedged = await self._hedged_completion(
+                    acompletion,
+                    params,
+                    hedge_model,
+                    [m for m in fallbacks if m != hedge_model],
+                )
+            else:
+                if fallbacks:
+                    params["fallbacks"] = fallbacks
+                response, hedged = await self._timed_completion(acompletion, params), False
 
-            return {
+            result = {
                 "content": response.choices[0].message.content,
                 "model": response.model,
                 "usage": {
@@ -306,9 +397,119 @@ class LLMGateway:
                 },
                 "cost": completion_cost(response),
             }
+
+            # Charge tokens and cost to the model that answered, not the one requested
+            record.model = _served_model(response, [model, *fallbacks]) or model
+            record.cache_hit, record.retries = _response_meta(response)
+            record.retries += int(hedged)
+            record.prompt_tokens = result["usage"]["prompt_tokens"] or 0
+            record.completion_tokens = result["usage"]["completion_tokens"] or 0
+            record.cost_usd = result["cost"] or 0.0
+            return result
         except Exception as e:
+            record.ok = False
             logger.error(f"LLM completion failed: {e}")
             raise LLMError(f"All models failed: {str(e)}")
+        finally:
+            record.latency_s = time.monotonic() - start
+            record_llm_call(record)
+
+    async def _timed_completion(
+        self,
+        acompletion: Callable[..., Awaitable[Any]],
+        params: dict[str, Any],
+    ) -> Any:
+        """Run a completion and record its latency/outcome per model.
+
+        LiteLLM tries ``fallbacks`` in order, so when a fallback serves the
+        call, the models before it are recorded as failed and the serving
+        model as succeeded (with the whole call's latency, an upper bound).
+        Cancelled requests (hedging losers) are recorded as censored
+        samples of the primary: at least as slow as the time waited.
+        """
+        model = params["model"]
+        candidates = [model, *params.get("fallbacks", [])]
+        start = time.monotonic()
+        try:
+            response = await acompletion(**params)
+        except asyncio.CancelledError:
+            self._router.record_censored(model, time.monotonic() - start)
+            raise
+        except Exception:
+            elapsed = time.monotonic() - start
+            for failed in candidates:
+                self._router.record(failed, elapsed, ok=False)
+            raise
+        elapsed = time.monotonic() - start
+        served = _served_model(response, candidates) or model
+        for failed in candidates[:candidates.index(served)]:
+            self._router.record(failed, elapsed, ok=False)
+        self._router.record(served, elapsed, ok=True)
+        return response
+
+    async def _hedged_completion(
+        self,
+        acompletion: Callable[..., Awaitable[Any]],
+        params: dict[str, Any],
+        hedge_model: str,
+        hedge_fallbacks: list[str],
+    ) -> tuple[Any, bool]:
+        """Race the primary model against a delayed request to hedge_model.
+
+        The hedge is sent once the primary has been outstanding for its
+        (clamped) p95 latency, or immediately if the primary fails first.
+        The first successful response wins; the other request is cancelled.
+
+        Returns:
+            (response, whether the hedged request was sent)
+        """
+        model = params["model"]
+        delay = self._router.hedge_delay(
+            model,
+            default_s=settings.llm_hedge_default_delay,
+            min_s=settings.llm_hedge_min_delay,
+            max_s=settings.llm_hedge_max_delay,
+        )
+
+        primary = asyncio.create_task(self._timed_completion(acompletion, params))
+        hedged: asyncio.Task | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if primary in done and primary.exception() is None:
+                return primary.result(), False
+
+            reason = "failed" if primary.done() else f"exceeded {delay:.2f}s"
+            logger.info(f"Primary model {model} {reason}, hedging with {hedge_model}")
+
+            hedge_params = {**params, "model": hedge_model}
+            if hedge_fallbacks:
+                hedge_params["fallbacks"] = hedge_fallbacks
+            hedged = asyncio.create_task(self._timed_completion(acompletion, hedge_params))
+
+            errors: list[BaseException] = []
+            pending = {hedged}
+            if primary.done():
+                errors.append(primary.exception())
+            else:
+                pending.add(primary)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedged:
+                            logger.info(f"Hedged request to {hedge_model} won over {model}")
+                        return task.result(), True
+                    errors.append(task.exception())
+
+            raise errors[-1]
+        finally:
+            # Cancel the loser and wait for it so its connection is released
+            losers = [task for task in (primary, hedged) if task is not None and not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
 
     async def complete_stream(
         self,
@@ -347,6 +548,7 @@ class LLMGateway:
         model: str | None = None,
         temperature: float = 0.2,
         max_tokens: int = 4096,
+        task: str | None = None,
         **kwargs,
     ) -> AsyncIterator[str]:
         """
@@ -355,12 +557,12 @@ class LLMGateway:
         Yields:
             Text chunks as they are generated
         """
-        # Lazy import litellm
-        _ensure_litellm()
-        from litellm import acompletion
+        acompletion, _ = self._get_completion_fns()
 
         model = model or self.DEFAULT_MODELS["chat"]
 
+        record = LLMCallRecord(kind="stream", task=task or DEFAULT_TASK, model=model)
+        start = time.monotonic()
         try:
             response = await acompletion(
                 model=model,
@@ -373,11 +575,17 @@ class LLMGateway:
 
             async for chunk in response:
                 if chunk.choices[0].delta.content:
+                    if record.time_to_first_token_s is None:
+                        record.time_to_first_token_s = time.monotonic() - start
                     yield chunk.choices[0].delta.content
 
         except Exception as e:
+            record.ok = False
             logger.error(f"LLM streaming failed: {e}")
             raise LLMError(f"Streaming failed: {str(e)}")
+        finally:
+            record.latency_s = time.monotonic() - start
+            record_llm_call(record)
 
     async def chat_stream_with_usage(
         self,
@@ -385,6 +593,7 @@ class LLMGateway:
         model: str | None = None,
         temperature: float = 0.2,
         max_tokens: int = 4096,
+        task: str | None = None,
         **kwargs,
     ) -> tuple[AsyncIterator[str], "asyncio.Future[dict[str, Any]]"]:
         """
@@ -402,8 +611,7 @@ class LLMGateway:
         """
         import asyncio
 
-        _ensure_litellm()
-        from litellm import acompletion, completion_cost
+        acompletion, completion_cost = self._get_completion_fns()
 
         model = model or self.DEFAULT_MODELS["chat"]
 
@@ -411,6 +619,8 @@ class LLMGateway:
         final_future: asyncio.Future[dict[str, Any]] = loop.create_future()
 
         async def _iterator() -> AsyncIterator[str]:
+            record = LLMCallRecord(kind="stream", task=task or DEFAULT_TASK, model=model)
+            start = time.monotonic()
             try:
                 response = await acompletion(
                     model=model,
@@ -445,8 +655,15 @@ class LLMGateway:
                             final_cost = None
 
                     if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                        if record.time_to_first_token_s is None:
+                            record.time_to_first_token_s = time.monotonic() - start
                         yield chunk.choices[0].delta.content
 
+                if final_usage:
+                    record.prompt_tokens = final_usage["prompt_tokens"]
+                    record.completion_tokens = final_usage["completion_tokens"]
+                record.cost_usd = final_cost or 0.0
+
                 if not final_future.done():
                     final_future.set_result(
                         {
@@ -456,10 +673,14 @@ class LLMGateway:
                         }
                     )
             except Exception as e:
+                record.ok = False
                 if not final_future.done():
                     final_future.set_exception(e)
                 logger.error(f"LLM streaming failed: {e}")
                 raise LLMError(f"Streaming failed: {str(e)}")
+            finally:
+                record.latency_s = time.monotonic() - start
+                record_llm_call(record)
 
         return _iterator(), final_future
 
@@ -501,6 +722,7 @@ class LLMGateway:
         self,
         texts: list[str] | str,
         model: str | None = None,
+        task: str = "embedding",
     ) -> list[list[float]]:
         """
         Generate embeddings for texts.
@@ -514,13 +736,17 @@ class LLMGateway:
                    - bedrock/amazon.titan-embed-text-v2:0
                    - vertex_ai/text-embedding-004
                    - gemini/text-embedding-004
+            task: Task label for telemetry
 
         Returns:
             List of embedding vectors
         """
-        # Lazy import litellm
-        _ensure_litellm()
-        from litellm import aembedding
+        if self._embedding_fn is not None:
+            aembedding = self._embedding_fn
+        else:
+            # Lazy import litellm
+            _ensure_litellm()
+            from litellm import aembedding
 
         # Determine model to use
         if model is None:
@@ -529,6 +755,8 @@ class LLMGateway:
         if isinstance(texts, str):
             texts = [texts]
 
+        record = LLMCallRecord(kind="embedding", task=task, model=model)
+        start = time.monotonic()
         try:
             # Build params
             params = {
@@ -545,10 +773,21 @@ class LLMGateway:
                 params["vertex_location"] = settings.vertex_location
 
             response = await aembedding(**params)
+
+            usage = getattr(response, "usage", None)
+            record.prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            record.cache_hit, record.retries = _response_meta(response)
+            hidden = getattr(response, "_hidden_params", None) or {}
+            record.cost_usd = hidden.get("response_cost") or 0.0
+
             return [item["embedding"] for item in response.data]
         except Exception as e:
+            record.ok = False
             logger.error(f"Embedding generation failed: {e}")
             raise LLMError(f"Embedding failed: {str(e)}")
+        finally:
+            record.latency_s = time.monotonic() - start
+            record_llm_call(record)
 
     async def analyze_code(
         self,
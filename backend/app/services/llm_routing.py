@@ -0,0 +1,153 @@
+"""Latency-aware model routing for the LLM Gateway.
+
+Tracks a rolling window of latency and success per model. The gateway
+uses it to order fallback models by health and, for latency-sensitive
+tasks, to decide when to fire a hedged request at a second model: if the
+primary has not answered by its observed p95 latency, the request is
+duplicated and whichever model answers first wins.
+"""
+
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# Samples kept per model
+DEFAULT_WINDOW_SIZE = 50
+
+# Samples required before p95 is trusted over the default hedge delay
+MIN_SAMPLES_FOR_P95 = 5
+
+# Models failing more often than this are not used as hedge targets
+MAX_HEDGE_ERROR_RATE = 0.5
+
+
+# =============================================================================
+# Stats
+# =============================================================================
+
+
+@dataclass
+class ModelStats:
+    """Rolling latency/outcome window for a single model.
+
+    Samples are (latency_s, ok). ok is None for censored samples: requests
+    abandoned before they finished (hedging losers), whose latency is only
+    known to be at least latency_s. They count towards latency percentiles
+    but not the error rate, so dropping slow requests does not make a model
+    look faster than it is.
+    """
+
+    window_size: int = DEFAULT_WINDOW_SIZE
+    samples: deque = field(init=False)
+
+    def __post_init__(self):
+        self.samples = deque(maxlen=self.window_size)
+
+    def record(self, latency_s: float, ok: bool | None) -> None:
+        self.samples.append((latency_s, ok))
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    @property
+    def error_rate(self) -> float:
+        outcomes = [ok for _, ok in self.samples if ok is not None]
+        if not outcomes:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank percentile of successful and censored request latencies."""
+        latencies = sorted(latency for latency, ok in self.samples if ok is not False)
+        if not latencies:
+            return None
+        rank = max(1, math.ceil(q * len(latencies)))
+        return latencies[rank - 1]
+
+
+# =============================================================================
+# Router
+# =============================================================================
+
+
+class ModelRouter:
+    """Per-process model health tracker.
+
+    Thread-safe: the gateway singleton is shared by API request handlers
+    and worker threads.
+    """
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE):
+        self._window_size = window_size
+        self._stats: dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, latency_s: float, ok: bool) -> None:
+        """Record the outcome of a completion request."""
+        self._record(model, latency_s, ok)
+
+    def record_censored(self, model: str, latency_s: float) -> None:
+        """Record a request abandoned after latency_s (e.g. a cancelled hedging loser)."""
+        self._record(model, latency_s, None)
+
+    def _record(self, model: str, latency_s: float, ok: bool | None) -> None:
+        with self._lock:
+            stats = self._stats.get(model)
+            if stats is None:
+                stats = self._stats[model] = ModelStats(window_size=self._window_size)
+            stats.record(latency_s, ok)
+
+    def p95(self, model: str) -> float | None:
+        """p95 latency in seconds, or None until enough samples exist."""
+        with self._lock:
+            stats = self._stats.get(model)
+            if stats is None or stats.count < MIN_SAMPLES_FOR_P95:
+                return None
+            return stats.percentile(0.95)
+
+    def error_rate(self, model: str) -> float:
+        with self._lock:
+            stats = self._stats.get(model)
+            return stats.error_rate if stats else 0.0
+
+    def hedge_delay(self, model: str, default_s: float, min_s: float, max_s: float) -> float:
+        """Seconds to wait on the primary before sending a hedged request.
+
+        Uses the primary's p95 latency, clamped to [min_s, max_s], so only
+        the slowest ~5% of requests are duplicated.
+        """
+        p95 = self.p95(model)
+        delay = default_s if p95 is None else p95
+        return min(max(delay, min_s), max_s)
+
+    def rank(self, models: list[str]) -> list[str]:
+        """Order models by error rate, then p95 latency.
+
+        Models without samples keep their configured order behind healthy
+        models with equal error rate. The sort is stable.
+        """
+        def key(model: str) -> tuple[float, float]:
+            p95 = self.p95(model)
+            return (round(self.error_rate(model), 2), p95 if p95 is not None else math.inf)
+
+        return sorted(models, key=key)
+
+    def pick_hedge_model(self, primary: str, candidates: list[str]) -> str | None:
+        """Choose the healthiest candidate other than the primary."""
+        healthy = [
+            model for model in candidates
+            if model != primary and self.error_rate(model) <= MAX_HEDGE_ERROR_RATE
+        ]
+        ranked = self.rank(healthy)
+        return ranked[0] if ranked else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
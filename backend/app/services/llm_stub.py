@@ -0,0 +1,206 @@
+"""Local stub LLM provider for deterministic tests and benchmarks.
+
+Stands in for ``litellm.acompletion`` / ``litellm.completion_cost`` when
+passed to ``LLMGateway(completion_fn=..., cost_fn=...)``. Each model gets
+a scripted latency, failure pattern and response, so routing, hedging
+and fallback behaviour can be exercised without network access.
+
+Example:
+    provider = StubProvider({
+        "slow/model": StubModel(latency_s=0.5),
+        "fast/model": StubModel(latency_s=0.01, content="hi"),
+    })
+    gateway = LLMGateway(completion_fn=provider.acompletion, cost_fn=provider.completion_cost)
+
+StubEmbeddingProvider likewise stands in for ``litellm.aembedding``
+(``LLMGateway(embedding_fn=...)``) with deterministic hashed bag-of-words
+vectors, so texts sharing identifiers land close together.
+"""
+
+import asyncio
+import hashlib
+import math
+import re
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+
+class StubProviderError(Exception):
+    """Scripted provider failure."""
+    pass
+
+
+@dataclass
+class StubModel:
+    """Scripted behaviour for one model.
+
+    Attributes:
+        latency_s: Seconds before the response (or failure) is returned.
+            A callable receives the 0-based call index.
+        content: Response text. A callable receives the request messages.
+        fail: Fail every call, or only the listed 0-based call indices.
+        prompt_tokens: Reported prompt token usage
+        completion_tokens: Reported completion token usage
+        cost_usd: Cost reported by ``completion_cost``
+        chunk_latency_s: Delay between streamed chunks (``stream=True``)
+    """
+
+    latency_s: float | Callable[[int], float] = 0.0
+    content: str | Callable[[list[dict]], str] = "ok"
+    fail: bool | set[int] = False
+    prompt_tokens: int = 10
+    completion_tokens: int = 5
+    cost_usd: float = 0.001
+    chunk_latency_s: float = 0.0
+
+
+@dataclass
+class StubCall:
+    """Record of one call made to the stub provider."""
+
+    model: str
+    messages: list[dict]
+    params: dict[str, Any]
+    cancelled: bool = False
+    failed: bool = False
+
+
+@dataclass
+class StubProvider:
+    """Scripted async completion provider."""
+
+    models: dict[str, StubModel]
+    calls: list[StubCall] = field(default_factory=list)
+
+    def _next_index(self, model: str) -> int:
+        return sum(1 for call in self.calls if call.model == model)
+
+    async def acompletion(
+        self,
+        model: str,
+        messages: list[dict],
+        fallbacks: list[str] | None = None,
+        **params: Any,
+    ) -> SimpleNamespace:
+        """Mimic ``litellm.acompletion``.
+
+        With ``stream=True`` an async iterator of delta chunks is returned.
+        Like LiteLLM, ``fallbacks`` are tried in order after the model fails.
+        """
+        try:
+            return await self._complete(model, messages, params)
+        except StubProviderError:
+            for fallback_model in fallbacks or []:
+                try:
+                    return await self._complete(fallback_model, messages, params)
+                except StubProviderError:
+                    continue
+            raise
+
+    async def _complete(self, model: str, messages: list[dict], params: dict[str, Any]) -> SimpleNamespace:
+        spec = self.models.get(model)
+        if spec is None:
+            raise StubProviderError(f"Unknown stub model: {model}")
+
+        index = self._next_index(model)
+        call = StubCall(model=model, messages=messages, params=params)
+        self.calls.append(call)
+
+        latency = spec.latency_s(index) if callable(spec.latency_s) else spec.latency_s
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            call.cancelled = True
+            raise
+
+        if spec.fail is True or (isinstance(spec.fail, set) and index in spec.fail):
+            call.failed = True
+            raise StubProviderError(f"{model} failed (call {index})")
+
+        content = spec.content(messages) if callable(spec.content) else spec.content
+        if params.get("stream"):
+            return self._stream(model, spec, content, params)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=spec.prompt_tokens,
+                completion_tokens=spec.completion_tokens,
+                total_tokens=spec.prompt_tokens + spec.completion_tokens,
+            ),
+        )
+
+    async def _stream(
+        self,
+        model: str,
+        spec: StubModel,
+        content: str,
+        params: dict[str, Any],
+    ) -> AsyncIterator[SimpleNamespace]:
+        """Yield content word by word, then a usage chunk if requested."""
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            if i and spec.chunk_latency_s:
+                await asyncio.sleep(spec.chunk_latency_s)
+            delta = word if i == len(words) - 1 else word + " "
+            yield SimpleNamespace(
+                model=model,
+                usage=None,
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))],
+            )
+        if (params.get("stream_options") or {}).get("include_usage"):
+            yield SimpleNamespace(
+                model=model,
+                usage=SimpleNamespace(
+                    prompt_tokens=spec.prompt_tokens,
+                    completion_tokens=spec.completion_tokens,
+                    total_tokens=spec.prompt_tokens + spec.completion_tokens,
+                ),
+                choices=[],
+            )
+
+    def completion_cost(self, response: SimpleNamespace) -> float:
+        """Mimic ``litellm.completion_cost``."""
+        return self.models[response.model].cost_usd
+
+    def calls_for(self, model: str) -> list[StubCall]:
+        return [call for call in self.calls if call.model == model]
+
+
+_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+
+
+@dataclass
+class StubEmbeddingProvider:
+    """Deterministic embedding provider (feature hashing of tokens).
+
+    Attributes:
+        dimensions: Vector size
+        latency_s: Seconds per call
+    """
+
+    dimensions: int = 256
+    latency_s: float = 0.0
+    calls: int = 0
+
+    def embed_text(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    async def aembedding(self, model: str, input: list[str], **params: Any) -> SimpleNamespace:
+        """Mimic ``litellm.aembedding``."""
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return SimpleNamespace(
+            model=model,
+            data=[{"embedding": self.embed_text(text), "index": i} for i, text in enumerate(input)],
+            usage=SimpleNamespace(prompt_tokens=sum(len(text) // 4 for text in input)),
+        )
@@ -0,0 +1,180 @@
+"""Per-call LLM telemetry.
+
+LLMGateway reports every chat, stream and embedding call here. Each call
+updates the process metrics served at /metrics and is appended to the
+active collector, if any, so Celery tasks can attach an ``llm_usage``
+summary to their result.
+
+Usage in a Celery task:
+    @celery_app.task(bind=True, name="...")
+    @with_llm_telemetry
+    def my_task(self, ...) -> dict:
+        ...
+"""
+
+import functools
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Label used when a caller does not name its task
+DEFAULT_TASK = "unspecified"
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+TOKEN_BUCKETS = (100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+
+LLM_REQUESTS = REGISTRY.counter(
+    "n9r_llm_requests_total", "LLM calls by outcome", ("kind", "task", "model", "status"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "n9r_llm_tokens_total", "LLM tokens consumed", ("task", "model", "type"),
+)
+LLM_COST = REGISTRY.counter(
+    "n9r_llm_cost_usd_total", "Estimated LLM cost in USD", ("task", "model"),
+)
+LLM_RETRIES = REGISTRY.counter(
+    "n9r_llm_retries_total", "Extra LLM attempts (fallbacks, hedges, provider retries)", ("task", "model"),
+)
+LLM_CACHE_HITS = REGISTRY.counter(
+    "n9r_llm_cache_hits_total", "LLM calls served from the response cache", ("task", "model"),
+)
+LLM_LATENCY = REGISTRY.histogram(
+    "n9r_llm_request_duration_seconds", "Total LLM call latency", ("kind", "task", "model"),
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TTFT = REGISTRY.histogram(
+    "n9r_llm_time_to_first_token_seconds", "Streaming time to first token", ("task", "model"),
+    buckets=LATENCY_BUCKETS,
+)
+LLM_CALL_TOKENS = REGISTRY.histogram(
+    "n9r_llm_request_tokens", "Tokens per LLM call", ("task", "model", "type"),
+    buckets=TOKEN_BUCKETS,
+)
+
+
+@dataclass
+class LLMCallRecord:
+    """Telemetry for one gateway call.
+
+    Attributes:
+        kind: "chat", "stream" or "embedding"
+        task: Caller-supplied task label (e.g. "broad_scan", "chat")
+        model: Model that served the call (for chat calls answered by a
+            fallback, the fallback rather than the requested model)
+        prompt_tokens: Prompt (input) tokens
+        completion_tokens: Completion (output) tokens
+        latency_s: Wall-clock duration of the call
+        time_to_first_token_s: Streaming calls only
+        retries: Extra attempts beyond the first request
+        cache_hit: Response served from the LiteLLM cache
+        cost_usd: Estimated cost
+        ok: Whether the call succeeded
+    """
+
+    kind: str
+    task: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_s: float = 0.0
+    time_to_first_token_s: float | None = None
+    retries: int = 0
+    cache_hit: bool = False
+    cost_usd: float = 0.0
+    ok: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+_collector: ContextVar[list[LLMCallRecord] | None] = ContextVar("llm_call_collector", default=None)
+
+
+def record_llm_call(record: LLMCallRecord) -> None:
+    """Update metrics and the active collector with a finished call."""
+    labels = {"task": record.task, "model": record.model}
+
+    LLM_REQUESTS.inc(kind=record.kind, status="ok" if record.ok else "error", **labels)
+    LLM_LATENCY.observe(record.latency_s, kind=record.kind, **labels)
+    if record.time_to_first_token_s is not None:
+        LLM_TTFT.observe(record.time_to_first_token_s, **labels)
+    for token_type, tokens in (("prompt", record.prompt_tokens), ("completion", record.completion_tokens)):
+        if tokens:
+            LLM_TOKENS.inc(tokens, type=token_type, **labels)
+            LLM_CALL_TOKENS.observe(tokens, type=token_type, **labels)
+    if record.cost_usd:
+        LLM_COST.inc(record.cost_usd, **labels)
+    if record.retries:
+        LLM_RETRIES.inc(record.retries, **labels)
+    if record.cache_hit:
+        LLM_CACHE_HITS.inc(**labels)
+
+    calls = _collector.get()
+    if calls is not None:
+        calls.append(record)
+
+    logger.debug(f"LLM call: {record.to_dict()}")
+
+
+@contextmanager
+def collect_llm_calls() -> Iterator[list[LLMCallRecord]]:
+    """Collect LLM calls made in this context (including asyncio tasks it starts)."""
+    calls: list[LLMCallRecord] = []
+    token = _collector.set(calls)
+    try:
+        yield calls
+    finally:
+        _collector.reset(token)
+
+
+def _aggregate(records: list[LLMCallRecord]) -> dict[str, Any]:
+    return {
+        "calls": len(records),
+        "failed": sum(1 for r in records if not r.ok),
+        "prompt_tokens": sum(r.prompt_tokens for r in records),
+        "completion_tokens": sum(r.completion_tokens for r in records),
+        "cost_usd": round(sum(r.cost_usd for r in records), 6),
+        "latency_s": round(sum(r.latency_s for r in records), 3),
+        "retries": sum(r.retries for r in records),
+        "cache_hits": sum(1 for r in records if r.cache_hit),
+    }
+
+
+def summarize_llm_calls(records: list[LLMCallRecord]) -> dict[str, Any]:
+    """Summarize calls overall, per task and per model."""
+    by_task: dict[str, list[LLMCallRecord]] = {}
+    by_model: dict[str, list[LLMCallRecord]] = {}
+    for record in records:
+        by_task.setdefault(record.task, []).append(record)
+        by_model.setdefault(record.model, []).append(record)
+
+    return {
+        **_aggregate(records),
+        "by_task": {task: _aggregate(rs) for task, rs in sorted(by_task.items())},
+        "by_model": {model: _aggregate(rs) for model, rs in sorted(by_model.items())},
+    }
+
+
+def with_llm_telemetry(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Attach an ``llm_usage`` summary to a task's dict result.
+
+    Apply below ``@celery_app.task`` so the summary is part of the stored
+    Celery result. Results without LLM calls are returned unchanged.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with collect_llm_calls() as calls:
+            result = fn(*args, **kwargs)
+        if calls and isinstance(result, dict):
+            result = {**result, "llm_usage": summarize_llm_calls(calls)}
+        return result
+
+    return wrapper
@@ -21,13 +21,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from sqlalchemy import select, update
+from sqlalchemy import delete, exists, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
 from app.models.repo_content_cache import RepoContentCache
 from app.models.repo_content_object import RepoContentObject
 from app.models.repo_content_tree import RepoContentTree
+from app.models.repo_content_tree_entry import RepoContentTreeEntry
 from app.services.object_storage import (
     MinIOClient,
     ObjectStorageError,
@@ -98,6 +99,9 @@ MAX_FILE_SIZE = 100 * 1024
 # Minimum file size (50 bytes) - skip very small files
 MIN_FILE_SIZE = 50
 
+# Rows per INSERT when writing tree entries (keeps bind params under PG limit)
+TREE_ENTRY_BATCH_SIZE = 2000
+
 
 # =============================================================================
 # Helper Functions
@@ -116,6 +120,18 @@ def compute_content_hash(content: bytes) -> str:
     return hashlib.sha256(content).hexdigest()
 
 
+def parent_path_of(path: str) -> str:
+    """Get the parent directory of a repository-relative path.
+
+    Args:
+        path: Entry path (e.g., "src/utils/helpers.py")
+
+    Returns:
+        Parent directory path, or "" for root-level entries
+    """
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
 def generate_object_key(repository_id: uuid.UUID, commit_sha: str) -> str:
     """Generate a stable UUID-based object key for MinIO.
 
@@ -642,7 +658,9 @@ class RepoContentService:
     ) -> None:
         """Save tree structure for fast directory listings.
 
-        Uses PostgreSQL upsert to handle concurrent saves.
+        Uses PostgreSQL upsert to handle concurrent saves. The full tree is
+        written as directory-indexed RepoContentTreeEntry rows (see
+        save_tree_entries) rather than a single JSONB blob.
 
         Args:
             db: Database session
@@ -654,25 +672,65 @@ class RepoContentService:
         **Validates: Requirements 1.1**
         """
         # Use upsert to handle concurrent saves
-        values = {"cache_id": cache_id, "tree": tree}
-        update_values = {"tree": tree}
-
-        if full_tree is not None:
-            values["full_tree"] = full_tree
-            update_values["full_tree"] = full_tree
-
-        stmt = pg_insert(RepoContentTree).values(**values)
+        stmt = pg_insert(RepoContentTree).values(cache_id=cache_id, tree=tree)
         stmt = stmt.on_conflict_do_update(
             constraint="uq_repo_content_tree_cache",
-            set_=update_values,
+            set_={"tree": tree},
         )
 
         await db.execute(stmt)
+
+        if full_tree is not None:
+            await self.save_tree_entries(db, cache_id, full_tree)
+
         await db.flush()
 
         full_tree_len = len(full_tree) if full_tree else 0
         logger.debug(f"Saved tree for cache {cache_id}: {len(tree)} code files, {full_tree_len} full tree entries")
 
+    async def save_tree_entries(
+        self,
+        db: AsyncSession,
+        cache_id: uuid.UUID,
+        full_tree: list[dict],
+    ) -> None:
+        """Replace the directory-indexed explorer tree for a cache.
+
+        Existing entries are deleted and the new ones inserted in batches,
+        each row tagged with its parent directory so get_full_tree can read
+        a single directory through the (cache_id, parent_path) index.
+
+        Args:
+            db: Database session
+            cache_id: Cache UUID
+            full_tree: Entries as returned by collect_full_tree
+
+        **Feature: commit-centric-explorer**
+        """
+        await db.execute(
+            delete(RepoContentTreeEntry).where(RepoContentTreeEntry.cache_id == cache_id)
+        )
+
+        rows = [
+            {
+                "cache_id": cache_id,
+                "parent_path": parent_path_of(entry["path"]),
+                "name": entry["name"],
+                "path": entry["path"],
+                "type": entry["type"],
+                "size": entry.get("size"),
+            }
+            for entry in full_tree
+        ]
+
+        for start in range(0, len(rows), TREE_ENTRY_BATCH_SIZE):
+            batch = rows[start:start + TREE_ENTRY_BATCH_SIZE]
+            stmt = pg_insert(RepoContentTreeEntry).values(batch)
+            stmt = stmt.on_conflict_do_nothing(
+                constraint="uq_repo_content_tree_entries_cache_path",
+            )
+            await db.execute(stmt)
+
     # =========================================================================
     # File Retrieval
     # =========================================================================
@@ -737,21 +795,21 @@ class RepoContentService:
         db: AsyncSession,
         cache_id: uuid.UUID,
     ) -> bool:
-        """Check if cache has full_tree populated.
+        """Check if cache has its explorer tree populated.
 
         Args:
             db: Database session
             cache_id: Cache UUID
 
         Returns:
-            True if full_tree is not null, False otherwise
+            True if at least one tree entry exists, False otherwise
         """
         result = await db.execute(
-            select(RepoContentTree.full_tree)
-            .where(RepoContentTree.cache_id == cache_id)
+            select(
+                exists().where(RepoContentTreeEntry.cache_id == cache_id)
+            )
         )
-        row = result.one_or_none()
-        return row is not None and row.full_tree is not None
+        return bool(result.scalar())
 
     async def get_full_tree(
         self,
@@ -760,19 +818,22 @@ class RepoContentService:
         commit_sha: str,
         path: str = "",
     ) -> list[dict] | None:
-        """Get full directory tree for file explorer.
+        """Get one directory of the full tree for the file explorer.
 
-        Returns the complete directory structure with metadata for the
-        commit-centric file explorer. Optionally filters by path prefix.
+        Returns the direct children of ``path`` with metadata for the
+        commit-centric file explorer. Only that directory's rows are read
+        (via the (cache_id, parent_path) index), so cost does not grow with
+        repository size.
 
         Args:
             db: Database session
             repository_id: Repository UUID
             commit_sha: Git commit SHA
-            path: Optional path prefix to filter (e.g., "src" for src/ contents)
+            path: Directory to list (e.g., "src" for src/ contents, "" for root)
 
         Returns:
-            List of file/directory entries if cache is ready, None otherwise
+            List of file/directory entries if cache is ready and has a tree,
+            None otherwise
 
         **Feature: commit-centric-explorer**
         """
@@ -795,46 +856,34 @@ class RepoContentService:
             logger.debug(f"Cache not ready for {commit_sha[:7]}: {cache_row.status}")
             return None
 
-        # Fetch full_tree from repo_content_tree
+        # Normalize path (remove trailing slash)
+        path = path.rstrip("/")
+
         result = await db.execute(
-            select(RepoContentTree.full_tree)
-            .where(RepoContentTree.cache_id == cache_row.id)
+            select(
+                RepoContentTreeEntry.name,
+                RepoContentTreeEntry.path,
+                RepoContentTreeEntry.type,
+                RepoContentTreeEntry.size,
+            )
+            .where(
+                RepoContentTreeEntry.cache_id == cache_row.id,
+                RepoContentTreeEntry.parent_path == path,
+            )
+            .order_by(RepoContentTreeEntry.path)
         )
-        full_tree = result.scalar_one_or_none()
+        entries = [
+            {"name": row.name, "path": row.path, "type": row.type, "size": row.size}
+            for row in result.all()
+        ]
 
-        if full_tree is None:
+        # An empty listing is ambiguous: empty directory vs. tree never saved
+        if not entries and not await self.has_full_tree(db, cache_row.id):
             logger.debug(f"No full_tree found for {commit_sha[:7]}")
             return None
 
-        # Filter by path if specified
-        if path:
-            # Normalize path (remove trailing slash)
-            path = path.rstrip("/")
-
-            # Filter entries that are direct children of the path
-            filtered = []
-            for entry in full_tree:
-                entry_path = entry["path"]
-
-                # Check if entry is a direct child of the requested path
-                if "/" in entry_path:
-                    parent = entry_path.rsplit("/", 1)[0]
-                else:
-                    parent = ""
-
-                if parent == path:
-                    filtered.append(entry)
-
-            logger.debug(f"Retrieved full_tree for {commit_sha[:7]} path={path}: {len(filtered)} entries")
-            return filtered
-        else:
-            # Return root level entries only
-            root_entries = [
-                entry for entry in full_tree
-                if "/" not in entry["path"]
-            ]
-            logger.debug(f"Retrieved full_tree for {commit_sha[:7]} (root): {len(root_entries)} entries")
-            return root_entries
+        logger.debug(f"Retrieved full_tree for {commit_sha[:7]} path={path or '(root)'}: {len(entries)} entries")
+        return entries
 
     async def get_file(
         self,
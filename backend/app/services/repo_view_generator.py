@@ -5,10 +5,15 @@ respecting token budgets and prioritizing important files.
 """
 
 import logging
+import math
 import os
+from collections import OrderedDict
 from dataclasses import dataclass
+from itertools import groupby
 from pathlib import Path
 
+from app.services.tokenizer import CharEstimateTokenizer, Tokenizer
+
 logger = logging.getLogger(__name__)
 
 # Directories to exclude from analysis
@@ -181,6 +186,16 @@ MAX_FILE_SIZE = 50_000  # ~12.5K tokens
 # Excerpt size for large files
 EXCERPT_SIZE = 4_000  # ~1K tokens
 
+# Knapsack packing: capacity is bucketed into this many units, and tiers
+# with more files than KNAPSACK_MAX_ITEMS are packed greedily
+KNAPSACK_RESOLUTION = 1024
+KNAPSACK_MAX_ITEMS = 256
+
+# Generated views memoized per (repository_id, commit_sha, token_budget,
+# tokenizer name); forks share commit SHAs but not ignore rules or settings
+REPO_VIEW_MEMO_SIZE = 4
+_repo_view_memo: "OrderedDict[tuple[str, str, int, str], RepoViewResult]" = OrderedDict()
+
 
 @dataclass
 class FileInfo:
@@ -204,30 +219,51 @@ class RepoViewResult:
 
 
 class RepoViewGenerator:
-    """Generates LLM-friendly markdown view of repository."""
+    """Generates LLM-friendly markdown view of repository.
 
-    def __init__(self, repo_path: Path, token_budget: int = DEFAULT_TOKEN_BUDGET):
+    Each file is read at most once per generator; rendered file sections and
+    their token counts are cached, so budget retries, truncation and
+    focused views reuse them.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        tokenizer: Tokenizer | None = None,
+        commit_sha: str | None = None,
+        repository_id: str | None = None,
+    ):
         """Initialize the generator.
 
         Args:
             repo_path: Path to the repository root
             token_budget: Maximum tokens to include (default 800K)
+            tokenizer: Token counter (default: ~4 characters per token)
+            commit_sha: Commit checked out at repo_path
+            repository_id: Repository checked out at repo_path; with
+                commit_sha, enables memoizing generate() results per
+                (repository, commit, budget, tokenizer)
         """
         self.repo_path = Path(repo_path)
         self.token_budget = token_budget
+        self.tokenizer = tokenizer or CharEstimateTokenizer()
+        self.commit_sha = commit_sha
+        self.repository_id = repository_id
+        self._files: list[FileInfo] | None = None
+        self._texts: dict[Path, str] = {}
+        self._sections: dict[tuple[str, bool], tuple[str, int, bool]] = {}
 
     def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count for text.
-
-        Uses approximation of ~4 characters per token.
+        """Count tokens for text with the configured tokenizer.
 
         Args:
-            text: Text to estimate tokens for
+            text: Text to count tokens for
 
         Returns:
-            Estimated token count
+            Token count
         """
-        return len(text) // 4
+        return self.tokenizer.count(text)
 
     def _should_exclude_dir(self, dir_name: str) -> bool:
         """Check if a directory should be excluded.
@@ -284,12 +320,14 @@ class RepoViewGenerator:
         """Build ASCII file tree representation of repository.
 
         Excludes common non-source directories like node_modules, .git, etc.
+        The root is labelled "./" rather than with the clone directory name,
+        which is random, so the same commit always yields the same view.
 
         Returns:
             ASCII tree string representation
         """
         lines = []
-        lines.append(f"{self.repo_path.name}/")
+        lines.append("./")
 
         def walk_dir(dir_path: Path, prefix: str = "") -> None:
             """Recursively walk directory and build tree."""
@@ -377,6 +415,9 @@ class RepoViewGenerator:
         Returns:
             List of FileInfo objects sorted by priority
         """
+        if self._files is not None:
+            return list(self._files)
+
         files: list[FileInfo] = []
 
         for root, dirs, filenames in os.walk(self.repo_path):
@@ -409,7 +450,57 @@ class RepoViewGenerator:
         # Sort by priority (ascending), then by path for consistency
         files.sort(key=lambda f: (f.priority, f.relative_path))
 
-        return files
+        self._files = files
+        return list(files)
+
+    def _read_text(self, file_path: Path) -> str:
+        """Read a file once; later calls return the cached text.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            File content, or an error marker if the file cannot be read
+        """
+        text = self._texts.get(file_path)
+        if text is None:
+            try:
+                with open(file_path, encoding="utf-8", errors="ignore") as f:
+                    text = f.read()
+            except Exception as e:
+                logger.warning(f"Failed to read {file_path}: {e}")
+                text = f"[Error reading file: {e}]"
+            self._texts[file_path] = text
+        return text
+
+    @staticmethod
+    def _truncate_content(content: str) -> str:
+        """Reduce content to beginning and end excerpts.
+
+        Args:
+            content: Full file content
+
+        Returns:
+            Excerpt with a truncation marker
+        """
+        half_excerpt = EXCERPT_SIZE // 2
+        beginning = content[:half_excerpt]
+        ending = content[-half_excerpt:]
+
+        # Find clean break points (newlines)
+        begin_break = beginning.rfind("\n")
+        if begin_break > half_excerpt // 2:
+            beginning = beginning[:begin_break]
+
+        end_break = ending.find("\n")
+        if end_break > 0 and end_break < half_excerpt // 2:
+            ending = ending[end_break + 1:]
+
+        return (
+            f"{beginning}\n\n"
+            f"... [TRUNCATED: {len(content) - EXCERPT_SIZE} characters omitted] ...\n\n"
+            f"{ending}"
+        )
 
     def _read_file_content(self, file_path: Path, truncate: bool = False) -> tuple[str, bool]:
         """Read file content, optionally truncating large files.
@@ -421,104 +512,188 @@ class RepoViewGenerator:
         Returns:
             Tuple of (content, was_truncated)
         """
-        try:
-            with open(file_path, encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-
-            if truncate and len(content) > MAX_FILE_SIZE:
-                # Take beginning and end excerpts
-                half_excerpt = EXCERPT_SIZE // 2
-                beginning = content[:half_excerpt]
-                ending = content[-half_excerpt:]
-
-                # Find clean break points (newlines)
-                begin_break = beginning.rfind("\n")
-                if begin_break > half_excerpt // 2:
-                    beginning = beginning[:begin_break]
-
-                end_break = ending.find("\n")
-                if end_break > 0 and end_break < half_excerpt // 2:
-                    ending = ending[end_break + 1:]
-
-                truncated_content = (
-                    f"{beginning}\n\n"
-                    f"... [TRUNCATED: {len(content) - EXCERPT_SIZE} characters omitted] ...\n\n"
-                    f"{ending}"
-                )
-                return truncated_content, True
-
-            return content, False
-
-        except Exception as e:
-            logger.warning(f"Failed to read {file_path}: {e}")
-            return f"[Error reading file: {e}]", False
+        content = self._read_text(file_path)
+        if truncate and len(content) > MAX_FILE_SIZE:
+            return self._truncate_content(content), True
+        return content, False
+
+    def _file_section(self, file_info: FileInfo, excerpt: bool) -> tuple[str, int, bool]:
+        """Render a file section and count its tokens (cached).
+
+        Args:
+            file_info: File to render
+            excerpt: Render beginning/end excerpts instead of full content
+
+        Returns:
+            Tuple of (section, tokens, was_truncated)
+        """
+        key = (file_info.relative_path, excerpt)
+        cached = self._sections.get(key)
+        if cached is None:
+            content = self._read_text(file_info.path)
+            was_truncated = excerpt and len(content) > EXCERPT_SIZE
+            if was_truncated:
+                content = self._truncate_content(content)
+            section = f"\n### {file_info.relative_path}\n\n```\n{content}\n```\n"
+            cached = (section, self._estimate_tokens(section), was_truncated)
+            self._sections[key] = cached
+        return cached
+
+    def _file_options(self, file_info: FileInfo) -> list[tuple[str, int, bool]]:
+        """Candidate renderings of a file, preferred first.
+
+        Files above MAX_FILE_SIZE are only included as excerpts; other
+        files may fall back to an excerpt when the full content doesn't fit.
+        """
+        if file_info.size > MAX_FILE_SIZE:
+            return [self._file_section(file_info, excerpt=True)]
+        options = [self._file_section(file_info, excerpt=False)]
+        if file_info.size > EXCERPT_SIZE:
+            options.append(self._file_section(file_info, excerpt=True))
+        return options
+
+    @staticmethod
+    def _knapsack(options: list[list[int]], capacity: int) -> list[int | None]:
+        """Pick at most one option per item to maximize tokens within capacity.
+
+        Multiple-choice 0/1 knapsack over token weights bucketed to
+        KNAPSACK_RESOLUTION units. Weights are rounded up, so the chosen
+        set never exceeds capacity.
+
+        Args:
+            options: Token cost of each option, per item
+            capacity: Token capacity
+
+        Returns:
+            Chosen option index per item (None if the item is left out)
+        """
+        scale = max(1, math.ceil(capacity / KNAPSACK_RESOLUTION))
+        slots = capacity // scale
+        best = [0] * (slots + 1)
+        picks: list[list[int | None]] = []
+
+        for item_options in options:
+            new_best = best[:]
+            pick: list[int | None] = [None] * (slots + 1)
+            for option_index, tokens in enumerate(item_options):
+                weight = math.ceil(tokens / scale)
+                for w in range(slots, weight - 1, -1):
+                    value = best[w - weight] + tokens
+                    if value > new_best[w]:
+                        new_best[w] = value
+                        pick[w] = option_index
+            best = new_best
+            picks.append(pick)
+
+        # Walk back through the picks from the best final slot
+        chosen: list[int | None] = [None] * len(options)
+        w = max(range(slots + 1), key=lambda slot: best[slot])
+        for i in range(len(options) - 1, -1, -1):
+            option_index = picks[i][w]
+            if option_index is not None:
+                chosen[i] = option_index
+                w -= math.ceil(options[i][option_index] / scale)
+        return chosen
 
     def _generate_file_content_section(
         self,
         files: list[FileInfo],
-        remaining_budget: int
+        remaining_budget: int,
+        tier_key=None,
     ) -> tuple[str, int, int]:
         """Generate the file contents section within token budget.
 
+        See _select_file_sections() for how files are chosen.
+
+        Returns:
+            Tuple of (content_section, files_included, files_truncated)
+        """
+        sections = self._select_file_sections(files, remaining_budget, tier_key)
+        return (
+            "".join(section for section, _, _ in sections),
+            len(sections),
+            sum(1 for _, _, truncated in sections if truncated),
+        )
+
+    def _select_file_sections(
+        self,
+        files: list[FileInfo],
+        remaining_budget: int,
+        tier_key=None,
+    ) -> list[tuple[str, int, bool]]:
+        """Choose the rendered file sections that fit the token budget.
+
+        Files are packed tier by tier (consecutive files with the same
+        tier_key, by default the file priority). A tier that fits is taken
+        whole; otherwise a knapsack picks the full/excerpt/skip choice per
+        file that fills the remaining budget best. Lower tiers only get the
+        budget left over by higher ones.
+
         Args:
             files: List of FileInfo objects sorted by priority
             remaining_budget: Remaining token budget
+            tier_key: Optional function mapping a FileInfo to its tier
 
         Returns:
-            Tuple of (content_section, files_included, files_truncated)
+            (section, tokens, truncated) per chosen file, in file order
         """
-        sections = []
-        current_tokens = 0
-        files_included = 0
-        files_truncated = 0
+        tier_key = tier_key or (lambda f: f.priority)
 
         # Reserve a small buffer for token estimation variance (1% or minimum 10 tokens)
         safety_buffer = max(10, remaining_budget // 100)
-        effective_budget = remaining_budget - safety_buffer
-
-        for file_info in files:
-            # Check if we have budget for at least a small file
-            if current_tokens >= effective_budget:
-                break
+        capacity = remaining_budget - safety_buffer
 
-            # Determine if we should truncate based on file size
-            should_truncate = file_info.size > MAX_FILE_SIZE
-
-            content, was_truncated = self._read_file_content(
-                file_info.path,
-                truncate=should_truncate
-            )
-
-            # Build file section
-            file_section = f"\n### {file_info.relative_path}\n\n```\n{content}\n```\n"
-            section_tokens = self._estimate_tokens(file_section)
-
-            # Check if adding this file would exceed budget
-            if current_tokens + section_tokens > effective_budget:
-                # Try with truncation if not already truncated
-                if not was_truncated and file_info.size > EXCERPT_SIZE:
-                    content, was_truncated = self._read_file_content(
-                        file_info.path,
-                        truncate=True
-                    )
-                    file_section = f"\n### {file_info.relative_path}\n\n```\n{content}\n```\n"
-                    section_tokens = self._estimate_tokens(file_section)
-
-                    if current_tokens + section_tokens > effective_budget:
-                        # Still too large, skip this file
-                        continue
-                else:
-                    # Skip this file
-                    continue
+        chosen: dict[str, tuple[str, int, bool]] = {}
+        used = 0
 
-            sections.append(file_section)
-            current_tokens += section_tokens
-            files_included += 1
-
-            if was_truncated:
-                files_truncated += 1
+        for _, tier in groupby(files, key=tier_key):
+            if used >= capacity:
+                break
+            tier = list(tier)
+            options = [self._file_options(f) for f in tier]
+            available = capacity - used
+
+            if sum(opts[0][1] for opts in options) <= available:
+                picks: list[int | None] = [0] * len(tier)
+            elif len(tier) <= KNAPSACK_MAX_ITEMS:
+                picks = self._knapsack([[o[1] for o in opts] for opts in options], available)
+            else:
+                # Greedy: preferred rendering, then excerpt, else skip
+                picks = []
+                remaining = available
+                for opts in options:
+                    pick = next((k for k, o in enumerate(opts) if o[1] <= remaining), None)
+                    if pick is not None:
+                        remaining -= opts[pick][1]
+                    picks.append(pick)
+
+            for file_info, opts, pick in zip(tier, options, picks, strict=True):
+                if pick is not None:
+                    chosen[file_info.relative_path] = opts[pick]
+                    used += opts[pick][1]
+
+        return [chosen[f.relative_path] for f in files if f.relative_path in chosen]
+
+    def _fit_to_budget(
+        self, header: str, sections: list[tuple[str, int, bool]]
+    ) -> tuple[str, int, int, int]:
+        """Drop trailing file sections until the whole view fits the budget.
+
+        Section token counts are summed per file; tokenizers are not exactly
+        additive across concatenation, so the final view is re-counted.
 
-        return "".join(sections), files_included, files_truncated
+        Returns:
+            Tuple of (full_content, total_tokens, files_included, files_truncated)
+        """
+        sections = list(sections)
+        full_content = header + "".join(section for section, _, _ in sections)
+        total_tokens = self._estimate_tokens(full_content)
+        while total_tokens > self.token_budget and sections:
+            sections.pop()
+            full_content = header + "".join(section for section, _, _ in sections)
+            total_tokens = self._estimate_tokens(full_content)
+        files_truncated = sum(1 for _, _, truncated in sections if truncated)
+        return full_content, total_tokens, len(sections), files_truncated
 
     def generate(self) -> RepoViewResult:
         """Generate markdown view within token budget.
@@ -527,9 +702,21 @@ class RepoViewGenerator:
         1. Repository file tree
         2. Prioritized file contents (entry points, configs, core logic, etc.)
 
+        Results are memoized per (repository_id, commit_sha, token_budget,
+        tokenizer) when the generator was given a repository_id and commit_sha.
+
         Returns:
             RepoViewResult with content and metadata
         """
+        memo_key = None
+        if self.repository_id and self.commit_sha:
+            memo_key = (self.repository_id, self.commit_sha, self.token_budget, self.tokenizer.name)
+            cached = _repo_view_memo.get(memo_key)
+            if cached is not None:
+                _repo_view_memo.move_to_end(memo_key)
+                logger.info(f"Reusing repo view for commit {self.commit_sha[:7]}")
+                return cached
+
         # Build file tree
         file_tree = self._build_file_tree()
 
@@ -561,22 +748,18 @@ The following files are included in priority order:
         remaining_budget = self.token_budget - header_tokens
 
         # Generate file content section
-        content_section, files_included, files_truncated = self._generate_file_content_section(
-            files,
-            remaining_budget
-        )
+        sections = self._select_file_sections(files, remaining_budget)
 
         # Combine sections
-        full_content = header + content_section
-        total_tokens = self._estimate_tokens(full_content)
+        full_content, total_tokens, files_included, files_truncated = self._fit_to_budget(header, sections)
 
         logger.info(
-            f"Generated repo view: {total_tokens} tokens, "
+            f"Generated repo view: {total_tokens} tokens ({self.tokenizer.name}), "
             f"{files_included}/{total_files} files included, "
             f"{files_truncated} truncated"
         )
 
-        return RepoViewResult(
+        result = RepoViewResult(
             content=full_content,
             token_estimate=total_tokens,
             files_included=files_included,
@@ -584,6 +767,83 @@ The following files are included in priority order:
             total_files=total_files,
         )
 
+        if memo_key is not None:
+            _repo_view_memo[memo_key] = result
+            while len(_repo_view_memo) > REPO_VIEW_MEMO_SIZE:
+                _repo_view_memo.popitem(last=False)
+
+        return result
+
+    def generate_focused(
+        self,
+        changed_files: list[str],
+        related_files: list[str] | None = None,
+    ) -> RepoViewResult:
+        """Generate a markdown view limited to a set of files.
+
+        Used for incremental AI scans: only the changed files and their
+        related (import graph neighbour) files are included, so the view
+        size scales with the diff rather than the repository.
+
+        Args:
+            changed_files: Repo-relative paths changed since the base scan
+            related_files: Repo-relative paths included as context only
+
+        Returns:
+            RepoViewResult with content and metadata
+        """
+        related_files = related_files or []
+        changed_set = set(changed_files)
+        focus_paths = changed_set | set(related_files)
+
+        files = [f for f in self._prioritize_files() if f.relative_path in focus_paths]
+        # Changed files first so they survive budget cuts, then by priority
+        files.sort(key=lambda f: (f.relative_path not in changed_set, f.priority, f.relative_path))
+
+        changed_list = "\n".join(f"- {path}" for path in sorted(changed_set)) or "- (none)"
+        related_list = "\n".join(f"- {path}" for path in sorted(related_files)) or "- (none)"
+        header = f"""# Repository Analysis View (incremental)
+
+## Changed Files
+
+Only the following files changed since the previous scan. Report issues
+in these files; related files are included as context.
+
+{changed_list}
+
+## Related Files
+
+Files importing or imported by the changed files.
+
+{related_list}
+
+## File Contents
+
+"""
+
+        header_tokens = self._estimate_tokens(header)
+        sections = self._select_file_sections(
+            files,
+            self.token_budget - header_tokens,
+            tier_key=lambda f: (f.relative_path not in changed_set, f.priority),
+        )
+
+        full_content, total_tokens, files_included, files_truncated = self._fit_to_budget(header, sections)
+
+        logger.info(
+            f"Generated focused repo view: {total_tokens} tokens, "
+            f"{files_included}/{len(files)} files included "
+            f"({len(changed_set)} changed, {len(related_files)} related)"
+        )
+
+        return RepoViewResult(
+            content=full_content,
+            token_estimate=total_tokens,
+            files_included=files_included,
+            files_truncated=files_truncated,
+            total_files=len(files),
+        )
+
 
 # Convenience function
 def generate_repo_view(repo_path: Path, token_budget: int = DEFAULT_TOKEN_BUDGET) -> RepoViewResult:
@@ -1,9 +1,14 @@
 """Sandbox service for isolated code execution."""
 
+import asyncio
+import codecs
 import logging
 import os
 import shutil
 import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 from uuid import UUID
@@ -114,6 +119,65 @@ ENV PYTHONUNBUFFERED=1
 """
 
 
+# Seconds between SIGTERM and SIGKILL when an exec'd command times out
+EXEC_KILL_GRACE_SECONDS = 5
+# Extra host-side wait past timeout + grace before giving up on the exec stream
+EXEC_HOST_GRACE_SECONDS = 10
+# Exit code of coreutils `timeout` when the time limit was hit
+TIMEOUT_EXIT_CODE = 124
+TRUNCATION_MARKER = "\n[... {omitted} bytes truncated ...]\n"
+
+
+@dataclass
+class ExecResult:
+    """Result of a command executed in the sandbox."""
+
+    exit_code: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    truncated: bool = False
+    duration_s: float = 0.0
+
+    @property
+    def output(self) -> str:
+        """Combined stdout+stderr, as returned by Sandbox.exec()."""
+        return self.stdout + self.stderr
+
+
+class _OutputBuffer:
+    """Keeps the first and last limit/2 bytes of a stream."""
+
+    def __init__(self, limit: int):
+        self.head_limit = limit - limit // 2
+        self.tail_limit = limit // 2
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def append(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data and self.tail_limit:
+            self.tail += data
+            del self.tail[:-self.tail_limit]
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.head) + len(self.tail)
+
+    def text(self) -> str:
+        head = bytes(self.head).decode("utf-8", errors="replace")
+        tail = bytes(self.tail).decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + tail
+        omitted = self.total - len(self.head) - len(self.tail)
+        return head + TRUNCATION_MARKER.format(omitted=omitted) + tail
+
+
 class SandboxManager:
     """Manages isolated sandbox containers for code analysis."""
 
@@ -190,6 +254,11 @@ class Sandbox:
         self.timeout = timeout
         self.container = None
         self.workdir = None
+        # Set once commands or fix files have touched the cloned repository
+        self.workspace_dirty = False
+        # Copy of the fresh checkout that reset_workspace() restores from; kept
+        # beside the workdir so nothing inside the container can modify it
+        self.pristine_dir: str | None = None
 
     def _supports_storage_opt(self) -> bool:
         """Check if Docker storage driver supports storage_opt.
@@ -232,7 +301,9 @@ class Sandbox:
         # SECURITY: network_mode="none" prevents any network access from sandbox
         # Repository is cloned on host before sandbox starts (via RepoAnalyzer)
         # Sandbox only performs local analysis on mounted files
-        self.container = self.client.containers.run(
+        # docker-py is blocking; keep the event loop free while the container starts
+        self.container = await asyncio.to_thread(
+            self.client.containers.run,
             SANDBOX_IMAGE,
             command="sleep infinity",  # Keep container running
             detach=True,
@@ -262,7 +333,8 @@ class Sandbox:
         # Files cloned on host may have different uid than sandbox user inside container.
         # Run chown as root to fix ownership before any sandbox operations.
         # This ensures sandbox user (uid=1000) can write to /workspace (e.g., __pycache__, .pytest_cache)
-        self.container.exec_run(
+        await asyncio.to_thread(
+            self.container.exec_run,
             "chown -R sandbox:sandbox /workspace",
             user="root",
         )
@@ -426,6 +498,102 @@ class Sandbox:
             logger.error(f"Clone failed: {e}")
             return False
 
+    async def run(
+        self,
+        args: list[str],
+        workdir: str = "/workspace/repo",
+        timeout: int | None = None,
+        on_output: Callable[[str, str], Any] | None = None,
+        user: str | None = None,
+    ) -> ExecResult:
+        """Execute a command in the sandbox without blocking the event loop.
+
+        The command runs under coreutils `timeout`, so a hung process is sent
+        SIGTERM after `timeout` seconds and SIGKILL EXEC_KILL_GRACE_SECONDS
+        later. Each stream keeps at most settings.sandbox_max_output_bytes
+        (head and tail, with a truncation marker in between).
+
+        Args:
+            args: Command and arguments as a list (no shell interpretation)
+            workdir: Working directory inside the container
+            timeout: Wall-clock limit in seconds (defaults to the sandbox timeout)
+            on_output: Called on the event loop as on_output(stream, text) for
+                every chunk received, stream being "stdout" or "stderr"
+            user: Container user to run as (defaults to the image user)
+
+        Returns:
+            ExecResult with exit code, captured output and timeout/truncation flags
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not started")
+
+        timeout = max(1, int(timeout or self.timeout))
+        self.workspace_dirty = True
+        limit = settings.sandbox_max_output_bytes
+        buffers = {"stdout": _OutputBuffer(limit), "stderr": _OutputBuffer(limit)}
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        command = [
+            "timeout", "--kill-after", f"{EXEC_KILL_GRACE_SECONDS}s", f"{timeout}s", *args,
+        ]
+
+        def _emit(stream: str, decoder, data: bytes) -> None:
+            text = decoder.decode(data)
+            if text:
+                loop.call_soon_threadsafe(on_output, stream, text)
+
+        def _run_blocking() -> int:
+            api = self.client.api
+            exec_id = api.exec_create(
+                self.container.id,
+                command,
+                workdir=workdir,
+                user=user or "",
+                stdout=True,
+                stderr=True,
+            )["Id"]
+            decoders = {
+                name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+                for name in buffers
+            }
+            for stdout, stderr in api.exec_start(exec_id, stream=True, demux=True):
+                for name, data in (("stdout", stdout), ("stderr", stderr)):
+                    if data:
+                        buffers[name].append(data)
+                        if on_output is not None:
+                            _emit(name, decoders[name], data)
+            return api.exec_inspect(exec_id).get("ExitCode")
+
+        try:
+            exit_code = await asyncio.wait_for(
+                asyncio.to_thread(_run_blocking),
+                timeout=timeout + EXEC_KILL_GRACE_SECONDS + EXEC_HOST_GRACE_SECONDS,
+            )
+        except TimeoutError:
+            # The in-container kill did not end the exec stream; the reader
+            # thread is released when the container is stopped in cleanup().
+            logger.error(f"Sandbox exec did not finish within its {timeout}s limit: {args[:3]}")
+            exit_code = None
+
+        duration = time.monotonic() - started
+        timed_out = exit_code is None or exit_code == TIMEOUT_EXIT_CODE or (
+            exit_code == 137 and duration >= timeout
+        )
+        stderr = buffers["stderr"].text()
+        if timed_out:
+            stderr += f"\n[sandbox] Command timed out after {timeout}s\n"
+            logger.warning(f"Sandbox command timed out after {timeout}s: {args[:3]}")
+
+        return ExecResult(
+            exit_code=TIMEOUT_EXIT_CODE if exit_code is None else exit_code,
+            stdout=buffers["stdout"].text(),
+            stderr=stderr,
+            timed_out=timed_out,
+            truncated=any(b.truncated for b in buffers.values()),
+            duration_s=duration,
+        )
+
     async def exec(
         self,
         command: str,
@@ -440,30 +608,14 @@ class Sandbox:
         being interpolated into the command string to prevent injection.
 
         For commands with untrusted arguments, prefer exec_args() instead.
+        See run() for timeout and output limits.
         """
-        if not self.container:
-            raise RuntimeError("Sandbox not started")
-
-        timeout = timeout or self.timeout
-
         logger.debug(f"Executing in sandbox: {command}")
 
-        # Execute command via shell
         # SECURITY: Command is passed as a list to avoid double-escaping issues.
         # The caller is responsible for escaping any dynamic values in the command.
-        exec_result = self.container.exec_run(
-            ["sh", "-c", command],
-            workdir=workdir,
-            demux=True,
-        )
-
-        exit_code = exec_result.exit_code
-        stdout = exec_result.output[0] or b""
-        stderr = exec_result.output[1] or b""
-
-        output = (stdout + stderr).decode("utf-8", errors="replace")
-
-        return exit_code, output
+        result = await self.run(["sh", "-c", command], workdir=workdir, timeout=timeout)
+        return result.exit_code, result.output
 
     async def exec_args(
         self,
@@ -481,32 +633,135 @@ class Sandbox:
         Args:
             args: Command and arguments as a list, e.g., ["python", "-m", "pytest", "test.py"]
             workdir: Working directory inside the container
-            timeout: Command timeout in seconds
+            timeout: Command timeout in seconds (the process is killed when exceeded)
 
         Returns:
             Tuple of (exit_code, combined stdout+stderr output)
         """
-        if not self.container:
+        logger.debug(f"Executing in sandbox (no shell): {args}")
+
+        # Execute command directly without shell - safe for untrusted arguments
+        result = await self.run(args, workdir=workdir, timeout=timeout)
+        return result.exit_code, result.output
+
+    def write_workspace_file(self, relative_path: str, content: str) -> Path:
+        """Write a file into the cloned repository (on the host).
+
+        Args:
+            relative_path: Path relative to the repository root
+            content: File content
+
+        Returns:
+            Host path of the written file
+        """
+        if not self.workdir:
             raise RuntimeError("Sandbox not started")
 
-        timeout = timeout or self.timeout
+        repo_dir = (Path(self.workdir) / "repo").resolve()
+        target = (repo_dir / relative_path.lstrip("/")).resolve()
+        if not target.is_relative_to(repo_dir) or target == repo_dir:
+            raise ValueError(f"Path escapes the repository: {relative_path}")
 
-        logger.debug(f"Executing in sandbox (no shell): {args}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+        self.workspace_dirty = True
+        return target
 
-        # Execute command directly without shell - safe for untrusted arguments
-        exec_result = self.container.exec_run(
-            args,
-            workdir=workdir,
-            demux=True,
-        )
+    def snapshot_workspace(self) -> bool:
+        """Keep a pristine copy of the cloned repository for reset_workspace().
+
+        Call right after clone_repository_on_host(), before any repository
+        code has run. The copy is made with `cp -a --reflink=auto`, so it is
+        copy-on-write where the filesystem supports it and keeps ownership
+        and modes of the checkout.
+
+        Returns:
+            True if the snapshot was taken, False otherwise
+        """
+        import subprocess
+
+        if not self.workdir:
+            logger.error("Sandbox workdir not initialized. Call start() first.")
+            return False
+
+        pristine_dir = f"{self.workdir}.pristine"
+        try:
+            result = subprocess.run(
+                ["cp", "-a", "--reflink=auto", str(Path(self.workdir) / "repo"), pristine_dir],
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Failed to snapshot sandbox workspace: {e}")
+            shutil.rmtree(pristine_dir, ignore_errors=True)
+            return False
+
+        if result.returncode != 0:
+            logger.warning(f"Failed to snapshot sandbox workspace: {result.stderr[:500]}")
+            shutil.rmtree(pristine_dir, ignore_errors=True)
+            return False
+
+        self.pristine_dir = pristine_dir
+        return True
+
+    def _restore_workspace(self) -> bool:
+        """Replace the repository with a copy of the pristine snapshot (blocking)."""
+        import subprocess
+
+        repo_dir = Path(self.workdir) / "repo"
+        try:
+            shutil.rmtree(repo_dir)
+            result = subprocess.run(
+                ["cp", "-a", "--reflink=auto", self.pristine_dir, str(repo_dir)],
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Sandbox workspace reset failed: {e}")
+            return False
+
+        if result.returncode != 0:
+            logger.warning(f"Sandbox workspace reset failed: {result.stderr[:500]}")
+            return False
+
+        # Ownership is only preserved when the host process runs as root
+        return self.fix_workspace_permissions()
 
-        exit_code = exec_result.exit_code
-        stdout = exec_result.output[0] or b""
-        stderr = exec_result.output[1] or b""
+    async def reset_workspace(self) -> bool:
+        """Return the cloned repository to its checked-out state.
 
-        output = (stdout + stderr).decode("utf-8", errors="replace")
+        The repository is replaced with a copy of the snapshot taken by
+        snapshot_workspace(). Nothing is run in the container and git never
+        runs on the host, so repository-controlled git config and hooks cannot
+        execute, and the reset does not depend on which uid owns the clone.
+        Much cheaper than re-cloning between healing iterations.
+
+        Returns:
+            True if the workspace is clean, False if it should be discarded
+        """
+        if not self.workspace_dirty:
+            return True
+        if not self.pristine_dir:
+            logger.warning("Sandbox workspace has no snapshot to reset from")
+            return False
 
-        return exit_code, output
+        if not await asyncio.to_thread(self._restore_workspace):
+            return False
+
+        self.workspace_dirty = False
+        return True
+
+    def is_running(self) -> bool:
+        """Check whether the container is still up."""
+        if not self.container:
+            return False
+        try:
+            self.container.reload()
+            return self.container.status == "running"
+        except Exception:
+            return False
 
     async def run_analysis_tool(
         self,
@@ -588,19 +843,25 @@ class Sandbox:
         """Stop and remove the sandbox."""
         if self.container:
             try:
-                self.container.stop(timeout=5)
-                self.container.remove(force=True)
+                await asyncio.to_thread(self.container.stop, timeout=5)
+                await asyncio.to_thread(self.container.remove, force=True)
                 logger.info(f"Sandbox container {self.container.id[:12]} removed")
             except Exception as e:
                 logger.error(f"Failed to cleanup container: {e}")
 
         if self.workdir and os.path.exists(self.workdir):
             try:
-                shutil.rmtree(self.workdir)
+                await asyncio.to_thread(shutil.rmtree, self.workdir)
                 logger.info(f"Sandbox workdir {self.workdir} removed")
             except Exception as e:
                 logger.error(f"Failed to cleanup workdir: {e}")
 
+        if self.pristine_dir and os.path.exists(self.pristine_dir):
+            try:
+                await asyncio.to_thread(shutil.rmtree, self.pristine_dir)
+            except Exception as e:
+                logger.error(f"Failed to cleanup workspace snapshot: {e}")
+
     async def __aenter__(self):
         """Context manager entry."""
         await self.start()
@@ -611,6 +872,93 @@ class Sandbox:
         await self.cleanup()
 
 
+class SandboxPool:
+    """A small pool of pre-started, network-isolated sandbox containers.
+
+    Containers are started ahead of time so a heal does not wait for
+    container start-up. A leased sandbox runs repository code and is
+    never returned: callers clean it up, and the pool refills itself in
+    the background.
+    """
+
+    def __init__(
+        self,
+        client: docker.DockerClient,
+        size: int = 1,
+        memory_limit: str = "4g",
+        cpu_limit: float = 2.0,
+        timeout: int = 1800,
+    ):
+        self.client = client
+        self.size = max(0, size)
+        self.memory_limit = memory_limit
+        self.cpu_limit = cpu_limit
+        self.timeout = timeout
+        self._idle: list[Sandbox] = []
+        self._filling: asyncio.Task | None = None
+
+    def _new_sandbox(self, repository_id: UUID) -> Sandbox:
+        return Sandbox(
+            client=self.client,
+            repository_id=repository_id,
+            memory_limit=self.memory_limit,
+            cpu_limit=self.cpu_limit,
+            timeout=self.timeout,
+        )
+
+    async def acquire(self, repository_id: UUID) -> Sandbox:
+        """Lease a started sandbox (warm if available, otherwise started now)."""
+        sandbox = None
+        while self._idle and sandbox is None:
+            candidate = self._idle.pop()
+            if await asyncio.to_thread(candidate.is_running):
+                sandbox = candidate
+            else:
+                await candidate.cleanup()
+
+        if sandbox is None:
+            sandbox = self._new_sandbox(repository_id)
+            try:
+                await sandbox.start()
+            except Exception:
+                await sandbox.cleanup()
+                raise
+        else:
+            sandbox.repository_id = repository_id
+            logger.info(f"Leased warm sandbox {sandbox.container.id[:12]}")
+
+        self._schedule_fill()
+        return sandbox
+
+    async def fill(self) -> None:
+        """Start containers until the pool holds `size` idle sandboxes."""
+        while len(self._idle) < self.size:
+            sandbox = self._new_sandbox(UUID(int=0))
+            try:
+                await sandbox.start()
+            except Exception as e:
+                logger.warning(f"Failed to pre-start sandbox: {e}")
+                await sandbox.cleanup()
+                return
+            self._idle.append(sandbox)
+
+    def _schedule_fill(self) -> None:
+        if not self.size:
+            return
+        loop = asyncio.get_running_loop()
+        if self._filling is None or self._filling.done() or self._filling.get_loop() is not loop:
+            self._filling = loop.create_task(self.fill())
+
+    async def close(self) -> None:
+        """Stop the refill and remove idle containers."""
+        if self._filling is not None and not self._filling.done():
+            self._filling.cancel()
+        self._filling = None
+        idle, self._idle = self._idle, []
+        for sandbox in idle:
+            await sandbox.cleanup()
+
+
 # Singleton manager
 _sandbox_manager: SandboxManager | None = None
 
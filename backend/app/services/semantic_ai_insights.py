@@ -136,6 +136,7 @@ class SemanticAIInsightsService:
                     temperature=temperature,
                     max_tokens=2000,
                     response_format={"type": "json_object"},
+                    task="semantic_insights",
                 )
 
                 total_cost += response.get("cost", 0)
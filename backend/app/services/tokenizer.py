@@ -0,0 +1,72 @@
+"""Pluggable token counters for LLM context budgeting.
+
+Budgets (such as the AI scan repo view) are expressed in tokens. The
+default counter keeps the historical ~4 characters per token estimate;
+a tiktoken-based counter gives provider-accurate counts when its
+encoding files are available.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIKTOKEN_ENCODING = "cl100k_base"
+
+
+class Tokenizer(Protocol):
+    """Counts tokens in text.
+
+    ``name`` identifies the tokenizer in cache keys, so two tokenizers with
+    the same name must produce the same counts.
+    """
+
+    name: str
+
+    def count(self, text: str) -> int:
+        ...
+
+
+class CharEstimateTokenizer:
+    """Approximates tokens as ~4 characters per token."""
+
+    name = "chars"
+
+    def count(self, text: str) -> int:
+        return len(text) // 4
+
+
+class TiktokenTokenizer:
+    """Counts tokens with a tiktoken BPE encoding."""
+
+    def __init__(self, encoding_name: str = DEFAULT_TIKTOKEN_ENCODING):
+        import tiktoken
+
+        self._encoding = tiktoken.get_encoding(encoding_name)
+        self.name = f"tiktoken:{encoding_name}"
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(spec: str = "chars") -> Tokenizer:
+    """Get a tokenizer by spec.
+
+    Args:
+        spec: "chars" or "tiktoken[:<encoding>]" (e.g. "tiktoken:o200k_base")
+
+    Returns:
+        Tokenizer instance. Falls back to the character estimate if the
+        requested tokenizer cannot be loaded.
+    """
+    kind, _, option = spec.partition(":")
+    if kind == "tiktoken":
+        try:
+            return TiktokenTokenizer(option or DEFAULT_TIKTOKEN_ENCODING)
+        except Exception as e:
+            logger.warning(f"Could not load tokenizer '{spec}', using character estimate: {e}")
+    elif kind != "chars":
+        logger.warning(f"Unknown tokenizer '{spec}', using character estimate")
+    return CharEstimateTokenizer()
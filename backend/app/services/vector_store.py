@@ -16,7 +16,6 @@ import hashlib
 import logging
 import re
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
 from typing import Protocol
 from uuid import UUID
 
@@ -28,6 +27,7 @@ from qdrant_client.models import (
     MatchValue,
 )
 
+from app.core.cache import SharedCache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -52,39 +52,29 @@ class RefResolution:
     cached: bool = False
 
 
-class _InMemoryRefCache:
-    """Very small TTL cache to reduce GitHub API pressure.
+# Branch ref -> commit SHA, shared by API replicas and workers
+_ref_cache = SharedCache("cache:ref", ttl_seconds=settings.ref_cache_ttl_seconds)
+
+
+def _ref_key(repository_id: str, ref: str) -> str:
+    return f"{repository_id}:{ref}"
 
-    This is intentionally per-process. For multi-worker deployments you may
-    want to replace with Redis.
-    """
 
-    def __init__(self, ttl_seconds: int = 300, max_size: int = 4096):
-        self._ttl = timedelta(seconds=max(30, ttl_seconds))
-        self._max_size = max(128, max_size)
-        self._data: dict[tuple[str, str], tuple[str, datetime]] = {}
+def get_cached_ref_sha(repository_id: str, ref: str) -> str | None:
+    """Commit SHA cached for a branch ref, if still fresh."""
+    return _ref_cache.get(_ref_key(repository_id, ref))
 
-    def get(self, repository_id: str, ref: str) -> str | None:
-        key = (repository_id, ref)
-        hit = self._data.get(key)
-        if not hit:
-            return None
-        value, expires_at = hit
-        if datetime.now(UTC) >= expires_at:
-            self._data.pop(key, None)
-            return None
-        return value
 
-    def set(self, repository_id: str, ref: str, sha: str) -> None:
-        # naive size control
-        if len(self._data) >= self._max_size:
-            # drop oldest-ish by iteration order (good enough)
-            for k in list(self._data.keys())[: max(1, self._max_size // 10)]:
-                self._data.pop(k, None)
-        self._data[(repository_id, ref)] = (sha, datetime.now(UTC) + self._ttl)
+def cache_ref_sha(repository_id: str, ref: str, sha: str) -> None:
+    """Record a branch ref -> commit SHA resolution (e.g. from a push webhook)."""
+    if sha and _SHA40_RE.match(sha):
+        _ref_cache.set(_ref_key(repository_id, ref), sha)
 
 
-_ref_cache = _InMemoryRefCache(ttl_seconds=300)
+async def acache_ref_sha(repository_id: str, ref: str, sha: str) -> None:
+    """Async cache_ref_sha; the Redis write runs off the event loop."""
+    if sha and _SHA40_RE.match(sha):
+        await _ref_cache.aset(_ref_key(repository_id, ref), sha)
 
 
 def stable_int64_hash(text: str) -> int:
@@ -250,7 +240,7 @@ class VectorStoreService:
             return RefResolution(requested_ref=ref, resolved_commit_sha=normalized, source="sha")
 
         # Cache check
-        cached_sha = _ref_cache.get(str(repository_id), normalized)
+        cached_sha = await _ref_cache.aget(_ref_key(repository_id, normalized))
         if cached_sha:
             return RefResolution(requested_ref=ref, resolved_commit_sha=cached_sha, source="github_branch", cached=True)
 
@@ -274,7 +264,7 @@ class VectorStoreService:
                 branch_info = await github.get_branch(owner, repo_name, normalized)
                 sha = (branch_info.get("commit") or {}).get("sha")
                 if sha and _SHA40_RE.match(sha):
-                    _ref_cache.set(str(repository_id), normalized, sha)
+                    await _ref_cache.aset(_ref_key(repository_id, normalized), sha)
                     return RefResolution(requested_ref=ref, resolved_commit_sha=sha, source="github_branch")
             except Exception as e:
                 logger.info(f"ref->sha resolution via GitHub failed (repo={repository_id}, ref={normalized}): {e}")
@@ -2,8 +2,9 @@
 
 Orchestrates the AI scan pipeline:
 1. Clone repository at specific commit
-2. Generate LLM-friendly repo view
-3. Run multi-model broad scan
+2. Generate LLM-friendly repo view (reuse an earlier scan if its inputs match)
+3. Run multi-model broad scan (limited to the diff against a previous scan
+   when possible)
 4. Merge and deduplicate issues
 5. Cache results in Analysis.ai_scan_cache
 
@@ -28,6 +29,8 @@ from app.core.database import get_sync_session
 from app.models.analysis import Analysis
 from app.models.repository import Repository
 from app.models.user import User
+from app.services.llm_telemetry import with_llm_telemetry
+from app.workers.progress_writer import ProgressWriter
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +68,7 @@ def _update_ai_scan_state(
     message: str | None = None,
     error: str | None = None,
     cache_data: dict[str, Any] | None = None,
+    publish_events: bool = True,
 ) -> None:
     """Update AI scan state in PostgreSQL via AnalysisStateService.
 
@@ -81,6 +85,8 @@ def _update_ai_scan_state(
         message: Human-readable progress message
         error: Error message (for failed status)
         cache_data: AI scan results (for completed status)
+        publish_events: Whether AnalysisStateService publishes Redis events
+            (False when ProgressWriter already published them)
 
     **Feature: ai-scan-progress-fix**
     **Validates: Requirements 2.2**
@@ -89,7 +95,7 @@ def _update_ai_scan_state(
 
     try:
         with _get_db_session() as session:
-            state_service = AnalysisStateService(session, publish_events=True)
+            state_service = AnalysisStateService(session, publish_events=publish_events)
 
             if status == "running":
                 # Use start_ai_scan for pending -> running transition
@@ -256,6 +262,140 @@ def _update_ai_scan_cache(analysis_id: str, cache_data: dict[str, Any]) -> None:
             logger.warning(f"Analysis {analysis_id} not found for cache update")
 
 
+def _find_reusable_ai_scan(
+    repository_id: UUID | str,
+    fingerprint: str,
+    exclude_analysis_id: str,
+) -> tuple[str, dict[str, Any]] | None:
+    """Find a completed AI scan of the same repository with identical inputs.
+
+    Args:
+        repository_id: Repository the scan belongs to
+        fingerprint: Fingerprint of the scan inputs (see compute_scan_fingerprint)
+        exclude_analysis_id: Analysis currently being scanned
+
+    Returns:
+        Tuple of (source analysis_id, ai_scan_cache) or None if no match
+    """
+    with get_sync_session() as db:
+        row = db.execute(
+            select(Analysis.id, Analysis.ai_scan_cache)
+            .where(
+                Analysis.repository_id == repository_id,
+                Analysis.ai_scan_fingerprint == fingerprint,
+                Analysis.ai_scan_status == "completed",
+                Analysis.id != exclude_analysis_id,
+            )
+            .order_by(Analysis.ai_scan_completed_at.desc())
+            .limit(1)
+        ).first()
+
+    if row is None or not row.ai_scan_cache:
+        return None
+    return str(row.id), row.ai_scan_cache
+
+
+def _find_previous_ai_scan(
+    repository_id: UUID | str,
+    exclude_analysis_id: str,
+    commit_sha: str,
+) -> tuple[str, str, dict[str, Any]] | None:
+    """Find the latest completed AI scan of the repository at another commit.
+
+    Args:
+        repository_id: Repository the scan belongs to
+        exclude_analysis_id: Analysis currently being scanned
+        commit_sha: Commit currently being scanned
+
+    Returns:
+        Tuple of (analysis_id, commit_sha, ai_scan_cache) or None
+    """
+    with get_sync_session() as db:
+        row = db.execute(
+            select(Analysis.id, Analysis.commit_sha, Analysis.ai_scan_cache)
+            .where(
+                Analysis.repository_id == repository_id,
+                Analysis.ai_scan_status == "completed",
+                Analysis.id != exclude_analysis_id,
+                Analysis.commit_sha != commit_sha,
+            )
+            .order_by(Analysis.ai_scan_completed_at.desc())
+            .limit(1)
+        ).first()
+
+    if row is None or not row.ai_scan_cache:
+        return None
+    return str(row.id), row.commit_sha, row.ai_scan_cache
+
+
+def _plan_incremental_scan(
+    repo_path,
+    repository_id: UUID | str,
+    analysis_id: str,
+    commit_sha: str,
+    models: list[str],
+) -> dict[str, Any] | None:
+    """Decide whether this scan can be limited to the diff of a previous scan.
+
+    Requires a previous completed scan with the same models whose commit is
+    reachable, and a diff of at most ai_scan_incremental_max_changed_files.
+
+    Returns:
+        Dict with base_analysis_id, base_cache, changed_files, related_files
+        or None if a full scan is required
+    """
+    from app.services.incremental_scan import find_related_files, get_changed_files
+
+    previous = _find_previous_ai_scan(repository_id, analysis_id, commit_sha)
+    if previous is None:
+        return None
+
+    base_analysis_id, base_sha, base_cache = previous
+    if sorted(base_cache.get("models_used") or []) != sorted(models):
+        logger.info(f"Previous AI scan {base_analysis_id} used other models, running full scan")
+        return None
+
+    changed_files = get_changed_files(repo_path, base_sha, commit_sha)
+    if not changed_files or len(changed_files) > settings.ai_scan_incremental_max_changed_files:
+        logger.info(
+            f"Diff against {base_sha[:7]} not suitable for incremental scan "
+            f"({'unavailable' if changed_files is None else len(changed_files)} changed files)"
+        )
+        return None
+
+    related_files = find_related_files(
+        repo_path, changed_files, settings.ai_scan_incremental_max_related_files
+    )
+    return {
+        "base_analysis_id": base_analysis_id,
+        "base_cache": base_cache,
+        "changed_files": changed_files,
+        "related_files": related_files,
+    }
+
+
+def _build_reused_cache(
+    source_cache: dict[str, Any],
+    source_analysis_id: str,
+    fingerprint: str,
+    commit_sha: str,
+) -> dict[str, Any]:
+    """Build ai_scan_cache for a scan reused from an earlier analysis.
+
+    Issues and overview are copied as-is; token and cost totals are zero
+    because no model was called for this analysis.
+    """
+    return {
+        **source_cache,
+        "computed_at": datetime.now(UTC).isoformat(),
+        "total_tokens_used": 0,
+        "total_cost_usd": 0.0,
+        "commit_sha": commit_sha,
+        "fingerprint": fingerprint,
+        "reused_from_analysis_id": source_analysis_id,
+    }
+
+
 def _mark_ai_scan_failed(analysis_id: str, error_message: str) -> None:
     """Mark AI scan as failed in the cache.
 
@@ -287,9 +427,15 @@ async def _investigate_issues(
     repo_path: Any,
     llm_gateway: Any,
     publish_progress: Any,
+    concurrency: int | None = None,
+    max_cost_usd: float | None = None,
 ) -> list:
     """Investigate high-severity issues using the IssueInvestigator.
 
+    Issues are investigated concurrently (at most ``concurrency`` at a
+    time) and share one read_file/search result cache and one cost budget.
+    Once the budget is spent, remaining investigations finish as uncertain.
+
     Args:
         merged_issues: List of MergedIssue objects
         investigate_severity: List of severity levels to investigate
@@ -297,11 +443,19 @@ async def _investigate_issues(
         repo_path: Path to the cloned repository
         llm_gateway: LLMGateway instance
         publish_progress: Function to publish progress updates
+        concurrency: Maximum parallel investigations
+            (defaults to settings.ai_scan_investigation_concurrency)
+        max_cost_usd: Investigation cost budget in USD
+            (defaults to settings.ai_scan_investigation_max_cost)
 
     Returns:
         Updated list of MergedIssue objects with investigation results
     """
-    from app.services.issue_investigator import get_issue_investigator
+    from app.services.issue_investigator import (
+        InvestigationBudget,
+        ToolResultCache,
+        get_issue_investigator,
+    )
 
     # Filter issues by severity
     issues_to_investigate = [
@@ -313,54 +467,75 @@ async def _investigate_issues(
         logger.info("No issues match investigation criteria")
         return merged_issues
 
+    if concurrency is None:
+        concurrency = settings.ai_scan_investigation_concurrency
+    if max_cost_usd is None:
+        max_cost_usd = settings.ai_scan_investigation_max_cost
+
     logger.info(
         f"Investigating {len(issues_to_investigate)} issues "
-        f"(severity: {investigate_severity})"
+        f"(severity: {investigate_severity}, concurrency: {concurrency})"
     )
 
-    # Create investigator
+    # One investigator, tool cache and budget for the whole scan
+    tool_cache = ToolResultCache()
+    budget = InvestigationBudget(max_cost_usd=max_cost_usd)
     investigator = get_issue_investigator(
         llm_gateway=llm_gateway,
         repo_path=repo_path,
         sandbox=None,  # CLI commands disabled for now
+        tool_cache=tool_cache,
+        budget=budget,
     )
 
-    # Investigate each issue
-    for i, issue in enumerate(issues_to_investigate):
-        progress_pct = 80 + int((i / len(issues_to_investigate)) * 10)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    total = len(issues_to_investigate)
+    completed = 0
+
+    async def investigate_one(issue) -> None:
+        nonlocal completed
+        async with semaphore:
+            try:
+                result = await investigator.investigate(issue)
+
+                # Update issue with investigation results
+                issue.investigation_status = result.status
+                if result.suggested_fix:
+                    issue.suggested_fix = result.suggested_fix
+
+                logger.info(
+                    f"Issue {issue.id} investigation: {result.status} "
+                    f"({result.iterations_used} iterations, ${result.cost_usd:.4f})"
+                )
+
+            except Exception as e:
+                logger.error(f"Failed to investigate issue {issue.id}: {e}")
+                issue.investigation_status = "uncertain"
+
+        completed += 1
         publish_progress(
             "investigating",
-            progress_pct,
-            f"Investigating issue {i + 1}/{len(issues_to_investigate)}: {issue.id}"
+            80 + int((completed / total) * 10),
+            f"Investigated {completed}/{total} issues",
         )
 
-        try:
-            result = await investigator.investigate(issue)
-
-            # Update issue with investigation results
-            issue.investigation_status = result.status
-            if result.suggested_fix:
-                issue.suggested_fix = result.suggested_fix
+    await asyncio.gather(*(investigate_one(issue) for issue in issues_to_investigate))
 
-            logger.info(
-                f"Issue {issue.id} investigation: {result.status} "
-                f"({result.iterations_used} iterations)"
-            )
-
-        except Exception as e:
-            logger.error(f"Failed to investigate issue {issue.id}: {e}")
-            issue.investigation_status = "uncertain"
+    logger.info(
+        f"Investigated {total} issues: ${budget.spent_usd:.4f} spent, "
+        f"tool cache {tool_cache.hits} hits / {tool_cache.misses} misses"
+    )
 
     return merged_issues
 
 
-
 # =============================================================================
 # Main Celery Task
 # =============================================================================
 
 
 @celery_app.task(bind=True, name="app.workers.ai_scan.run_ai_scan")
+@with_llm_telemetry
 def run_ai_scan(
     self,
     analysis_id: str,
@@ -390,10 +565,16 @@ def run_ai_scan(
     """
     from app.services.broad_scan_agent import (
             DEFAULT_SCAN_MODELS,
+            compute_scan_fingerprint,
             get_broad_scan_agent,
         )
     from app.services.issue_merger import get_issue_merger
     from app.services.repo_view_generator import RepoViewGenerator
+    from app.workers.helpers import is_analysis_superseded
+
+    if is_analysis_superseded(analysis_id, "ai_scan"):
+        logger.info(f"Skipping AI scan for analysis {analysis_id}: superseded by a newer push")
+        return {"analysis_id": analysis_id, "status": "superseded"}
 
     logger.info(f"Starting AI scan for analysis {analysis_id}")
 
@@ -401,6 +582,18 @@ def run_ai_scan(
     if models is None:
         models = DEFAULT_SCAN_MODELS.copy()
 
+    progress_writer = ProgressWriter(
+        analysis_id,
+        track="ai_scan",
+        persist=lambda progress, stage, message: _update_ai_scan_state(
+            analysis_id=analysis_id,
+            progress=progress,
+            stage=stage,
+            message=message,
+            publish_events=False,
+        ),
+    )
+
     def publish_progress(stage: str, progress: int, message: str | None = None):
         """Helper to publish progress updates.
 
@@ -417,13 +610,8 @@ def run_ai_scan(
                 status="running",
             )
         else:
-            # Progress update without status change (Requirements 4.3)
-            _update_ai_scan_state(
-                analysis_id=analysis_id,
-                progress=progress,
-                stage=stage,
-                message=message,
-            )
+            # Progress update without status change, coalesced (Requirements 4.3)
+            progress_writer.update(progress, stage, message)
 
         # Also publish to Redis for real-time SSE updates (Requirements 4.1)
         publish_ai_scan_progress(
@@ -462,7 +650,14 @@ def run_ai_scan(
             # Step 4: Generate repo view
             publish_progress("generating_view", 35, "Generating repository view...")
 
-            generator = RepoViewGenerator(repo_path)
+            from app.services.tokenizer import get_tokenizer
+
+            generator = RepoViewGenerator(
+                repo_path,
+                tokenizer=get_tokenizer(settings.ai_scan_tokenizer),
+                commit_sha=commit_sha,
+                repository_id=str(analysis.repository_id),
+            )
             repo_view_result = generator.generate()
 
             logger.info(
@@ -470,6 +665,70 @@ def run_ai_scan(
                 f"{repo_view_result.files_included} files"
             )
 
+            # Step 4.5: Reuse an earlier scan with identical inputs
+            fingerprint = compute_scan_fingerprint(repo_view_result.content, models)
+            reusable = None
+            if settings.ai_scan_reuse_enabled:
+                reusable = _find_reusable_ai_scan(
+                    analysis.repository_id, fingerprint, analysis_id
+                )
+
+            if reusable is not None:
+                source_analysis_id, source_cache = reusable
+                cache_data = _build_reused_cache(
+                    source_cache, source_analysis_id, fingerprint, commit_sha
+                )
+                issues_count = len(cache_data.get("issues") or [])
+                logger.info(
+                    f"Reusing AI scan from analysis {source_analysis_id} "
+                    f"for analysis {analysis_id} (fingerprint {fingerprint[:12]})"
+                )
+
+                progress_writer.discard()
+                _update_ai_scan_state(
+                    analysis_id=analysis_id,
+                    status="completed",
+                    cache_data=cache_data,
+                )
+                publish_ai_scan_progress(
+                    analysis_id=analysis_id,
+                    stage="completed",
+                    progress=100,
+                    message=f"AI scan complete! Found {issues_count} issues (reused).",
+                    status="completed",
+                )
+
+                return {
+                    "analysis_id": analysis_id,
+                    "commit_sha": commit_sha,
+                    "status": "completed",
+                    "issues_count": issues_count,
+                    "models_used": models,
+                    "models_succeeded": cache_data.get("models_succeeded", []),
+                    "total_tokens": 0,
+                    "total_cost_usd": 0.0,
+                    "reused_from_analysis_id": source_analysis_id,
+                }
+
+            # Step 4.6: Limit the scan to the diff against a previous scan
+            incremental = None
+            scan_content = repo_view_result.content
+            if settings.ai_scan_incremental_enabled:
+                incremental = _plan_incremental_scan(
+                    repo_path, analysis.repository_id, analysis_id, commit_sha, models
+                )
+            if incremental is not None:
+                focused_view = generator.generate_focused(
+                    incremental["changed_files"], incremental["related_files"]
+                )
+                scan_content = focused_view.content
+                logger.info(
+                    f"Incremental AI scan against analysis {incremental['base_analysis_id']}: "
+                    f"{len(incremental['changed_files'])} changed, "
+                    f"{len(incremental['related_files'])} related files, "
+                    f"{focused_view.token_estimate} tokens"
+                )
+
             # Step 5: Run broad scan with multiple models
             publish_progress("scanning", 50, f"Running AI scan with {len(models)} models...")
 
@@ -480,7 +739,7 @@ def run_ai_scan(
             broad_scan_agent = get_broad_scan_agent(llm_gateway, models)
 
             # Run async scan in sync context
-            broad_scan_result = run_async(broad_scan_agent.scan(repo_view_result.content))
+            broad_scan_result = run_async(broad_scan_agent.scan(scan_content))
 
             logger.info(
                 f"Broad scan completed: {len(broad_scan_result.candidates)} candidates, "
@@ -528,20 +787,37 @@ def run_ai_scan(
                 "suggested_fix": issue.suggested_fix,
             })
 
+        repo_overview = broad_scan_result.repo_overview
+        if incremental is not None:
+            # Focused view only covers the diff; keep the full-repo overview
+            from app.services.incremental_scan import merge_incremental_issues
+
+            base_cache = incremental["base_cache"]
+            issues_data = merge_incremental_issues(
+                base_cache.get("issues") or [], issues_data, incremental["changed_files"]
+            )
+            repo_overview = base_cache.get("repo_overview") or repo_overview
+
         cache_data = {
             "status": "completed",
             "models_used": models,
             "models_succeeded": broad_scan_result.models_succeeded,
-            "repo_overview": broad_scan_result.repo_overview,
+            "repo_overview": repo_overview,
             "issues": issues_data,
             "computed_at": datetime.now(UTC).isoformat(),
             "total_tokens_used": broad_scan_result.total_tokens,
             "total_cost_usd": broad_scan_result.total_cost,
             "commit_sha": commit_sha,
+            "fingerprint": fingerprint,
+            "scan_mode": "full" if incremental is None else "incremental",
         }
+        if incremental is not None:
+            cache_data["base_analysis_id"] = incremental["base_analysis_id"]
+            cache_data["changed_files"] = incremental["changed_files"]
 
         # Step 8: Save to database via state service (Requirements 1.4)
         # Use AnalysisStateService for state transition: running -> completed
+        progress_writer.discard()
         _update_ai_scan_state(
             analysis_id=analysis_id,
             status="completed",
@@ -553,13 +829,13 @@ def run_ai_scan(
             analysis_id=analysis_id,
             stage="completed",
             progress=100,
-            message=f"AI scan complete! Found {len(merged_issues)} issues.",
+            message=f"AI scan complete! Found {len(issues_data)} issues.",
             status="completed",
         )
 
         logger.info(
             f"AI scan completed for analysis {analysis_id}: "
-            f"{len(merged_issues)} issues, "
+            f"{len(issues_data)} issues, "
             f"{broad_scan_result.total_tokens} tokens, "
             f"${broad_scan_result.total_cost:.4f}"
         )
@@ -568,11 +844,12 @@ def run_ai_scan(
             "analysis_id": analysis_id,
             "commit_sha": commit_sha,
             "status": "completed",
-            "issues_count": len(merged_issues),
+            "issues_count": len(issues_data),
             "models_used": models,
             "models_succeeded": broad_scan_result.models_succeeded,
             "total_tokens": broad_scan_result.total_tokens,
             "total_cost_usd": broad_scan_result.total_cost,
+            "scan_mode": cache_data["scan_mode"],
         }
 
     except Exception as e:
@@ -580,6 +857,7 @@ def run_ai_scan(
         logger.error(f"AI scan failed for analysis {analysis_id}: {error_msg}")
 
         # Update PostgreSQL state via AnalysisStateService (primary source of truth)
+        progress_writer.discard()
         _update_ai_scan_state(
             analysis_id=analysis_id,
             status="failed",
@@ -12,7 +12,15 @@ from app.core.config import settings
 from app.core.database import get_sync_session
 from app.core.redis import publish_analysis_progress
 from app.services.repo_analyzer import RepoAnalyzer
-from app.workers.helpers import collect_files_for_embedding, get_repo_url
+from app.workers.helpers import collect_files_for_embedding, get_repo_url, is_analysis_superseded
+from app.workers.scheduling import (
+    LANE_INTERACTIVE,
+    acquire_analysis_slots,
+    defer_countdown,
+    get_repo_owner_id,
+    lane_for,
+    release_analysis_slots,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -296,7 +304,32 @@ def analyze_repository(
 
     Progress is published to Redis Pub/Sub for real-time SSE updates.
     Heartbeat updates are sent to the database to indicate the worker is alive.
+
+    Webhook and scheduled analyses first take per-owner (and, for scheduled,
+    lane-wide) concurrency slots; when capped, the task is re-queued with a
+    jittered countdown and the analysis stays pending. Webhook analyses
+    superseded by a newer push before they start are skipped.
     """
+    if triggered_by == "webhook" and is_analysis_superseded(analysis_id):
+        logger.info(f"Skipping analysis {analysis_id}: superseded by a newer push")
+        return {"repository_id": repository_id, "analysis_id": analysis_id, "status": "superseded"}
+
+    slot_keys: list[str] = []
+    if lane_for(triggered_by) != LANE_INTERACTIVE:
+        slots = acquire_analysis_slots(analysis_id, get_repo_owner_id(repository_id), triggered_by)
+        if slots is None:
+            if self.request.retries < settings.analysis_defer_max_retries:
+                logger.info(
+                    f"Deferring {triggered_by} analysis {analysis_id}: concurrency cap reached "
+                    f"(attempt {self.request.retries + 1})"
+                )
+                raise self.retry(countdown=defer_countdown(), max_retries=settings.analysis_defer_max_retries)
+            logger.warning(
+                f"Analysis {analysis_id} still capped after {self.request.retries} deferrals, running anyway"
+            )
+        else:
+            slot_keys = slots
+
     logger.info(
         f"Starting analysis {analysis_id} for repository {repository_id}, "
         f"commit={commit_sha}, triggered_by={triggered_by}"
@@ -396,6 +429,8 @@ def analyze_repository(
         _mark_analysis_failed(analysis_id, error_msg)
         self.update_state(state="FAILURE", meta={"error": error_msg})
         raise
+    finally:
+        release_analysis_slots(analysis_id, slot_keys)
 
 
 @celery_app.task(name="app.workers.analysis.run_quick_scan")
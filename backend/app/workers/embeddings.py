@@ -21,7 +21,9 @@ from app.core.config import settings
 from app.core.redis import publish_embedding_progress
 from app.schemas.qdrant_payload import QdrantPointPayload
 from app.services.code_chunker import CodeChunk, get_code_chunker
+from app.services.llm_telemetry import with_llm_telemetry
 from app.services.vector_store import stable_int64_hash
+from app.workers.progress_writer import ProgressWriter
 
 # Note: LLMGateway is imported lazily inside functions to avoid fork-safety issues
 # with LiteLLM/aiohttp when used with Celery prefork pool on macOS.
@@ -70,6 +72,7 @@ def _update_embeddings_state(
     message: str | None = None,
     error: str | None = None,
     vectors_count: int | None = None,
+    publish_events: bool = True,
 ) -> None:
     """Update embeddings state in PostgreSQL via AnalysisStateService.
 
@@ -84,6 +87,8 @@ def _update_embeddings_state(
         message: Human-readable progress message
         error: Error message (for failed status)
         vectors_count: Number of vectors stored
+        publish_events: Whether AnalysisStateService publishes Redis events
+            (False when ProgressWriter already published them)
 
     **Feature: progress-tracking-refactor**
     **Validates: Requirements 2.1, 2.2, 2.3, 2.4**
@@ -92,7 +97,7 @@ def _update_embeddings_state(
 
     try:
         with _get_db_session() as session:
-            state_service = AnalysisStateService(session, publish_events=True)
+            state_service = AnalysisStateService(session, publish_events=publish_events)
 
             if status == "running":
                 # Use start_embeddings for pending -> running transition
@@ -117,6 +122,21 @@ def _update_embeddings_state(
         # Don't raise - we still want to continue processing
 
 
+def _embeddings_progress_writer(analysis_id: str) -> ProgressWriter:
+    """Create a coalescing writer for embeddings progress of one analysis."""
+    return ProgressWriter(
+        analysis_id,
+        track="embeddings",
+        persist=lambda progress, stage, message: _update_embeddings_state(
+            analysis_id=analysis_id,
+            progress=progress,
+            stage=stage,
+            message=message,
+            publish_events=False,
+        ),
+    )
+
+
 def _compute_and_store_semantic_cache(
     repository_id: str,
     analysis_id: str,
@@ -162,6 +182,7 @@ def _compute_and_store_semantic_cache(
 
 
 @celery_app.task(bind=True, name="app.workers.embeddings.generate_embeddings")
+@with_llm_telemetry
 def generate_embeddings(
     self,
     repository_id: str,
@@ -192,14 +213,18 @@ def generate_embeddings(
         raise ValueError("commit_sha is required for generate_embeddings")
     logger.info(f"Generating embeddings for repository {repository_id}")
 
+    progress_writer = _embeddings_progress_writer(analysis_id) if analysis_id else None
+
     def publish_progress(stage: str, progress: int, message: str | None = None,
                          status: str = "running", chunks: int = 0, vectors: int = 0):
         """Helper to publish embedding progress.
 
         Updates state in PostgreSQL (primary) and Redis (for real-time updates).
+        Batch progress is coalesced by ProgressWriter; status transitions are
+        written immediately.
         """
         # Update PostgreSQL state via AnalysisStateService (primary source of truth)
-        if analysis_id:
+        if progress_writer:
             if status == "running" and stage == "initializing" and progress <= 5:
                 # Transition from pending -> running
                 _update_embeddings_state(
@@ -208,6 +233,7 @@ def generate_embeddings(
                 )
             elif status == "completed":
                 # Transition from running -> completed
+                progress_writer.discard()
                 _update_embeddings_state(
                     analysis_id=analysis_id,
                     status="completed",
@@ -215,19 +241,15 @@ def generate_embeddings(
                 )
             elif status == "error" or status == "failed":
                 # Transition to failed
+                progress_writer.discard()
                 _update_embeddings_state(
                     analysis_id=analysis_id,
                     status="failed",
                     error=message,
                 )
             else:
-                # Progress update without status change
-                _update_embeddings_state(
-                    analysis_id=analysis_id,
-                    progress=progress,
-                    stage=stage,
-                    message=message,
-                )
+                # Progress update without status change (coalesced)
+                progress_writer.update(progress, stage, message)
 
         # Also publish to Redis for backward compatibility and real-time updates
         publish_embedding_progress(
@@ -549,6 +571,7 @@ def generate_embeddings(
 
 
 @celery_app.task(bind=True, name="app.workers.embeddings.compute_semantic_cache")
+@with_llm_telemetry
 def compute_semantic_cache(
     self,
     repository_id: str,
@@ -1052,18 +1075,18 @@ def _populate_content_cache(
                     commit_sha,
                 )
 
-                # If cache is already ready, we update the full_tree to ensure dotfiles are visible
-                # (since we changed the filter logic), but we MUST return "skipped" to avoid
-                # triggering upload_files which sets status to "uploading" (causing GitHub fallback)
+                # If cache is already ready, backfill the explorer tree if it is missing,
+                # but we MUST return "skipped" to avoid triggering upload_files which
+                # sets status to "uploading" (causing GitHub fallback)
                 if cache.status == "ready":
                     try:
-                        logger.info(f"Cache ready for {commit_sha[:7]}, updating full_tree for dotfiles...")
-                        # Collect full tree (fast, local disk walk)
-                        full_tree = service.collect_full_tree(repo_path)
-                        # Save tree (idempotent upsert)
-                        await service.save_tree(db, cache.id, [], full_tree=full_tree)
-
-                        logger.info(f"Updated full_tree for {commit_sha[:7]}")
+                        if not await service.has_full_tree(db, cache.id):
+                            logger.info(f"Cache ready for {commit_sha[:7]}, backfilling full_tree...")
+                            # Collect full tree (fast, local disk walk)
+                            full_tree = service.collect_full_tree(repo_path)
+                            await service.save_tree_entries(db, cache.id, full_tree)
+                            await db.commit()
+                            logger.info(f"Backfilled full_tree for {commit_sha[:7]}")
                         return {
                             "status": "skipped",
                             "reason": "cache_already_ready",
@@ -1076,9 +1099,6 @@ def _populate_content_cache(
                             "reason": "cache_already_ready_tree_update_failed",
                         }
 
-
-
-
                 # If cache is uploading (another process is working on it), skip
                 if cache.status == "uploading":
                     logger.info(f"Cache already uploading for {commit_sha[:7]}")
@@ -1172,6 +1192,7 @@ def _populate_content_cache(
 
 
 @celery_app.task(bind=True, name="app.workers.embeddings.generate_embeddings_parallel")
+@with_llm_telemetry
 def generate_embeddings_parallel(
     self,
     repository_id: str,
@@ -1203,13 +1224,23 @@ def generate_embeddings_parallel(
     **Validates: Requirements 5.1, 5.4, 6.1**
     """
     from app.services.repo_analyzer import RepoAnalyzer
-    from app.workers.helpers import collect_files_for_embedding, get_repo_url
+    from app.workers.helpers import (
+        collect_files_for_embedding,
+        get_repo_url,
+        is_analysis_superseded,
+    )
+
+    if is_analysis_superseded(analysis_id, "embeddings"):
+        logger.info(f"Skipping embeddings for analysis {analysis_id}: superseded by a newer push")
+        return {"repository_id": repository_id, "analysis_id": analysis_id, "status": "superseded"}
 
     logger.info(
         f"Starting parallel embeddings for analysis {analysis_id}, "
         f"repository {repository_id}, commit {commit_sha}"
     )
 
+    progress_writer = _embeddings_progress_writer(analysis_id)
+
     def publish_progress(stage: str, progress: int, message: str | None = None,
                          status: str = "running", chunks: int = 0, vectors: int = 0):
         """Helper to publish embedding progress."""
@@ -1222,6 +1253,7 @@ def generate_embeddings_parallel(
             )
         elif status == "completed":
             # Transition from running -> completed
+            progress_writer.discard()
             _update_embeddings_state(
                 analysis_id=analysis_id,
                 status="completed",
@@ -1229,19 +1261,15 @@ def generate_embeddings_parallel(
             )
         elif status == "error" or status == "failed":
             # Transition to failed
+            progress_writer.discard()
             _update_embeddings_state(
                 analysis_id=analysis_id,
                 status="failed",
                 error=message,
             )
         else:
-            # Progress update without status change
-            _update_embeddings_state(
-                analysis_id=analysis_id,
-                progress=progress,
-                stage=stage,
-                message=message,
-            )
+            # Progress update without status change (coalesced)
+            progress_writer.update(progress, stage, message)
 
         # Also publish to Redis for real-time updates
         publish_embedding_progress(
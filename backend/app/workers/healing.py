@@ -4,6 +4,7 @@ import asyncio
 import logging
 from datetime import datetime
 
+from celery.signals import worker_process_shutdown
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
@@ -15,8 +16,10 @@ from app.models.auto_pr import AutoPR
 from app.models.issue import Issue
 from app.models.repository import Repository
 from app.models.user import User
+from app.services.agents import orchestrator as orchestrator_module
 from app.services.agents.orchestrator import HealingOrchestrator, HealingStatus
 from app.services.github import GitHubService
+from app.services.llm_telemetry import with_llm_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,18 @@ def run_async(coro):
     return loop.run_until_complete(coro)
 
 
+@worker_process_shutdown.connect
+def _close_validation_pool(**kwargs) -> None:
+    """Remove pre-started validation sandboxes when the worker exits."""
+    pool = orchestrator_module._validation_pool
+    if pool is None:
+        return
+    try:
+        run_async(pool.close())
+    except Exception as e:
+        logger.warning(f"Failed to remove warm sandboxes: {e}")
+
+
 def publish_healing_progress(
     issue_id: str,
     stage: str,
@@ -343,6 +358,7 @@ async def _create_github_pr(
 
 
 @celery_app.task(bind=True, name="app.workers.healing.heal_issue")
+@with_llm_telemetry
 def heal_issue(
     self,
     issue_id: str,
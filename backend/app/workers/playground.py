@@ -0,0 +1,222 @@
+"""Playground scan worker.
+
+Public playground scans are unauthenticated, so they run on their own
+"playground" Celery queue, consumed by a dedicated worker, instead of in
+the API process. Each scan runs RepoAnalyzer in a child process
+(app.workers.playground_job) with kernel-enforced CPU time and memory
+limits and a wall-clock timeout: a runaway scan kills only its child,
+never the worker.
+
+The queue is bounded by a Redis slot pool (``playground_max_queued_scans``
+counts queued and running scans), and completed results are cached by
+(repository, HEAD commit) so repeat scans of an unchanged repository are
+served without running again.
+"""
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from redis.exceptions import RedisError
+
+import app
+from app.core.celery import celery_app
+from app.core.config import settings
+from app.core.redis import (
+    cache_playground_result,
+    get_sync_redis_context,
+    release_playground_claim,
+    update_playground_scan,
+)
+from app.workers.scheduling import release_slot, try_acquire_slot
+
+logger = logging.getLogger(__name__)
+
+PLAYGROUND_QUEUE = "playground"
+PLAYGROUND_SLOT_KEY = "playground:slots"
+# Slots and claims expire on their own if a worker dies; a scan queued
+# behind a full backlog may wait this long before it starts
+PLAYGROUND_SLOT_TTL_SECONDS = 3600
+
+# Backend root, so the child can import the app package from any cwd
+_BACKEND_ROOT = Path(app.__file__).resolve().parent.parent
+
+
+class PlaygroundScanError(Exception):
+    """A playground scan failed or exceeded its limits."""
+
+
+# =============================================================================
+# Queue bound
+# =============================================================================
+
+
+def reserve_playground_slot(scan_id: str) -> bool:
+    """Take a place in the playground backlog.
+
+    Redis errors fail open (no bound), like analysis slots.
+
+    Returns:
+        False if ``playground_max_queued_scans`` scans are queued or running
+    """
+    try:
+        with get_sync_redis_context() as redis_client:
+            return try_acquire_slot(
+                redis_client,
+                PLAYGROUND_SLOT_KEY,
+                scan_id,
+                settings.playground_max_queued_scans,
+                ttl_s=PLAYGROUND_SLOT_TTL_SECONDS,
+            )
+    except RedisError as e:
+        logger.warning(f"Playground slots unavailable for scan {scan_id}, running unbounded: {e}")
+        return True
+
+
+def release_playground_slot(scan_id: str) -> None:
+    try:
+        with get_sync_redis_context() as redis_client:
+            release_slot(redis_client, PLAYGROUND_SLOT_KEY, scan_id)
+    except RedisError as e:
+        logger.warning(f"Failed to release playground slot for scan {scan_id}: {e}")
+
+
+# =============================================================================
+# Isolated execution
+# =============================================================================
+
+
+def _job_command(repo_url: str, output_path: str) -> list[str]:
+    return [
+        sys.executable, "-m", "app.workers.playground_job", repo_url, output_path,
+        "--cpu-seconds", str(settings.playground_scan_cpu_limit_seconds),
+        "--memory-mb", str(settings.playground_scan_memory_limit_mb),
+    ]
+
+
+def run_scan_subprocess(repo_url: str) -> dict:
+    """Run one scan in a resource-limited child process.
+
+    Returns:
+        Result dict written by the child (see playground_job.scan)
+
+    Raises:
+        PlaygroundScanError: On failure or when a limit is exceeded
+    """
+    time_limit = settings.playground_scan_time_limit_seconds
+    with tempfile.TemporaryDirectory(prefix="n9r_playground_") as tmp:
+        output_path = os.path.join(tmp, "result.json")
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(_BACKEND_ROOT), os.environ.get("PYTHONPATH")])),
+        }
+        # Own process group, so a timeout also kills git/lizard grandchildren
+        process = subprocess.Popen(
+            _job_command(repo_url, output_path),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env,
+            start_new_session=True,
+        )
+        try:
+            _, stderr = process.communicate(timeout=time_limit)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.communicate()
+            raise PlaygroundScanError(f"Scan exceeded the {time_limit}s time limit")
+
+        if process.returncode == -signal.SIGXCPU:
+            raise PlaygroundScanError(
+                f"Scan exceeded the {settings.playground_scan_cpu_limit_seconds}s CPU limit"
+            )
+        if process.returncode == -signal.SIGKILL:
+            raise PlaygroundScanError("Scan process was killed after exceeding its resource limits")
+
+        try:
+            with open(output_path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Playground scan child exited with {process.returncode}: {(stderr or '')[-2000:]}")
+            raise PlaygroundScanError(f"Scan process exited with code {process.returncode}")
+
+    if not payload.get("ok"):
+        raise PlaygroundScanError(payload.get("error") or "Scan failed")
+    return payload["result"]
+
+
+# =============================================================================
+# Task
+# =============================================================================
+
+
+@celery_app.task(
+    name="app.workers.playground.run_playground_scan",
+    # The child enforces the real limit; these only catch a wedged parent
+    soft_time_limit=settings.playground_scan_time_limit_seconds + 30,
+    time_limit=settings.playground_scan_time_limit_seconds + 60,
+)
+def run_playground_scan(scan_id: str, repo_url: str, head_sha: str | None = None) -> dict:
+    """
+    Run a public playground scan and publish the result.
+
+    Args:
+        scan_id: Playground scan ID (state lives in Redis)
+        repo_url: Public GitHub repository URL
+        head_sha: HEAD commit resolved at submission, if known (claim key)
+
+    Returns:
+        dict with scan status
+    """
+    logger.info(f"Starting playground scan {scan_id} for {repo_url}")
+
+    update_playground_scan(scan_id, {
+        "status": "running",
+        "started_at": datetime.utcnow().isoformat(),
+    })
+
+    try:
+        result = run_scan_subprocess(repo_url)
+
+        update_playground_scan(scan_id, {
+            "status": "completed",
+            **result,
+            "completed_at": datetime.utcnow().isoformat(),
+        })
+
+        if result.get("commit_sha"):
+            try:
+                cache_playground_result(
+                    repo_url,
+                    result["commit_sha"],
+                    result,
+                    ttl=settings.playground_result_cache_ttl_seconds,
+                )
+            except RedisError as e:
+                logger.warning(f"Failed to cache playground result for {repo_url}: {e}")
+
+        logger.info(f"Playground scan {scan_id} completed, VCI: {result.get('vci_score')}")
+        return {"scan_id": scan_id, "status": "completed"}
+
+    except Exception as e:
+        logger.error(f"Playground scan {scan_id} failed: {e}")
+        update_playground_scan(scan_id, {
+            "status": "failed",
+            "error": str(e)[:500],
+            "completed_at": datetime.utcnow().isoformat(),
+        })
+        return {"scan_id": scan_id, "status": "failed"}
+
+    finally:
+        release_playground_slot(scan_id)
+        if head_sha:
+            try:
+                release_playground_claim(repo_url, head_sha, scan_id)
+            except RedisError as e:
+                logger.warning(f"Failed to release playground claim for scan {scan_id}: {e}")
@@ -0,0 +1,77 @@
+"""Child process entry point for one playground scan.
+
+Started by app.workers.playground as
+``python -m app.workers.playground_job REPO_URL OUTPUT_PATH --cpu-seconds N --memory-mb M``.
+Resource limits are applied to this process before anything is cloned
+and are inherited by the git/lizard subprocesses it starts. The result
+(or error) is written as JSON to OUTPUT_PATH; stdout/stderr carry logs only.
+
+Kept free of Celery imports so the child starts quickly.
+"""
+
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+
+TOP_ISSUES = 5
+
+
+def apply_limits(cpu_seconds: int, memory_mb: int) -> None:
+    """Cap CPU time (SIGXCPU, then SIGKILL) and address space for this process tree."""
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+    memory_bytes = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def scan(repo_url: str) -> dict:
+    """Analyze the default branch head of a public repository."""
+    from app.services.repo_analyzer import RepoAnalyzer
+
+    with RepoAnalyzer(repo_url) as analyzer:
+        result = analyzer.analyze()
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            cwd=str(analyzer.temp_dir),
+        )
+
+    return {
+        "commit_sha": head.stdout.strip() if head.returncode == 0 else None,
+        "vci_score": result.vci_score,
+        "tech_debt_level": result.tech_debt_level,
+        "metrics": result.metrics,
+        "top_issues": result.issues[:TOP_ISSUES],
+        "ai_report": result.ai_report,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("repo_url")
+    parser.add_argument("output_path")
+    parser.add_argument("--cpu-seconds", type=int, required=True)
+    parser.add_argument("--memory-mb", type=int, required=True)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    apply_limits(args.cpu_seconds, args.memory_mb)
+
+    try:
+        payload = {"ok": True, "result": scan(args.repo_url)}
+    except MemoryError:
+        payload = {"ok": False, "error": f"Scan exceeded the {args.memory_mb} MB memory limit"}
+    except Exception as e:
+        payload = {"ok": False, "error": str(e)[:500]}
+
+    with open(args.output_path, "w") as f:
+        json.dump(payload, f)
+    return 0 if payload["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Coalescing progress writer for worker tracks.
+
+Workers report progress for every batch of every task. Persisting each of
+those updates opens a sync DB session, loads the Analysis row and commits,
+so Postgres write load grows with the number of batches.
+
+ProgressWriter keeps only the latest progress per (analysis, track),
+publishes the progress event to Redis immediately (SSE stays real-time),
+and writes to PostgreSQL at a bounded rate: on the first update, when the
+stage changes, and at most once per flush interval otherwise. Status
+transitions (running/completed/failed) are still written directly by the
+worker, so Postgres writes become O(transitions + stages) instead of
+O(batches).
+
+**Feature: progress-tracking-refactor**
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingProgress:
+    """Latest progress not yet persisted to PostgreSQL."""
+
+    progress: int
+    stage: str
+    message: str | None
+
+
+class ProgressWriter:
+    """Coalesces progress updates for one (analysis, track) pair.
+
+    Example:
+        writer = ProgressWriter(
+            analysis_id,
+            track="embeddings",
+            persist=lambda progress, stage, message: _update_embeddings_state(
+                analysis_id, progress=progress, stage=stage, message=message,
+                publish_events=False,
+            ),
+        )
+        writer.update(40, "embedding", "Embedding batch 3/10...")
+        ...
+        writer.discard()  # before a status transition supersedes it
+    """
+
+    def __init__(
+        self,
+        analysis_id: str,
+        track: str,
+        persist: Callable[[int, str, str | None], None],
+        min_interval_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the writer.
+
+        Args:
+            analysis_id: UUID of the analysis (as string)
+            track: Status field prefix ("embeddings" or "ai_scan")
+            persist: Writes (progress, stage, message) to PostgreSQL
+            min_interval_seconds: Minimum time between Postgres writes
+                (defaults to settings.progress_flush_interval_seconds)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.analysis_id = analysis_id
+        self.track = track
+        self._persist = persist
+        self._min_interval = (
+            settings.progress_flush_interval_seconds
+            if min_interval_seconds is None
+            else min_interval_seconds
+        )
+        self._clock = clock
+        self._pending: PendingProgress | None = None
+        self._last_flush_at: float | None = None
+        self._last_flushed_stage: str | None = None
+        self.flush_count = 0
+
+    @property
+    def pending(self) -> PendingProgress | None:
+        """Progress recorded but not yet persisted."""
+        return self._pending
+
+    def update(self, progress: int, stage: str, message: str | None = None) -> bool:
+        """Record progress, publish it to Redis and persist it if due.
+
+        Args:
+            progress: Progress percentage (0-100)
+            stage: Current stage name
+            message: Human-readable progress message
+
+        Returns:
+            True if the update was written to PostgreSQL, False if coalesced
+        """
+        self._pending = PendingProgress(progress=progress, stage=stage, message=message)
+        self._publish_event(progress, stage)
+
+        if self._is_flush_due(stage):
+            return self.flush()
+        return False
+
+    def flush(self) -> bool:
+        """Persist the pending progress, if any.
+
+        Persistence errors are logged and swallowed; progress reporting
+        must never fail the task.
+
+        Returns:
+            True if a pending update was written, False if nothing was pending
+        """
+        if self._pending is None:
+            return False
+
+        pending, self._pending = self._pending, None
+        self._last_flush_at = self._clock()
+        self._last_flushed_stage = pending.stage
+        self.flush_count += 1
+
+        try:
+            self._persist(pending.progress, pending.stage, pending.message)
+        except Exception as e:
+            logger.warning(f"Failed to persist {self.track} progress for {self.analysis_id}: {e}")
+        return True
+
+    def discard(self) -> None:
+        """Drop pending progress that a status transition makes obsolete."""
+        self._pending = None
+
+    def _is_flush_due(self, stage: str) -> bool:
+        if self._last_flush_at is None or stage != self._last_flushed_stage:
+            return True
+        return self._clock() - self._last_flush_at >= self._min_interval
+
+    def _publish_event(self, progress: int, stage: str) -> None:
+        """Publish the progress event that AnalysisStateService would emit."""
+        from app.core.redis import publish_analysis_event
+
+        publish_analysis_event(
+            analysis_id=self.analysis_id,
+            event_type=f"{self.track}_progress_updated",
+            status_data={
+                f"{self.track}_status": "running",
+                f"{self.track}_progress": progress,
+                f"{self.track}_stage": stage,
+            },
+        )
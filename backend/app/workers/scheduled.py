@@ -31,10 +31,10 @@ def cleanup_stuck_analyses() -> dict:
     **Feature: heartbeat-stuck-detection**
     **Validates: Section 6.2 and 6.9 of analysis-status-contract.md**
     """
-    from app.api.v1.analyses import get_stuck_reason, is_analysis_stuck
     from app.core.config import settings
     from app.core.database import get_sync_session
     from app.models.analysis import Analysis
+    from app.services.analysis_state import get_stuck_reason, is_analysis_stuck
 
     logger.info(
         f"Starting stuck analyses cleanup (pending_timeout={settings.analysis_pending_stuck_minutes}min, "
@@ -141,84 +141,80 @@ def cleanup_stuck_analyses() -> dict:
     }
 
 
+# Repositories analyzed more recently than this are skipped by the daily sweep
+SWEEP_MIN_INTERVAL = timedelta(hours=12)
+
+
+def _analyzed_recently(repo, now: datetime) -> bool:
+    return bool(repo.last_analysis_at and now - repo.last_analysis_at < SWEEP_MIN_INTERVAL)
+
+
 @celery_app.task(name="app.workers.scheduled.analyze_all_repositories")
 def analyze_all_repositories() -> dict:
     """
     Analyze all active repositories.
 
-    This task runs daily via Celery Beat and queues analysis
-    for each active repository.
+    This task runs daily via Celery Beat. Instead of queueing every
+    repository at once, it schedules one queue_scheduled_analysis per
+    repository at a jittered offset within `analysis_sweep_window_minutes`,
+    interleaving owners so no single owner's repositories arrive as a burst.
+    The analyses run on the scheduled lane under the fairness caps in
+    app.workers.scheduling.
 
     Returns:
-        dict with statistics about queued analyses.
+        dict with statistics about scheduled analyses.
     """
+    from app.core.config import settings
     from app.core.database import get_sync_session
     from app.models.repository import Repository
-    from app.workers.analysis import analyze_repository
+    from app.workers.scheduling import LANE_SCHEDULED, interleave_by_owner, sweep_countdowns
 
     logger.info("Starting daily repository analysis sweep")
 
-    queued_count = 0
+    now = datetime.now(UTC)
     skipped_count = 0
-    error_count = 0
 
     try:
         with get_sync_session() as db:
-            # Get all active repositories
             result = db.execute(
-                select(Repository).where(Repository.is_active)
+                select(Repository.id, Repository.owner_id, Repository.last_analysis_at)
+                .where(Repository.is_active)
+                .order_by(Repository.id)
             )
-            repositories = result.scalars().all()
-
-            for repo in repositories:
-                try:
-                    # Skip if analyzed recently (within last 12 hours)
-                    if repo.last_analysis_at:
-                        time_since = datetime.now(UTC) - repo.last_analysis_at
-                        if time_since < timedelta(hours=12):
-                            logger.debug(
-                                f"Skipping repo {repo.id}: analyzed {time_since} ago"
-                            )
-                            skipped_count += 1
-                            continue
-
-                    # Create analysis record first
-                    from app.models.analysis import Analysis
-                    analysis = Analysis(
-                        repository_id=repo.id,
-                        commit_sha="HEAD",
-                        branch=repo.default_branch,
-                        status="pending",
-                    )
-                    db.add(analysis)
-                    db.flush()
-
-                    # Queue analysis task with analysis_id
-                    analyze_repository.delay(
-                        repository_id=str(repo.id),
-                        analysis_id=str(analysis.id),
-                        commit_sha=None,  # Analyze latest commit
-                        triggered_by="scheduled",
-                    )
-                    queued_count += 1
-                    logger.info(f"Queued analysis for repository {repo.id}")
-
-                except Exception as e:
-                    logger.error(f"Failed to queue analysis for repo {repo.id}: {e}")
-                    error_count += 1
-
-            # Commit all analysis records
-            db.commit()
-
+            due = []
+            for repo in result.all():
+                if _analyzed_recently(repo, now):
+                    logger.debug(f"Skipping repo {repo.id}: analyzed {now - repo.last_analysis_at} ago")
+                    skipped_count += 1
+                    continue
+                due.append(repo)
     except Exception as e:
         logger.error(f"Failed to run daily analysis sweep: {e}")
         raise
 
+    due = interleave_by_owner(due, lambda repo: repo.owner_id)
+    window_s = settings.analysis_sweep_window_minutes * 60
+    queued_count = 0
+    error_count = 0
+
+    for repo, countdown in zip(due, sweep_countdowns(len(due), window_s), strict=True):
+        try:
+            queue_scheduled_analysis.apply_async(
+                args=[str(repo.id)],
+                queue=LANE_SCHEDULED,
+                countdown=countdown,
+            )
+            queued_count += 1
+        except Exception as e:
+            logger.error(f"Failed to schedule analysis for repo {repo.id}: {e}")
+            error_count += 1
+
     result = {
         "status": "completed",
         "queued": queued_count,
         "skipped": skipped_count,
         "errors": error_count,
+        "window_seconds": window_s,
         "timestamp": datetime.now(UTC).isoformat(),
     }
 
@@ -226,6 +222,239 @@ def analyze_all_repositories() -> dict:
     return result
 
 
+@celery_app.task(name="app.workers.scheduled.queue_scheduled_analysis")
+def queue_scheduled_analysis(repository_id: str) -> dict:
+    """
+    Create and queue the scheduled analysis for one repository.
+
+    Runs at the offset chosen by analyze_all_repositories. The analysis
+    record is only created now, so a repository waiting for its slot in
+    the sweep window never shows up as a stale pending analysis, and
+    repositories analyzed (or deactivated) in the meantime are skipped.
+
+    The default branch head is resolved first (shared ref cache, then
+    git ls-remote); if that commit already has a completed or in-flight
+    analysis, nothing is queued.
+    """
+    from app.core.database import get_sync_session
+    from app.models.analysis import Analysis
+    from app.models.repository import Repository
+    from app.workers.helpers import find_analysis_for_commit, get_repo_url, resolve_branch_head_sha
+    from app.workers.scheduling import enqueue_analysis
+
+    with get_sync_session() as db:
+        repo = db.execute(
+            select(Repository).where(Repository.id == repository_id)
+        ).scalar_one_or_none()
+
+        if not repo or not repo.is_active:
+            return {"status": "skipped", "reason": "inactive", "repository_id": repository_id}
+        if _analyzed_recently(repo, datetime.now(UTC)):
+            return {"status": "skipped", "reason": "recently_analyzed", "repository_id": repository_id}
+        branch = repo.default_branch
+
+    repo_url, access_token = get_repo_url(repository_id)
+    head_sha = resolve_branch_head_sha(repository_id, repo_url, branch, access_token)
+
+    with get_sync_session() as db:
+        if head_sha:
+            existing = find_analysis_for_commit(db, repository_id, head_sha)
+            if existing:
+                logger.info(
+                    f"Skipping scheduled analysis for repository {repository_id}: "
+                    f"{branch}@{head_sha[:7]} already has analysis {existing.id} ({existing.status})"
+                )
+                return {
+                    "status": "skipped",
+                    "reason": "unchanged",
+                    "repository_id": repository_id,
+                    "commit_sha": head_sha,
+                    "analysis_id": str(existing.id),
+                }
+
+        analysis = Analysis(
+            repository_id=repository_id,
+            commit_sha=head_sha or "HEAD",
+            branch=branch,
+            status="pending",
+        )
+        db.add(analysis)
+        db.flush()
+        analysis_id = str(analysis.id)
+        db.commit()
+
+    enqueue_analysis(
+        repository_id=repository_id,
+        analysis_id=analysis_id,
+        commit_sha=head_sha,  # None analyzes the latest commit
+        triggered_by="scheduled",
+    )
+    logger.info(f"Queued scheduled analysis {analysis_id} for repository {repository_id}")
+
+    return {"status": "queued", "repository_id": repository_id, "analysis_id": analysis_id}
+
+
+def _supersede_push_analyses(db, analysis_ids: list[str], head_sha: str) -> list[str]:
+    """Cancel work not yet started for push-triggered analyses of older heads.
+
+    Pending analyses are marked failed; pending embeddings/AI scan tracks
+    (also of running analyses) are cancelled. Their tasks exit when they
+    start (see is_analysis_superseded). Static analyses already running
+    are left to finish.
+
+    Returns:
+        IDs of the analyses that were (partly) cancelled
+    """
+    from app.models.analysis import Analysis
+    from app.workers.helpers import SUPERSEDED_MESSAGE_PREFIX
+
+    if not analysis_ids:
+        return []
+
+    message = f"{SUPERSEDED_MESSAGE_PREFIX} ({head_sha[:7]})"
+    now = datetime.now(UTC)
+    superseded = []
+    analyses = db.execute(select(Analysis).where(Analysis.id.in_(analysis_ids))).scalars().all()
+    for analysis in analyses:
+        if analysis.commit_sha == head_sha:
+            continue
+        changed = False
+        if analysis.status == "pending":
+            analysis.status = "failed"
+            analysis.error_message = message
+            analysis.completed_at = now
+            changed = True
+        if analysis.embeddings_status == "pending":
+            analysis.embeddings_status = "failed"
+            analysis.embeddings_error = message
+            changed = True
+        if analysis.ai_scan_status == "pending":
+            analysis.ai_scan_status = "skipped"
+            analysis.ai_scan_message = message
+            changed = True
+        if changed:
+            analysis.state_updated_at = now
+            superseded.append(str(analysis.id))
+    return superseded
+
+
+@celery_app.task(name="app.workers.scheduled.flush_push_analysis")
+def flush_push_analysis(repository_id: str, branch: str) -> dict:
+    """
+    Analyze the newest head pushed to a repository in the last window.
+
+    Scheduled by the push webhook when a push opens a coalescing window
+    (``webhook_push_debounce_seconds``). Older push-triggered analyses
+    that have not started are superseded, and the newest head runs the
+    full pipeline (static analysis, embeddings and AI scan) unless it is
+    already covered.
+    """
+    from app.core.config import settings
+    from app.core.database import get_sync_session
+    from app.core.redis import publish_analysis_progress
+    from app.models.analysis import Analysis
+    from app.models.repository import Repository
+    from app.workers.ai_scan import run_ai_scan
+    from app.workers.embeddings import generate_embeddings_parallel
+    from app.workers.helpers import SUPERSEDED_MESSAGE_PREFIX, find_analysis_for_commit
+    from app.workers.scheduling import (
+        enqueue_analysis,
+        pop_push_analyses,
+        take_pushed_head,
+        track_push_analysis,
+    )
+
+    head_sha = take_pushed_head(repository_id)
+    if not head_sha:
+        return {"status": "skipped", "reason": "no_pending_push", "repository_id": repository_id}
+
+    tracked = pop_push_analyses(repository_id)
+
+    with get_sync_session() as db:
+        repo = db.execute(
+            select(Repository).where(Repository.id == repository_id)
+        ).scalar_one_or_none()
+        if not repo or not repo.is_active:
+            return {"status": "skipped", "reason": "inactive", "repository_id": repository_id}
+
+        superseded = _supersede_push_analyses(db, tracked, head_sha)
+
+        existing = find_analysis_for_commit(db, repository_id, head_sha)
+        analysis_id = None
+        if not existing:
+            analysis = Analysis(
+                repository_id=repository_id,
+                commit_sha=head_sha,
+                branch=branch,
+                status="pending",
+                embeddings_status="pending",
+                ai_scan_status="pending" if settings.ai_scan_enabled else "skipped",
+            )
+            db.add(analysis)
+            db.flush()
+            analysis_id = str(analysis.id)
+        db.commit()
+
+    for superseded_id in superseded:
+        logger.info(f"Analysis {superseded_id} superseded by push of {head_sha[:7]}")
+        publish_analysis_progress(
+            analysis_id=superseded_id,
+            stage="failed",
+            progress=0,
+            message=f"{SUPERSEDED_MESSAGE_PREFIX} ({head_sha[:7]})",
+            status="failed",
+        )
+
+    # Still-running analyses stay tracked so a later push can cancel their pending tracks
+    for tracked_id in tracked:
+        if tracked_id not in superseded:
+            track_push_analysis(repository_id, tracked_id)
+
+    if existing:
+        logger.info(
+            f"Push head {head_sha[:7]} of repository {repository_id} already has "
+            f"analysis {existing.id} ({existing.status}), not re-analyzing"
+        )
+        return {
+            "status": "skipped",
+            "reason": "commit already analyzed",
+            "repository_id": repository_id,
+            "analysis_id": str(existing.id),
+            "commit_sha": head_sha,
+            "superseded": superseded,
+        }
+
+    track_push_analysis(repository_id, analysis_id)
+
+    # Full pipeline for the newest head: static analysis on the webhook lane,
+    # embeddings and AI scan on their own queues
+    enqueue_analysis(
+        repository_id=repository_id,
+        analysis_id=analysis_id,
+        commit_sha=head_sha,
+        triggered_by="webhook",
+    )
+    generate_embeddings_parallel.delay(
+        repository_id=repository_id,
+        analysis_id=analysis_id,
+        commit_sha=head_sha,
+    )
+    if settings.ai_scan_enabled:
+        run_ai_scan.delay(analysis_id=analysis_id)
+
+    logger.info(
+        f"Queued push analysis {analysis_id} for repository {repository_id} at {head_sha[:7]}"
+        f" ({len(superseded)} superseded)"
+    )
+    return {
+        "status": "queued",
+        "repository_id": repository_id,
+        "analysis_id": analysis_id,
+        "commit_sha": head_sha,
+        "superseded": superseded,
+    }
+
+
 @celery_app.task(name="app.workers.scheduled.cleanup_old_data")
 def cleanup_old_data() -> dict:
     """
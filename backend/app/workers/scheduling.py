@@ -0,0 +1,308 @@
+"""Priority lanes and fairness for analysis work.
+
+Analyses are routed to one of three Celery queues by trigger:
+
+- ``analysis``: manual runs and initial connects (a user is waiting)
+- ``analysis_webhook``: push webhooks
+- ``analysis_scheduled``: the daily sweep
+
+Workers consume all three, so background lanes can no longer bury
+interactive requests in one FIFO. On top of that, webhook and scheduled
+analyses must hold Redis-backed slots before they run: one per owner
+(``analysis_owner_max_concurrency``) and, for scheduled work, one of a
+global pool (``analysis_scheduled_max_concurrency``) so the sweep never
+occupies every worker process. Capped analyses are re-queued with a
+jittered countdown instead of blocking a worker.
+
+Push webhooks are also coalesced per repository (see "Push coalescing"),
+so a burst of merges yields one analysis of the newest head.
+"""
+
+import logging
+import random
+import time
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, TypeVar
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import get_sync_session
+from app.core.redis import get_sync_redis_context
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LANE_INTERACTIVE = "analysis"
+LANE_WEBHOOK = "analysis_webhook"
+LANE_SCHEDULED = "analysis_scheduled"
+ANALYSIS_LANES = (LANE_INTERACTIVE, LANE_WEBHOOK, LANE_SCHEDULED)
+
+_LANE_BY_TRIGGER = {
+    "manual": LANE_INTERACTIVE,
+    "connect": LANE_INTERACTIVE,
+    "webhook": LANE_WEBHOOK,
+    "scheduled": LANE_SCHEDULED,
+}
+
+# Slots expire on their own if a worker dies without releasing them;
+# slightly longer than the Celery hard time limit
+SLOT_TTL_SECONDS = 35 * 60
+
+SCHEDULED_LANE_SLOT_KEY = "analysis:slots:lane:scheduled"
+
+
+def lane_for(triggered_by: str) -> str:
+    """Queue for an analysis trigger (unknown triggers are interactive)."""
+    return _LANE_BY_TRIGGER.get(triggered_by, LANE_INTERACTIVE)
+
+
+def enqueue_analysis(
+    repository_id: str,
+    analysis_id: str,
+    commit_sha: str | None,
+    triggered_by: str,
+    countdown: float | None = None,
+):
+    """Queue analyze_repository on the lane for ``triggered_by``."""
+    from app.workers.analysis import analyze_repository
+
+    return analyze_repository.apply_async(
+        kwargs={
+            "repository_id": repository_id,
+            "analysis_id": analysis_id,
+            "commit_sha": commit_sha,
+            "triggered_by": triggered_by,
+        },
+        queue=lane_for(triggered_by),
+        countdown=countdown,
+    )
+
+
+# =============================================================================
+# Concurrency slots
+# =============================================================================
+
+
+def owner_slot_key(owner_id: str) -> str:
+    return f"analysis:slots:owner:{owner_id}"
+
+
+def try_acquire_slot(
+    redis_client,
+    key: str,
+    holder: str,
+    limit: int,
+    ttl_s: int = SLOT_TTL_SECONDS,
+    now: float | None = None,
+) -> bool:
+    """Take one of ``limit`` slots in the sorted set at ``key``.
+
+    Members are holders scored by expiry time; expired members do not
+    count. Re-acquiring a held slot refreshes it. Uses WATCH/MULTI so
+    concurrent workers cannot overshoot the limit.
+    """
+    now = time.time() if now is None else now
+    acquired = False
+
+    def _acquire(pipe) -> None:
+        nonlocal acquired
+        held = pipe.zscore(key, holder) is not None
+        if not held and pipe.zcount(key, f"({now}", "+inf") >= limit:
+            acquired = False
+            return
+        pipe.multi()
+        pipe.zremrangebyscore(key, "-inf", now)
+        pipe.zadd(key, {holder: now + ttl_s})
+        pipe.expire(key, ttl_s)
+        acquired = True
+
+    redis_client.transaction(_acquire, key)
+    return acquired
+
+
+def release_slot(redis_client, key: str, holder: str) -> None:
+    redis_client.zrem(key, holder)
+
+
+def get_repo_owner_id(repository_id: str) -> str | None:
+    from app.models.repository import Repository
+
+    with get_sync_session() as db:
+        owner_id = db.execute(
+            select(Repository.owner_id).where(Repository.id == repository_id)
+        ).scalar_one_or_none()
+    return str(owner_id) if owner_id else None
+
+
+def acquire_analysis_slots(
+    analysis_id: str,
+    owner_id: str | None,
+    triggered_by: str,
+) -> list[str] | None:
+    """Acquire the fairness slots an analysis needs before it may run.
+
+    Interactive lanes need none. Redis errors fail open (no caps).
+
+    Returns:
+        Keys of the acquired slots (pass to release_analysis_slots), or
+        None if a cap is reached; partial acquisitions are rolled back.
+    """
+    lane = lane_for(triggered_by)
+    if lane == LANE_INTERACTIVE:
+        return []
+
+    wanted: list[tuple[str, int]] = []
+    if owner_id:
+        wanted.append((owner_slot_key(owner_id), settings.analysis_owner_max_concurrency))
+    if lane == LANE_SCHEDULED:
+        wanted.append((SCHEDULED_LANE_SLOT_KEY, settings.analysis_scheduled_max_concurrency))
+
+    acquired: list[str] = []
+    try:
+        with get_sync_redis_context() as redis_client:
+            for key, limit in wanted:
+                if not try_acquire_slot(redis_client, key, analysis_id, limit):
+                    for held in acquired:
+                        release_slot(redis_client, held, analysis_id)
+                    return None
+                acquired.append(key)
+    except RedisError as e:
+        logger.warning(f"Concurrency slots unavailable for analysis {analysis_id}, running uncapped: {e}")
+        return []
+    return acquired
+
+
+def release_analysis_slots(analysis_id: str, keys: list[str]) -> None:
+    if not keys:
+        return
+    try:
+        with get_sync_redis_context() as redis_client:
+            for key in keys:
+                release_slot(redis_client, key, analysis_id)
+    except RedisError as e:
+        # Slots expire after SLOT_TTL_SECONDS anyway
+        logger.warning(f"Failed to release concurrency slots for analysis {analysis_id}: {e}")
+
+
+# =============================================================================
+# Push coalescing
+# =============================================================================
+#
+# A push to the default branch opens a per-repository window of
+# ``webhook_push_debounce_seconds`` and schedules one flush for its end;
+# later pushes in the window only move the recorded head. The flush
+# analyzes the newest head and supersedes the repository's older
+# push-triggered analyses that have not started yet.
+
+# Head and tracked analyses outlive a backed-up queue; the window key only
+# needs to outlive its flush
+PUSH_STATE_TTL_SECONDS = 24 * 3600
+PUSH_WINDOW_GRACE_SECONDS = 300
+
+
+def _push_head_key(repository_id: str) -> str:
+    return f"analysis:push:head:{repository_id}"
+
+
+def _push_window_key(repository_id: str) -> str:
+    return f"analysis:push:window:{repository_id}"
+
+
+def _push_analyses_key(repository_id: str) -> str:
+    return f"analysis:push:analyses:{repository_id}"
+
+
+def record_push(repository_id: str, commit_sha: str) -> bool:
+    """Record the newest pushed head of a repository.
+
+    Raises RedisError if Redis is unavailable (callers fall back to
+    analyzing the push directly).
+
+    Returns:
+        True if this push opened a window; the caller schedules
+        flush_push_analysis for its end
+    """
+    window_ttl = settings.webhook_push_debounce_seconds + PUSH_WINDOW_GRACE_SECONDS
+    with get_sync_redis_context() as redis_client:
+        pipe = redis_client.pipeline()
+        pipe.set(_push_head_key(repository_id), commit_sha, ex=PUSH_STATE_TTL_SECONDS)
+        pipe.set(_push_window_key(repository_id), commit_sha, nx=True, ex=window_ttl)
+        _, opened = pipe.execute()
+    return bool(opened)
+
+
+def take_pushed_head(repository_id: str) -> str | None:
+    """Close the repository's push window and return its newest head.
+
+    Pushes arriving after this open a new window.
+    """
+    with get_sync_redis_context() as redis_client:
+        pipe = redis_client.pipeline()
+        pipe.delete(_push_window_key(repository_id))
+        pipe.get(_push_head_key(repository_id))
+        pipe.delete(_push_head_key(repository_id))
+        _, head, _ = pipe.execute()
+    return str(head) if head is not None else None
+
+
+def track_push_analysis(repository_id: str, analysis_id: str) -> None:
+    """Remember a push-triggered analysis so a newer push can supersede it."""
+    with get_sync_redis_context() as redis_client:
+        pipe = redis_client.pipeline()
+        pipe.sadd(_push_analyses_key(repository_id), analysis_id)
+        pipe.expire(_push_analyses_key(repository_id), PUSH_STATE_TTL_SECONDS)
+        pipe.execute()
+
+
+def pop_push_analyses(repository_id: str) -> list[str]:
+    """Take the push-triggered analyses recorded for a repository."""
+    with get_sync_redis_context() as redis_client:
+        pipe = redis_client.pipeline()
+        pipe.smembers(_push_analyses_key(repository_id))
+        pipe.delete(_push_analyses_key(repository_id))
+        members, _ = pipe.execute()
+    return sorted(str(m) for m in members)
+
+
+def defer_countdown(rng: random.Random | None = None) -> float:
+    """Jittered re-queue delay for a capped analysis."""
+    rng = rng or random
+    return settings.analysis_defer_seconds * rng.uniform(0.5, 1.5)
+
+
+# =============================================================================
+# Scheduled sweep
+# =============================================================================
+
+
+def interleave_by_owner(items: Sequence[T], owner_of: Callable[[T], Hashable]) -> list[T]:
+    """Round-robin ``items`` across owners, keeping each owner's order.
+
+    An owner with many repositories then gets spread over the whole sweep
+    window instead of a contiguous burst.
+    """
+    by_owner: dict[Any, list[T]] = defaultdict(list)
+    for item in items:
+        by_owner[owner_of(item)].append(item)
+    queues = list(by_owner.values())
+    result: list[T] = []
+    for round_index in range(max((len(q) for q in queues), default=0)):
+        result.extend(q[round_index] for q in queues if round_index < len(q))
+    return result
+
+
+def sweep_countdowns(count: int, window_s: float, rng: random.Random | None = None) -> list[float]:
+    """Countdowns spreading ``count`` dispatches over ``window_s`` seconds.
+
+    The window is cut into equal slots with one dispatch at a random
+    offset inside each, so load is even but never lock-stepped.
+    """
+    if count <= 0:
+        return []
+    rng = rng or random
+    step = max(0.0, window_s) / count
+    return [(i + rng.random()) * step for i in range(count)]
@@ -0,0 +1,16 @@
+"""Performance benchmarks on synthetic repositories.
+
+Runs the analysis hot paths (chunking, call graph, repo view, static
+analysis, embedding pipeline, clustering, content cache) against a
+generated repository, using local stand-ins instead of external
+services: Qdrant local mode, in-memory object storage and the
+deterministic stub LLM/embedding providers.
+
+Usage (from backend/):
+    python -m benchmarks --files 500 --languages python,typescript,javascript
+    python -m benchmarks --only chunker,call_graph --output bench.json
+    python -m benchmarks --baseline bench.json   # exit 1 on regression
+
+Regression limits (allowed current/baseline ratios) live in
+benchmarks/thresholds.json.
+"""
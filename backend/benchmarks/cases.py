@@ -0,0 +1,157 @@
+"""Benchmark cases.
+
+Each case has an untimed ``setup`` and a timed ``run``; ``run`` returns
+the number of items processed (files or chunks) for throughput.
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID, uuid5
+
+from benchmarks.stand_ins import (
+    InMemoryObjectStorage,
+    RecordingAsyncSession,
+    content_cache_record,
+    create_local_qdrant,
+    create_stub_gateway,
+    local_embedding_worker,
+)
+from benchmarks.synthetic_repo import SyntheticRepo
+
+# Stable repository id so vector point ids are reproducible
+_BENCH_NAMESPACE = UUID("6f1c1f55-8d5e-4c38-9a55-0b3b6a1d2f00")
+
+
+@dataclass
+class BenchContext:
+    """State shared by the setup and run phases of one case."""
+
+    repo: SyntheticRepo
+    state: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def repository_id(self) -> str:
+        return str(uuid5(_BENCH_NAMESPACE, self.repo.commit_sha))
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    unit: str
+    run: Callable[[BenchContext], int]
+    setup: Callable[[BenchContext], None] = lambda ctx: None
+    description: str = ""
+
+
+# =============================================================================
+# Setup helpers
+# =============================================================================
+
+
+def _collect_files(ctx: BenchContext) -> None:
+    from app.workers.helpers import collect_files_for_embedding
+
+    ctx.state["files"] = collect_files_for_embedding(ctx.repo.path)
+
+
+def _setup_embedding_pipeline(ctx: BenchContext) -> None:
+    _collect_files(ctx)
+    ctx.state["qdrant"] = create_local_qdrant()
+    ctx.state["gateway"] = create_stub_gateway()
+
+
+def _setup_cluster_analyzer(ctx: BenchContext) -> None:
+    _setup_embedding_pipeline(ctx)
+    _run_embedding_pipeline(ctx)
+
+
+# =============================================================================
+# Timed runs
+# =============================================================================
+
+
+def _run_chunker(ctx: BenchContext) -> int:
+    from app.services.code_chunker import CodeChunker
+
+    chunker = CodeChunker()
+    chunks = 0
+    for file_info in ctx.state["files"]:
+        chunks += len(chunker.chunk_file(file_info["path"], file_info["content"]))
+    ctx.state["chunks"] = chunks
+    return len(ctx.state["files"])
+
+
+def _run_call_graph(ctx: BenchContext) -> int:
+    from app.services.call_graph_analyzer import CallGraphAnalyzer
+
+    graph = CallGraphAnalyzer().analyze(ctx.repo.path)
+    ctx.state["nodes"] = len(graph.nodes)
+    return len(ctx.repo.files)
+
+
+def _run_repo_view(ctx: BenchContext) -> int:
+    from app.services.repo_view_generator import RepoViewGenerator, _repo_view_memo
+
+    _repo_view_memo.clear()
+    view = RepoViewGenerator(ctx.repo.path, commit_sha=ctx.repo.commit_sha).generate()
+    return view.files_included
+
+
+def _run_repo_analyzer(ctx: BenchContext) -> int:
+    from app.services.repo_analyzer import RepoAnalyzer
+
+    with RepoAnalyzer(str(ctx.repo.path)) as analyzer:
+        result = analyzer.analyze()
+    return result.metrics["total_files"]
+
+
+def _run_embedding_pipeline(ctx: BenchContext) -> int:
+    with local_embedding_worker(ctx.state["qdrant"], ctx.state["gateway"]) as task:
+        result = task.run(ctx.repository_id, ctx.repo.commit_sha, files=ctx.state["files"])
+    if result.get("status") != "completed":
+        raise RuntimeError(f"Embedding pipeline failed: {result}")
+    return result["chunks_processed"]
+
+
+def _run_cluster_analyzer(ctx: BenchContext) -> int:
+    from app.services.cluster_analyzer import ClusterAnalyzer
+
+    health = asyncio.run(
+        ClusterAnalyzer(qdrant_client=ctx.state["qdrant"]).analyze(
+            ctx.repository_id, commit_sha=ctx.repo.commit_sha,
+        )
+    )
+    return health.total_chunks
+
+
+def _run_content_cache(ctx: BenchContext) -> int:
+    from app.services.repo_content import RepoContentService
+
+    service = RepoContentService(storage_client=InMemoryObjectStorage())
+    files = service.collect_files_from_repo(ctx.repo.path)
+    cache = content_cache_record(UUID(ctx.repository_id), ctx.repo.commit_sha)
+    result = asyncio.run(service.upload_files(RecordingAsyncSession(), cache, files))
+    return result.uploaded
+
+
+BENCHMARKS: dict[str, BenchmarkCase] = {
+    case.name: case
+    for case in (
+        BenchmarkCase("chunker", "files", _run_chunker, _collect_files,
+                      "CodeChunker.chunk_file over every code file"),
+        BenchmarkCase("call_graph", "files", _run_call_graph,
+                      description="CallGraphAnalyzer.analyze"),
+        BenchmarkCase("repo_view", "files", _run_repo_view,
+                      description="RepoViewGenerator.generate (memo cleared)"),
+        BenchmarkCase("repo_analyzer", "files", _run_repo_analyzer,
+                      description="RepoAnalyzer.analyze (local clone, radon + lizard)"),
+        BenchmarkCase("embedding_pipeline", "chunks", _run_embedding_pipeline, _setup_embedding_pipeline,
+                      "generate_embeddings: chunk, stub-embed, upsert into local Qdrant"),
+        BenchmarkCase("cluster_analyzer", "chunks", _run_cluster_analyzer, _setup_cluster_analyzer,
+                      "ClusterAnalyzer.analyze over the stub-embedded vectors"),
+        BenchmarkCase("content_cache", "files", _run_content_cache,
+                      description="RepoContentService collect + upload to in-memory object storage"),
+    )
+}
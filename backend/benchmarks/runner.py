@@ -0,0 +1,248 @@
+"""Benchmark runner: timing, peak RSS, JSON reports and regression checks.
+
+Each case runs in a fresh spawned interpreter (unless ``--no-isolate``)
+so its peak RSS is not inflated by earlier cases. Timings are the best
+and median of ``--repeat`` runs after an untimed setup.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from benchmarks.cases import BENCHMARKS, BenchContext
+from benchmarks.synthetic_repo import (
+    SUPPORTED_LANGUAGES,
+    SyntheticRepo,
+    SyntheticRepoSpec,
+    generate_synthetic_repo,
+)
+
+DEFAULT_THRESHOLDS_PATH = Path(__file__).with_name("thresholds.json")
+
+# Metrics compared against a baseline (higher is worse for all of them)
+COMPARED_METRICS = ("seconds_min", "peak_rss_mb")
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    unit: str
+    items: int
+    seconds_min: float
+    seconds_median: float
+    throughput_per_s: float
+    peak_rss_mb: float
+    rss_growth_mb: float
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _current_rss_mb() -> float:
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, IndexError, ValueError):
+        return _peak_rss_mb()
+
+
+def run_case(name: str, repo: SyntheticRepo, repeat: int = 3) -> BenchmarkResult:
+    """Run one case in the current process."""
+    logging.getLogger().setLevel(logging.WARNING)
+    case = BENCHMARKS[name]
+    ctx = BenchContext(repo=repo)
+    case.setup(ctx)
+    gc.collect()
+    rss_before = _current_rss_mb()
+
+    timings = []
+    items = 0
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        items = case.run(ctx)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    peak = _peak_rss_mb()
+    return BenchmarkResult(
+        name=name,
+        unit=case.unit,
+        items=items,
+        seconds_min=round(best, 4),
+        seconds_median=round(statistics.median(timings), 4),
+        throughput_per_s=round(items / best, 2) if best > 0 else 0.0,
+        peak_rss_mb=round(peak, 1),
+        rss_growth_mb=round(max(0.0, peak - rss_before), 1),
+    )
+
+
+def _run_case_isolated(name: str, repo: SyntheticRepo, repeat: int) -> BenchmarkResult:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_case, name, repo, repeat).result()
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(
+    spec: SyntheticRepoSpec,
+    names: list[str] | None = None,
+    repeat: int = 3,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """Generate a synthetic repository and run the selected cases.
+
+    Returns:
+        Report dict with ``meta`` and per-case ``results``
+    """
+    names = names or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {unknown}. Available: {list(BENCHMARKS)}")
+
+    with tempfile.TemporaryDirectory(prefix="n9r_bench_") as tmp:
+        repo = generate_synthetic_repo(Path(tmp) / "repo", spec)
+        results = {}
+        for name in names:
+            runner = _run_case_isolated if isolate else run_case
+            results[name] = asdict(runner(name, repo, repeat))
+
+    return {
+        "meta": {
+            "generated_at": datetime.now(UTC).isoformat(),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "spec": spec.to_dict(),
+            "repo": {
+                "files": len(repo.files),
+                "functions": repo.function_count,
+                "duplicated_functions": repo.duplicated_functions,
+                "calls": repo.call_count,
+            },
+        },
+        "results": results,
+    }
+
+
+def load_thresholds(path: Path = DEFAULT_THRESHOLDS_PATH) -> dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def compare_to_baseline(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    thresholds: dict[str, Any],
+) -> list[str]:
+    """List regressions of ``report`` against ``baseline``.
+
+    A metric regresses when current / baseline exceeds its allowed ratio
+    (per-case overrides in ``thresholds["cases"]``, else ``thresholds["default"]``).
+    Cases missing from the baseline are skipped.
+    """
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        limits = {**thresholds.get("default", {}), **thresholds.get("cases", {}).get(name, {})}
+        for metric in COMPARED_METRICS:
+            allowed = limits.get(metric)
+            before, after = previous.get(metric), current.get(metric)
+            if not allowed or not before or after is None:
+                continue
+            ratio = after / before
+            if ratio > allowed:
+                regressions.append(
+                    f"{name}.{metric}: {before} -> {after} ({ratio:.2f}x, allowed {allowed:.2f}x)"
+                )
+    return regressions
+
+
+def _format_table(report: dict[str, Any]) -> str:
+    header = f"{'benchmark':<20} {'items':>7} {'best s':>9} {'median s':>9} {'throughput':>16} {'peak RSS MB':>12}"
+    lines = [header, "-" * len(header)]
+    for name, r in report["results"].items():
+        throughput = f"{r['throughput_per_s']:.1f} {r['unit']}/s"
+        lines.append(
+            f"{name:<20} {r['items']:>7} {r['seconds_min']:>9.3f} {r['seconds_median']:>9.3f} "
+            f"{throughput:>16} {r['peak_rss_mb']:>12.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--files", type=int, default=200, help="Synthetic source files")
+    parser.add_argument("--languages", default="python,typescript",
+                        help=f"Comma-separated subset of {','.join(SUPPORTED_LANGUAGES)}")
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--duplication", type=float, default=0.1, help="Duplicated function rate (0-1)")
+    parser.add_argument("--call-density", type=float, default=1.5, help="Average calls per function")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--only", help=f"Comma-separated subset of {','.join(BENCHMARKS)}")
+    parser.add_argument("--no-isolate", action="store_true", help="Run all cases in this process")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Previous JSON report to compare against")
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    spec = SyntheticRepoSpec(
+        file_count=args.files,
+        languages=tuple(lang.strip() for lang in args.languages.split(",") if lang.strip()),
+        functions_per_file=args.functions_per_file,
+        duplication_rate=args.duplication,
+        call_density=args.call_density,
+        seed=args.seed,
+    )
+    names = [n.strip() for n in args.only.split(",")] if args.only else None
+
+    report = run_benchmarks(spec, names=names, repeat=args.repeat, isolate=not args.no_isolate)
+    print(_format_table(report))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("meta", {}).get("spec") != report["meta"]["spec"]:
+            print("\nBaseline was recorded with a different synthetic repo spec; not comparing.")
+            return 0
+        regressions = compare_to_baseline(report, baseline, load_thresholds(args.thresholds))
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+
+    return 0
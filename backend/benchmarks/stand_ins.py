@@ -0,0 +1,122 @@
+"""Local stand-ins for external services used by the benchmarks.
+
+- Qdrant: qdrant-client local mode (in-process, in-memory)
+- MinIO: InMemoryObjectStorage implementing ObjectStorageClient
+- PostgreSQL (content cache bookkeeping): a minimal AsyncSession stand-in
+- LLM / embeddings: LLMGateway wired to the deterministic stub providers
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+from uuid import uuid4
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+from app.services.llm_gateway import LLMGateway
+from app.services.llm_stub import StubEmbeddingProvider, StubModel, StubProvider
+from app.services.object_storage import ObjectStorageClient
+from app.services.vector_store import COLLECTION_NAME
+
+EMBEDDING_DIMENSIONS = 256
+
+
+def create_local_qdrant(dimensions: int = EMBEDDING_DIMENSIONS) -> QdrantClient:
+    """In-memory Qdrant with the code embeddings collection created."""
+    client = QdrantClient(location=":memory:")
+    client.create_collection(
+        collection_name=COLLECTION_NAME,
+        vectors_config=VectorParams(size=dimensions, distance=Distance.COSINE),
+    )
+    return client
+
+
+def create_stub_gateway(
+    embedder: StubEmbeddingProvider | None = None,
+    models: dict[str, StubModel] | None = None,
+) -> LLMGateway:
+    """LLMGateway backed by deterministic stub providers."""
+    provider = StubProvider(models or {LLMGateway.DEFAULT_MODELS["chat"]: StubModel()})
+    return LLMGateway(
+        completion_fn=provider.acompletion,
+        cost_fn=provider.completion_cost,
+        embedding_fn=(embedder or StubEmbeddingProvider(dimensions=EMBEDDING_DIMENSIONS)).aembedding,
+    )
+
+
+class InMemoryObjectStorage(ObjectStorageClient):
+    """Dict-backed object storage (MinIO stand-in)."""
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+
+    async def put_object(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        self.objects[(bucket, key)] = bytes(data)
+
+    async def get_object(self, bucket: str, key: str) -> bytes | None:
+        return self.objects.get((bucket, key))
+
+    async def delete_object(self, bucket: str, key: str) -> None:
+        self.objects.pop((bucket, key), None)
+
+    async def object_exists(self, bucket: str, key: str) -> bool:
+        return (bucket, key) in self.objects
+
+    async def list_objects(self, bucket: str, prefix: str = "") -> list[str]:
+        return sorted(k for b, k in self.objects if b == bucket and k.startswith(prefix))
+
+
+class _EmptyResult:
+    def all(self) -> list[Any]:
+        return []
+
+    def scalar_one_or_none(self) -> None:
+        return None
+
+
+class RecordingAsyncSession:
+    """AsyncSession stand-in that records added rows and returns empty results."""
+
+    def __init__(self):
+        self.added: list[Any] = []
+
+    async def execute(self, statement: Any) -> _EmptyResult:
+        return _EmptyResult()
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    async def flush(self) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+@contextmanager
+def local_embedding_worker(qdrant: QdrantClient, gateway: LLMGateway):
+    """Run the embeddings worker against local stand-ins.
+
+    Redirects the worker's Qdrant client, LLM gateway and Redis progress
+    publishing; Celery state updates become no-ops.
+    """
+    from app.workers.embeddings import generate_embeddings
+
+    with patch("app.workers.embeddings.get_qdrant_client", return_value=qdrant), \
+            patch("app.services.llm_gateway.get_llm_gateway", return_value=gateway), \
+            patch("app.workers.embeddings.publish_embedding_progress"), \
+            patch.object(generate_embeddings, "update_state"):
+        yield generate_embeddings
+
+
+def content_cache_record(repository_id: Any, commit_sha: str) -> SimpleNamespace:
+    """Stand-in for a RepoContentCache row."""
+    return SimpleNamespace(id=uuid4(), repository_id=repository_id, commit_sha=commit_sha)
@@ -0,0 +1,318 @@
+"""Deterministic synthetic repository generator.
+
+Produces a git repository with Python, TypeScript and/or JavaScript
+modules spread over a few architectural layers. Functions call each
+other (with cross-module imports) at a configurable density, and a
+configurable fraction of function bodies are copies of earlier ones, so
+call graph, clustering and duplicate detection have realistic work to do.
+
+The same spec and seed always produce the same files and commit SHA.
+"""
+
+import os
+import random
+import subprocess
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+SUPPORTED_LANGUAGES = ("python", "typescript", "javascript")
+
+# Architectural layers; each gets its own vocabulary so embeddings cluster
+LAYERS: dict[str, tuple[str, ...]] = {
+    "api": ("request", "response", "route", "handler", "payload", "status"),
+    "services": ("order", "invoice", "customer", "billing", "discount", "ledger"),
+    "models": ("record", "schema", "field", "column", "entity", "relation"),
+    "utils": ("string", "buffer", "format", "parse", "encode", "digest"),
+    "core": ("config", "session", "cache", "queue", "token", "registry"),
+}
+
+VERBS = ("load", "save", "build", "check", "merge", "render", "compute", "sync")
+
+_EXTENSIONS = {"python": ".py", "typescript": ".ts", "javascript": ".js"}
+
+# Fixed identity/dates so the commit SHA is reproducible
+_GIT_ENV = {
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+    "GIT_AUTHOR_DATE": "2024-01-01T00:00:00Z",
+    "GIT_COMMITTER_DATE": "2024-01-01T00:00:00Z",
+}
+
+
+@dataclass(frozen=True)
+class SyntheticRepoSpec:
+    """Shape of a synthetic repository.
+
+    Attributes:
+        file_count: Number of source modules (entry points excluded)
+        languages: Languages to generate, split round-robin across files
+        functions_per_file: Functions defined per module
+        duplication_rate: Fraction of functions whose body copies an earlier one
+        call_density: Average outgoing calls per function
+        lines_per_function: Approximate body length
+        seed: Random seed
+    """
+
+    file_count: int = 200
+    languages: tuple[str, ...] = ("python", "typescript")
+    functions_per_file: int = 8
+    duplication_rate: float = 0.1
+    call_density: float = 1.5
+    lines_per_function: int = 12
+    seed: int = 0
+
+    def __post_init__(self):
+        unknown = set(self.languages) - set(SUPPORTED_LANGUAGES)
+        if unknown or not self.languages:
+            raise ValueError(f"languages must be a non-empty subset of {SUPPORTED_LANGUAGES}")
+        if not 0.0 <= self.duplication_rate <= 1.0:
+            raise ValueError("duplication_rate must be between 0 and 1")
+        if self.file_count < 1 or self.functions_per_file < 1:
+            raise ValueError("file_count and functions_per_file must be positive")
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["languages"] = list(self.languages)
+        return data
+
+
+@dataclass
+class SyntheticRepo:
+    """A generated repository on disk."""
+
+    path: Path
+    spec: SyntheticRepoSpec
+    commit_sha: str
+    files: list[str] = field(default_factory=list)
+    function_count: int = 0
+    duplicated_functions: int = 0
+    call_count: int = 0
+
+
+@dataclass
+class _Function:
+    name: str
+    language: str
+    module: str  # Python dotted module or TS/JS path without extension
+    path: str
+    layer: str
+    calls: list["_Function"] = field(default_factory=list)
+    body_of: "_Function | None" = None  # Duplicated from
+
+
+def _module_for(language: str, layer: str, index: int) -> tuple[str, str]:
+    """Return (module id, repo-relative path) for a generated module."""
+    if language == "python":
+        return f"pkg.{layer}.mod_{index}", f"pkg/{layer}/mod_{index}.py"
+    root = "web/src" if language == "typescript" else "web/lib"
+    return f"{root}/{layer}/mod_{index}", f"{root}/{layer}/mod_{index}{_EXTENSIONS[language]}"
+
+
+def _body_lines(fn: _Function, rng: random.Random, lines: int) -> list[tuple[str, int]]:
+    """Language-neutral (variable, constant) assignments for a function body."""
+    words = LAYERS[fn.layer]
+    return [
+        (f"{words[rng.randrange(len(words))]}_{i}", rng.randrange(1, 100))
+        for i in range(max(1, lines - 8))
+    ]
+
+
+def _render_python(fn: _Function, body: list[tuple[str, int]], threshold: int, factor: int) -> list[str]:
+    words = LAYERS[fn.layer]
+    lines = [
+        f"def {fn.name}(items, limit={threshold}):",
+        f'    """{fn.name.split("_")[1].capitalize()} {words[0]} {words[1]} data for the {fn.layer} layer."""',
+        "    total = 0",
+        "    for item in items:",
+        "        if item > limit:",
+        f"            total += item * {factor}",
+        "        else:",
+        "            total -= 1",
+    ]
+    for name, value in body:
+        lines.append(f"    {name} = total + {value}")
+    for i, callee in enumerate(fn.calls):
+        lines.append(f"    result_{i} = {callee.name}(items, limit)")
+        lines.append(f"    total += result_{i}")
+    lines.append("    return total")
+    return lines
+
+
+def _render_js(fn: _Function, body: list[tuple[str, int]], threshold: int, factor: int) -> list[str]:
+    typed = fn.language == "typescript"
+    words = LAYERS[fn.layer]
+    signature = (
+        f"export function {fn.name}(items: number[], limit = {threshold}): number {{"
+        if typed else f"export function {fn.name}(items, limit = {threshold}) {{"
+    )
+    lines = [
+        f"/** {fn.name.split('_')[1].capitalize()} {words[0]} {words[1]} data for the {fn.layer} layer. */",
+        signature,
+        "  let total = 0;",
+        "  for (const item of items) {",
+        "    if (item > limit) {",
+        f"      total += item * {factor};",
+        "    } else {",
+        "      total -= 1;",
+        "    }",
+        "  }",
+    ]
+    for name, value in body:
+        lines.append(f"  const {name} = total + {value};")
+    for callee in fn.calls:
+        lines.append(f"  total += {callee.name}(items, limit);")
+    lines.append("  return total;")
+    lines.append("}")
+    return lines
+
+
+def _import_line(importer: _Function, callee: _Function, names: list[str]) -> str:
+    joined = ", ".join(sorted(names))
+    if importer.language == "python":
+        return f"from {callee.module} import {joined}"
+    rel = os.path.relpath(callee.module, os.path.dirname(importer.module))
+    if not rel.startswith("."):
+        rel = f"./{rel}"
+    return f"import {{ {joined} }} from '{rel}';"
+
+
+def generate_synthetic_repo(root: Path, spec: SyntheticRepoSpec) -> SyntheticRepo:
+    """Write a synthetic repository to ``root`` and commit it.
+
+    Args:
+        root: Empty (or missing) directory to create the repository in
+        spec: Repository shape
+
+    Returns:
+        SyntheticRepo describing the generated files
+    """
+    rng = random.Random(spec.seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    layers = list(LAYERS)
+    modules: list[tuple[str, str, str, str]] = []  # (language, layer, module, path)
+    for i in range(spec.file_count):
+        language = spec.languages[i % len(spec.languages)]
+        layer = layers[(i // len(spec.languages)) % len(layers)]
+        module, path = _module_for(language, layer, i)
+        modules.append((language, layer, module, path))
+
+    functions_by_path: dict[str, list[_Function]] = {}
+    functions_by_language: dict[str, list[_Function]] = {lang: [] for lang in spec.languages}
+    for index, (language, layer, module, path) in enumerate(modules):
+        fns = []
+        for j in range(spec.functions_per_file):
+            verb = VERBS[rng.randrange(len(VERBS))]
+            fn = _Function(f"{layer}_{verb}_{index}_{j}", language, module, path, layer)
+            fns.append(fn)
+            functions_by_language[language].append(fn)
+        functions_by_path[path] = fns
+
+    # Calls: callees are drawn from the same language (imports must resolve)
+    for fns in functions_by_path.values():
+        for fn in fns:
+            pool = functions_by_language[fn.language]
+            whole, frac = divmod(spec.call_density, 1)
+            n_calls = int(whole) + (1 if rng.random() < frac else 0)
+            for _ in range(n_calls):
+                callee = pool[rng.randrange(len(pool))]
+                if callee is not fn and callee not in fn.calls:
+                    fn.calls.append(callee)
+
+    # Duplicates copy the statements and calls of an earlier function
+    for pool in functions_by_language.values():
+        for position, fn in enumerate(pool):
+            if position and rng.random() < spec.duplication_rate:
+                source = pool[rng.randrange(position)]
+                fn.body_of = source.body_of or source
+                fn.calls = [c for c in fn.body_of.calls if c is not fn]
+
+    body_params: dict[str, tuple[list[tuple[str, int]], int, int]] = {}
+    rendered: dict[str, list[str]] = {}
+    for fns in functions_by_path.values():
+        for fn in fns:
+            source = fn.body_of or fn
+            if source.name not in body_params:
+                body_params[source.name] = (
+                    _body_lines(source, rng, spec.lines_per_function),
+                    rng.randrange(5, 50),
+                    rng.randrange(2, 9),
+                )
+            render = _render_python if fn.language == "python" else _render_js
+            rendered[fn.name] = render(fn, *body_params[source.name])
+
+    files: list[str] = []
+    for path, fns in functions_by_path.items():
+        imports: dict[str, tuple[_Function, list[str]]] = {}
+        for fn in fns:
+            for callee in fn.calls:
+                if callee.path != path:
+                    entry = imports.setdefault(callee.path, (callee, []))
+                    if callee.name not in entry[1]:
+                        entry[1].append(callee.name)
+        lines = [_import_line(fns[0], callee, names) for callee, names in imports.values()]
+        separator = ["", ""] if fns[0].language == "python" else [""]
+        for fn in fns:
+            lines.extend(separator)
+            lines.extend(rendered[fn.name])
+        _write(root / path, "\n".join(lines).lstrip("\n") + "\n")
+        files.append(path)
+
+    # Entry points call the first function of a few modules per language
+    for language in spec.languages:
+        roots = [fns[0] for fns in functions_by_path.values() if fns[0].language == language][:5]
+        if language == "python":
+            path = "main.py"
+            entry = _Function("main", language, "main", path, "core", calls=roots)
+            lines = [_import_line(entry, fn, [fn.name]) for fn in roots]
+            lines += ["", "", "def main():"] + [f"    {fn.name}([1, 2, 3])" for fn in roots]
+            lines += ["", "", 'if __name__ == "__main__":', "    main()"]
+        else:
+            base = "web/src" if language == "typescript" else "web/lib"
+            path = f"{base}/index{_EXTENSIONS[language]}"
+            entry = _Function("main", language, f"{base}/index", path, "core", calls=roots)
+            lines = [_import_line(entry, fn, [fn.name]) for fn in roots]
+            lines += ["", "export function main() {"] + [f"  {fn.name}([1, 2, 3]);" for fn in roots] + ["}"]
+        _write(root / path, "\n".join(lines) + "\n")
+        files.append(path)
+
+    for package_dir in {Path(p).parent for p in files if p.endswith(".py")}:
+        parts = package_dir.parts
+        for depth in range(1, len(parts) + 1):
+            init = root / Path(*parts[:depth]) / "__init__.py"
+            if not init.exists():
+                _write(init, "")
+
+    commit_sha = _git_commit(root)
+    return SyntheticRepo(
+        path=root,
+        spec=spec,
+        commit_sha=commit_sha,
+        files=sorted(files),
+        function_count=sum(len(fns) for fns in functions_by_path.values()),
+        duplicated_functions=sum(1 for fns in functions_by_path.values() for fn in fns if fn.body_of),
+        call_count=sum(len(fn.calls) for fns in functions_by_path.values() for fn in fns),
+    )
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _git_commit(root: Path) -> str:
+    env = {**os.environ, **_GIT_ENV}
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=root, env=env, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+
+    git("init", "-q", "-b", "main")
+    git("add", "-A")
+    git("commit", "-q", "-m", "Synthetic repository")
+    return git("rev-parse", "HEAD")
@@ -1,14 +1,18 @@
 """FastAPI application entry point."""
 
+import hmac
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
 from app.api.v1 import router as api_v1_router
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE_LATEST, REGISTRY
 from app.core.redis import close_redis_pool
+from app.services import llm_telemetry  # noqa: F401  (registers LLM metrics)
 
 
 @asynccontextmanager
@@ -56,3 +60,29 @@ async def root() -> dict[str, str]:
         "version": "0.1.0",
         "docs": "/docs",
     }
+
+
+def verify_metrics_access(authorization: str | None = Header(None)) -> None:
+    """Require ``Authorization: Bearer <METRICS_TOKEN>`` for /metrics.
+
+    Without a configured token the endpoint is open in development and
+    disabled in production.
+    """
+    if not settings.metrics_token:
+        if settings.app_env == "production":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        return
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token, settings.metrics_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_access)])
+async def metrics() -> Response:
+    """Prometheus metrics for this API process."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,105 @@
+"""Tests for AI scan reuse by repo-view fingerprint.
+
+**Feature: ai-scan-integration**
+"""
+
+from dataclasses import dataclass
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.services.broad_scan_agent import compute_scan_fingerprint
+from app.workers.ai_scan import _build_reused_cache, run_ai_scan
+
+MODELS = ["gemini/gemini-3-pro-preview", "bedrock/claude"]
+
+
+class TestScanFingerprint:
+    """Fingerprint covers repo view content, models and prompt version."""
+
+    @given(st.text(max_size=200), st.permutations(MODELS))
+    @settings(max_examples=50)
+    def test_fingerprint_is_stable_and_model_order_insensitive(self, content, models):
+        assert compute_scan_fingerprint(content, models) == compute_scan_fingerprint(content, MODELS)
+
+    @given(st.text(max_size=200), st.text(min_size=1, max_size=20))
+    @settings(max_examples=50)
+    def test_fingerprint_changes_with_content(self, content, suffix):
+        assert compute_scan_fingerprint(content, MODELS) != compute_scan_fingerprint(content + suffix, MODELS)
+
+    def test_fingerprint_changes_with_models(self):
+        assert compute_scan_fingerprint("view", MODELS) != compute_scan_fingerprint("view", MODELS[:1])
+
+    def test_fingerprint_changes_with_prompt_version(self):
+        before = compute_scan_fingerprint("view", MODELS)
+        with patch("app.services.broad_scan_agent.BROAD_SCAN_PROMPT_VERSION", "next"):
+            assert compute_scan_fingerprint("view", MODELS) != before
+
+
+def test_reused_cache_keeps_issues_and_zeroes_cost():
+    source = {
+        "status": "completed",
+        "issues": [{"id": "sec-001"}],
+        "repo_overview": {"guessed_project_type": "api"},
+        "total_tokens_used": 500_000,
+        "total_cost_usd": 4.2,
+        "commit_sha": "a" * 40,
+    }
+
+    cache = _build_reused_cache(source, "source-id", "f" * 64, "b" * 40)
+
+    assert cache["issues"] == source["issues"]
+    assert cache["repo_overview"] == source["repo_overview"]
+    assert cache["commit_sha"] == "b" * 40
+    assert cache["fingerprint"] == "f" * 64
+    assert cache["reused_from_analysis_id"] == "source-id"
+    assert cache["total_tokens_used"] == 0
+    assert cache["total_cost_usd"] == 0.0
+
+
+def test_run_ai_scan_reuses_matching_scan_without_calling_models():
+    """A fingerprint match completes the scan from the earlier cache."""
+
+    @dataclass
+    class MockAnalysis:
+        id: str
+        repository_id: str
+
+    analysis_id = str(uuid4())
+    analysis = MockAnalysis(id=analysis_id, repository_id=str(uuid4()))
+    source_cache = {"status": "completed", "issues": [{"id": "sec-001"}, {"id": "db-001"}]}
+
+    analyzer = MagicMock()
+    analyzer.__enter__.return_value.clone.return_value = "/tmp/repo"
+    generator = MagicMock()
+    generator.return_value.generate.return_value = MagicMock(
+        content="# repo view", token_estimate=10, files_included=1,
+    )
+
+    with patch("app.workers.helpers.is_analysis_superseded", return_value=False), \
+            patch("app.workers.ai_scan._get_analysis_with_repo",
+                  return_value=(analysis, None, None, "c" * 40, "https://github.com/o/r")), \
+            patch("app.services.repo_analyzer.RepoAnalyzer", return_value=analyzer), \
+            patch("app.services.repo_view_generator.RepoViewGenerator", generator), \
+            patch("app.workers.ai_scan._find_reusable_ai_scan",
+                  return_value=("source-id", source_cache)) as mock_find, \
+            patch("app.services.broad_scan_agent.get_broad_scan_agent") as mock_agent, \
+            patch("app.workers.ai_scan._update_ai_scan_state") as mock_state, \
+            patch("app.workers.ai_scan.publish_ai_scan_progress"), \
+            patch("app.core.redis.publish_analysis_event"), \
+            patch.object(run_ai_scan, "update_state"):
+        result = run_ai_scan.run(analysis_id, models=MODELS)
+
+    mock_agent.assert_not_called()
+    mock_find.assert_called_once_with(
+        analysis.repository_id, compute_scan_fingerprint("# repo view", MODELS), analysis_id,
+    )
+    assert result["reused_from_analysis_id"] == "source-id"
+    assert result["issues_count"] == 2
+
+    completed = mock_state.call_args.kwargs
+    assert completed["status"] == "completed"
+    assert completed["cache_data"]["reused_from_analysis_id"] == "source-id"
+    assert completed["cache_data"]["commit_sha"] == "c" * 40
@@ -347,9 +347,9 @@ class TestTriggerAnalysisStuckDetection:
 
         Test that a pending analysis with recent created_at is not considered stuck.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "pending"
             mock_analysis.created_at = datetime.now(UTC) - timedelta(minutes=5)
 
@@ -363,9 +363,9 @@ class TestTriggerAnalysisStuckDetection:
 
         Test that a pending analysis with old created_at is considered stuck.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "pending"
             # Created 35 minutes ago (exceeds 30 minute timeout)
             mock_analysis.created_at = datetime.now(UTC) - timedelta(minutes=35)
@@ -380,9 +380,9 @@ class TestTriggerAnalysisStuckDetection:
 
         Test that a running analysis with fresh state_updated_at is not considered stuck.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "running"
             mock_analysis.state_updated_at = datetime.now(UTC) - timedelta(minutes=5)
 
@@ -396,9 +396,9 @@ class TestTriggerAnalysisStuckDetection:
 
         Test that a running analysis with stale state_updated_at is considered stuck.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "running"
             # Last heartbeat 20 minutes ago (exceeds 15 minute timeout)
             mock_analysis.state_updated_at = datetime.now(UTC) - timedelta(minutes=20)
@@ -413,9 +413,9 @@ class TestTriggerAnalysisStuckDetection:
 
         Test that terminal states are never considered stuck.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             for status in ["completed", "failed", "skipped"]:
                 mock_analysis.status = status
                 # Even with very old timestamps
@@ -440,9 +440,9 @@ class TestGetStuckReason:
 
         Test that get_stuck_reason returns 'pending_timeout' for stuck pending analysis.
         """
-        from app.api.v1.analyses import get_stuck_reason
+        from app.services.analysis_state import get_stuck_reason
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "pending"
             mock_analysis.created_at = datetime.now(UTC) - timedelta(minutes=35)
 
@@ -456,9 +456,9 @@ class TestGetStuckReason:
 
         Test that get_stuck_reason returns 'heartbeat_timeout' for stuck running analysis.
         """
-        from app.api.v1.analyses import get_stuck_reason
+        from app.services.analysis_state import get_stuck_reason
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "running"
             mock_analysis.state_updated_at = datetime.now(UTC) - timedelta(minutes=20)
 
@@ -472,9 +472,9 @@ class TestGetStuckReason:
 
         Test that get_stuck_reason returns None for non-stuck analysis.
         """
-        from app.api.v1.analyses import get_stuck_reason
+        from app.services.analysis_state import get_stuck_reason
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "running"
             mock_analysis.state_updated_at = datetime.now(UTC) - timedelta(minutes=5)
 
@@ -722,9 +722,9 @@ class TestIsAnalysisStuckEdgeCases:
 
         Test boundary condition when pending analysis is exactly at timeout.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "pending"
             # Exactly at 30 minute boundary - IS stuck (implementation uses >=)
             mock_analysis.created_at = datetime.now(UTC) - timedelta(minutes=30)
@@ -740,9 +740,9 @@ class TestIsAnalysisStuckEdgeCases:
 
         Test boundary condition when pending analysis is just over timeout.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "pending"
             # Just over 30 minute boundary - should be stuck
             mock_analysis.created_at = datetime.now(UTC) - timedelta(minutes=30, seconds=1)
@@ -757,9 +757,9 @@ class TestIsAnalysisStuckEdgeCases:
 
         Test that is_analysis_stuck handles naive datetime correctly.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "pending"
             # Naive datetime (no timezone info)
             mock_analysis.created_at = datetime.utcnow() - timedelta(minutes=35)
@@ -775,9 +775,9 @@ class TestIsAnalysisStuckEdgeCases:
 
         Test boundary condition when running analysis is exactly at heartbeat timeout.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "running"
             # Exactly at 15 minute boundary - IS stuck (implementation uses >=)
             mock_analysis.state_updated_at = datetime.now(UTC) - timedelta(minutes=15)
@@ -792,9 +792,9 @@ class TestIsAnalysisStuckEdgeCases:
 
         Test that unknown status is treated as not stuck.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "unknown_status"
             mock_analysis.created_at = datetime.now(UTC) - timedelta(days=30)
             mock_analysis.state_updated_at = datetime.now(UTC) - timedelta(days=30)
@@ -817,9 +817,9 @@ class TestGetStuckReasonEdgeCases:
 
         Test that terminal states return None for stuck reason.
         """
-        from app.api.v1.analyses import get_stuck_reason
+        from app.services.analysis_state import get_stuck_reason
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             for status in ["completed", "failed", "skipped"]:
                 mock_analysis.status = status
                 mock_analysis.created_at = datetime.now(UTC) - timedelta(days=30)
@@ -835,9 +835,9 @@ class TestGetStuckReasonEdgeCases:
 
         Test that unknown status returns None for stuck reason.
         """
-        from app.api.v1.analyses import get_stuck_reason
+        from app.services.analysis_state import get_stuck_reason
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "unknown_status"
             mock_analysis.created_at = datetime.now(UTC) - timedelta(days=30)
             mock_analysis.state_updated_at = datetime.now(UTC) - timedelta(days=30)
@@ -1055,9 +1055,9 @@ class TestHeartbeatIntegration:
 
         Test that pending stuck detection uses created_at, not state_updated_at.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "pending"
             # Old created_at but fresh state_updated_at
             mock_analysis.created_at = datetime.now(UTC) - timedelta(minutes=35)
@@ -1074,9 +1074,9 @@ class TestHeartbeatIntegration:
 
         Test that running stuck detection uses state_updated_at, not created_at.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "running"
             # Fresh created_at but old state_updated_at
             mock_analysis.created_at = datetime.now(UTC) - timedelta(minutes=5)
@@ -1094,9 +1094,9 @@ class TestHeartbeatIntegration:
         Test that a long-running analysis with recent heartbeat is not considered stuck.
         This is the key scenario that the heartbeat system is designed to handle.
         """
-        from app.api.v1.analyses import is_analysis_stuck
+        from app.services.analysis_state import is_analysis_stuck
 
-        with patch("app.api.v1.analyses.settings", mock_settings):
+        with patch("app.services.analysis_state.settings", mock_settings):
             mock_analysis.status = "running"
             # Very old created_at (analysis running for 2 hours)
             mock_analysis.created_at = datetime.now(UTC) - timedelta(hours=2)
@@ -0,0 +1,70 @@
+"""Tests for analysis listing query projections.
+
+The list and VCI history endpoints must not load the large JSONB caches
+(semantic_cache, ai_scan_cache) stored on each Analysis row.
+"""
+
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.analyses import build_analysis_list_query, build_vci_history_query
+from app.models.analysis import Analysis, grade_for_score
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+class TestListingProjections:
+    """Heavy JSONB columns are excluded from listing queries."""
+
+    def test_list_query_excludes_caches(self):
+        sql = compile_sql(build_analysis_list_query(uuid.uuid4(), limit=20, offset=0))
+
+        assert "semantic_cache" not in sql.replace("semantic_cache_status", "")
+        assert "ai_scan_cache" not in sql
+        assert "analyses.metrics" in sql
+        assert "ORDER BY analyses.created_at DESC" in sql
+
+    def test_vci_history_query_is_column_projection(self):
+        sql = compile_sql(build_vci_history_query(uuid.uuid4(), limit=30))
+        selected = sql.split("FROM")[0]
+
+        assert "semantic_cache" not in sql
+        assert "ai_scan_cache" not in sql
+        assert "analyses.metrics" not in sql
+        for column in ("completed_at", "created_at", "vci_score", "commit_sha"):
+            assert f"analyses.{column}" in selected
+
+    def test_vci_history_columns_covered_by_index(self):
+        """Every column the history reads is in the covering index."""
+        index = next(
+            i for i in Analysis.__table__.indexes
+            if i.name == "ix_analyses_repo_status_completed"
+        )
+        covered = {c.name for c in index.columns} | set(
+            index.dialect_options["postgresql"]["include"]
+        )
+        sql = compile_sql(build_vci_history_query(uuid.uuid4(), limit=30))
+
+        referenced = {
+            c.name for c in Analysis.__table__.columns if f"analyses.{c.name}" in sql
+        }
+        assert referenced <= covered
+
+
+class TestGradeForScore:
+    """grade_for_score matches Analysis.grade thresholds."""
+
+    def test_thresholds(self):
+        assert grade_for_score(None) is None
+        assert grade_for_score(95) == "A"
+        assert grade_for_score(80) == "B"
+        assert grade_for_score(70.5) == "C"
+        assert grade_for_score(60) == "D"
+        assert grade_for_score(10) == "F"
+
+    def test_matches_model_property(self):
+        analysis = Analysis(vci_score=72)
+        assert analysis.grade == grade_for_score(72) == "C"
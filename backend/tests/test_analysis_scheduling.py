@@ -0,0 +1,216 @@
+"""Tests for analysis priority lanes, fairness caps and the jittered sweep."""
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from celery.exceptions import Retry
+
+from app.core.config import settings
+from app.workers.scheduling import (
+    LANE_INTERACTIVE,
+    LANE_SCHEDULED,
+    LANE_WEBHOOK,
+    SCHEDULED_LANE_SLOT_KEY,
+    acquire_analysis_slots,
+    interleave_by_owner,
+    lane_for,
+    owner_slot_key,
+    release_slot,
+    sweep_countdowns,
+    try_acquire_slot,
+)
+
+
+class FakeRedis:
+    """Sorted-set subset of redis-py used by the slot helpers."""
+
+    def __init__(self):
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    def transaction(self, func, *keys):
+        func(self)
+
+    def multi(self):
+        pass
+
+    def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    def zcount(self, key, low, high):
+        low = float(low.lstrip("("))
+        return sum(1 for score in self.zsets.get(key, {}).values() if score > low)
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    def expire(self, key, ttl):
+        pass
+
+
+@pytest.fixture
+def fake_redis():
+    client = FakeRedis()
+
+    @contextmanager
+    def context():
+        yield client
+
+    with patch("app.workers.scheduling.get_sync_redis_context", context):
+        yield client
+
+
+def test_lanes_by_trigger():
+    assert lane_for("manual") == LANE_INTERACTIVE
+    assert lane_for("connect") == LANE_INTERACTIVE
+    assert lane_for("webhook") == LANE_WEBHOOK
+    assert lane_for("scheduled") == LANE_SCHEDULED
+    assert lane_for("something-new") == LANE_INTERACTIVE
+
+
+class TestSlots:
+
+    def test_limit_is_enforced_until_release(self):
+        redis = FakeRedis()
+
+        assert try_acquire_slot(redis, "k", "a1", limit=2, now=100)
+        assert try_acquire_slot(redis, "k", "a2", limit=2, now=100)
+        assert not try_acquire_slot(redis, "k", "a3", limit=2, now=100)
+        # Re-acquiring a held slot succeeds
+        assert try_acquire_slot(redis, "k", "a1", limit=2, now=100)
+
+        release_slot(redis, "k", "a1")
+        assert try_acquire_slot(redis, "k", "a3", limit=2, now=100)
+
+    def test_expired_slots_do_not_count(self):
+        redis = FakeRedis()
+        assert try_acquire_slot(redis, "k", "dead-worker", limit=1, ttl_s=60, now=100)
+
+        assert not try_acquire_slot(redis, "k", "a2", limit=1, now=150)
+        assert try_acquire_slot(redis, "k", "a2", limit=1, now=161)
+        assert "dead-worker" not in redis.zsets["k"]
+
+    def test_interactive_analyses_need_no_slots(self, fake_redis):
+        assert acquire_analysis_slots("a1", "owner", "manual") == []
+        assert fake_redis.zsets == {}
+
+    def test_owner_cap(self, fake_redis):
+        with patch.object(settings, "analysis_owner_max_concurrency", 1):
+            assert acquire_analysis_slots("a1", "owner", "webhook") == [owner_slot_key("owner")]
+            assert acquire_analysis_slots("a2", "owner", "webhook") is None
+            assert acquire_analysis_slots("a3", "other-owner", "webhook") == [owner_slot_key("other-owner")]
+
+    def test_scheduled_lane_cap_rolls_back_owner_slot(self, fake_redis):
+        with patch.multiple(settings, analysis_owner_max_concurrency=5, analysis_scheduled_max_concurrency=1):
+            assert acquire_analysis_slots("a1", "o1", "scheduled") == [
+                owner_slot_key("o1"), SCHEDULED_LANE_SLOT_KEY,
+            ]
+            assert acquire_analysis_slots("a2", "o2", "scheduled") is None
+
+        assert fake_redis.zsets[owner_slot_key("o2")] == {}
+
+    def test_redis_failure_runs_uncapped(self):
+        from redis.exceptions import ConnectionError
+
+        @contextmanager
+        def broken():
+            raise ConnectionError("down")
+            yield
+
+        with patch("app.workers.scheduling.get_sync_redis_context", broken):
+            assert acquire_analysis_slots("a1", "owner", "scheduled") == []
+
+
+def test_interleave_by_owner_round_robins():
+    items = [("a", 1), ("a", 2), ("a", 3), ("b", 1), ("c", 1), ("c", 2)]
+
+    result = interleave_by_owner(items, lambda item: item[0])
+
+    assert result == [("a", 1), ("b", 1), ("c", 1), ("a", 2), ("c", 2), ("a", 3)]
+
+
+def test_sweep_countdowns_spread_over_window():
+    countdowns = sweep_countdowns(10, 600, rng=random.Random(1))
+
+    assert len(countdowns) == 10
+    for i, countdown in enumerate(countdowns):
+        assert i * 60 <= countdown < (i + 1) * 60
+    assert sweep_countdowns(0, 600) == []
+
+
+class TestAnalyzeRepositoryCaps:
+
+    def test_capped_analysis_is_deferred(self):
+        from app.workers.analysis import analyze_repository
+
+        with patch("app.workers.analysis.get_repo_owner_id", return_value="owner"), \
+                patch("app.workers.analysis.acquire_analysis_slots", return_value=None), \
+                patch("app.workers.analysis._mark_analysis_running") as mark_running, \
+                patch.object(analyze_repository, "retry", side_effect=Retry()) as retry:
+            with pytest.raises(Retry):
+                analyze_repository.run("repo-1", "analysis-1", triggered_by="scheduled")
+
+        mark_running.assert_not_called()
+        assert retry.call_args.kwargs["countdown"] > 0
+
+    def test_slots_released_after_failure(self):
+        from app.workers.analysis import analyze_repository
+
+        with patch("app.workers.analysis.get_repo_owner_id", return_value="owner"), \
+                patch("app.workers.analysis.acquire_analysis_slots", return_value=["slot"]), \
+                patch("app.workers.analysis.release_analysis_slots") as release, \
+                patch("app.workers.analysis._mark_analysis_running"), \
+                patch("app.workers.analysis._mark_analysis_failed"), \
+                patch("app.workers.analysis.publish_analysis_progress"), \
+                patch("app.workers.analysis.update_heartbeat"), \
+                patch("app.workers.analysis._get_repo_url", side_effect=ValueError("gone")), \
+                patch("app.workers.analysis.is_analysis_superseded", return_value=False), \
+                patch.object(analyze_repository, "update_state"):
+            with pytest.raises(ValueError):
+                analyze_repository.run("repo-1", "analysis-1", triggered_by="webhook")
+
+        release.assert_called_once_with("analysis-1", ["slot"])
+
+
+@patch("app.core.database.get_sync_session")
+def test_sweep_schedules_due_repositories_across_window(mock_get_session):
+    from app.workers.scheduled import analyze_all_repositories, queue_scheduled_analysis
+
+    now = datetime.now(UTC)
+    owner_a, owner_b = uuid.uuid4(), uuid.uuid4()
+    repos = [
+        SimpleNamespace(id=uuid.uuid4(), owner_id=owner_a, last_analysis_at=None),
+        SimpleNamespace(id=uuid.uuid4(), owner_id=owner_a, last_analysis_at=now - timedelta(days=2)),
+        SimpleNamespace(id=uuid.uuid4(), owner_id=owner_a, last_analysis_at=now - timedelta(hours=1)),
+        SimpleNamespace(id=uuid.uuid4(), owner_id=owner_b, last_analysis_at=None),
+    ]
+    session = MagicMock()
+    session.execute.return_value.all.return_value = repos
+    session.__enter__ = MagicMock(return_value=session)
+    session.__exit__ = MagicMock(return_value=False)
+    mock_get_session.return_value = session
+
+    with patch.object(queue_scheduled_analysis, "apply_async") as apply_async, \
+            patch.object(settings, "analysis_sweep_window_minutes", 10):
+        result = analyze_all_repositories()
+
+    assert (result["queued"], result["skipped"]) == (3, 1)
+    calls = [c.kwargs for c in apply_async.call_args_list]
+    # Owners are interleaved and dispatches spread over the 10 minute window
+    assert [c["args"][0] for c in calls] == [str(repos[0].id), str(repos[3].id), str(repos[1].id)]
+    assert all(c["queue"] == LANE_SCHEDULED for c in calls)
+    countdowns = [c["countdown"] for c in calls]
+    assert countdowns == sorted(countdowns)
+    assert 0 <= countdowns[0] and countdowns[-1] < 600
@@ -0,0 +1,172 @@
+"""Tests for skipping scheduled/webhook analyses of already-analyzed commits."""
+
+import subprocess
+import uuid
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.vector_store import _ref_cache, cache_ref_sha, get_cached_ref_sha
+from app.workers.helpers import resolve_branch_head_sha
+
+SHA = "a" * 40
+REPO_URL = "https://github.com/acme/widgets"
+
+
+@pytest.fixture(autouse=True)
+def clear_ref_cache():
+    _ref_cache.clear()
+    yield
+    _ref_cache.clear()
+
+
+class TestResolveBranchHead:
+
+    def test_uses_shared_ref_cache(self):
+        cache_ref_sha("repo-1", "main", SHA)
+
+        with patch("subprocess.run") as run:
+            assert resolve_branch_head_sha("repo-1", REPO_URL, "main") == SHA
+
+        run.assert_not_called()
+
+    def test_ls_remote_result_is_cached(self):
+        completed = subprocess.CompletedProcess([], 0, stdout=f"{SHA}\trefs/heads/main\n", stderr="")
+
+        with patch("subprocess.run", return_value=completed) as run:
+            assert resolve_branch_head_sha("repo-1", REPO_URL, "main", access_token="tok") == SHA
+            assert resolve_branch_head_sha("repo-1", REPO_URL, "main", access_token="tok") == SHA
+
+        run.assert_called_once()
+        assert "x-access-token:tok@github.com" in run.call_args.args[0][2]
+
+    @pytest.mark.parametrize("completed", [
+        subprocess.CompletedProcess([], 128, stdout="", stderr="fatal"),
+        subprocess.CompletedProcess([], 0, stdout="", stderr=""),
+    ])
+    def test_unresolvable_branch(self, completed):
+        with patch("subprocess.run", return_value=completed):
+            assert resolve_branch_head_sha("repo-1", REPO_URL, "main") is None
+
+
+def _session(execute_results):
+    session = MagicMock()
+    session.execute.side_effect = execute_results
+
+    @contextmanager
+    def get_session():
+        yield session
+
+    return session, get_session
+
+
+class TestScheduledAnalysis:
+
+    def test_unchanged_head_is_not_requeued(self):
+        from app.workers.scheduled import queue_scheduled_analysis
+
+        repository_id = str(uuid.uuid4())
+        repo = MagicMock(is_active=True, last_analysis_at=None, default_branch="main")
+        existing = MagicMock(id=uuid.uuid4(), status="completed")
+        repo_result = MagicMock()
+        repo_result.scalar_one_or_none.return_value = repo
+        session, get_session = _session([repo_result])
+
+        with patch("app.core.database.get_sync_session", get_session), \
+                patch("app.workers.helpers.get_repo_url", return_value=(REPO_URL, None)), \
+                patch("app.workers.helpers.resolve_branch_head_sha", return_value=SHA), \
+                patch("app.workers.helpers.find_analysis_for_commit", return_value=existing), \
+                patch("app.workers.scheduling.enqueue_analysis") as enqueue:
+            result = queue_scheduled_analysis(repository_id)
+
+        assert result["status"] == "skipped"
+        assert result["reason"] == "unchanged"
+        assert result["analysis_id"] == str(existing.id)
+        enqueue.assert_not_called()
+        session.add.assert_not_called()
+
+    def test_new_head_is_queued_pinned_to_sha(self):
+        from app.workers.scheduled import queue_scheduled_analysis
+
+        repository_id = str(uuid.uuid4())
+        repo = MagicMock(is_active=True, last_analysis_at=None, default_branch="main")
+        repo_result = MagicMock()
+        repo_result.scalar_one_or_none.return_value = repo
+        session, get_session = _session([repo_result])
+        session.add.side_effect = lambda analysis: setattr(analysis, "id", uuid.uuid4())
+
+        with patch("app.core.database.get_sync_session", get_session), \
+                patch("app.workers.helpers.get_repo_url", return_value=(REPO_URL, None)), \
+                patch("app.workers.helpers.resolve_branch_head_sha", return_value=SHA), \
+                patch("app.workers.helpers.find_analysis_for_commit", return_value=None), \
+                patch("app.workers.scheduling.enqueue_analysis") as enqueue:
+            result = queue_scheduled_analysis(repository_id)
+
+        assert result["status"] == "queued"
+        [analysis] = [c.args[0] for c in session.add.call_args_list]
+        assert analysis.commit_sha == SHA
+        assert enqueue.call_args.kwargs["commit_sha"] == SHA
+        assert enqueue.call_args.kwargs["triggered_by"] == "scheduled"
+
+
+class TestPushWebhook:
+
+    @staticmethod
+    def _push(sha: str) -> dict:
+        return {
+            "ref": "refs/heads/main",
+            "after": sha,
+            "head_commit": {"id": sha},
+            "repository": {"id": 42, "default_branch": "main"},
+        }
+
+    @staticmethod
+    def _db(existing):
+        repository = MagicMock(id=uuid.uuid4(), is_active=True)
+        repo_result = MagicMock()
+        repo_result.scalar_one_or_none.return_value = repository
+        existing_result = MagicMock()
+        existing_result.scalar_one_or_none.return_value = existing
+        sync_db = MagicMock()
+        sync_db.execute.return_value = existing_result
+        db = AsyncMock()
+        db.execute.return_value = repo_result
+        # The commit lookup is the workers' sync helper, run on the async session
+        db.run_sync.side_effect = lambda fn, *args: fn(sync_db, *args)
+        db.add = MagicMock()
+        return db, repository
+
+    async def test_already_analyzed_commit_is_skipped(self):
+        from app.api.v1.webhooks import handle_push_event
+
+        existing = MagicMock(id=uuid.uuid4(), status="completed")
+        db, repository = self._db(existing)
+
+        # The blocking Redis write must not run on the event loop
+        with patch("app.api.v1.webhooks.enqueue_analysis") as enqueue, \
+                patch.object(_ref_cache, "set", side_effect=AssertionError("sync cache write")):
+            result = await handle_push_event(self._push(SHA), db)
+
+        assert result["status"] == "skipped"
+        assert result["analysis_id"] == str(existing.id)
+        enqueue.assert_not_called()
+        db.add.assert_not_called()
+        # The pushed head is shared with other resolvers
+        assert get_cached_ref_sha(str(repository.id), "main") == SHA
+
+    async def test_new_commit_is_queued_directly_without_redis(self):
+        from redis.exceptions import RedisError
+
+        from app.api.v1.webhooks import handle_push_event
+
+        db, _ = self._db(None)
+
+        with patch("app.api.v1.webhooks.record_push", side_effect=RedisError("down")), \
+                patch("app.api.v1.webhooks.enqueue_analysis") as enqueue:
+            enqueue.return_value.id = "task-1"
+            result = await handle_push_event(self._push(SHA), db)
+
+        assert result["status"] == "queued"
+        assert enqueue.call_args.kwargs["triggered_by"] == "webhook"
+        db.add.assert_called_once()
@@ -10,14 +10,14 @@ from __future__ import annotations
 
 import uuid
 from datetime import UTC, datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
+from sqlalchemy import Delete, Insert
+from sqlalchemy.dialects import postgresql
 
-from app.models.dead_code import DeadCode
-from app.models.file_churn import FileChurn
 from app.schemas.architecture_llm import (
     ArchitectureSummary,
     DeadCodeFinding,
@@ -100,6 +100,57 @@ def hot_spot_finding_strategy(draw) -> HotSpotFinding:
 # =============================================================================
 
 
+def _architecture_data(
+    dead_code: list[DeadCodeFinding],
+    hot_spots: list[HotSpotFinding],
+) -> LLMReadyArchitectureData:
+    return LLMReadyArchitectureData(
+        summary=ArchitectureSummary(
+            health_score=80,
+            main_concerns=[],
+            total_files=10,
+            total_functions=50,
+            dead_code_count=len(dead_code),
+            hot_spot_count=len(hot_spots),
+        ),
+        dead_code=dead_code,
+        hot_spots=hot_spots,
+        issues=[],
+    )
+
+
+def _persist(architecture_data, repository_id, analysis_id, dismissed=()):
+    """Run persist_findings against a mock session.
+
+    Returns:
+        (result, dead code rows, hot spot rows, executed statements)
+    """
+    from app.services.architecture_findings_service import ArchitectureFindingsService
+
+    bulk_rows: dict[str, list[dict]] = {"dead_code": [], "file_churn": []}
+
+    def execute(statement, params=None):
+        result = MagicMock()
+        if isinstance(params, list):
+            bulk_rows[statement.table.name] = params
+            result.scalars.return_value.all.return_value = [uuid.uuid4() for _ in params]
+        else:
+            result.__iter__.return_value = iter(dismissed)
+        return result
+
+    mock_db = MagicMock()
+    mock_db.execute.side_effect = execute
+
+    result = ArchitectureFindingsService().persist_findings(
+        db=mock_db,
+        repository_id=repository_id,
+        analysis_id=analysis_id,
+        architecture_data=architecture_data,
+    )
+    statements = [c.args[0] for c in mock_db.execute.call_args_list]
+    return result, bulk_rows["dead_code"], bulk_rows["file_churn"], statements
+
+
 class TestDatabasePersistenceRoundTrip:
     """Property tests for database persistence round-trip.
 
@@ -114,78 +165,28 @@ class TestDatabasePersistenceRoundTrip:
         **Feature: cluster-map-refactoring, Property 13: Database Persistence Round-Trip**
         **Validates: Requirements 7.1**
         """
-        from app.services.architecture_findings_service import ArchitectureFindingsService
-
         repository_id = uuid.uuid4()
         analysis_id = uuid.uuid4()
-        persisted_dead_codes = []
-
-        def mock_dead_code_init(**kwargs):
-            obj = MagicMock(spec=DeadCode)
-            for k, v in kwargs.items():
-                setattr(obj, k, v)
-            obj.id = uuid.uuid4()
-            obj.is_dismissed = False
-            obj.dismissed_at = None
-            obj.created_at = datetime.now(UTC)
-            persisted_dead_codes.append(obj)
-            return obj
-
-        def mock_file_churn_init(**kwargs):
-            obj = MagicMock(spec=FileChurn)
-            for k, v in kwargs.items():
-                setattr(obj, k, v)
-            return obj
-
-        architecture_data = LLMReadyArchitectureData(
-            summary=ArchitectureSummary(
-                health_score=80,
-                main_concerns=[],
-                total_files=10,
-                total_functions=50,
-                dead_code_count=1,
-                hot_spot_count=0,
-            ),
-            dead_code=[finding],
-            hot_spots=[],
-            issues=[],
-        )
-
-        mock_db = MagicMock()
-        mock_db.execute.return_value = None
-
-        service = ArchitectureFindingsService()
 
-        with patch.object(service, '_clear_existing_findings'):
-            with patch(
-                'app.services.architecture_findings_service.DeadCode',
-                side_effect=mock_dead_code_init
-            ):
-                with patch(
-                    'app.services.architecture_findings_service.FileChurn',
-                    side_effect=mock_file_churn_init
-                ):
-                    result = service.persist_findings(
-                        db=mock_db,
-                        repository_id=repository_id,
-                        analysis_id=analysis_id,
-                        architecture_data=architecture_data,
-                    )
+        result, dead_code_rows, _, _ = _persist(
+            _architecture_data([finding], []), repository_id, analysis_id,
+        )
 
         assert result["dead_code_count"] == 1
-        assert len(persisted_dead_codes) == 1
-
-        persisted = persisted_dead_codes[0]
-        assert persisted.file_path == finding.file_path
-        assert persisted.function_name == finding.function_name
-        assert persisted.line_start == finding.line_start
-        assert persisted.line_end == finding.line_end
-        assert persisted.line_count == finding.line_count
-        assert persisted.confidence == finding.confidence
-        assert persisted.evidence == finding.evidence
-        assert persisted.suggested_action == finding.suggested_action
-        assert persisted.analysis_id == analysis_id
-        assert persisted.repository_id == repository_id
+        assert len(dead_code_rows) == 1
+
+        persisted = dead_code_rows[0]
+        assert persisted["file_path"] == finding.file_path
+        assert persisted["function_name"] == finding.function_name
+        assert persisted["line_start"] == finding.line_start
+        assert persisted["line_end"] == finding.line_end
+        assert persisted["line_count"] == finding.line_count
+        assert persisted["confidence"] == finding.confidence
+        assert persisted["evidence"] == finding.evidence
+        assert persisted["suggested_action"] == finding.suggested_action
+        assert persisted["analysis_id"] == analysis_id
+        assert persisted["repository_id"] == repository_id
+        assert persisted["is_dismissed"] is False
 
     @given(hot_spot_finding_strategy())
     @settings(max_examples=100)
@@ -194,77 +195,30 @@ class TestDatabasePersistenceRoundTrip:
         **Feature: cluster-map-refactoring, Property 13: Database Persistence Round-Trip**
         **Validates: Requirements 7.2**
         """
-        from app.services.architecture_findings_service import ArchitectureFindingsService
-
         repository_id = uuid.uuid4()
         analysis_id = uuid.uuid4()
-        persisted_file_churns = []
-
-        def mock_dead_code_init(**kwargs):
-            obj = MagicMock(spec=DeadCode)
-            for k, v in kwargs.items():
-                setattr(obj, k, v)
-            return obj
-
-        def mock_file_churn_init(**kwargs):
-            obj = MagicMock(spec=FileChurn)
-            for k, v in kwargs.items():
-                setattr(obj, k, v)
-            obj.id = uuid.uuid4()
-            obj.created_at = datetime.now(UTC)
-            persisted_file_churns.append(obj)
-            return obj
-
-        architecture_data = LLMReadyArchitectureData(
-            summary=ArchitectureSummary(
-                health_score=80,
-                main_concerns=[],
-                total_files=10,
-                total_functions=50,
-                dead_code_count=0,
-                hot_spot_count=1,
-            ),
-            dead_code=[],
-            hot_spots=[finding],
-            issues=[],
-        )
-
-        mock_db = MagicMock()
-        mock_db.execute.return_value = None
-
-        service = ArchitectureFindingsService()
 
-        with patch.object(service, '_clear_existing_findings'):
-            with patch(
-                'app.services.architecture_findings_service.DeadCode',
-                side_effect=mock_dead_code_init
-            ):
-                with patch(
-                    'app.services.architecture_findings_service.FileChurn',
-                    side_effect=mock_file_churn_init
-                ):
-                    result = service.persist_findings(
-                        db=mock_db,
-                        repository_id=repository_id,
-                        analysis_id=analysis_id,
-                        architecture_data=architecture_data,
-                    )
+        result, _, hot_spot_rows, _ = _persist(
+            _architecture_data([], [finding]), repository_id, analysis_id,
+        )
 
         assert result["hot_spot_count"] == 1
-        assert len(persisted_file_churns) == 1
+        assert len(hot_spot_rows) == 1
 
-        persisted = persisted_file_churns[0]
-        assert persisted.file_path == finding.file_path
-        assert persisted.changes_90d == finding.churn_count
-        assert persisted.coverage_rate == finding.coverage_rate
-        assert persisted.unique_authors == finding.unique_authors
-        assert persisted.risk_factors == finding.risk_factors
-        assert persisted.suggested_action == finding.suggested_action
-        assert persisted.analysis_id == analysis_id
+        persisted = hot_spot_rows[0]
+        assert persisted["file_path"] == finding.file_path
+        assert persisted["changes_90d"] == finding.churn_count
+        assert persisted["coverage_rate"] == finding.coverage_rate
+        assert persisted["unique_authors"] == finding.unique_authors
+        assert persisted["risk_factors"] == finding.risk_factors
+        assert persisted["suggested_action"] == finding.suggested_action
+        assert persisted["analysis_id"] == analysis_id
 
     @given(
-        st.lists(dead_code_finding_strategy(), min_size=0, max_size=5),
-        st.lists(hot_spot_finding_strategy(), min_size=0, max_size=5),
+        st.lists(dead_code_finding_strategy(), min_size=0, max_size=5,
+                 unique_by=lambda f: (f.file_path, f.function_name, f.line_start)),
+        st.lists(hot_spot_finding_strategy(), min_size=0, max_size=5,
+                 unique_by=lambda f: f.file_path),
     )
     @settings(max_examples=100)
     def test_multiple_findings_persistence_round_trip(
@@ -276,68 +230,182 @@ class TestDatabasePersistenceRoundTrip:
         **Feature: cluster-map-refactoring, Property 13: Database Persistence Round-Trip**
         **Validates: Requirements 7.1**
         """
-        from app.services.architecture_findings_service import ArchitectureFindingsService
+        result, dead_code_rows, hot_spot_rows, statements = _persist(
+            _architecture_data(dead_code_findings, hot_spot_findings), uuid.uuid4(), uuid.uuid4(),
+        )
 
-        repository_id = uuid.uuid4()
-        analysis_id = uuid.uuid4()
-        persisted_dead_codes = []
-        persisted_file_churns = []
-
-        def mock_dead_code_init(**kwargs):
-            obj = MagicMock(spec=DeadCode)
-            for k, v in kwargs.items():
-                setattr(obj, k, v)
-            obj.id = uuid.uuid4()
-            persisted_dead_codes.append(obj)
-            return obj
-
-        def mock_file_churn_init(**kwargs):
-            obj = MagicMock(spec=FileChurn)
-            for k, v in kwargs.items():
-                setattr(obj, k, v)
-            obj.id = uuid.uuid4()
-            persisted_file_churns.append(obj)
-            return obj
-
-        architecture_data = LLMReadyArchitectureData(
-            summary=ArchitectureSummary(
-                health_score=80,
-                main_concerns=[],
-                total_files=10,
-                total_functions=50,
-                dead_code_count=len(dead_code_findings),
-                hot_spot_count=len(hot_spot_findings),
-            ),
-            dead_code=dead_code_findings,
-            hot_spots=hot_spot_findings,
-            issues=[],
+        assert result["dead_code_count"] == len(dead_code_findings)
+        assert result["hot_spot_count"] == len(hot_spot_findings)
+        assert len(dead_code_rows) == len(dead_code_findings)
+        assert len(hot_spot_rows) == len(hot_spot_findings)
+        # One upsert per non-empty table, one stale-row delete per table
+        assert sum(isinstance(s, Insert) for s in statements) == bool(dead_code_findings) + bool(hot_spot_findings)
+        assert sum(isinstance(s, Delete) for s in statements) == 2
+
+
+class TestBulkPersistence:
+    """Set-based writes keep dismissals across re-analysis."""
+
+    def test_upserts_do_not_overwrite_dismissal(self):
+        finding = DeadCodeFinding("src/a.py", "helper", 10, 20, 11, 1.0, "Never called", "Remove")
+
+        _, _, _, statements = _persist(_architecture_data([finding], []), uuid.uuid4(), uuid.uuid4())
+
+        upsert = next(s for s in statements if isinstance(s, Insert))
+        sql = str(upsert.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_dead_code_analysis_finding DO UPDATE" in sql
+        assert "is_dismissed = (dead_code.is_dismissed OR excluded.is_dismissed)" in sql
+
+    def test_dismissal_is_carried_from_earlier_analysis(self):
+        dismissed_at = datetime(2024, 12, 1, tzinfo=UTC)
+        moved = DeadCodeFinding("src/a.py", "helper", 42, 52, 11, 1.0, "Never called", "Remove")
+        fresh = DeadCodeFinding("src/a.py", "other", 60, 70, 11, 1.0, "Never called", "Remove")
+
+        _, dead_code_rows, _, _ = _persist(
+            _architecture_data([moved, fresh], []), uuid.uuid4(), uuid.uuid4(),
+            dismissed=[("src/a.py", "helper", dismissed_at)],
         )
 
-        mock_db = MagicMock()
-        mock_db.execute.return_value = None
+        by_name = {row["function_name"]: row for row in dead_code_rows}
+        assert by_name["helper"]["is_dismissed"] is True
+        assert by_name["helper"]["dismissed_at"] == dismissed_at
+        assert by_name["other"]["is_dismissed"] is False
 
-        service = ArchitectureFindingsService()
+    def test_repeated_finding_is_written_once(self):
+        finding = DeadCodeFinding("src/a.py", "helper", 10, 20, 11, 1.0, "Never called", "Remove")
 
-        with patch.object(service, '_clear_existing_findings'):
-            with patch(
-                'app.services.architecture_findings_service.DeadCode',
-                side_effect=mock_dead_code_init
-            ):
-                with patch(
-                    'app.services.architecture_findings_service.FileChurn',
-                    side_effect=mock_file_churn_init
-                ):
-                    result = service.persist_findings(
-                        db=mock_db,
-                        repository_id=repository_id,
-                        analysis_id=analysis_id,
-                        architecture_data=architecture_data,
-                    )
+        result, dead_code_rows, _, _ = _persist(
+            _architecture_data([finding, finding], []), uuid.uuid4(), uuid.uuid4(),
+        )
 
-        assert result["dead_code_count"] == len(dead_code_findings)
-        assert result["hot_spot_count"] == len(hot_spot_findings)
-        assert len(persisted_dead_codes) == len(dead_code_findings)
-        assert len(persisted_file_churns) == len(hot_spot_findings)
+        assert result["dead_code_count"] == 1
+        assert len(dead_code_rows) == 1
+
+    def test_stale_delete_does_not_grow_with_findings(self):
+        findings = [
+            DeadCodeFinding("src/a.py", f"helper_{i}", i * 10 + 1, i * 10 + 5, 5, 1.0, "Never called", "Remove")
+            for i in range(200)
+        ]
+
+        _, dead_code_rows, _, statements = _persist(_architecture_data(findings, []), uuid.uuid4(), uuid.uuid4())
+
+        assert len(dead_code_rows) == 200
+        stale = next(s for s in statements if isinstance(s, Delete) and s.table.name == "dead_code")
+        compiled = stale.compile(dialect=postgresql.dialect())
+        # Only the analysis id and this persist's stamp are sent
+        assert len(compiled.params) == 2
+        assert "last_seen_at !=" in str(compiled)
+        assert dead_code_rows[0]["last_seen_at"] in compiled.params.values()
+
+
+# =============================================================================
+# Persistence against PostgreSQL
+# =============================================================================
+
+
+@pytest.fixture
+def pg_session():
+    """Session on the configured PostgreSQL database, rolled back afterwards.
+
+    Skipped when the database is not reachable (it runs in CI, where the
+    schema is migrated to head).
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings as app_settings
+
+    engine = create_engine(str(app_settings.database_url), connect_args={"connect_timeout": 3})
+    try:
+        connection = engine.connect()
+    except OperationalError as e:
+        engine.dispose()
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    transaction = connection.begin()
+    # persist_findings commits; the commits only release savepoints here
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+class TestPostgresPersistence:
+    """Upserts and stale-row removal against a real PostgreSQL."""
+
+    @staticmethod
+    def _analysis(db, repository=None):
+        from app.models.analysis import Analysis
+        from app.models.repository import Repository
+        from app.models.user import User
+
+        if repository is None:
+            github_id = uuid.uuid4().int % 2**31
+            user = User(github_id=github_id, username=f"user-{github_id}")
+            db.add(user)
+            db.flush()
+            repository = Repository(
+                github_id=github_id, owner_id=user.id, name="shop", full_name=f"acme-{github_id}/shop",
+            )
+            db.add(repository)
+            db.flush()
+        analysis = Analysis(repository_id=repository.id, commit_sha="a" * 40, branch="main", status="completed")
+        db.add(analysis)
+        db.flush()
+        return repository, analysis
+
+    def test_reanalysis_updates_in_place_keeps_dismissal_and_removes_stale(self, pg_session):
+        from sqlalchemy import select
+
+        from app.models.dead_code import DeadCode
+        from app.models.file_churn import FileChurn
+        from app.services.architecture_findings_service import ArchitectureFindingsService
+
+        db = pg_session
+        service = ArchitectureFindingsService()
+        repository, analysis = self._analysis(db)
+        helper = DeadCodeFinding("src/a.py", "helper", 10, 20, 11, 1.0, "Never called", "Remove")
+        other = DeadCodeFinding("src/a.py", "other", 30, 40, 11, 1.0, "Never called", "Remove")
+        hot = HotSpotFinding("src/a.py", 30, None, 3, ["churn"], "Split", 0.5)
+        cold = HotSpotFinding("src/b.py", 12, 0.5, 1, ["churn"], "Watch", 0.2)
+
+        service.persist_findings(db, repository.id, analysis.id, _architecture_data([helper, other], [hot, cold]))
+        helper_row = db.execute(select(DeadCode).where(DeadCode.function_name == "helper")).scalar_one()
+        helper_row.is_dismissed = True
+        helper_row.dismissed_at = datetime(2024, 12, 1, tzinfo=UTC)
+        db.flush()
+        helper_id = helper_row.id
+
+        # Re-analysis reports helper again (new evidence) and a new finding
+        helper.evidence = "Still never called"
+        third = DeadCodeFinding("src/c.py", "third", 5, 9, 5, 1.0, "Never called", "Remove")
+        service.persist_findings(db, repository.id, analysis.id, _architecture_data([helper, third], [hot]))
+        db.expire_all()
+
+        rows = {
+            row.function_name: row
+            for row in db.execute(select(DeadCode).where(DeadCode.analysis_id == analysis.id)).scalars()
+        }
+        assert set(rows) == {"helper", "third"}
+        assert rows["helper"].id == helper_id
+        assert rows["helper"].is_dismissed is True
+        assert rows["helper"].evidence == "Still never called"
+        assert rows["third"].is_dismissed is False
+        churn = db.execute(select(FileChurn.file_path).where(FileChurn.analysis_id == analysis.id)).scalars().all()
+        assert churn == ["src/a.py"]
+
+        # A later analysis of the repository carries the dismissal over
+        _, later = self._analysis(db, repository)
+        moved = DeadCodeFinding("src/a.py", "helper", 12, 22, 11, 1.0, "Never called", "Remove")
+        service.persist_findings(db, repository.id, later.id, _architecture_data([moved], []))
+        carried = db.execute(select(DeadCode).where(DeadCode.analysis_id == later.id)).scalar_one()
+        assert carried.is_dismissed is True
+        assert carried.dismissed_at == datetime(2024, 12, 1, tzinfo=UTC)
 
 
 # =============================================================================
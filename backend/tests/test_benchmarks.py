@@ -0,0 +1,77 @@
+"""Tests for the synthetic repository generator and benchmark runner."""
+
+import pytest
+
+from benchmarks.runner import compare_to_baseline, run_case
+from benchmarks.synthetic_repo import SyntheticRepoSpec, generate_synthetic_repo
+
+SMALL_SPEC = SyntheticRepoSpec(
+    file_count=12,
+    languages=("python", "typescript", "javascript"),
+    functions_per_file=4,
+    duplication_rate=0.25,
+    call_density=1.0,
+)
+
+
+@pytest.fixture(scope="module")
+def synthetic_repo(tmp_path_factory):
+    return generate_synthetic_repo(tmp_path_factory.mktemp("bench") / "repo", SMALL_SPEC)
+
+
+class TestSyntheticRepo:
+
+    def test_generation_is_deterministic(self, synthetic_repo, tmp_path):
+        again = generate_synthetic_repo(tmp_path / "repo", SMALL_SPEC)
+
+        assert again.commit_sha == synthetic_repo.commit_sha
+        assert again.files == synthetic_repo.files
+
+    def test_follows_spec(self, synthetic_repo):
+        # One entry point per language on top of the modules
+        assert len(synthetic_repo.files) == SMALL_SPEC.file_count + 3
+        assert synthetic_repo.function_count == SMALL_SPEC.file_count * SMALL_SPEC.functions_per_file
+        assert synthetic_repo.duplicated_functions > 0
+        assert synthetic_repo.call_count > 0
+        assert {p.rsplit(".", 1)[1] for p in synthetic_repo.files} == {"py", "ts", "js"}
+        assert (synthetic_repo.path / "pkg" / "__init__.py").exists()
+
+    def test_python_modules_compile(self, synthetic_repo):
+        for path in synthetic_repo.files:
+            if path.endswith(".py"):
+                compile((synthetic_repo.path / path).read_text(), path, "exec")
+
+    def test_rejects_unknown_language(self):
+        with pytest.raises(ValueError):
+            SyntheticRepoSpec(languages=("cobol",))
+
+
+@pytest.mark.parametrize("name", ["chunker", "call_graph", "repo_view", "embedding_pipeline", "content_cache"])
+def test_case_runs_in_process(synthetic_repo, name):
+    result = run_case(name, synthetic_repo, repeat=1)
+
+    assert result.items > 0
+    assert result.seconds_min >= 0
+    assert result.peak_rss_mb > 0
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {"results": {
+        "chunker": {"seconds_min": 1.0, "peak_rss_mb": 100.0},
+        "call_graph": {"seconds_min": 2.0, "peak_rss_mb": 100.0},
+    }}
+    report = {"results": {
+        "chunker": {"seconds_min": 1.2, "peak_rss_mb": 130.0},
+        "call_graph": {"seconds_min": 3.5, "peak_rss_mb": 100.0},
+        "repo_view": {"seconds_min": 9.0, "peak_rss_mb": 900.0},
+    }}
+    thresholds = {
+        "default": {"seconds_min": 1.25, "peak_rss_mb": 1.2},
+        "cases": {"call_graph": {"seconds_min": 2.0}},
+    }
+
+    regressions = compare_to_baseline(report, baseline, thresholds)
+
+    # chunker memory regressed; call_graph is within its override; repo_view has no baseline
+    assert len(regressions) == 1
+    assert regressions[0].startswith("chunker.peak_rss_mb")
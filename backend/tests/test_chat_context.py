@@ -0,0 +1,228 @@
+"""Tests for token-budgeted chat prompts and the running history summary."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.api.v1.chat import _build_chat_messages, _roll_up_history_in_background
+from app.models.chat import ChatMessage
+from app.services.chat_context import (
+    TRUNCATION_MARKER,
+    ChatPromptBudget,
+    budget_for_model,
+    fit_history,
+    format_rag_context,
+    load_history_window,
+    roll_up_history,
+    truncate_to_tokens,
+)
+from app.services.tokenizer import CharEstimateTokenizer
+
+T0 = datetime(2024, 12, 1, tzinfo=UTC)
+tokenizer = CharEstimateTokenizer()
+
+
+def _messages(*contents: str) -> list[ChatMessage]:
+    return [
+        ChatMessage(
+            role="user" if i % 2 == 0 else "assistant",
+            content=content,
+            created_at=T0 + timedelta(minutes=i),
+        )
+        for i, content in enumerate(contents)
+    ]
+
+
+def _db(rows):
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    db.execute.return_value = result
+    return db
+
+
+class TestPromptBudget:
+
+    def test_budget_is_split_across_parts(self):
+        budget = ChatPromptBudget.split(10_000)
+
+        assert (budget.system, budget.rag, budget.tools, budget.history) == (1500, 2500, 3500, 2500)
+        assert budget.system + budget.rag + budget.tools + budget.history <= budget.total
+
+    def test_small_model_window_lowers_budget(self):
+        with patch("app.services.chat_context._model_input_tokens", return_value=16_000), \
+                patch("app.services.chat_context.settings") as settings:
+            settings.chat_prompt_token_budget = 32_000
+            assert budget_for_model("small-model").total == 16_000 - 4096
+
+            settings.chat_prompt_token_budget = 8_000
+            assert budget_for_model("small-model").total == 8_000
+
+    def test_unknown_model_uses_configured_budget(self):
+        with patch("app.services.chat_context._model_input_tokens", return_value=None), \
+                patch("app.services.chat_context.settings") as settings:
+            settings.chat_prompt_token_budget = 32_000
+            assert budget_for_model("custom/model").total == 32_000
+
+    def test_truncate_to_tokens(self):
+        text = "x" * 4000
+
+        assert truncate_to_tokens(text, 2000, tokenizer) == text
+        cut = truncate_to_tokens(text, 100, tokenizer)
+        assert cut.endswith(TRUNCATION_MARKER)
+        assert tokenizer.count(cut) <= 100
+
+    def test_rag_context_keeps_best_ranked_chunks_within_budget(self):
+        chunks = [
+            {"file_path": f"app/{i}.py", "name": None, "chunk_type": "block",
+             "line_start": None, "line_end": None, "content": "y" * 1200}
+            for i in range(5)
+        ]
+
+        section, included = format_rag_context(chunks, 700, tokenizer)
+
+        assert included == 2
+        assert "app/0.py" in section and "app/1.py" in section and "app/2.py" not in section
+        assert tokenizer.count(section) <= 700
+
+
+class TestHistoryWindow:
+
+    async def test_window_is_ordered_and_limited_in_sql(self):
+        newest_first = list(reversed(_messages("a", "b", "c")))
+        db = _db(newest_first)
+        thread = MagicMock(summary_through=T0)
+
+        window = await load_history_window(db, thread, limit=3)
+
+        sql = str(db.execute.await_args.args[0])
+        assert "ORDER BY chat_messages.created_at DESC" in sql
+        assert "LIMIT" in sql
+        assert "chat_messages.created_at >" in sql
+        assert [m.content for m in window] == ["a", "b", "c"]
+
+    def test_newest_turns_that_fit_are_kept(self):
+        window = _messages("a" * 400, "b" * 400, "c" * 40, "d" * 40)
+
+        history = fit_history(window, None, 150, tokenizer)
+
+        assert [m.content[0] for m in history.messages] == ["b", "c", "d"]
+        assert history.roll_up_before == window[1].created_at
+        assert history.window == window
+
+    def test_summary_is_charged_first(self):
+        window = _messages("a" * 400, "b" * 40)
+
+        history = fit_history(window, "s" * 400, 150, tokenizer)
+        rendered = history.to_messages()
+
+        assert rendered[0]["role"] == "system"
+        assert "Summary of the earlier conversation" in rendered[0]["content"]
+        assert [m["content"][0] for m in rendered[1:]] == ["b"]
+
+    def test_nothing_fits_rolls_up_whole_window(self):
+        window = _messages("a" * 400, "b" * 400)
+
+        history = fit_history(window, None, 10, tokenizer)
+
+        assert history.messages == []
+        assert history.roll_up_before > window[-1].created_at
+
+
+class TestRollUp:
+
+    async def test_pending_turns_are_folded_into_summary(self):
+        pending = _messages("How is auth done?", "JWT in app/core/security.py", "Refresh?", "30 days")
+        db = _db(pending)
+        thread = MagicMock(summary="Earlier: repo layout.", summary_through=None)
+        llm = MagicMock(DEFAULT_MODELS={"fast": "fast-model"})
+        llm.chat = AsyncMock(return_value={"content": "Auth uses JWT (app/core/security.py)."})
+
+        updated = await roll_up_history(
+            db, thread, fit_history(pending, None, 0, tokenizer), llm,
+        )
+
+        assert updated
+        assert thread.summary == "Auth uses JWT (app/core/security.py)."
+        assert thread.summary_through == pending[-1].created_at
+        prompt = llm.chat.await_args.kwargs["messages"][1]["content"]
+        assert "Earlier: repo layout." in prompt and "JWT in app/core/security.py" in prompt
+        assert llm.chat.await_args.kwargs["model"] == "fast-model"
+        db.commit.assert_awaited_once()
+
+    async def test_few_pending_turns_are_not_summarized(self):
+        pending = _messages("a", "b")
+        db = _db(pending)
+        llm = MagicMock()
+        llm.chat = AsyncMock()
+        thread = MagicMock(summary=None, summary_through=None)
+
+        assert not await roll_up_history(db, thread, fit_history(pending, None, 0, tokenizer), llm)
+
+        llm.chat.assert_not_awaited()
+
+    async def test_failed_summary_leaves_thread_unchanged(self):
+        pending = _messages("a", "b", "c", "d")
+        db = _db(pending)
+        llm = MagicMock(DEFAULT_MODELS={"fast": "fast-model"})
+        llm.chat = AsyncMock(side_effect=RuntimeError("provider down"))
+        thread = MagicMock(summary="old", summary_through=None)
+
+        assert not await roll_up_history(db, thread, fit_history(pending, None, 0, tokenizer), llm)
+
+        assert thread.summary == "old"
+        db.commit.assert_not_awaited()
+
+    async def test_background_roll_up_uses_its_own_session(self):
+        pending = _messages("a", "b", "c", "d")
+        db = _db(pending)
+        thread = MagicMock(id="t1", summary=None, summary_through=None)
+        db.get = AsyncMock(return_value=thread)
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__ = AsyncMock(return_value=db)
+        session_maker.return_value.__aexit__ = AsyncMock(return_value=False)
+        llm = MagicMock(DEFAULT_MODELS={"fast": "fast-model"})
+        llm.chat = AsyncMock(return_value={"content": "Summary."})
+
+        with patch("app.core.database.async_session_maker", session_maker):
+            await _roll_up_history_in_background("t1", fit_history(pending, None, 0, tokenizer), llm)
+
+        db.get.assert_awaited_once()
+        assert thread.summary == "Summary."
+        db.commit.assert_awaited_once()
+
+    async def test_background_roll_up_failure_is_logged_not_raised(self):
+        pending = _messages("a", "b", "c", "d")
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__ = AsyncMock(side_effect=ConnectionError("db down"))
+        session_maker.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.core.database.async_session_maker", session_maker), \
+                patch("app.api.v1.chat.logger") as logger:
+            await _roll_up_history_in_background("t1", fit_history(pending, None, 0, tokenizer), MagicMock())
+
+        logger.warning.assert_called_once()
+
+
+class TestBuildChatMessages:
+
+    @pytest.fixture
+    def thread(self):
+        thread = MagicMock(context_file=None, summary="User is refactoring checkout.")
+        thread.repository.full_name = "acme/shop"
+        return thread
+
+    async def test_prompt_uses_summary_and_fitted_history(self, thread):
+        window = _messages("old " * 2000, "recent question", "recent answer")
+
+        with patch("app.api.v1.chat._get_rag_context", AsyncMock(return_value=[])), \
+                patch("app.api.v1.chat.budget_for_model", return_value=ChatPromptBudget.split(8000)):
+            messages, history = await _build_chat_messages(
+                thread, "And payments?", history_window=window,
+            )
+
+        assert messages[0]["role"] == "system"
+        assert "User is refactoring checkout." in messages[1]["content"]
+        assert [m["content"] for m in messages[2:]] == ["recent question", "recent answer", "And payments?"]
+        assert history.roll_up_before == window[1].created_at
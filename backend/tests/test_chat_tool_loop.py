@@ -0,0 +1,230 @@
+"""Tests for parallel tool execution and streamed answers in the chat tool loop."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.api.v1.chat import _stream_response, _TurnSplitter
+from app.services.chat_context import ChatPromptBudget
+
+ANSWER = "The checkout flow validates the cart in cart.py and charges the card in payments.py. " * 3
+
+
+class FakeGateway:
+    """Streams scripted model turns and records how far each stream got."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.requests = []
+        self.finished: list[bool] = []
+
+    async def chat_stream_with_usage(self, messages, **kwargs):
+        self.requests.append([dict(m) for m in messages])
+        chunks = self.turns.pop(0)
+        index = len(self.finished)
+        self.finished.append(False)
+        future = asyncio.get_running_loop().create_future()
+
+        async def tokens():
+            for chunk in chunks:
+                await asyncio.sleep(0)
+                yield chunk
+            self.finished[index] = True
+            future.set_result({
+                "model": "m",
+                "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+                "cost": 0.01,
+            })
+
+        return tokens(), future
+
+
+def _thread():
+    thread = MagicMock(context_file=None, summary=None)
+    thread.repository.full_name = "acme/shop"
+    return thread
+
+
+def _parse(events):
+    parsed = []
+    for raw in "".join(e for e, _ in events).split("\n\n"):
+        if raw.startswith("event: "):
+            name, data = raw.split("\n", 1)
+            parsed.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return parsed
+
+
+async def _run(gateway, read_file=None):
+    db = AsyncMock()
+    db.add = MagicMock()
+    events = []
+    with patch("app.api.v1.chat.get_llm_gateway", return_value=gateway), \
+            patch("app.api.v1.chat._get_rag_context", AsyncMock(return_value=[])), \
+            patch("app.api.v1.chat.budget_for_model", return_value=ChatPromptBudget.split(32000)), \
+            patch("app.api.v1.chat._read_repo_file_text", read_file or AsyncMock(return_value=("", "cache"))):
+        async for event in _stream_response(_thread(), "How does checkout work?", db):
+            # Record whether the model stream was still running when the event arrived
+            events.append((event, list(gateway.finished)))
+    return events, db
+
+
+class TestChatToolLoop:
+
+    async def test_independent_reads_run_concurrently(self):
+        gateway = FakeGateway([
+            [
+                '{"tool":"read_file","arguments":{"path":"cart.py"}}\n',
+                '{"tool":"read_file","arguments":{"path":"payments.py"}}\n',
+                '{"tool":"read_file","arguments":{"path":"cart.py"}}',
+            ],
+            [ANSWER],
+        ])
+        started: list[str] = []
+        both_started = asyncio.Event()
+
+        async def read_file(file_path, **kwargs):
+            started.append(file_path)
+            if len(started) == 2:
+                both_started.set()
+            # Deadlocks (and times out) if the reads ran one after the other
+            await asyncio.wait_for(both_started.wait(), timeout=2)
+            return f"# {file_path}", "cache"
+
+        events, db = await _run(gateway, read_file=read_file)
+        parsed = _parse(events)
+
+        assert sorted(started) == ["cart.py", "payments.py"]  # Duplicate call dropped
+        results = [payload for name, payload in parsed if name == "tool_result"]
+        assert [r["result"]["path"] for r in results] == ["cart.py", "payments.py"]
+        assert all(r["ok"] for r in results)
+        # One round-trip for both files
+        assert len(gateway.requests) == 2
+        feedback = gateway.requests[1][-1]["content"]
+        assert "# cart.py" in feedback and "# payments.py" in feedback
+
+    async def test_answer_after_tool_budget_is_streamed_as_generated(self):
+        reads = "\n".join(
+            json.dumps({"tool": "read_file", "arguments": {"path": f"file{i}.py"}}) for i in range(8)
+        )
+        chunks = [ANSWER[i:i + 20] for i in range(0, len(ANSWER), 20)]
+        gateway = FakeGateway([[reads], chunks])
+
+        events, db = await _run(gateway)
+        parsed = _parse(events)
+
+        tokens = [(event, finished) for event, finished in events if event.startswith("event: token")]
+        # The first token left before the model finished generating
+        assert tokens[0][1] == [True, False]
+        assert "".join(p["delta"] for name, p in parsed if name == "token") == ANSWER
+        saved = db.add.call_args.args[0]
+        assert saved.content == ANSWER
+
+    async def test_answer_without_tools_is_streamed_as_generated(self):
+        chunks = [ANSWER[i:i + 20] for i in range(0, len(ANSWER), 20)]
+        gateway = FakeGateway([chunks])
+
+        events, db = await _run(gateway)
+        parsed = _parse(events)
+
+        tokens = [finished for event, finished in events if event.startswith("event: token")]
+        # The first token left before the model finished generating
+        assert tokens[0] == [False]
+        assert not [p for name, p in parsed if name == "tool_call"]
+        assert "".join(p["delta"] for name, p in parsed if name == "token") == ANSWER
+        assert db.add.call_args.args[0].content == ANSWER
+
+    async def test_tool_call_after_long_preamble_runs(self):
+        preamble = "Let me look at how the checkout flow is wired before answering your question.\n"
+        call = '{"tool":"read_file","arguments":{"path":"cart.py"}}'
+        gateway = FakeGateway([
+            [preamble[i:i + 20] for i in range(0, len(preamble), 20)] + ['{"to', call[4:]],
+            [ANSWER],
+        ])
+        read_file = AsyncMock(return_value=("# cart.py", "cache"))
+
+        events, db = await _run(gateway, read_file=read_file)
+        parsed = _parse(events)
+
+        assert [p["name"] for name, p in parsed if name == "tool_call"] == ["read_file"]
+        read_file.assert_awaited_once()
+        streamed = "".join(p["delta"] for name, p in parsed if name == "token")
+        # The preamble streamed live, the tool JSON never reached the client
+        assert streamed == preamble + ANSWER
+        assert '"tool"' not in streamed
+        assert db.add.call_args.args[0].content == preamble + ANSWER
+        assert [p["title"] for name, p in parsed if name == "step"].count("Answering") == 1
+
+    async def test_fenced_tool_call_is_not_streamed(self):
+        gateway = FakeGateway([
+            ["```json\n", '{"tool":"read_file","arguments":{"path":"cart.py"}}\n', "```"],
+            [ANSWER],
+        ])
+
+        events, _ = await _run(gateway)
+        parsed = _parse(events)
+
+        assert [p["name"] for name, p in parsed if name == "tool_call"] == ["read_file"]
+        assert "".join(p["delta"] for name, p in parsed if name == "token") == ANSWER
+
+    async def test_usage_and_cost_are_summed_across_turns(self):
+        gateway = FakeGateway([
+            ['{"tool":"read_file","arguments":{"path":"cart.py"}}'],
+            [ANSWER],
+        ])
+
+        events, db = await _run(gateway)
+        parsed = _parse(events)
+
+        assert db.add.call_args.args[0].tokens_used == 14
+        done = [p for name, p in parsed if name == "done"][0]
+        assert done["usage"] == {"prompt_tokens": 10, "completion_tokens": 4, "total_tokens": 14}
+        assert done["cost"] == pytest.approx(0.02)
+
+    async def test_json_first_answer_is_buffered(self):
+        answer = '{"status": "ok"} is what the health endpoint returns.'
+        gateway = FakeGateway([[answer]])
+
+        events, _ = await _run(gateway)
+        parsed = _parse(events)
+
+        assert not [p for name, p in parsed if name == "tool_call"]
+        assert "".join(p["delta"] for name, p in parsed if name == "token") == answer
+
+
+
+class TestTurnSplitter:
+
+    def test_prose_is_released_as_it_arrives(self):
+        splitter = _TurnSplitter()
+
+        assert splitter.feed("The cart ") == "The cart "
+        assert splitter.feed("is validated.\nThen") == "is validated.\nThen"
+        assert splitter.held == ""
+
+    def test_line_is_held_while_it_may_open_a_tool_call(self):
+        splitter = _TurnSplitter()
+
+        assert splitter.feed("Checking.\n  {") == "Checking.\n"
+        assert splitter.feed('"tool": "read_file"') == ""
+        assert splitter.feed("}\nMore prose") == ""
+        assert splitter.held == '  {"tool": "read_file"}\nMore prose'
+
+    def test_json_that_is_not_a_tool_call_is_released(self):
+        splitter = _TurnSplitter()
+
+        assert splitter.feed('{"sta') == ""
+        assert splitter.feed('tus": "ok"} is returned') == '{"status": "ok"} is returned'
+
+    def test_code_fence_is_released_once_its_first_line_is_prose(self):
+        splitter = _TurnSplitter()
+
+        assert splitter.feed("``") == ""
+        assert splitter.feed("`python\n") == ""
+        assert splitter.feed("x = 1\n") == "```python\nx = 1\n"
+
+    def test_nothing_is_held_without_tools(self):
+        splitter = _TurnSplitter(detect_tool_calls=False)
+
+        assert splitter.feed('{"tool": "read_file"}') == '{"tool": "read_file"}'
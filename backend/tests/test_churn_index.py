@@ -0,0 +1,60 @@
+"""Tests for persisting per-repository churn indexes."""
+
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+from app.services.churn_index import load_churn_index, save_churn_index
+from app.services.git_analyzer import ChurnIndex
+
+REPO_ID = str(uuid.uuid4())
+NOW = datetime(2024, 12, 19, tzinfo=UTC)
+
+
+def _index(base_sha="a" * 40):
+    index = ChurnIndex(head_sha="b" * 40, base_sha=base_sha)
+    index.add("app.py", NOW, "alice", 3, 1)
+    return index
+
+
+def test_only_changed_files_are_written():
+    index = _index()
+    index.files["untouched.py"] = index.files["app.py"]
+    db = MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = uuid.uuid4()
+
+    assert save_churn_index(db, REPO_ID, index)
+
+    head_update, upsert = (call.args[0] for call in db.execute.call_args_list)
+    assert "WHERE repo_churn_indexes.repository_id" in str(head_update)
+    params = upsert.compile().params
+    assert "untouched.py" not in params.values()
+    assert params["file_path_m0"] == "app.py"
+    assert params["days_m0"] == {"2024-12-19": {"commits": 1, "added": 3, "removed": 1, "authors": ["alice"]}}
+    assert index.base_sha == index.head_sha and not index.touched
+
+
+def test_concurrently_moved_head_is_not_overwritten():
+    index = _index()
+    db = MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = None
+
+    assert not save_churn_index(db, REPO_ID, index)
+
+    db.execute.assert_called_once()
+    assert index.touched == {"app.py"}
+
+
+def test_loaded_index_resumes_from_head():
+    record = MagicMock(id=uuid.uuid4(), head_sha="a" * 40)
+    db = MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = record
+    db.execute.return_value.all.return_value = [
+        ("app.py", {"2024-12-19": {"commits": 2, "added": 5, "removed": 0, "authors": ["bob"]}}, NOW),
+    ]
+
+    index = load_churn_index(db, REPO_ID)
+
+    assert index.head_sha == index.base_sha == "a" * 40
+    churn = index.file_churn(now=NOW)["app.py"]
+    assert (churn.changes_30d, churn.lines_added_90d, churn.unique_authors) == (2, 5, 1)
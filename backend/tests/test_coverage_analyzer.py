@@ -8,13 +8,15 @@ Requirements: 3.1, 3.2
 
 from __future__ import annotations
 
+import io
+import json
 import tempfile
 from pathlib import Path
 
 from hypothesis import given, settings
 from hypothesis import strategies as st
 
-from app.services.coverage_analyzer import CoverageAnalyzer
+from app.services.coverage_analyzer import CoverageAnalyzer, _JsonStream
 
 # =============================================================================
 # Custom Strategies for Cobertura XML Generation
@@ -314,6 +316,116 @@ class TestCoverageEdgeCases:
         assert coverage_data["src/over_one.py"] == 1.0
 
 
+# =============================================================================
+# Streaming Ingestion Tests (lcov, coverage.py JSON)
+# =============================================================================
+
+
+LCOV_REPORT = """TN:
+SF:./src/app.ts
+DA:1,1
+DA:2,0
+LF:4
+LH:3
+end_of_record
+SF:src/util.ts
+DA:1,5
+DA:2,0
+DA:3,0
+DA:4,2
+end_of_record
+SF:src/empty.ts
+LF:0
+LH:0
+end_of_record
+"""
+
+
+def _coverage_json(files: dict[str, tuple[int, int]]) -> str:
+    return json.dumps({
+        "meta": {"version": "7.4.0", "branch_coverage": False},
+        "files": {
+            path: {
+                "executed_lines": list(range(1, covered + 1)),
+                "summary": {"covered_lines": covered, "num_statements": statements},
+                "missing_lines": [],
+            }
+            for path, (covered, statements) in files.items()
+        },
+        "totals": {"covered_lines": 0, "num_statements": 0},
+    }, indent=2)
+
+
+class TestStreamingCoverageFormats:
+    """lcov and coverage.py JSON produce the same per-file coverage map."""
+
+    def test_lcov_uses_summary_then_da_lines(self):
+        coverage_data = CoverageAnalyzer().parse_lcov_lines(io.StringIO(LCOV_REPORT))
+
+        assert coverage_data == {"src/app.ts": 0.75, "src/util.ts": 0.5, "src/empty.ts": 1.0}
+
+    def test_lcov_records_of_same_file_are_merged(self):
+        report = "SF:a.js\nLF:4\nLH:4\nend_of_record\nSF:a.js\nLF:4\nLH:0\nend_of_record\n"
+
+        assert CoverageAnalyzer().parse_lcov_lines(report.splitlines()) == {"a.js": 0.5}
+
+    @given(st.dictionaries(
+        st.from_regex(r"[a-z]{1,8}(/[a-z]{1,8}){0,3}\.py", fullmatch=True),
+        st.tuples(st.integers(0, 500), st.integers(1, 500)).map(lambda t: (min(t), t[1])),
+        max_size=30,
+    ))
+    @settings(max_examples=50)
+    def test_coverage_json_streams_across_chunks(self, files: dict[str, tuple[int, int]]):
+        """Tiny read chunks split keys, numbers and entries at arbitrary points."""
+        content = _coverage_json(files)
+        analyzer = CoverageAnalyzer()
+
+        with_small_chunks = analyzer.parse_coverage_json_stream(_ChunkedReader(content, 7))
+
+        assert with_small_chunks == {path: covered / statements for path, (covered, statements) in files.items()}
+
+    def test_json_number_split_at_chunk_boundary(self):
+        reader = _JsonStream(_ChunkedReader('{"a": 12345}', 8), chunk_size=8)
+
+        assert [(key, reader.value()) for key in reader.members()] == [("a", 12345)]
+
+    def test_parse_if_exists_finds_lcov_and_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_path = Path(tmpdir)
+            (repo_path / "coverage").mkdir()
+            (repo_path / "coverage" / "lcov.info").write_text(LCOV_REPORT)
+
+            assert CoverageAnalyzer().parse_if_exists(repo_path)["src/util.ts"] == 0.5
+
+            (repo_path / "coverage.json").write_text(_coverage_json({"app/main.py": (3, 4)}))
+
+            # coverage.py JSON is preferred over lcov
+            assert CoverageAnalyzer().parse_if_exists(repo_path) == {"app/main.py": 0.75}
+
+    def test_large_cobertura_report(self):
+        classes = "".join(
+            f'<class filename="src/f{i}.py" line-rate="0.5"><lines><line number="1" hits="1"/></lines></class>'
+            for i in range(2000)
+        )
+        xml_content = f"<coverage><packages><package><classes>{classes}</classes></package></packages></coverage>"
+
+        coverage_data = CoverageAnalyzer().parse_cobertura_xml_string(xml_content)
+
+        assert len(coverage_data) == 2000
+        assert coverage_data["src/f1999.py"] == 0.5
+
+
+class _ChunkedReader(io.StringIO):
+    """Text stream that returns at most ``size`` characters per read."""
+
+    def __init__(self, content: str, size: int) -> None:
+        super().__init__(content)
+        self._size = size
+
+    def read(self, n: int = -1) -> str:
+        return super().read(self._size if n < 0 else min(n, self._size))
+
+
 # =============================================================================
 # Property Tests for Coverage in Risk Factors (Property 9)
 # =============================================================================
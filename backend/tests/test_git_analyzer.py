@@ -8,15 +8,17 @@ Requirements: 2.1, 2.2, 2.3, 2.4
 
 from __future__ import annotations
 
+import os
 import subprocess
 import tempfile
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
+import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
 
-from app.services.git_analyzer import FileChurn, GitAnalyzer
+from app.services.git_analyzer import ChurnIndex, FileChurn, GitAnalyzer, _numstat_path
 
 # =============================================================================
 # Custom Strategies for FileChurn Generation
@@ -199,6 +201,128 @@ class TestGitLogParsingProperties:
             assert churn.changes_90d == 2, f"Expected 2 changes, got {churn.changes_90d}"
 
 
+# =============================================================================
+# Churn Index Tests
+# =============================================================================
+
+
+def _git(repo_path: Path, *args: str, env: dict | None = None) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo_path, check=True, capture_output=True, text=True,
+        env={**os.environ, **(env or {})},
+    ).stdout
+
+
+def _commit(repo_path: Path, file_name: str, content: str, days_ago: int, author: str = "Test User") -> str:
+    (repo_path / file_name).write_text(content)
+    date = (datetime.now(UTC) - timedelta(days=days_ago)).isoformat()
+    _git(repo_path, "add", file_name)
+    _git(
+        repo_path, "commit", "-m", f"Change {file_name}",
+        env={
+            "GIT_AUTHOR_NAME": author,
+            "GIT_AUTHOR_EMAIL": "dev@example.com",
+            "GIT_COMMITTER_NAME": author,
+            "GIT_COMMITTER_EMAIL": "dev@example.com",
+            "GIT_AUTHOR_DATE": date,
+            "GIT_COMMITTER_DATE": date,
+        },
+    )
+    return _git(repo_path, "rev-parse", "HEAD").strip()
+
+
+class TestChurnIndex:
+    """Single-pass mining into an incremental churn index."""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        _git(tmp_path, "init", "-q")
+        _commit(tmp_path, "old.py", "a\n", days_ago=120)
+        _commit(tmp_path, "app.py", "a\n", days_ago=60, author="Alice")
+        _commit(tmp_path, "app.py", "a\nb\n", days_ago=10, author="Bob")
+        return tmp_path
+
+    def test_one_pass_fills_all_windows(self, repo):
+        churn_data = GitAnalyzer().analyze(repo)
+
+        assert set(churn_data) == {"app.py"}
+        churn = churn_data["app.py"]
+        assert (churn.changes_90d, churn.changes_30d) == (2, 1)
+        assert (churn.lines_added_90d, churn.unique_authors) == (2, 2)
+
+    def test_resumed_index_mines_only_new_commits(self, repo):
+        analyzer = GitAnalyzer()
+        index = ChurnIndex()
+        analyzer.analyze(repo, index=index)
+        index.base_sha = index.head_sha
+        index.touched = set()
+
+        head = _commit(repo, "util.py", "x\n", days_ago=1)
+        churn_data = analyzer.analyze(repo, index=index)
+
+        assert index.head_sha == head
+        assert index.touched == {"util.py"}
+        assert not index.rebuilt
+        assert churn_data["app.py"].changes_90d == 2
+        assert churn_data["util.py"].changes_30d == 1
+
+    def test_rewritten_history_rebuilds_index(self, repo):
+        analyzer = GitAnalyzer()
+        index = ChurnIndex()
+        analyzer.analyze(repo, index=index)
+        index.base_sha = index.head_sha
+
+        _git(repo, "reset", "-q", "--hard", "HEAD~1")
+        churn_data = analyzer.analyze(repo, index=index)
+
+        assert index.rebuilt
+        assert churn_data["app.py"].changes_90d == 1
+
+    def test_shallow_clone_is_deepened_to_window(self, repo, tmp_path_factory):
+        clone = tmp_path_factory.mktemp("clone") / "repo"
+        _git(repo, "clone", "-q", "--depth", "1", f"file://{repo}", str(clone))
+
+        churn_data = GitAnalyzer().analyze(clone)
+
+        assert churn_data["app.py"].changes_90d == 2
+        assert "old.py" not in churn_data
+
+    def test_shallow_boundary_commit_is_not_counted(self, repo, tmp_path_factory):
+        clone = tmp_path_factory.mktemp("clone") / "repo"
+        _git(repo, "clone", "-q", "--depth", "1", f"file://{repo}", str(clone))
+
+        with pytest.MonkeyPatch.context() as mp:
+            # Keep the clone shallow: its only commit diffs against an empty tree
+            mp.setattr(GitAnalyzer, "_ensure_history", lambda *args: None)
+            churn_data = GitAnalyzer().analyze(clone)
+
+        assert churn_data == {}
+
+    def test_pruned_buckets_mark_files_changed(self):
+        index = ChurnIndex()
+        now = datetime.now(UTC)
+        index.add("gone.py", now - timedelta(days=100), "a", 1, 0)
+        index.add("kept.py", now - timedelta(days=5), "a", 1, 0)
+        index.touched = set()
+
+        index.prune(now)
+
+        assert set(index.files) == {"kept.py"}
+        assert index.touched == {"gone.py"}
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("app/main.py", "app/main.py"),
+            ("old.py => new.py", "new.py"),
+            ("src/{core => lib}/util.py", "src/lib/util.py"),
+            ("src/{ => lib}/util.py", "src/lib/util.py"),
+        ],
+    )
+    def test_renames_resolve_to_new_path(self, path, expected):
+        assert _numstat_path(path) == expected
+
+
 # =============================================================================
 # Property Tests for Hot Spot Threshold
 # =============================================================================
@@ -0,0 +1,234 @@
+"""Tests for warm validation sandboxes and workspace reuse across healing iterations."""
+
+import os
+import subprocess
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.agents.diagnosis import DiagnosisResult, FixPath
+from app.services.agents.fix import FixResult
+from app.services.agents.orchestrator import HealingOrchestrator, HealingStatus
+from app.services.agents.test import TestResult as GeneratedTest
+from app.services.impact_analysis import SelectedTest
+from app.services.sandbox import Sandbox, SandboxPool
+
+
+def _started_sandbox(tmp_path) -> Sandbox:
+    sandbox = Sandbox(client=MagicMock(), repository_id=uuid.uuid4())
+    sandbox.container = MagicMock(id="container-1", status="running")
+    sandbox.workdir = str(tmp_path)
+    (tmp_path / "repo" / "src").mkdir(parents=True)
+    (tmp_path / "repo" / "src" / "app.py").write_text("x = 1\n")
+    return sandbox
+
+
+class TestWorkspaceReset:
+
+    def test_writes_stay_inside_repository(self, tmp_path):
+        sandbox = _started_sandbox(tmp_path)
+
+        with pytest.raises(ValueError):
+            sandbox.write_workspace_file("../outside.py", "")
+
+    async def test_reset_restores_snapshot_of_repo_owned_by_another_uid(self, tmp_path):
+        if os.geteuid() != 0:
+            pytest.skip("changing file ownership requires root")
+        sandbox = _started_sandbox(tmp_path)
+        sandbox.container.exec_run.return_value = (0, (b"", b""))
+        repo = tmp_path / "repo"
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+        subprocess.run([*git, "init", "-q"], cwd=repo, check=True)
+        subprocess.run([*git, "add", "."], cwd=repo, check=True)
+        subprocess.run([*git, "commit", "-qm", "init"], cwd=repo, check=True)
+        # The clone belongs to another uid than the one resetting it
+        for path in [repo, *repo.rglob("*")]:
+            os.lchown(path, 1000, 1000)
+        assert sandbox.snapshot_workspace()
+
+        sandbox.write_workspace_file("src/app.py", "x = 2\n")
+        sandbox.write_workspace_file("tests/unit/test_app.py", "def test(): pass\n")
+        (repo / ".pytest_cache").mkdir()
+
+        assert await sandbox.reset_workspace()
+
+        assert (repo / "src" / "app.py").read_text() == "x = 1\n"
+        assert not (repo / "tests").exists()
+        assert not (repo / ".pytest_cache").exists()
+        assert (repo / "src" / "app.py").stat().st_uid == 1000
+        status = subprocess.run(
+            ["git", "-c", "safe.directory=*", "status", "--porcelain"],
+            cwd=repo, capture_output=True, text=True, check=True,
+        )
+        assert status.stdout == ""
+        assert not sandbox.workspace_dirty
+
+        # The snapshot is reused by later resets
+        sandbox.write_workspace_file("src/app.py", "x = 3\n")
+        assert await sandbox.reset_workspace()
+        assert (repo / "src" / "app.py").read_text() == "x = 1\n"
+
+        await sandbox.cleanup()
+        assert not os.path.exists(sandbox.pristine_dir)
+
+    async def test_snapshot_is_kept_outside_the_mounted_workdir(self, tmp_path):
+        sandbox = _started_sandbox(tmp_path / "work")
+
+        assert sandbox.snapshot_workspace()
+
+        assert not Path(sandbox.pristine_dir).is_relative_to(tmp_path / "work")
+        assert (Path(sandbox.pristine_dir) / "src" / "app.py").read_text() == "x = 1\n"
+
+    async def test_clean_workspace_is_not_reset(self, tmp_path):
+        sandbox = _started_sandbox(tmp_path)
+        sandbox.run = AsyncMock()
+
+        assert await sandbox.reset_workspace()
+
+        sandbox.run.assert_not_called()
+
+    async def test_reset_without_snapshot_is_reported(self, tmp_path):
+        sandbox = _started_sandbox(tmp_path)
+        sandbox.workspace_dirty = True
+
+        assert not await sandbox.reset_workspace()
+
+
+class TestSandboxPool:
+
+    @staticmethod
+    def _pool(size=1):
+        pool = SandboxPool(client=MagicMock(), size=size)
+        started = []
+
+        async def start(self):
+            self.container = MagicMock(id=f"c{len(started)}", status="running")
+            started.append(self)
+
+        return pool, started, patch.object(Sandbox, "start", start)
+
+    async def test_acquire_uses_warm_sandbox_and_refills(self):
+        pool, started, start_patch = self._pool()
+        repository_id = uuid.uuid4()
+
+        with start_patch:
+            await pool.fill()
+            warm = pool._idle[0]
+            leased = await pool.acquire(repository_id)
+            await pool._filling
+
+        assert leased is warm
+        assert leased.repository_id == repository_id
+        assert len(pool._idle) == 1 and pool._idle[0] is not warm
+        assert len(started) == 2
+
+    async def test_dead_warm_sandbox_is_replaced(self):
+        pool, started, start_patch = self._pool(size=0)
+        dead = Sandbox(client=MagicMock(), repository_id=uuid.uuid4())
+        dead.container = MagicMock(status="exited")
+        dead.cleanup = AsyncMock()
+        pool._idle.append(dead)
+
+        with start_patch:
+            leased = await pool.acquire(uuid.uuid4())
+
+        dead.cleanup.assert_awaited_once()
+        assert leased is started[0]
+
+
+class TestHealingWorkspaceReuse:
+
+    @staticmethod
+    def _orchestrator():
+        with patch.multiple(
+            "app.services.agents.orchestrator",
+            DiagnosisAgent=MagicMock, FixAgent=MagicMock, TestAgent=MagicMock,
+        ):
+            orchestrator = HealingOrchestrator(max_iterations=3)
+        orchestrator.diagnosis_agent.diagnose = AsyncMock(return_value=DiagnosisResult(
+            issue_id="i", fix_path=FixPath.PATH_A, confidence=0.9, complexity_score=2,
+            estimated_changes=1, context_needed=[], fix_description="", risk_factors=[],
+            can_auto_fix=True,
+        ))
+        orchestrator.fix_agent.generate_fix = AsyncMock(return_value=FixResult(
+            issue_id="i", success=True, file_path="src/app.py", original_content="x = 1\n",
+            fixed_content="x = 2\n", diff="", explanation="", confidence=0.9, changes_summary=[],
+        ))
+        orchestrator.test_agent.generate_test = AsyncMock(return_value=GeneratedTest(
+            issue_id="i", success=False, test_file_path="", test_content="",
+            test_framework="pytest", test_count=0, explanation="",
+        ))
+        return orchestrator
+
+    @staticmethod
+    def _sandbox(*resets):
+        sandbox = MagicMock()
+        sandbox.reset_workspace = AsyncMock(side_effect=list(resets) if resets else None, return_value=True)
+        sandbox.cleanup = AsyncMock()
+        return sandbox
+
+    async def test_repository_is_cloned_once_per_heal(self):
+        orchestrator = self._orchestrator()
+
+        sandbox = self._sandbox()
+        orchestrator._provision_workspace = AsyncMock(return_value=sandbox)
+        orchestrator._run_lint_check_in_sandbox = AsyncMock(side_effect=[
+            {"passed": False, "output": "SyntaxError"},
+            {"passed": False, "output": "SyntaxError"},
+            {"passed": True, "output": ""},
+        ])
+
+        result = await orchestrator.heal_issue(
+            issue={"id": "i"}, repository={"id": str(uuid.uuid4())}, file_content="x = 1\n",
+        )
+
+        assert result.status == HealingStatus.COMPLETED
+        assert result.iterations_used == 3
+        orchestrator._provision_workspace.assert_awaited_once()
+        # Reset before every fix is applied (a no-op on the fresh clone)
+        assert sandbox.reset_workspace.await_count == 3
+        assert sandbox.write_workspace_file.call_count == 3
+        sandbox.cleanup.assert_awaited_once()
+
+    async def test_reset_failure_after_baseline_reprovisions_without_spending_an_iteration(self):
+        orchestrator = self._orchestrator()
+        broken = self._sandbox(True, False)  # Clean before the fix, fails after the baseline
+        fresh = self._sandbox()
+        orchestrator._provision_workspace = AsyncMock(side_effect=[broken, fresh])
+        orchestrator._select_impacted_tests = MagicMock(return_value=(
+            [SelectedTest("tests/test_app.py", "imports src/app.py")], "pytest",
+        ))
+        orchestrator._run_selected_tests = AsyncMock(return_value={})
+        orchestrator._run_impacted_tests_in_sandbox = AsyncMock(return_value={"passed": True})
+        orchestrator._run_lint_check_in_sandbox = AsyncMock(return_value={"passed": True, "output": ""})
+
+        result = await orchestrator.heal_issue(
+            issue={"id": "i"}, repository={"id": str(uuid.uuid4())}, file_content="x = 1\n",
+        )
+
+        assert result.status == HealingStatus.COMPLETED
+        assert result.iterations_used == 1
+        orchestrator.fix_agent.generate_fix.assert_awaited_once()
+        assert orchestrator._provision_workspace.await_count == 2
+        broken.cleanup.assert_awaited_once()
+        broken.write_workspace_file.assert_not_called()
+        # The baseline of the clean checkout is reused on the fresh workspace
+        orchestrator._run_selected_tests.assert_awaited_once()
+        fresh.write_workspace_file.assert_called_once_with("src/app.py", "x = 2\n")
+
+    async def test_unusable_workspaces_fail_without_feeding_the_fix_agent(self):
+        orchestrator = self._orchestrator()
+        orchestrator._provision_workspace = AsyncMock(side_effect=[self._sandbox(False), self._sandbox(False)])
+        orchestrator._run_lint_check_in_sandbox = AsyncMock()
+
+        result = await orchestrator.heal_issue(
+            issue={"id": "i"}, repository={"id": str(uuid.uuid4())}, file_content="x = 1\n",
+        )
+
+        assert result.status == HealingStatus.FAILED
+        assert "Sandbox validation unavailable" in result.error_message
+        orchestrator.fix_agent.generate_fix.assert_awaited_once()
+        assert orchestrator.fix_agent.generate_fix.await_args.kwargs["previous_error"] is None
+        orchestrator._run_lint_check_in_sandbox.assert_not_called()
@@ -0,0 +1,155 @@
+"""Tests for impact-scoped test selection during fix validation."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.agents.orchestrator import HealingOrchestrator
+from app.services.agents.test import TestResult as GeneratedTest
+from app.services.impact_analysis import (
+    ImpactIndex,
+    SelectedTest,
+    impacted_test_command,
+    is_test_file,
+    parse_failed_tests,
+)
+from app.services.sandbox import ExecResult
+
+
+@pytest.fixture
+def repo(tmp_path):
+    files = {
+        "app/users.py": "def load_user(user_id):\n    return {'id': user_id}\n",
+        "app/orders.py": "from app.users import load_user\n\ndef order_owner(order):\n    return load_user(order)\n",
+        "app/reports.py": "def build_report():\n    return order_owner(1)\n",
+        "tests/test_users.py": "from app.users import load_user\n\ndef test_load():\n    assert load_user(1)\n",
+        "tests/test_orders.py": "from app.orders import order_owner\n\ndef test_owner():\n    assert order_owner(1)\n",
+        "tests/test_reports.py": "def test_report():\n    assert build_report()\n",
+        "tests/test_misc.py": "def test_nothing():\n    assert True\n",
+        "web/user.test.ts": "import { x } from '../app/users'\n",
+    }
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path
+
+
+class TestImpactIndex:
+
+    def test_selects_tests_reaching_changed_file(self, repo):
+        index = ImpactIndex.build(repo)
+
+        selected = {t.path: t.reason for t in index.select_tests("app/users.py", max_files=10)}
+
+        assert selected["tests/test_users.py"].startswith("imports app/users.py")
+        assert selected["tests/test_orders.py"].startswith("imports app/orders.py -> app/users.py")
+        # Reached through the call graph only
+        assert selected["tests/test_reports.py"] == "test_report calls load_user()"
+        assert "tests/test_misc.py" not in selected
+        # Other languages are not selected
+        assert "web/user.test.ts" not in selected
+
+    def test_direct_importers_rank_first(self, repo):
+        index = ImpactIndex.build(repo)
+
+        [first] = index.select_tests("app/users.py", max_files=1)
+
+        assert first.path == "tests/test_users.py"
+
+    def test_unknown_file_type_selects_nothing(self, repo):
+        assert ImpactIndex.build(repo).select_tests("README.md", max_files=10) == []
+
+    @pytest.mark.parametrize(("path", "expected"), [
+        ("tests/test_users.py", True),
+        ("pkg/users_test.py", True),
+        ("src/__tests__/api.ts", True),
+        ("src/api.spec.tsx", True),
+        ("tests/conftest.py", False),
+        ("app/testing.py", False),
+    ])
+    def test_is_test_file(self, path, expected):
+        assert is_test_file(path) is expected
+
+    def test_pytest_failures_are_parsed(self):
+        output = "FAILED tests/test_a.py::test_x - assert 0\nERROR tests/test_b.py - ImportError\n1 failed\n"
+
+        assert parse_failed_tests(output, "pytest") == {"tests/test_a.py::test_x", "tests/test_b.py"}
+        assert parse_failed_tests(output, "jest") is None
+
+    def test_paths_cannot_become_options(self):
+        assert impacted_test_command(["-x.py"], "pytest")[-1] == "./-x.py"
+
+
+class TestImpactedValidation:
+
+    @staticmethod
+    def _orchestrator():
+        with patch.multiple(
+            "app.services.agents.orchestrator",
+            DiagnosisAgent=MagicMock, FixAgent=MagicMock, TestAgent=MagicMock,
+        ):
+            return HealingOrchestrator()
+
+    @staticmethod
+    def _run(exit_code, output="", timed_out=False):
+        return ExecResult(exit_code=exit_code, stdout=output, stderr="", timed_out=timed_out)
+
+    async def _validate(self, orchestrator, baseline, with_fix):
+        sandbox = MagicMock(workdir="/tmp/none")
+        sandbox.reset_workspace = AsyncMock(return_value=True)
+        sandbox.run = AsyncMock(side_effect=[baseline, with_fix])
+        orchestrator._impact_index = MagicMock()
+        orchestrator._impact_index.select_tests.return_value = [
+            SelectedTest("tests/test_users.py", "imports app/users.py"),
+        ]
+        orchestrator._run_lint_check_in_sandbox = AsyncMock(return_value={"passed": True})
+        fix = MagicMock(file_path="app/users.py", fixed_content="x = 2\n")
+        test = GeneratedTest(
+            issue_id="i", success=False, test_file_path="", test_content="",
+            test_framework="pytest", test_count=0, explanation="",
+        )
+
+        result = await orchestrator._validate_in_sandbox(
+            repository={"id": str(uuid.uuid4())}, fix=fix, test=test, sandbox=sandbox,
+        )
+        return result, sandbox
+
+    async def test_preexisting_failures_do_not_fail_validation(self):
+        orchestrator = self._orchestrator()
+        failing = "FAILED tests/test_users.py::test_other - ImportError\n"
+
+        result, sandbox = await self._validate(
+            orchestrator, self._run(1, failing), self._run(1, failing),
+        )
+
+        assert result["passed"]
+        assert result["impacted_tests"]["selected"] == [
+            {"path": "tests/test_users.py", "reason": "imports app/users.py"},
+        ]
+        # Baseline ran on the clean checkout, before the fix was written
+        assert sandbox.run.await_args_list[0].args[0][:3] == ["python", "-m", "pytest"]
+        assert sandbox.reset_workspace.await_count == 2
+
+    async def test_regression_fails_validation(self):
+        orchestrator = self._orchestrator()
+
+        result, _ = await self._validate(
+            orchestrator,
+            self._run(0, "1 passed\n"),
+            self._run(1, "FAILED tests/test_users.py::test_load - assert 0\n"),
+        )
+
+        assert not result["passed"]
+        assert result["impacted_tests"]["regressions"] == ["tests/test_users.py::test_load"]
+        assert "tests/test_users.py::test_load" in orchestrator._extract_error_details(result)
+
+    async def test_timeout_with_fix_only_is_a_regression(self):
+        orchestrator = self._orchestrator()
+
+        result, _ = await self._validate(
+            orchestrator, self._run(0), self._run(124, timed_out=True),
+        )
+
+        assert not result["passed"]
+        assert result["impacted_tests"]["timed_out"]
@@ -0,0 +1,187 @@
+"""Tests for diff-scoped incremental AI scans.
+
+**Feature: ai-scan-integration**
+"""
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.broad_scan_agent import BroadScanResult, CandidateIssue
+from app.services.incremental_scan import (
+    find_related_files,
+    get_changed_files,
+    merge_incremental_issues,
+)
+from app.services.repo_view_generator import RepoViewGenerator
+from app.workers.ai_scan import run_ai_scan
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def _commit(repo: Path, message: str) -> str:
+    _git(repo, "add", "-A")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+def _write(repo: Path, files: dict[str, str]) -> None:
+    for path, content in files.items():
+        target = repo / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    _write(tmp_path, {
+        "app/__init__.py": "",
+        "app/core/db.py": "def connect():\n    pass\n",
+        "app/services/users.py": "from app.core.db import connect\n",
+        "app/api/users.py": "from app.services.users import *\n",
+        "app/unrelated.py": "import os\n",
+        "web/src/lib/api.ts": "export const get = () => 1;\n",
+        "web/src/page.tsx": "import { get } from './lib/api';\n",
+    })
+    return tmp_path
+
+
+def issue(issue_id: str, path: str, title: str, dimension: str = "security") -> dict:
+    return {"id": issue_id, "dimension": dimension, "title": title, "files": [{"path": path}]}
+
+
+class TestChangedFiles:
+
+    def test_lists_files_changed_between_commits(self, repo):
+        base = _commit(repo, "base")
+        _write(repo, {"app/core/db.py": "def connect():\n    return 1\n"})
+        (repo / "app/unrelated.py").unlink()
+        head = _commit(repo, "change")
+
+        assert get_changed_files(repo, base, head) == ["app/core/db.py", "app/unrelated.py"]
+
+    def test_unknown_base_requires_full_scan(self, repo):
+        head = _commit(repo, "base")
+
+        assert get_changed_files(repo, "0" * 40, head) is None
+
+
+class TestRelatedFiles:
+
+    def test_includes_importers_and_imports(self, repo):
+        related = find_related_files(repo, ["app/services/users.py"], max_files=10)
+
+        assert related == ["app/api/users.py", "app/core/db.py"]
+
+    def test_resolves_relative_js_imports(self, repo):
+        assert find_related_files(repo, ["web/src/lib/api.ts"], max_files=10) == ["web/src/page.tsx"]
+
+    def test_respects_limit(self, repo):
+        assert len(find_related_files(repo, ["app/services/users.py"], max_files=1)) == 1
+
+
+class TestMergeIncrementalIssues:
+
+    def test_invalidates_issues_in_changed_files(self):
+        previous = [issue("sec-001", "a.py", "SQL injection"), issue("sec-002", "b.py", "Hardcoded secret")]
+
+        merged = merge_incremental_issues(previous, [], ["a.py"])
+
+        assert [i["id"] for i in merged] == ["sec-002"]
+
+    def test_new_issues_get_non_colliding_ids(self):
+        previous = [issue("sec-002", "b.py", "Hardcoded secret")]
+        new = [issue("sec-001", "a.py", "SQL injection in query builder")]
+
+        merged = merge_incremental_issues(previous, new, ["a.py"])
+
+        assert [i["id"] for i in merged] == ["sec-002", "sec-003"]
+        assert merged[1]["title"] == "SQL injection in query builder"
+
+    def test_drops_new_duplicates_of_kept_issues(self):
+        previous = [issue("sec-001", "b.py", "Hardcoded secret in settings")]
+        new = [issue("sec-001", "b.py", "Hardcoded secret in settings!")]
+
+        merged = merge_incremental_issues(previous, new, ["a.py"])
+
+        assert merged == previous
+
+
+def test_focused_view_contains_only_changed_and_related_files(repo):
+    view = RepoViewGenerator(repo).generate_focused(
+        ["app/services/users.py"], ["app/core/db.py"],
+    )
+
+    assert "### app/services/users.py" in view.content
+    assert "### app/core/db.py" in view.content
+    assert "### app/unrelated.py" not in view.content
+    assert view.content.index("### app/services/users.py") < view.content.index("### app/core/db.py")
+    assert view.files_included == 2
+
+
+def test_run_ai_scan_incremental_scans_focused_view_and_merges(repo):
+    """Incremental mode sends the focused view and merges with the base cache."""
+
+    @dataclass
+    class MockAnalysis:
+        id: str
+        repository_id: str
+
+    analysis_id = str(uuid4())
+    analysis = MockAnalysis(id=analysis_id, repository_id=str(uuid4()))
+    plan = {
+        "base_analysis_id": "base-id",
+        "base_cache": {
+            "issues": [issue("sec-001", "app/core/db.py", "Old issue"),
+                       issue("sec-002", "app/api/users.py", "Kept issue")],
+            "repo_overview": {"guessed_project_type": "api"},
+        },
+        "changed_files": ["app/core/db.py"],
+        "related_files": ["app/services/users.py"],
+    }
+    candidate = CandidateIssue(
+        id_hint="sec-001", dimension="security", severity="high",
+        files=[{"path": "app/core/db.py"}], summary="New issue", detailed_description="",
+        evidence_snippets=[], potential_impact="", remediation_idea="",
+        confidence="medium", source_model="m1",
+    )
+    agent = MagicMock()
+    agent.scan = AsyncMock(return_value=BroadScanResult(
+        candidates=[candidate], models_used=["m1"], models_succeeded=["m1"],
+    ))
+    analyzer = MagicMock()
+    analyzer.__enter__.return_value.clone.return_value = repo
+
+    with patch("app.workers.helpers.is_analysis_superseded", return_value=False), \
+            patch("app.workers.ai_scan._get_analysis_with_repo",
+                  return_value=(analysis, None, None, "c" * 40, "https://github.com/o/r")), \
+            patch("app.services.repo_analyzer.RepoAnalyzer", return_value=analyzer), \
+            patch("app.workers.ai_scan._find_reusable_ai_scan", return_value=None), \
+            patch("app.workers.ai_scan._plan_incremental_scan", return_value=plan), \
+            patch("app.services.broad_scan_agent.get_broad_scan_agent", return_value=agent), \
+            patch("app.services.llm_gateway.get_llm_gateway"), \
+            patch("app.workers.ai_scan._update_ai_scan_state") as mock_state, \
+            patch("app.workers.ai_scan.publish_ai_scan_progress"), \
+            patch("app.core.redis.publish_analysis_event"), \
+            patch.object(run_ai_scan, "update_state"):
+        result = run_ai_scan.run(analysis_id, models=["m1"])
+
+    scanned_view = agent.scan.call_args.args[0]
+    assert "### app/core/db.py" in scanned_view
+    assert "### app/unrelated.py" not in scanned_view
+
+    cache = mock_state.call_args.kwargs["cache_data"]
+    assert cache["scan_mode"] == "incremental"
+    assert cache["base_analysis_id"] == "base-id"
+    assert [i["title"] for i in cache["issues"]] == ["Kept issue", "New issue"]
+    assert cache["repo_overview"] == {"guessed_project_type": "api"}
+    assert result["issues_count"] == 2
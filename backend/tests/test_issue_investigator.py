@@ -620,3 +620,167 @@ class TestCLICommandParsing:
 
         result = _parse_shell_command(r"grep hello\ world file.txt")
         assert result == ["grep", "hello world", "file.txt"]
+
+
+# =============================================================================
+# Shared Tool Cache, Budget and Concurrent Investigation
+# =============================================================================
+
+
+class FakeLLM:
+    """LLM stand-in: reads one file, then finishes; records peak concurrency."""
+
+    def __init__(self, delay: float = 0.05, cost: float = 0.1):
+        self.delay = delay
+        self.cost = cost
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def chat(self, messages, **kwargs):
+        import asyncio
+
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+
+        if len(messages) == 2:
+            content = '{"tool": "read_file", "arguments": {"path": "app/main.py"}}'
+        else:
+            content = '{"status": "confirmed", "technical_notes": ["checked"]}'
+        return {"content": content, "cost": self.cost}
+
+
+def _merged_issue(issue_id: str, severity: str = "high"):
+    from app.services.issue_merger import MergedIssue
+
+    return MergedIssue(
+        id=issue_id, dimension="security", severity=severity, title="t", summary="s",
+        files=[{"path": "app/main.py"}], evidence_snippets=[], confidence="high",
+        found_by_models=["m"],
+    )
+
+
+class TestToolResultCache:
+    """Shared read-only tool results across investigations."""
+
+    def test_identical_calls_execute_once(self):
+        import asyncio
+
+        from app.services.issue_investigator import ToolResultCache
+
+        executions = []
+
+        async def execute(call):
+            executions.append(call)
+            await asyncio.sleep(0.01)
+            return ToolResult(tool_name=call.name, success=True, output="content")
+
+        async def run():
+            cache = ToolResultCache()
+            calls = [
+                ToolCall(name="read_file", arguments={"path": "app/main.py"}),
+                ToolCall(name="read_file", arguments={"path": "./app/main.py"}),
+                ToolCall(name="read_file", arguments={"path": "app/main.py"}),
+            ]
+            results = await asyncio.gather(*(cache.get_or_execute(c, execute) for c in calls))
+            return cache, results
+
+        cache, results = asyncio.run(run())
+
+        assert len(executions) == 1
+        assert cache.hits == 2 and cache.misses == 1
+        assert all(r.output == "content" for r in results)
+
+    def test_cli_run_is_not_cached(self):
+        import asyncio
+
+        from app.services.issue_investigator import ToolResultCache
+
+        executions = []
+
+        async def execute(call):
+            executions.append(call)
+            return ToolResult(tool_name=call.name, success=True, output="")
+
+        async def run():
+            cache = ToolResultCache()
+            call = ToolCall(name="cli_run", arguments={"command": "ls"})
+            await cache.get_or_execute(call, execute)
+            await cache.get_or_execute(call, execute)
+
+        asyncio.run(run())
+
+        assert len(executions) == 2
+
+
+class TestConcurrentInvestigation:
+    """_investigate_issues runs investigations in parallel under limits."""
+
+    def test_runs_concurrently_with_shared_cache(self, tmp_path):
+        import asyncio
+        import time
+        from unittest.mock import AsyncMock, patch
+
+        from app.services.issue_investigator import IssueInvestigator
+        from app.workers.ai_scan import _investigate_issues
+
+        issues = [_merged_issue(f"sec-{i:03d}") for i in range(6)]
+        llm = FakeLLM(delay=0.05)
+        read_file = AsyncMock(
+            return_value=ToolResult(tool_name="read_file", success=True, output="x")
+        )
+
+        def parse_tool_calls(self, content):
+            if "read_file" in content:
+                return [ToolCall(name="read_file", arguments={"path": "app/main.py"})]
+            return []
+
+        started = time.monotonic()
+        with patch.object(IssueInvestigator, "_execute_read_file", read_file), \
+                patch.object(IssueInvestigator, "_parse_tool_calls", parse_tool_calls):
+            asyncio.run(_investigate_issues(
+                issues, ["high"], 10, tmp_path, llm, lambda *a: None,
+                concurrency=6, max_cost_usd=None,
+            ))
+        elapsed = time.monotonic() - started
+
+        assert all(i.investigation_status == "confirmed" for i in issues)
+        assert llm.peak == 6
+        assert read_file.await_count == 1  # shared read_file result
+        assert elapsed < 6 * 2 * 0.05
+
+    def test_respects_concurrency_limit(self, tmp_path):
+        import asyncio
+
+        from app.workers.ai_scan import _investigate_issues
+
+        issues = [_merged_issue(f"sec-{i:03d}") for i in range(5)]
+        llm = FakeLLM(delay=0.01)
+
+        asyncio.run(_investigate_issues(
+            issues, ["high"], 10, tmp_path, llm, lambda *a: None,
+            concurrency=2, max_cost_usd=None,
+        ))
+
+        assert llm.peak == 2
+
+    def test_budget_stops_remaining_investigations(self, tmp_path):
+        import asyncio
+
+        from app.workers.ai_scan import _investigate_issues
+
+        issues = [_merged_issue(f"sec-{i:03d}") for i in range(4)]
+        llm = FakeLLM(delay=0.0, cost=0.5)
+
+        asyncio.run(_investigate_issues(
+            issues, ["high"], 10, tmp_path, llm, lambda *a: None,
+            concurrency=1, max_cost_usd=1.0,
+        ))
+
+        statuses = [i.investigation_status for i in issues]
+        assert statuses[0] == "confirmed"
+        assert statuses[1:] == ["uncertain"] * 3
+        assert llm.calls == 2
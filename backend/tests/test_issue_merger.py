@@ -703,3 +703,76 @@ class TestIssueMergerUnit:
 
         custom_merger = get_issue_merger(similarity_threshold=0.5)
         assert custom_merger.similarity_threshold == 0.5
+
+
+# =============================================================================
+# Indexed Merge Equivalence
+# =============================================================================
+
+SHARED_PATHS = ["app/db.py", "app/api.py", "app/auth.py", "web/index.ts"]
+SUMMARY_STEMS = [
+    "SQL injection in user query builder",
+    "Hardcoded API key in settings module",
+    "Missing authorization check on admin endpoint",
+]
+
+
+@st.composite
+def overlapping_candidate(draw) -> CandidateIssue:
+    """Candidate drawn from small path/summary pools so duplicates are common."""
+    stem = draw(st.sampled_from(SUMMARY_STEMS))
+    suffix = draw(st.text(alphabet="abcxyz !", max_size=8))
+    paths = draw(st.lists(st.sampled_from(SHARED_PATHS), min_size=1, max_size=2, unique=True))
+    return CandidateIssue(
+        id_hint="x", dimension="security", severity="high",
+        files=[{"path": p} for p in paths],
+        summary=draw(st.sampled_from([stem + suffix, suffix, (stem + suffix).upper()])),
+        detailed_description="", evidence_snippets=[], potential_impact="",
+        remediation_idea="", confidence="medium", source_model=draw(model_name()),
+    )
+
+
+def reference_groups(merger: IssueMerger, candidates: list[CandidateIssue]) -> list[list[int]]:
+    """Pairwise grouping as originally implemented (seed vs. every candidate)."""
+    assigned: set[int] = set()
+    groups = []
+    for i in range(len(candidates)):
+        if i in assigned:
+            continue
+        group = [i]
+        assigned.add(i)
+        for j in range(len(candidates)):
+            if j in assigned:
+                continue
+            if merger._has_file_overlap(candidates[i], candidates[j]) and (
+                merger._calculate_similarity(candidates[i].summary, candidates[j].summary)
+                > merger.similarity_threshold
+            ):
+                group.append(j)
+                assigned.add(j)
+        groups.append(group)
+    return groups
+
+
+class TestIndexedMergeEquivalence:
+    """The inverted-index merge groups exactly like pairwise comparison."""
+
+    @given(
+        st.lists(overlapping_candidate(), min_size=1, max_size=25),
+        st.sampled_from([0.5, 0.8, 0.95]),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_groups_match_pairwise_reference(self, candidates, threshold):
+        merger = IssueMerger(similarity_threshold=threshold)
+
+        merged = merger.merge(candidates)
+        expected = reference_groups(merger, candidates)
+
+        assert len(merged) == len(expected)
+        for issue, group in zip(merged, expected, strict=True):
+            assert issue.summary == candidates[group[0]].summary
+            expected_models = list(dict.fromkeys(candidates[k].source_model for k in group))
+            assert issue.found_by_models == expected_models
+            assert {f["path"] for f in issue.files} == set().union(
+                *(merger._get_file_paths(candidates[k]) for k in group)
+            )
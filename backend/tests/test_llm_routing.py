@@ -0,0 +1,257 @@
+"""Tests for latency-aware LLM routing and hedged requests.
+
+Uses the local stub provider, so no network access or API keys are needed.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.services.llm_gateway import LLMError, LLMGateway
+from app.services.llm_routing import MIN_SAMPLES_FOR_P95, ModelRouter
+from app.services.llm_stub import StubModel, StubProvider
+
+PRIMARY = "gemini/primary"
+SECONDARY = "bedrock/secondary"
+TERTIARY = "azure/tertiary"
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def make_gateway(models: dict[str, StubModel], fallbacks: list[str] | None = None):
+    provider = StubProvider(models)
+    gateway = LLMGateway(completion_fn=provider.acompletion, cost_fn=provider.completion_cost)
+    available = fallbacks if fallbacks is not None else [m for m in models if m != PRIMARY]
+    patcher = patch.object(
+        gateway, "_get_available_fallbacks",
+        side_effect=lambda exclude: [m for m in available if m != exclude],
+    )
+    patcher.start()
+    return gateway, provider, patcher
+
+
+@pytest.fixture
+def hedge_settings():
+    with patch.multiple(
+        settings,
+        llm_hedging_enabled=True,
+        llm_hedge_default_delay=0.05,
+        llm_hedge_min_delay=0.01,
+        llm_hedge_max_delay=1.0,
+    ):
+        yield settings
+
+
+class TestModelRouter:
+
+    def test_p95_requires_minimum_samples(self):
+        router = ModelRouter()
+        for _ in range(MIN_SAMPLES_FOR_P95 - 1):
+            router.record(PRIMARY, 1.0, ok=True)
+
+        assert router.p95(PRIMARY) is None
+        router.record(PRIMARY, 1.0, ok=True)
+        assert router.p95(PRIMARY) == 1.0
+
+    def test_p95_uses_successful_latencies(self):
+        router = ModelRouter()
+        for i in range(1, 21):
+            router.record(PRIMARY, float(i), ok=True)
+        router.record(PRIMARY, 100.0, ok=False)
+
+        assert router.p95(PRIMARY) == 19.0
+        assert router.error_rate(PRIMARY) == pytest.approx(1 / 21)
+
+    def test_censored_samples_raise_p95_without_counting_as_errors(self):
+        router = ModelRouter()
+        for _ in range(10):
+            router.record(PRIMARY, 0.2, ok=True)
+        for _ in range(5):
+            router.record_censored(PRIMARY, 4.0)
+
+        assert router.p95(PRIMARY) == 4.0
+        assert router.error_rate(PRIMARY) == 0.0
+
+    def test_window_is_rolling(self):
+        router = ModelRouter(window_size=5)
+        for _ in range(5):
+            router.record(PRIMARY, 1.0, ok=False)
+        for _ in range(5):
+            router.record(PRIMARY, 1.0, ok=True)
+
+        assert router.error_rate(PRIMARY) == 0.0
+
+    def test_hedge_delay_is_clamped(self):
+        router = ModelRouter()
+        assert router.hedge_delay(PRIMARY, default_s=3.0, min_s=0.5, max_s=10.0) == 3.0
+
+        for _ in range(10):
+            router.record(PRIMARY, 60.0, ok=True)
+        assert router.hedge_delay(PRIMARY, default_s=3.0, min_s=0.5, max_s=10.0) == 10.0
+
+    def test_rank_prefers_healthy_then_fast_models(self):
+        router = ModelRouter()
+        for _ in range(10):
+            router.record(PRIMARY, 0.1, ok=False)
+            router.record(SECONDARY, 2.0, ok=True)
+            router.record(TERTIARY, 0.5, ok=True)
+
+        assert router.rank([PRIMARY, SECONDARY, TERTIARY]) == [TERTIARY, SECONDARY, PRIMARY]
+        assert router.pick_hedge_model(TERTIARY, [PRIMARY, SECONDARY, TERTIARY]) == SECONDARY
+
+    def test_rank_keeps_configured_order_without_samples(self):
+        assert ModelRouter().rank([SECONDARY, TERTIARY]) == [SECONDARY, TERTIARY]
+
+
+class TestGatewayRouting:
+
+    async def test_plain_chat_records_latency(self):
+        gateway, provider, patcher = make_gateway({PRIMARY: StubModel(content="hi", cost_usd=0.02)})
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY, fallback=False)
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "hi"
+        assert result["model"] == PRIMARY
+        assert result["cost"] == 0.02
+        assert result["usage"]["total_tokens"] == 15
+        assert gateway.router.error_rate(PRIMARY) == 0.0
+        assert len(provider.calls) == 1
+
+    async def test_fallbacks_are_ordered_by_health(self):
+        gateway, provider, patcher = make_gateway({
+            PRIMARY: StubModel(fail=True),
+            SECONDARY: StubModel(content="secondary"),
+            TERTIARY: StubModel(content="tertiary"),
+        })
+        for _ in range(10):
+            gateway.router.record(SECONDARY, 1.0, ok=False)
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY)
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "tertiary"
+        assert [c.model for c in provider.calls] == [PRIMARY, TERTIARY]
+        # The primary's failure is recorded even though a fallback answered
+        assert gateway.router.error_rate(PRIMARY) == 1.0
+        assert gateway.router.error_rate(TERTIARY) == 0.0
+        assert gateway.router.rank([PRIMARY, TERTIARY]) == [TERTIARY, PRIMARY]
+
+    async def test_fallback_is_recorded_under_served_model(self):
+        gateway, provider, patcher = make_gateway({
+            PRIMARY: StubModel(fail=True),
+            SECONDARY: StubModel(fail=True),
+            TERTIARY: StubModel(content="tertiary"),
+        })
+        try:
+            await gateway.chat(MESSAGES, model=PRIMARY)
+        finally:
+            patcher.stop()
+
+        assert gateway.router.error_rate(PRIMARY) == 1.0
+        assert gateway.router.error_rate(SECONDARY) == 1.0
+        assert [ok for _, ok in gateway.router._stats[TERTIARY].samples] == [True]
+
+    async def test_all_models_failing_raises(self):
+        gateway, _, patcher = make_gateway({PRIMARY: StubModel(fail=True)}, fallbacks=[])
+        try:
+            with pytest.raises(LLMError):
+                await gateway.chat(MESSAGES, model=PRIMARY)
+        finally:
+            patcher.stop()
+
+        assert gateway.router.error_rate(PRIMARY) == 1.0
+
+
+class TestHedgedRequests:
+
+    async def test_fast_primary_is_not_hedged(self, hedge_settings):
+        gateway, provider, patcher = make_gateway({
+            PRIMARY: StubModel(latency_s=0.0, content="primary"),
+            SECONDARY: StubModel(content="secondary"),
+        })
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY, task="chat")
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "primary"
+        assert provider.calls_for(SECONDARY) == []
+
+    async def test_slow_primary_is_hedged_and_loser_cancelled(self, hedge_settings):
+        gateway, provider, patcher = make_gateway({
+            PRIMARY: StubModel(latency_s=5.0, content="primary"),
+            SECONDARY: StubModel(latency_s=0.0, content="secondary"),
+        })
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY, task="chat")
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "secondary"
+        assert provider.calls_for(PRIMARY)[0].cancelled
+        assert "fallbacks" not in provider.calls_for(PRIMARY)[0].params
+        # Cancelled losers are not counted as errors, but their wait is kept
+        assert gateway.router.error_rate(PRIMARY) == 0.0
+        [(latency, ok)] = gateway.router._stats[PRIMARY].samples
+        assert ok is None and latency >= hedge_settings.llm_hedge_default_delay
+
+    async def test_primary_failure_triggers_hedge_immediately(self, hedge_settings):
+        hedge_settings.llm_hedge_default_delay = 10.0
+        hedge_settings.llm_hedge_max_delay = 10.0
+        gateway, _, patcher = make_gateway({
+            PRIMARY: StubModel(fail=True),
+            SECONDARY: StubModel(content="secondary"),
+        })
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY, task="fast")
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "secondary"
+        assert gateway.router.error_rate(PRIMARY) == 1.0
+
+    async def test_hedge_delay_follows_primary_p95(self, hedge_settings):
+        gateway, provider, patcher = make_gateway({
+            PRIMARY: StubModel(latency_s=0.1, content="primary"),
+            SECONDARY: StubModel(latency_s=0.0, content="secondary"),
+        })
+        # Primary's p95 is well above this request's latency: no hedge
+        for _ in range(10):
+            gateway.router.record(PRIMARY, 0.5, ok=True)
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY, task="chat")
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "primary"
+        assert provider.calls_for(SECONDARY) == []
+
+    async def test_hedge_target_inherits_remaining_fallbacks(self, hedge_settings):
+        gateway, provider, patcher = make_gateway({
+            PRIMARY: StubModel(fail=True),
+            SECONDARY: StubModel(fail=True),
+            TERTIARY: StubModel(content="tertiary"),
+        })
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY, task="chat")
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "tertiary"
+        assert [c.model for c in provider.calls] == [PRIMARY, SECONDARY, TERTIARY]
+
+    async def test_non_latency_sensitive_tasks_are_not_hedged(self, hedge_settings):
+        gateway, provider, patcher = make_gateway({
+            PRIMARY: StubModel(latency_s=0.2, content="primary"),
+            SECONDARY: StubModel(content="secondary"),
+        })
+        try:
+            result = await gateway.chat(MESSAGES, model=PRIMARY, task="analysis")
+        finally:
+            patcher.stop()
+
+        assert result["content"] == "primary"
+        assert provider.calls_for(SECONDARY) == []
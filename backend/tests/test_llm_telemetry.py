@@ -0,0 +1,218 @@
+"""Tests for per-call LLM telemetry and the /metrics exposition."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry
+from app.services.llm_gateway import LLMError, LLMGateway
+from app.services.llm_stub import StubModel, StubProvider
+from app.services.llm_telemetry import (
+    LLM_REQUESTS,
+    LLM_TTFT,
+    LLMCallRecord,
+    collect_llm_calls,
+    summarize_llm_calls,
+    with_llm_telemetry,
+)
+
+PRIMARY = "gemini/primary"
+SECONDARY = "bedrock/secondary"
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def make_gateway(models: dict[str, StubModel]) -> tuple[LLMGateway, StubProvider]:
+    provider = StubProvider(models)
+    gateway = LLMGateway(completion_fn=provider.acompletion, cost_fn=provider.completion_cost)
+    return gateway, provider
+
+
+class TestMetricsRegistry:
+
+    def test_counter_exposition(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("model",))
+        requests.inc(model='a"b')
+        requests.inc(2, model='a"b')
+
+        assert registry.render() == (
+            "# HELP requests_total Requests\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{model="a\\"b"} 3.0\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", ("task",), buckets=(1.0, 5.0))
+        for value in (0.5, 2.0, 7.0):
+            latency.observe(value, task="chat")
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{task="chat",le="1.0"} 1' in lines
+        assert 'latency_seconds_bucket{task="chat",le="5.0"} 2' in lines
+        assert 'latency_seconds_bucket{task="chat",le="+Inf"} 3' in lines
+        assert 'latency_seconds_sum{task="chat"} 9.5' in lines
+        assert 'latency_seconds_count{task="chat"} 3' in lines
+
+    def test_labels_must_match(self):
+        counter = MetricsRegistry().counter("c", "C", ("task",))
+        with pytest.raises(ValueError):
+            counter.inc(model="x")
+
+    def test_reregistering_returns_existing_metric(self):
+        registry = MetricsRegistry()
+        assert registry.counter("c", "C", ("task",)) is registry.counter("c", "C", ("task",))
+        with pytest.raises(ValueError):
+            registry.histogram("c", "C", ("task",))
+
+
+class TestGatewayTelemetry:
+
+    async def test_chat_call_is_recorded(self):
+        gateway, _ = make_gateway({PRIMARY: StubModel(prompt_tokens=100, completion_tokens=20, cost_usd=0.5)})
+        before = LLM_REQUESTS.value(kind="chat", task="broad_scan", model=PRIMARY, status="ok")
+
+        with collect_llm_calls() as calls:
+            await gateway.chat(MESSAGES, model=PRIMARY, fallback=False, task="broad_scan")
+
+        [call] = calls
+        assert (call.kind, call.task, call.model) == ("chat", "broad_scan", PRIMARY)
+        assert (call.prompt_tokens, call.completion_tokens, call.cost_usd) == (100, 20, 0.5)
+        assert call.ok and call.retries == 0 and not call.cache_hit
+        assert call.latency_s >= 0
+        assert LLM_REQUESTS.value(kind="chat", task="broad_scan", model=PRIMARY, status="ok") == before + 1
+
+    async def test_failed_call_is_recorded(self):
+        gateway, _ = make_gateway({PRIMARY: StubModel(fail=True)})
+
+        with collect_llm_calls() as calls:
+            with pytest.raises(LLMError):
+                await gateway.chat(MESSAGES, model=PRIMARY, fallback=False)
+
+        assert [(c.task, c.ok) for c in calls] == [("unspecified", False)]
+
+    async def test_hedged_request_counts_as_retry(self):
+        gateway, _ = make_gateway({
+            PRIMARY: StubModel(latency_s=5.0),
+            SECONDARY: StubModel(latency_s=0.0, cost_usd=0.2),
+        })
+
+        with patch.multiple(settings, llm_hedging_enabled=True, llm_hedge_default_delay=0.01,
+                            llm_hedge_min_delay=0.01), \
+                patch.object(gateway, "_get_available_fallbacks", return_value=[SECONDARY]), \
+                collect_llm_calls() as calls:
+            await gateway.chat(MESSAGES, model=PRIMARY, task="chat")
+
+        [call] = calls
+        assert call.retries == 1
+        assert call.cost_usd == 0.2
+        assert call.model == SECONDARY
+
+    async def test_fallback_call_is_charged_to_served_model(self):
+        gateway, _ = make_gateway({
+            PRIMARY: StubModel(fail=True),
+            SECONDARY: StubModel(prompt_tokens=40, cost_usd=0.3),
+        })
+        before = LLM_REQUESTS.value(kind="chat", task="chat", model=SECONDARY, status="ok")
+
+        with patch.object(gateway, "_get_available_fallbacks", return_value=[SECONDARY]), \
+                collect_llm_calls() as calls:
+            await gateway.chat(MESSAGES, model=PRIMARY, task="chat")
+
+        [call] = calls
+        assert (call.model, call.prompt_tokens, call.cost_usd) == (SECONDARY, 40, 0.3)
+        assert LLM_REQUESTS.value(kind="chat", task="chat", model=SECONDARY, status="ok") == before + 1
+
+    async def test_stream_records_time_to_first_token_and_usage(self):
+        gateway, _ = make_gateway({
+            PRIMARY: StubModel(content="one two three", chunk_latency_s=0.01,
+                               prompt_tokens=7, completion_tokens=3),
+        })
+        ttft_before = LLM_TTFT.count(task="chat", model=PRIMARY)
+
+        with collect_llm_calls() as calls:
+            tokens, final = await gateway.chat_stream_with_usage(MESSAGES, model=PRIMARY, task="chat")
+            text = "".join([chunk async for chunk in tokens])
+            stats = await final
+
+        assert text == "one two three"
+        assert stats["usage"]["total_tokens"] == 10
+        [call] = calls
+        assert call.kind == "stream"
+        assert call.time_to_first_token_s is not None
+        assert call.time_to_first_token_s <= call.latency_s
+        assert (call.prompt_tokens, call.completion_tokens) == (7, 3)
+        assert LLM_TTFT.count(task="chat", model=PRIMARY) == ttft_before + 1
+
+
+def test_summary_groups_by_task_and_model():
+    records = [
+        LLMCallRecord(kind="chat", task="broad_scan", model="m1", prompt_tokens=100, cost_usd=1.0),
+        LLMCallRecord(kind="chat", task="investigation", model="m1", prompt_tokens=10, cost_usd=0.1),
+        LLMCallRecord(kind="chat", task="investigation", model="m2", ok=False, retries=1),
+    ]
+
+    summary = summarize_llm_calls(records)
+
+    assert summary["calls"] == 3
+    assert summary["failed"] == 1
+    assert summary["retries"] == 1
+    assert summary["cost_usd"] == 1.1
+    assert summary["by_task"]["investigation"]["calls"] == 2
+    assert summary["by_model"]["m1"]["prompt_tokens"] == 110
+
+
+def test_task_decorator_attaches_llm_usage():
+    gateway, _ = make_gateway({PRIMARY: StubModel()})
+
+    @with_llm_telemetry
+    def task_body() -> dict:
+        import asyncio
+        asyncio.run(gateway.chat(MESSAGES, model=PRIMARY, fallback=False, task="broad_scan"))
+        return {"status": "completed"}
+
+    @with_llm_telemetry
+    def task_without_llm() -> dict:
+        return {"status": "completed"}
+
+    result = task_body()
+
+    assert result["status"] == "completed"
+    assert result["llm_usage"]["calls"] == 1
+    assert result["llm_usage"]["by_task"]["broad_scan"]["calls"] == 1
+    assert task_without_llm() == {"status": "completed"}
+
+
+def test_metrics_endpoint_serves_llm_metrics():
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE n9r_llm_requests_total counter" in response.text
+    assert "# TYPE n9r_llm_request_duration_seconds histogram" in response.text
+
+
+@pytest.mark.parametrize(
+    ("token", "app_env", "authorization", "expected"),
+    [
+        ("s3cret", "production", "Bearer s3cret", 200),
+        ("s3cret", "development", "Bearer wrong", 401),
+        ("s3cret", "development", None, 401),
+        ("", "production", None, 404),
+    ],
+)
+def test_metrics_endpoint_requires_token(token, app_env, authorization, expected):
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    headers = {"Authorization": authorization} if authorization else {}
+    with patch.multiple(settings, metrics_token=token, app_env=app_env):
+        response = TestClient(app).get("/metrics", headers=headers)
+
+    assert response.status_code == expected
@@ -91,6 +91,7 @@ class TestIndependentCloningProperty:
 
         # Patch at the source modules where the imports happen
         with patch('app.workers.helpers.get_repo_url', return_value=(repo_url, access_token)) as mock_get_repo_url, \
+             patch('app.workers.helpers.is_analysis_superseded', return_value=False), \
              patch('app.services.repo_analyzer.RepoAnalyzer', side_effect=capture_repo_analyzer), \
              patch('app.workers.helpers.collect_files_for_embedding', return_value=[]), \
              patch('app.workers.embeddings._update_embeddings_state'), \
@@ -147,6 +148,7 @@ class TestIndependentCloningProperty:
 
         # Patch at the source modules where the imports happen
         with patch('app.workers.helpers.get_repo_url', return_value=(repo_url, None)), \
+             patch('app.workers.helpers.is_analysis_superseded', return_value=False), \
              patch('app.services.repo_analyzer.RepoAnalyzer', return_value=mock_repo_analyzer), \
              patch('app.workers.helpers.collect_files_for_embedding', return_value=[]), \
              patch('app.workers.embeddings._update_embeddings_state'), \
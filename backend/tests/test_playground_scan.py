@@ -0,0 +1,147 @@
+"""Tests for isolated, cached playground scans."""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.playground import PlaygroundScanRequest, get_scan_result, start_scan
+from app.core.redis import _playground_commit_key
+from app.workers.playground import PlaygroundScanError, run_playground_scan, run_scan_subprocess
+from app.workers.playground_job import main as job_main
+
+REPO = "https://github.com/acme/shop"
+SHA = "a" * 40
+RESULT = {
+    "commit_sha": SHA,
+    "vci_score": 81.5,
+    "tech_debt_level": "low",
+    "metrics": {"total_files": 3},
+    "top_issues": [],
+    "ai_report": "ok",
+}
+
+
+def _request():
+    return MagicMock(headers={}, client=MagicMock(host="203.0.113.7"))
+
+
+@pytest.fixture
+def store():
+    """In-memory stand-in for the playground scan records in Redis."""
+    scans: dict[str, dict] = {}
+
+    def update(scan_id, updates):
+        scans[scan_id].update(updates)
+
+    with patch("app.api.v1.playground.check_playground_rate_limit", return_value=True), \
+            patch("app.api.v1.playground.store_playground_scan", side_effect=scans.__setitem__), \
+            patch("app.api.v1.playground.update_playground_scan", side_effect=update), \
+            patch("app.api.v1.playground.get_playground_scan", side_effect=scans.get):
+        yield scans
+
+
+class TestStartScan:
+
+    async def test_unchanged_head_is_served_from_cache(self, store):
+        with patch("app.api.v1.playground.resolve_remote_head_sha", return_value=SHA), \
+                patch("app.api.v1.playground.get_cached_playground_result", return_value=RESULT), \
+                patch.object(run_playground_scan, "apply_async") as enqueue:
+            response = await start_scan(_request(), PlaygroundScanRequest(repo_url=REPO))
+
+        assert response.status == "completed"
+        enqueue.assert_not_called()
+        result = await get_scan_result(response.scan_id)
+        assert result.cached and result.vci_score == 81.5 and result.commit_sha == SHA
+
+    async def test_scan_is_queued_on_playground_queue(self, store):
+        with patch("app.api.v1.playground.resolve_remote_head_sha", return_value=SHA), \
+                patch("app.api.v1.playground.get_cached_playground_result", return_value=None), \
+                patch("app.api.v1.playground.claim_playground_scan", return_value=None), \
+                patch("app.api.v1.playground.reserve_playground_slot", return_value=True), \
+                patch.object(run_playground_scan, "apply_async") as enqueue:
+            response = await start_scan(_request(), PlaygroundScanRequest(repo_url=REPO))
+
+        assert response.status == "pending"
+        assert enqueue.call_args.kwargs == {"args": [response.scan_id, REPO, SHA], "queue": "playground"}
+
+    async def test_identical_inflight_scan_is_shared(self, store):
+        store["leader"] = {"scan_id": "leader", "repo_url": REPO, "status": "running"}
+
+        with patch("app.api.v1.playground.resolve_remote_head_sha", return_value=SHA), \
+                patch("app.api.v1.playground.get_cached_playground_result", return_value=None), \
+                patch("app.api.v1.playground.claim_playground_scan", return_value="leader"), \
+                patch.object(run_playground_scan, "apply_async") as enqueue:
+            response = await start_scan(_request(), PlaygroundScanRequest(repo_url=REPO))
+
+        enqueue.assert_not_called()
+        result = await get_scan_result(response.scan_id)
+        assert result.scan_id == response.scan_id
+        assert result.status == "running"
+
+    async def test_full_backlog_is_refused(self, store):
+        with patch("app.api.v1.playground.resolve_remote_head_sha", return_value=SHA), \
+                patch("app.api.v1.playground.get_cached_playground_result", return_value=None), \
+                patch("app.api.v1.playground.claim_playground_scan", return_value=None), \
+                patch("app.api.v1.playground.release_playground_claim") as release_claim, \
+                patch("app.api.v1.playground.reserve_playground_slot", return_value=False), \
+                patch.object(run_playground_scan, "apply_async") as enqueue:
+            with pytest.raises(HTTPException) as exc_info:
+                await start_scan(_request(), PlaygroundScanRequest(repo_url=REPO))
+
+        assert exc_info.value.status_code == 503
+        enqueue.assert_not_called()
+        release_claim.assert_called_once()
+
+    def test_cache_key_ignores_case_and_git_suffix(self):
+        assert _playground_commit_key("https://github.com/Acme/Shop.git", SHA) == f"acme/shop:{SHA}"
+
+
+class TestPlaygroundWorker:
+
+    def test_result_is_cached_by_scanned_commit(self):
+        with patch("app.workers.playground.run_scan_subprocess", return_value=RESULT), \
+                patch("app.workers.playground.update_playground_scan") as update, \
+                patch("app.workers.playground.cache_playground_result") as cache, \
+                patch("app.workers.playground.release_playground_slot") as release_slot, \
+                patch("app.workers.playground.release_playground_claim") as release_claim:
+            outcome = run_playground_scan("scan-1", REPO, SHA)
+
+        assert outcome["status"] == "completed"
+        assert update.call_args.args[1]["vci_score"] == 81.5
+        assert cache.call_args.args[:3] == (REPO, SHA, RESULT)
+        release_slot.assert_called_once_with("scan-1")
+        release_claim.assert_called_once_with(REPO, SHA, "scan-1")
+
+    def test_failed_scan_is_not_cached(self):
+        with patch("app.workers.playground.run_scan_subprocess", side_effect=PlaygroundScanError("boom")), \
+                patch("app.workers.playground.update_playground_scan") as update, \
+                patch("app.workers.playground.cache_playground_result") as cache, \
+                patch("app.workers.playground.release_playground_slot") as release_slot, \
+                patch("app.workers.playground.release_playground_claim"):
+            outcome = run_playground_scan("scan-1", REPO, SHA)
+
+        assert outcome["status"] == "failed"
+        assert update.call_args.args[1]["error"] == "boom"
+        cache.assert_not_called()
+        release_slot.assert_called_once_with("scan-1")
+
+    def test_wall_clock_limit_kills_scan(self):
+        hang = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+        with patch("app.workers.playground._job_command", return_value=hang), \
+                patch("app.workers.playground.settings") as settings:
+            settings.playground_scan_time_limit_seconds = 1
+            with pytest.raises(PlaygroundScanError, match="1s time limit"):
+                run_scan_subprocess(REPO)
+
+    def test_job_writes_result_under_limits(self, tmp_path):
+        output = tmp_path / "result.json"
+
+        with patch("app.workers.playground_job.scan", return_value=RESULT), \
+                patch("app.workers.playground_job.apply_limits") as limits:
+            assert job_main([REPO, str(output), "--cpu-seconds", "60", "--memory-mb", "512"]) == 0
+
+        limits.assert_called_once_with(60, 512)
+        assert '"vci_score": 81.5' in output.read_text()
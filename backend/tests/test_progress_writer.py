@@ -0,0 +1,141 @@
+"""Tests for the coalescing ProgressWriter used by worker tracks.
+
+**Feature: progress-tracking-refactor**
+"""
+
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.workers.progress_writer import ProgressWriter
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def published():
+    """Capture Redis events instead of publishing them."""
+    with patch("app.core.redis.publish_analysis_event") as mock_publish:
+        yield mock_publish
+
+
+def make_writer(clock: FakeClock, writes: list, interval: float = 5.0) -> ProgressWriter:
+    return ProgressWriter(
+        "analysis-1",
+        track="embeddings",
+        persist=lambda progress, stage, message: writes.append((progress, stage, message)),
+        min_interval_seconds=interval,
+        clock=clock,
+    )
+
+
+class TestProgressWriter:
+    """Unit tests for flush policy and event publishing."""
+
+    def test_first_update_is_persisted(self, published):
+        clock, writes = FakeClock(), []
+        writer = make_writer(clock, writes)
+
+        assert writer.update(10, "chunking", "Chunking...") is True
+        assert writes == [(10, "chunking", "Chunking...")]
+        assert writer.pending is None
+
+    def test_updates_within_interval_are_coalesced(self, published):
+        clock, writes = FakeClock(), []
+        writer = make_writer(clock, writes)
+
+        writer.update(25, "embedding")
+        for progress in range(26, 40):
+            clock.now += 0.1
+            assert writer.update(progress, "embedding") is False
+
+        assert writes == [(25, "embedding", None)]
+        assert writer.pending.progress == 39
+
+    def test_update_after_interval_writes_latest(self, published):
+        clock, writes = FakeClock(), []
+        writer = make_writer(clock, writes)
+
+        writer.update(25, "embedding")
+        clock.now += 1
+        writer.update(30, "embedding")
+        clock.now += 5
+        writer.update(50, "embedding", "Embedding batch 5/10...")
+
+        assert writes[-1] == (50, "embedding", "Embedding batch 5/10...")
+        assert len(writes) == 2
+
+    def test_stage_change_is_persisted_immediately(self, published):
+        clock, writes = FakeClock(), []
+        writer = make_writer(clock, writes)
+
+        writer.update(25, "embedding")
+        clock.now += 0.1
+        writer.update(85, "indexing")
+
+        assert [w[1] for w in writes] == ["embedding", "indexing"]
+
+    def test_every_update_publishes_event(self, published):
+        clock, writes = FakeClock(), []
+        writer = make_writer(clock, writes)
+
+        for progress in (25, 30, 35):
+            writer.update(progress, "embedding")
+
+        assert published.call_count == 3
+        last = published.call_args.kwargs
+        assert last["event_type"] == "embeddings_progress_updated"
+        assert last["status_data"]["embeddings_progress"] == 35
+
+    def test_discard_drops_pending(self, published):
+        clock, writes = FakeClock(), []
+        writer = make_writer(clock, writes)
+
+        writer.update(25, "embedding")
+        writer.update(30, "embedding")
+        writer.discard()
+
+        assert writer.flush() is False
+        assert len(writes) == 1
+
+    def test_persist_errors_are_swallowed(self, published):
+        def failing_persist(progress, stage, message):
+            raise RuntimeError("db down")
+
+        writer = ProgressWriter(
+            "analysis-1", track="ai_scan", persist=failing_persist, clock=FakeClock(),
+        )
+
+        assert writer.update(10, "loading") is True
+
+
+class TestProgressWriterProperties:
+    """Property tests for bounded write rate."""
+
+    @given(st.lists(st.floats(min_value=0.0, max_value=2.0), min_size=1, max_size=200))
+    @settings(max_examples=50)
+    def test_writes_bounded_by_elapsed_time(self, gaps: list[float]):
+        """
+        **Feature: progress-tracking-refactor**
+
+        Property: within a single stage, Postgres writes never exceed
+        1 + elapsed / interval, regardless of how many updates arrive.
+        """
+        clock, writes = FakeClock(), []
+        with patch("app.core.redis.publish_analysis_event"):
+            writer = make_writer(clock, writes, interval=5.0)
+            for i, gap in enumerate(gaps):
+                clock.now += gap
+                writer.update(min(i, 100), "embedding")
+
+        assert len(writes) <= 1 + int(clock.now / 5.0)
@@ -0,0 +1,213 @@
+"""Tests for the process-wide Redis Pub/Sub fan-out used by SSE endpoints."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.redis import (
+    PubSubDispatcher,
+    get_channel_pattern,
+    stream_channel,
+    subscribe_analysis_progress,
+)
+
+
+class FakePubSub:
+    """In-memory stand-in for redis.asyncio PubSub with pattern support."""
+
+    instances: list["FakePubSub"] = []
+
+    def __init__(self):
+        self.patterns: list[str] = []
+        self.closed = False
+        self._messages: asyncio.Queue = asyncio.Queue()
+        FakePubSub.instances.append(self)
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self.patterns) and not self.closed
+
+    async def psubscribe(self, *patterns: str) -> None:
+        self.patterns.extend(patterns)
+
+    async def listen(self):
+        while self.subscribed:
+            message = await self._messages.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+    def publish(self, channel: str, data: str) -> None:
+        pattern = get_channel_pattern(channel)
+        self._messages.put_nowait({
+            "type": "pmessage",
+            "pattern": pattern,
+            "channel": channel,
+            "data": data,
+        })
+
+    def drop_connection(self) -> None:
+        self._messages.put_nowait(RedisConnectionError("Connection reset by peer"))
+
+
+@pytest.fixture
+def dispatcher():
+    FakePubSub.instances.clear()
+    return PubSubDispatcher(pubsub_factory=FakePubSub, queue_size=3)
+
+
+def test_channel_pattern():
+    assert get_channel_pattern("analysis:progress:abc") == "analysis:progress:*"
+    assert get_channel_pattern("healing:progress:123") == "healing:progress:*"
+
+
+@pytest.mark.asyncio
+async def test_many_clients_share_one_subscription(dispatcher):
+    async with dispatcher.subscribe("analysis:progress:a") as q1, \
+            dispatcher.subscribe("analysis:progress:a") as q2, \
+            dispatcher.subscribe("analysis:progress:b") as q3:
+        assert len(FakePubSub.instances) == 1
+        assert FakePubSub.instances[0].patterns == ["analysis:progress:*"]
+
+        FakePubSub.instances[0].publish("analysis:progress:a", "hello")
+        assert await asyncio.wait_for(q1.get(), 1) == "hello"
+        assert await asyncio.wait_for(q2.get(), 1) == "hello"
+        assert q3.empty()
+
+    assert dispatcher.subscriber_count == 0
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_drops_oldest(dispatcher):
+    async with dispatcher.subscribe("embedding:progress:r") as queue:
+        pubsub = FakePubSub.instances[0]
+        for i in range(5):
+            pubsub.publish("embedding:progress:r", str(i))
+        await asyncio.sleep(0.05)
+
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert received == ["2", "3", "4"]
+    assert dispatcher.dropped_messages == 2
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_analysis_progress_stops_on_terminal_status(dispatcher):
+    with patch("app.core.redis.get_pubsub_dispatcher", return_value=dispatcher):
+        stream = subscribe_analysis_progress("a1")
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+
+        pubsub = FakePubSub.instances[0]
+        pubsub.publish("analysis:progress:a1", json.dumps({"status": "running", "progress": 50}))
+        assert json.loads(await asyncio.wait_for(first, 1))["progress"] == 50
+
+        pubsub.publish("analysis:progress:a1", json.dumps({"status": "completed", "progress": 100}))
+        assert json.loads(await asyncio.wait_for(stream.__anext__(), 1))["status"] == "completed"
+
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(stream.__anext__(), 1)
+
+    assert dispatcher.subscriber_count == 0
+    await dispatcher.close()
+
+
+class _FlakyFactory:
+    """PubSub factory whose first ``failures`` calls after the first raise."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self) -> FakePubSub:
+        self.calls += 1
+        if self.calls > 1 and self.failures > 0:
+            self.failures -= 1
+            raise RedisConnectionError("Connection refused")
+        return FakePubSub()
+
+
+@pytest.fixture
+def no_backoff():
+    with patch("app.core.redis.PUBSUB_RECONNECT_DELAY_SECONDS", 0), \
+            patch("app.core.redis.PUBSUB_RECONNECT_ATTEMPTS", 3):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_reconnect_is_retried_until_redis_is_back(no_backoff):
+    FakePubSub.instances.clear()
+    dispatcher = PubSubDispatcher(pubsub_factory=_FlakyFactory(failures=2), queue_size=3)
+
+    async with dispatcher.subscribe("analysis:progress:a") as queue:
+        FakePubSub.instances[0].drop_connection()
+        await asyncio.sleep(0.05)
+
+        assert len(FakePubSub.instances) == 2
+        resubscribed = FakePubSub.instances[1]
+        assert resubscribed.patterns == ["analysis:progress:*"]
+        resubscribed.publish("analysis:progress:a", "back")
+        assert await asyncio.wait_for(queue.get(), 1) == "back"
+
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_clients_are_released_when_reconnect_gives_up(no_backoff):
+    FakePubSub.instances.clear()
+    dispatcher = PubSubDispatcher(pubsub_factory=_FlakyFactory(failures=3), queue_size=3)
+
+    with patch("app.core.redis.get_pubsub_dispatcher", return_value=dispatcher):
+        stream = stream_channel("analysis:progress:a")
+        waiting = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+
+        FakePubSub.instances[0].drop_connection()
+        with pytest.raises(RedisConnectionError):
+            await asyncio.wait_for(waiting, 1)
+
+    assert dispatcher.subscriber_count == 0
+
+    # A later client starts over on a fresh subscription
+    async with dispatcher.subscribe("analysis:progress:b") as queue:
+        assert FakePubSub.instances[-1].patterns == ["analysis:progress:*"]
+        FakePubSub.instances[-1].publish("analysis:progress:b", "ok")
+        assert await asyncio.wait_for(queue.get(), 1) == "ok"
+
+    await dispatcher.close()
+
+
+class _RefusingPubSub(FakePubSub):
+    """PubSub whose subscription fails, as when Redis is down."""
+
+    async def psubscribe(self, *patterns: str) -> None:
+        raise RedisConnectionError("Connection refused")
+
+
+@pytest.mark.asyncio
+async def test_failed_subscription_does_not_leave_queue_registered():
+    FakePubSub.instances.clear()
+    factories = iter([_RefusingPubSub, FakePubSub])
+    dispatcher = PubSubDispatcher(pubsub_factory=lambda: next(factories)(), queue_size=3)
+
+    with pytest.raises(RedisConnectionError):
+        async with dispatcher.subscribe("analysis:progress:a"):
+            pass
+
+    assert dispatcher.subscriber_count == 0
+    assert FakePubSub.instances[0].closed
+
+    # The next client subscribes on a fresh connection
+    async with dispatcher.subscribe("analysis:progress:a") as queue:
+        FakePubSub.instances[1].publish("analysis:progress:a", "ok")
+        assert await asyncio.wait_for(queue.get(), 1) == "ok"
+
+    await dispatcher.close()
@@ -0,0 +1,213 @@
+"""Tests for coalescing push webhooks into one analysis of the newest head."""
+
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.workers.helpers import SUPERSEDED_MESSAGE_PREFIX
+from app.workers.scheduled import _supersede_push_analyses, flush_push_analysis
+
+OLD_SHA = "a" * 40
+HEAD_SHA = "b" * 40
+REPO_ID = str(uuid.uuid4())
+
+
+def _analysis(commit_sha, status="pending", embeddings="pending", ai_scan="pending"):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        commit_sha=commit_sha,
+        status=status,
+        error_message=None,
+        completed_at=None,
+        embeddings_status=embeddings,
+        embeddings_error=None,
+        ai_scan_status=ai_scan,
+        ai_scan_message=None,
+        state_updated_at=None,
+    )
+
+
+def _sync_db(*analyses, repo_active=True):
+    db = MagicMock()
+    repo_result = MagicMock()
+    repo_result.scalar_one_or_none.return_value = MagicMock(is_active=repo_active)
+    analyses_result = MagicMock()
+    analyses_result.scalars.return_value.all.return_value = list(analyses)
+    db.execute.side_effect = [repo_result, analyses_result]
+    return db
+
+
+class TestPushWebhookCoalescing:
+
+    @staticmethod
+    def _push(sha: str) -> dict:
+        return {
+            "ref": "refs/heads/main",
+            "after": sha,
+            "head_commit": {"id": sha},
+            "repository": {"id": 42, "default_branch": "main"},
+        }
+
+    @staticmethod
+    def _db():
+        repository = MagicMock(id=uuid.uuid4(), is_active=True)
+        repo_result = MagicMock()
+        repo_result.scalar_one_or_none.return_value = repository
+        existing_result = MagicMock()
+        existing_result.scalar_one_or_none.return_value = None
+        sync_db = MagicMock()
+        sync_db.execute.return_value = existing_result
+        db = AsyncMock()
+        db.execute.return_value = repo_result
+        # The commit lookup is the workers' sync helper, run on the async session
+        db.run_sync.side_effect = lambda fn, *args: fn(sync_db, *args)
+        db.add = MagicMock()
+        return db, repository
+
+    async def test_first_push_schedules_flush(self):
+        from app.api.v1.webhooks import handle_push_event
+
+        db, repository = self._db()
+
+        with patch("app.api.v1.webhooks.record_push", return_value=True), \
+                patch("app.api.v1.webhooks.flush_push_analysis") as flush, \
+                patch("app.api.v1.webhooks.enqueue_analysis") as enqueue, \
+                patch("app.api.v1.webhooks.settings") as settings:
+            settings.webhook_push_debounce_seconds = 60
+            result = await handle_push_event(self._push(HEAD_SHA), db)
+
+        assert result["status"] == "scheduled"
+        assert flush.apply_async.call_args.kwargs == {
+            "kwargs": {"repository_id": str(repository.id), "branch": "main"},
+            "countdown": 60,
+        }
+        enqueue.assert_not_called()
+        db.add.assert_not_called()
+
+    async def test_push_within_window_is_coalesced(self):
+        from app.api.v1.webhooks import handle_push_event
+
+        db, _ = self._db()
+
+        with patch("app.api.v1.webhooks.record_push", return_value=False), \
+                patch("app.api.v1.webhooks.flush_push_analysis") as flush, \
+                patch("app.api.v1.webhooks.enqueue_analysis") as enqueue:
+            result = await handle_push_event(self._push(HEAD_SHA), db)
+
+        assert result["status"] == "coalesced"
+        flush.apply_async.assert_not_called()
+        enqueue.assert_not_called()
+
+    async def test_failed_scheduling_closes_window_and_analyzes_directly(self):
+        from app.api.v1.webhooks import handle_push_event
+
+        db, _ = self._db()
+
+        with patch("app.api.v1.webhooks.record_push", return_value=True), \
+                patch("app.api.v1.webhooks.flush_push_analysis") as flush, \
+                patch("app.api.v1.webhooks.take_pushed_head") as take_head, \
+                patch("app.api.v1.webhooks.enqueue_analysis") as enqueue:
+            flush.apply_async.side_effect = RuntimeError("broker down")
+            enqueue.return_value.id = "task-1"
+            result = await handle_push_event(self._push(HEAD_SHA), db)
+
+        assert result["status"] == "queued"
+        take_head.assert_called_once()
+        enqueue.assert_called_once()
+
+
+class TestSupersede:
+
+    def test_pending_work_of_older_heads_is_cancelled(self):
+        queued = _analysis(OLD_SHA)
+        running = _analysis(OLD_SHA, status="running", embeddings="running")
+        head = _analysis(HEAD_SHA)
+        db = MagicMock()
+        db.execute.return_value.scalars.return_value.all.return_value = [queued, running, head]
+
+        superseded = _supersede_push_analyses(
+            db, [str(a.id) for a in (queued, running, head)], HEAD_SHA,
+        )
+
+        assert superseded == [str(queued.id), str(running.id)]
+        assert queued.status == "failed"
+        assert queued.error_message.startswith(SUPERSEDED_MESSAGE_PREFIX)
+        assert queued.embeddings_status == "failed"
+        assert queued.ai_scan_status == "skipped"
+        # A running static analysis finishes; only its queued AI scan is dropped
+        assert running.status == "running" and running.embeddings_status == "running"
+        assert running.ai_scan_status == "skipped"
+        assert head.status == "pending"
+
+
+class TestFlushPushAnalysis:
+
+    @pytest.fixture
+    def pipeline(self):
+        with patch("app.workers.scheduling.enqueue_analysis") as enqueue, \
+                patch("app.workers.embeddings.generate_embeddings_parallel") as embeddings, \
+                patch("app.workers.ai_scan.run_ai_scan") as ai_scan, \
+                patch("app.core.redis.publish_analysis_progress") as publish, \
+                patch("app.workers.scheduling.track_push_analysis") as track:
+            yield SimpleNamespace(
+                enqueue=enqueue, embeddings=embeddings, ai_scan=ai_scan, publish=publish, track=track,
+            )
+
+    @staticmethod
+    def _run(db, tracked, existing=None):
+        @contextmanager
+        def session():
+            yield db
+
+        with patch("app.core.database.get_sync_session", session), \
+                patch("app.workers.scheduling.take_pushed_head", return_value=HEAD_SHA), \
+                patch("app.workers.scheduling.pop_push_analyses", return_value=tracked), \
+                patch("app.workers.helpers.find_analysis_for_commit", return_value=existing):
+            return flush_push_analysis(REPO_ID, "main")
+
+    def test_newest_head_runs_full_pipeline(self, pipeline):
+        older = _analysis(OLD_SHA)
+        db = _sync_db(older)
+
+        def assign_id():
+            db.add.call_args.args[0].id = uuid.uuid4()
+
+        db.flush.side_effect = assign_id
+
+        with patch("app.core.config.settings.ai_scan_enabled", True):
+            result = self._run(db, [str(older.id)])
+
+        assert result["status"] == "queued"
+        assert result["superseded"] == [str(older.id)]
+        assert older.status == "failed"
+        created = db.add.call_args.args[0]
+        assert created.commit_sha == HEAD_SHA and created.embeddings_status == "pending"
+        assert pipeline.enqueue.call_args.kwargs["triggered_by"] == "webhook"
+        pipeline.embeddings.delay.assert_called_once()
+        pipeline.ai_scan.delay.assert_called_once_with(analysis_id=result["analysis_id"])
+        assert pipeline.publish.call_args.kwargs["analysis_id"] == str(older.id)
+        pipeline.track.assert_called_once_with(REPO_ID, result["analysis_id"])
+
+    def test_covered_head_is_not_reanalyzed(self, pipeline):
+        running = _analysis(OLD_SHA, status="running", embeddings="running", ai_scan="skipped")
+        db = _sync_db(running)
+        existing = MagicMock(id=uuid.uuid4(), status="running")
+
+        result = self._run(db, [str(running.id)], existing=existing)
+
+        assert result["status"] == "skipped"
+        assert result["analysis_id"] == str(existing.id)
+        pipeline.enqueue.assert_not_called()
+        db.add.assert_not_called()
+        # Still running, so a later push can cancel its pending tracks
+        pipeline.track.assert_called_once_with(REPO_ID, str(running.id))
+
+    def test_nothing_pushed_is_noop(self, pipeline):
+        with patch("app.workers.scheduling.take_pushed_head", return_value=None):
+            result = flush_push_analysis(REPO_ID, "main")
+
+        assert result["status"] == "skipped"
+        pipeline.enqueue.assert_not_called()
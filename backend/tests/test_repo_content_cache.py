@@ -6,6 +6,8 @@ defined in the design document for the repo-content-cache feature.
 
 import uuid
 from dataclasses import dataclass
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 from hypothesis import given, settings
 from hypothesis import strategies as st
@@ -352,6 +354,7 @@ from app.services.repo_content import (
     MIN_FILE_SIZE,
     RepoContentService,
     compute_content_hash,
+    parent_path_of,
 )
 
 
@@ -1815,3 +1818,128 @@ class TestFullTreeCollection:
             assert full_tree == []
         finally:
             cleanup_temp_repo(repo_path)
+
+
+class TestTreeEntryIndexing:
+    """Tests for directory-indexed tree entries."""
+
+    def test_parent_path_of_root_entry(self):
+        """Root-level entries have an empty parent path."""
+        assert parent_path_of("README.md") == ""
+        assert parent_path_of("src") == ""
+
+    def test_parent_path_of_nested_entry(self):
+        """Nested entries are indexed under their direct parent."""
+        assert parent_path_of("src/main.py") == "src"
+        assert parent_path_of("src/utils/helpers.py") == "src/utils"
+
+    def test_parent_index_covers_collected_tree(self):
+        """
+        **Feature: commit-centric-explorer**
+
+        Property: Grouping a collected tree by parent_path gives every
+        directory exactly its direct children, and every entry belongs to
+        exactly one listing.
+        """
+        files = {
+            "README.md": b"# README\n" * 10,
+            "src/main.py": b"# main\n" * 10,
+            "src/utils/helpers.py": b"# helpers\n" * 10,
+            "src/utils/deep/x.py": b"# x\n" * 10,
+        }
+        repo_path = create_temp_repo(files)
+        try:
+            service = RepoContentService()
+            full_tree = service.collect_full_tree(repo_path)
+
+            listings: dict[str, set[str]] = {}
+            for entry in full_tree:
+                listings.setdefault(parent_path_of(entry["path"]), set()).add(entry["path"])
+
+            assert listings[""] == {"README.md", "src"}
+            assert listings["src"] == {"src/main.py", "src/utils"}
+            assert listings["src/utils"] == {"src/utils/helpers.py", "src/utils/deep"}
+            assert listings["src/utils/deep"] == {"src/utils/deep/x.py"}
+            assert sum(len(v) for v in listings.values()) == len(full_tree)
+        finally:
+            cleanup_temp_repo(repo_path)
+
+
+class _TreeEntrySession:
+    """In-memory stand-in for the session get_full_tree queries.
+
+    Rows are stored in reverse path order, so a listing only comes back
+    sorted if the query asks for it.
+    """
+
+    def __init__(self, full_tree: list[dict], status: str = "ready"):
+        self.cache = SimpleNamespace(id=uuid.uuid4(), status=status)
+        self.rows = sorted(
+            (
+                SimpleNamespace(parent_path=parent_path_of(entry["path"]), **entry)
+                for entry in full_tree
+            ),
+            key=lambda row: row.path,
+            reverse=True,
+        )
+
+    async def execute(self, stmt):
+        sql = str(stmt.compile())
+        result = MagicMock()
+        if "FROM repo_content_cache" in sql:
+            result.one_or_none.return_value = self.cache
+        elif sql.startswith("SELECT EXISTS"):
+            result.scalar.return_value = bool(self.rows)
+        else:
+            parent_path = stmt.compile().params["parent_path_1"]
+            listing = [row for row in self.rows if row.parent_path == parent_path]
+            if "ORDER BY repo_content_tree_entries.path" in sql:
+                listing.sort(key=lambda row: row.path)
+            result.all.return_value = listing
+        return result
+
+
+class TestGetFullTree:
+    """Tests for reading one directory of the explorer tree."""
+
+    FULL_TREE = [
+        {"name": "src", "path": "src", "type": "directory", "size": None},
+        {"name": "README.md", "path": "README.md", "type": "file", "size": 90},
+        {"name": "utils", "path": "src/utils", "type": "directory", "size": None},
+        {"name": "main.py", "path": "src/main.py", "type": "file", "size": 70},
+        {"name": "app.py", "path": "src/app.py", "type": "file", "size": 30},
+        {"name": "helpers.py", "path": "src/utils/helpers.py", "type": "file", "size": 90},
+    ]
+
+    async def test_lists_direct_children_only(self):
+        db = _TreeEntrySession(self.FULL_TREE)
+
+        root = await RepoContentService().get_full_tree(db, uuid.uuid4(), "a" * 40)
+        nested = await RepoContentService().get_full_tree(db, uuid.uuid4(), "a" * 40, "src/utils/")
+
+        assert [entry["path"] for entry in root] == ["README.md", "src"]
+        assert nested == [
+            {"name": "helpers.py", "path": "src/utils/helpers.py", "type": "file", "size": 90},
+        ]
+
+    async def test_listing_is_ordered_by_path(self):
+        db = _TreeEntrySession(self.FULL_TREE)
+
+        listing = await RepoContentService().get_full_tree(db, uuid.uuid4(), "a" * 40, "src")
+
+        assert [entry["path"] for entry in listing] == ["src/app.py", "src/main.py", "src/utils"]
+
+    async def test_empty_directory_of_saved_tree_is_empty(self):
+        db = _TreeEntrySession(self.FULL_TREE)
+
+        assert await RepoContentService().get_full_tree(db, uuid.uuid4(), "a" * 40, "docs") == []
+
+    async def test_repo_without_entries_has_no_tree(self):
+        db = _TreeEntrySession([])
+
+        assert await RepoContentService().get_full_tree(db, uuid.uuid4(), "a" * 40) is None
+
+    async def test_cache_not_ready_has_no_tree(self):
+        db = _TreeEntrySession(self.FULL_TREE, status="uploading")
+
+        assert await RepoContentService().get_full_tree(db, uuid.uuid4(), "a" * 40) is None
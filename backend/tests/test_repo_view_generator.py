@@ -424,3 +424,152 @@ class TestLargeFileTruncation:
             )
         finally:
             cleanup_temp_repo(repo_path)
+
+
+# =============================================================================
+# Tokenizer, Single-Read Inventory, Knapsack Packing and Memoization
+# =============================================================================
+
+
+class WordTokenizer:
+    """Deterministic stand-in for a real tokenizer (one token per word)."""
+
+    name = "words"
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+def _write_repo(files: dict[str, str]) -> Path:
+    repo_path = Path(tempfile.mkdtemp(prefix="test_repo_"))
+    for rel_path, content in files.items():
+        file_path = repo_path / rel_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+    return repo_path
+
+
+class TestRepoViewPacking:
+    """Unit tests for tokenizer-aware packing."""
+
+    def test_uses_pluggable_tokenizer(self):
+        repo_path = _write_repo({"main.py": "a b c d\n" * 10})
+        try:
+            result = RepoViewGenerator(repo_path, tokenizer=WordTokenizer()).generate()
+            assert result.token_estimate == len(result.content.split())
+        finally:
+            cleanup_temp_repo(repo_path)
+
+    def test_each_file_read_once(self):
+        from unittest.mock import patch
+
+        repo_path = _write_repo({f"src/mod{i}.py": "x = 1\n" * 2000 for i in range(6)})
+        try:
+            generator = RepoViewGenerator(repo_path, token_budget=5000)
+            with patch("builtins.open", wraps=open) as mock_open:
+                generator.generate()
+                generator.generate_focused(["src/mod0.py"], ["src/mod1.py"])
+            opened = [call.args[0] for call in mock_open.call_args_list]
+            assert len(opened) == len(set(opened)) == 6
+        finally:
+            cleanup_temp_repo(repo_path)
+
+    def test_knapsack_fills_budget_better_than_greedy(self):
+        # Same tier: greedy by path takes the 600-token file and cannot fit
+        # either 500-token file; the knapsack takes both 500-token files.
+        words = lambda n: " ".join(["w"] * n)  # noqa: E731
+        repo_path = _write_repo({
+            "a.py": words(600),
+            "b.py": words(500),
+            "c.py": words(500),
+        })
+        try:
+            generator = RepoViewGenerator(repo_path, tokenizer=WordTokenizer())
+            files = generator._prioritize_files()
+            section, included, _ = generator._generate_file_content_section(files, 1020)
+            assert included == 2
+            assert "### b.py" in section and "### c.py" in section
+        finally:
+            cleanup_temp_repo(repo_path)
+
+    def test_higher_priority_tier_packed_first(self):
+        words = lambda n: " ".join(["w"] * n)  # noqa: E731
+        repo_path = _write_repo({"main.py": words(400), "other.py": words(400)})
+        try:
+            generator = RepoViewGenerator(repo_path, tokenizer=WordTokenizer())
+            section, included, _ = generator._generate_file_content_section(
+                generator._prioritize_files(), 600,
+            )
+            assert included == 1 and "### main.py" in section
+        finally:
+            cleanup_temp_repo(repo_path)
+
+    def test_fit_to_budget_reports_counts_of_kept_sections(self):
+        repo_path = _write_repo({"main.py": "print(1)\n"})
+        try:
+            generator = RepoViewGenerator(repo_path, token_budget=8, tokenizer=WordTokenizer())
+            sections = [
+                ("\n### a.py\nw w w\n", 5, True),
+                # A markdown file whose content has its own "### " headings
+                ("\n### README.md\n### Usage\nw w w\n", 8, True),
+            ]
+
+            content, tokens, included, truncated = generator._fit_to_budget("# View\n", sections)
+
+            assert (included, truncated) == (1, 1)
+            assert tokens == 7
+            assert "README.md" not in content and "Usage" not in content
+        finally:
+            cleanup_temp_repo(repo_path)
+
+    @given(repo_structure(), st.integers(min_value=200, max_value=5000))
+    @settings(max_examples=50, deadline=None)
+    def test_budget_respected_with_real_tokenizer(self, structure, token_budget):
+        repo_path = create_temp_repo(structure)
+        try:
+            result = RepoViewGenerator(
+                repo_path, token_budget=token_budget, tokenizer=WordTokenizer(),
+            ).generate()
+            assert result.token_estimate <= token_budget or result.files_included == 0
+        finally:
+            cleanup_temp_repo(repo_path)
+
+    def test_view_is_independent_of_clone_directory(self):
+        files = {"main.py": "print(1)\n", "src/app.py": "x = 1\n"}
+        first, second = _write_repo(files), _write_repo(files)
+        try:
+            assert (
+                RepoViewGenerator(first).generate().content
+                == RepoViewGenerator(second).generate().content
+            )
+        finally:
+            cleanup_temp_repo(first)
+            cleanup_temp_repo(second)
+
+    def test_memoized_per_repository_commit_and_tokenizer(self):
+        from app.services import repo_view_generator
+
+        repo_path = _write_repo({"main.py": "print(1)\n"})
+        try:
+            repo_view_generator._repo_view_memo.clear()
+            first = RepoViewGenerator(repo_path, commit_sha="a" * 40, repository_id="r1").generate()
+            (repo_path / "main.py").write_text("print(2)\n")
+
+            assert RepoViewGenerator(repo_path, commit_sha="a" * 40, repository_id="r1").generate() is first
+            assert RepoViewGenerator(repo_path, commit_sha="b" * 40, repository_id="r1").generate() is not first
+            # A fork at the same commit gets its own view
+            assert RepoViewGenerator(repo_path, commit_sha="a" * 40, repository_id="r2").generate() is not first
+            assert RepoViewGenerator(
+                repo_path, commit_sha="a" * 40, repository_id="r1", tokenizer=WordTokenizer(),
+            ).generate() is not first
+            assert RepoViewGenerator(repo_path, commit_sha="a" * 40).generate() is not first
+        finally:
+            repo_view_generator._repo_view_memo.clear()
+            cleanup_temp_repo(repo_path)
+
+
+def test_get_tokenizer_falls_back_to_char_estimate():
+    from app.services.tokenizer import get_tokenizer
+
+    assert get_tokenizer("chars").count("abcdefgh") == 2
+    assert get_tokenizer("unknown").name == "chars"
@@ -0,0 +1,127 @@
+"""Tests for enforced, non-blocking command execution in the Sandbox."""
+
+import asyncio
+import threading
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.sandbox import TIMEOUT_EXIT_CODE, Sandbox, _OutputBuffer
+
+
+def _sandbox(chunks, exit_code=0):
+    client = MagicMock()
+    client.api.exec_create.return_value = {"Id": "exec-1"}
+    client.api.exec_start.return_value = iter(chunks)
+    client.api.exec_inspect.return_value = {"ExitCode": exit_code}
+    sandbox = Sandbox(client=client, repository_id=uuid.uuid4(), timeout=300)
+    sandbox.container = MagicMock(id="container-1")
+    return sandbox, client.api
+
+
+class TestSandboxRun:
+
+    async def test_command_runs_under_timeout(self):
+        sandbox, api = _sandbox([(b"ok\n", None)])
+
+        exit_code, output = await sandbox.exec_args(["pytest", "t.py"], timeout=60)
+
+        assert (exit_code, output) == (0, "ok\n")
+        command = api.exec_create.call_args.args[1]
+        assert command[0] == "timeout"
+        assert command[-3:] == ["60s", "pytest", "t.py"]
+        assert api.exec_create.call_args.kwargs["workdir"] == "/workspace/repo"
+
+    async def test_output_keeps_stdout_before_stderr(self):
+        sandbox, _ = _sandbox([(b"out1 ", None), (None, b"err "), (b"out2 ", None)])
+
+        _, output = await sandbox.exec("make", timeout=10)
+
+        assert output == "out1 out2 err "
+
+    async def test_timeout_is_reported(self):
+        sandbox, _ = _sandbox([(b"partial", None)], exit_code=TIMEOUT_EXIT_CODE)
+
+        result = await sandbox.run(["npx", "tsc"], timeout=5)
+
+        assert result.timed_out
+        assert result.exit_code == TIMEOUT_EXIT_CODE
+        assert result.stdout == "partial"
+        assert "timed out after 5s" in result.stderr
+
+    async def test_hung_stream_does_not_block_event_loop(self):
+        release = threading.Event()
+
+        def hung_stream():
+            yield b"started\n", None
+            release.wait(5)
+
+        sandbox, _ = _sandbox(hung_stream())
+
+        with patch("app.services.sandbox.EXEC_KILL_GRACE_SECONDS", 0), \
+                patch("app.services.sandbox.EXEC_HOST_GRACE_SECONDS", 0):
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.05)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await sandbox.run(["sleep", "infinity"], timeout=1)
+            task.cancel()
+        release.set()
+
+        assert result.timed_out
+        assert result.exit_code == TIMEOUT_EXIT_CODE
+        assert result.stdout == "started\n"
+        assert ticks >= 10
+
+    async def test_output_is_streamed(self):
+        sandbox, _ = _sandbox([(b"a", None), (None, b"b"), ("é".encode()[:1], None), ("é".encode()[1:], None)])
+        seen = []
+
+        await sandbox.run(["cmd"], on_output=lambda stream, text: seen.append((stream, text)))
+        await asyncio.sleep(0)
+
+        assert seen == [("stdout", "a"), ("stderr", "b"), ("stdout", "é")]
+
+    async def test_output_is_capped(self):
+        sandbox, _ = _sandbox([(b"x" * 100, None), (b"y" * 100, None)])
+
+        with patch("app.services.sandbox.settings") as settings:
+            settings.sandbox_max_output_bytes = 20
+            result = await sandbox.run(["cmd"])
+
+        assert result.truncated
+        assert result.stdout.startswith("x" * 10)
+        assert result.stdout.endswith("y" * 10)
+        assert "180 bytes truncated" in result.stdout
+
+    async def test_requires_started_sandbox(self):
+        sandbox, _ = _sandbox([])
+        sandbox.container = None
+
+        with pytest.raises(RuntimeError):
+            await sandbox.exec("ls")
+
+
+class TestOutputBuffer:
+
+    def test_small_output_is_kept_whole(self):
+        buffer = _OutputBuffer(10)
+        buffer.append(b"abc")
+        buffer.append(b"def")
+
+        assert not buffer.truncated
+        assert buffer.text() == "abcdef"
+
+    def test_head_and_tail_are_kept(self):
+        buffer = _OutputBuffer(4)
+        for chunk in (b"ab", b"cd", b"ef", b"gh"):
+            buffer.append(chunk)
+
+        assert buffer.truncated
+        assert buffer.text() == "ab\n[... 4 bytes truncated ...]\ngh"
@@ -0,0 +1,177 @@
+"""Tests for the two-tier shared cache and GitHub conditional requests."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.cache import SharedCache
+from app.services.github import GitHubService
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.calls += 1
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        return [k for k in self.data if k.startswith(prefix)]
+
+
+class BrokenRedis:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        raise RedisConnectionError("down")
+
+    def set(self, key, value, ex=None):
+        self.get(key)
+
+
+class TestSharedCache:
+
+    def test_values_are_shared_through_redis(self):
+        redis = FakeRedis()
+        api = SharedCache("t", ttl_seconds=60, redis_client=redis)
+        worker = SharedCache("t", ttl_seconds=60, redis_client=redis)
+
+        api.set("k", {"sha": "abc"})
+
+        assert redis.data == {"t:k": '{"sha": "abc"}'}
+        assert worker.get("k") == {"sha": "abc"}
+
+    def test_local_hits_skip_redis(self):
+        redis = FakeRedis()
+        cache = SharedCache("t", ttl_seconds=60, redis_client=redis)
+        cache.set("k", "v")
+        calls = redis.calls
+
+        for _ in range(3):
+            assert cache.get("k") == "v"
+
+        assert redis.calls == calls
+
+    def test_local_tier_is_lru_bounded(self):
+        redis = FakeRedis()
+        cache = SharedCache("t", ttl_seconds=60, local_max_entries=2, redis_client=redis)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert list(cache._local) == ["a", "c"]
+
+    def test_redis_outage_degrades_to_local_tier(self):
+        redis = BrokenRedis()
+        cache = SharedCache("t", ttl_seconds=60, redis_client=redis)
+
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        assert cache.get("missing") is None
+        # Backoff: Redis is not retried on every call during an outage
+        assert redis.calls == 1
+
+    async def test_async_access(self):
+        redis = FakeRedis()
+        cache = SharedCache("t", ttl_seconds=60, redis_client=redis)
+
+        await cache.aset("k", [1, 2])
+        cache.clear_local()
+
+        assert await cache.aget("k") == [1, 2]
+
+    def test_clear_removes_namespace_only(self):
+        redis = FakeRedis()
+        redis.data["other:k"] = "1"
+        cache = SharedCache("t", ttl_seconds=60, redis_client=redis)
+        cache.set("k", "v")
+
+        cache.clear()
+
+        assert cache.get("k") is None
+        assert redis.data == {"other:k": "1"}
+
+
+def _response(status_code: int, body=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.is_success = status_code < 300
+    response.json.return_value = body
+    response.headers = headers or {}
+    return response
+
+
+class TestGitHubConditionalRequests:
+
+    @pytest.fixture(autouse=True)
+    def etag_cache(self):
+        cache = SharedCache("cache:github", ttl_seconds=3600, redis_client=FakeRedis())
+        with patch("app.services.github._etag_cache", cache):
+            yield cache
+
+    @staticmethod
+    def _client(*responses):
+        client = AsyncMock()
+        client.get.side_effect = list(responses)
+        return client
+
+    async def test_fresh_response_served_without_request(self):
+        branches = [{"name": "main", "commit": {"sha": "abc"}, "protected": False}]
+        client = self._client(
+            _response(200, branches, {"etag": 'W/"1"', "cache-control": "private, max-age=60"}),
+        )
+
+        with patch("httpx.AsyncClient") as http:
+            http.return_value.__aenter__.return_value = client
+            service = GitHubService("token")
+            first = await service.list_branches("o", "r")
+            second = await service.list_branches("o", "r")
+
+        assert first == second == [{"name": "main", "commit_sha": "abc", "protected": False}]
+        assert client.get.call_count == 1
+
+    async def test_stale_response_revalidated_with_etag(self, etag_cache):
+        repo = {"full_name": "o/r", "default_branch": "main"}
+        client = self._client(
+            _response(200, repo, {"etag": '"v1"', "cache-control": "private, max-age=0"}),
+            _response(304, None, {"cache-control": "private, max-age=0"}),
+        )
+
+        with patch("httpx.AsyncClient") as http:
+            http.return_value.__aenter__.return_value = client
+            service = GitHubService("token")
+            await service.get_repository("o", "r")
+            etag_cache.clear_local()  # As seen from another process
+            result = await service.get_repository("o", "r")
+
+        assert result == repo
+        assert client.get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
+    async def test_cache_is_scoped_by_token(self):
+        client = self._client(
+            _response(200, {"private": True}, {"etag": '"v1"', "cache-control": "max-age=60"}),
+            _response(200, {"private": False}, {"etag": '"v2"', "cache-control": "max-age=60"}),
+        )
+
+        with patch("httpx.AsyncClient") as http:
+            http.return_value.__aenter__.return_value = client
+            await GitHubService("token-a").get_repository("o", "r")
+            result = await GitHubService("token-b").get_repository("o", "r")
+
+        assert result == {"private": False}
+        assert "If-None-Match" not in client.get.call_args_list[1].kwargs["headers"]
@@ -305,7 +305,7 @@ class TestResolveRefToCommitSha:
 
         # Clear the ref cache to ensure we hit GitHub
         from app.services.vector_store import _ref_cache
-        _ref_cache._data.clear()
+        _ref_cache.clear()
 
         # Mock GitHub service - patch at the module where it's imported
         mock_github = MagicMock()